@@ -25,6 +25,12 @@ PNAD_ANO = 2025
 PNAD_TRIMESTRE = 3
 SALARIO_MINIMO = 1518  # Valor vigente em Q3/2025 (R$)
 
+# Pesos replicados bootstrap (v1028001…v1028200) para erros padrão do desenho.
+# Opcional: ~200 colunas extras no download (ou use --replicas no script 01)
+PNAD_PESOS_REPLICADOS = False
+N_REPLICAS = 200
+PESOS_REPLICADOS_COLS = [f"peso_rep{i:03d}" for i in range(1, N_REPLICAS + 1)]
+
 # ILO
 ILO_FILE = DATA_RAW / "Final_Scores_ISCO08_Gmyrek_et_al_2025.xlsx"
 ILO_URL = "https://github.com/pgmyrek/2025_GenAI_scores_ISCO08/raw/main/Final_Scores_ISCO08_Gmyrek_et_al_2025.xlsx"
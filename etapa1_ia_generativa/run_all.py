@@ -90,7 +90,12 @@ def main():
     # Etapa 7: Gerar Figuras
     if not run_script("07_analysis_figures.py"):
         return False
-    
+
+    # Etapa 10: Séries trimestrais (histórico de cubos; novos trimestres
+    # entram com: python src/10_serie_trimestral.py --trimestre ANO TRI)
+    if not run_script("10_serie_trimestral.py"):
+        return False
+
     # Finalização
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds() / 60
@@ -102,7 +107,7 @@ def main():
     print("=" * 60)
     
     print("\n📁 OUTPUTS GERADOS:")
-    print("  - data/processed/pnad_ilo_merged.csv")
+    print("  - data/output/pnad_ilo_merged.parquet")
     print("  - outputs/tables/*.csv e *.tex")
     print("  - outputs/figures/*.png e *.pdf")
     print("  - outputs/logs/*.log")
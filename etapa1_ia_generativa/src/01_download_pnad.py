@@ -2,6 +2,13 @@
 Script 01: Download dos microdados PNAD via BigQuery
 Entrada: Query BigQuery
 Saída: data/raw/pnad_2025q3.parquet
+
+Uso:
+    python src/01_download_pnad.py                       # trimestre de config/settings.py
+    python src/01_download_pnad.py --trimestre 2025 4    # trimestre específico
+
+Com QUERY_BACKEND=duckdb a mesma query roda no armazém local de Parquet
+(python -m query_backend sintetico, na raiz do repositório), sem BigQuery.
 """
 
 import logging
@@ -15,6 +22,8 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
+from src.utils.query_backend import get_backend, read_sql
+from src.utils.validators import validate_pnad_parquet
 
 # Setup logging
 logging.basicConfig(
@@ -27,25 +36,47 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def download_pnad(reauth=False):
+def raw_pnad_path(ano, trimestre):
+    """Caminho do parquet bruto de um trimestre: data/raw/pnad_{ano}q{trimestre}.parquet"""
+    return DATA_RAW / f"pnad_{ano}q{trimestre}.parquet"
+
+def download_pnad(reauth=False, replicas=PNAD_PESOS_REPLICADOS, ano=None, trimestre=None):
     """Baixa microdados PNAD do BigQuery.
 
     Se o parquet já existir em data/raw/, carrega direto.
     Senão, baixa do BigQuery.
+
+    Com replicas=True, inclui os 200 pesos replicados bootstrap
+    (v1028001…v1028200 → peso_rep001…peso_rep200), usados nos erros
+    padrão do desenho amostral (script 06).
+
+    Com ano e trimestre, usa/baixa exatamente esse trimestre (modo
+    incremental, script 10), sem recorrer ao trimestre mais recente.
     """
+    trimestre_fixo = ano is not None and trimestre is not None
 
     # --- Caminho rápido: arquivo local já disponível ---
-    pnad_files = sorted(DATA_RAW.glob("pnad_*.parquet"))
+    if trimestre_fixo:
+        pnad_files = [p for p in [raw_pnad_path(ano, trimestre)] if p.exists()]
+    else:
+        pnad_files = sorted(DATA_RAW.glob("pnad_*.parquet"))
 
     if pnad_files:
         pnad_path = pnad_files[-1]
         logger.info(f"Arquivo PNAD encontrado localmente: {pnad_path.name}")
+        # Validação pelos rodapés, antes de carregar o arquivo
+        _, errors = validate_pnad_parquet(pnad_path)
+        for error in errors:
+            logger.warning(f"Validação do arquivo local: {error}")
         df = pd.read_parquet(pnad_path)
         logger.info(f"Carregado: {len(df):,} observações")
+        if replicas and PESOS_REPLICADOS_COLS[0] not in df.columns:
+            logger.warning("Arquivo local não tem pesos replicados. "
+                           f"Apague {pnad_path.name} e rode novamente com --replicas.")
 
         # Validar que o arquivo corresponde à configuração
         match = re.search(r"pnad_(\d{4})q(\d)", pnad_path.name)
-        if match:
+        if match and not trimestre_fixo:
             ano_arquivo, trim_arquivo = int(match.group(1)), int(match.group(2))
             if ano_arquivo != PNAD_ANO or trim_arquivo != PNAD_TRIMESTRE:
                 logger.warning(f"Arquivo é {ano_arquivo} Q{trim_arquivo}, "
@@ -57,12 +88,12 @@ def download_pnad(reauth=False):
 
     # --- Caminho completo: download via BigQuery ---
     logger.info("Nenhum arquivo PNAD local encontrado. Iniciando download do BigQuery...")
-    import basedosdados as bd
-
-    logger.info(f"Projeto GCP: {GCP_PROJECT_ID}")
+    logger.info(f"Projeto GCP: {GCP_PROJECT_ID} (backend de consultas: {get_backend()})")
 
     # Verificar trimestres disponíveis
     logger.info("Verificando trimestres disponíveis...")
+    ano_config = ano if trimestre_fixo else PNAD_ANO
+    trim_config = trimestre if trimestre_fixo else PNAD_TRIMESTRE
     query_check = """
     SELECT DISTINCT ano, trimestre, COUNT(*) as n_obs
     FROM `basedosdados.br_ibge_pnadc.microdados`
@@ -73,24 +104,32 @@ def download_pnad(reauth=False):
     """
 
     try:
-        df_check = bd.read_sql(query_check, billing_project_id=GCP_PROJECT_ID, reauth=reauth)
+        df_check = read_sql(query_check, billing_project_id=GCP_PROJECT_ID, reauth=reauth)
         logger.info(f"Trimestres disponíveis:\n{df_check}")
 
         trimestre_existe = len(
-            df_check[(df_check['ano'] == PNAD_ANO) & (df_check['trimestre'] == PNAD_TRIMESTRE)]
+            df_check[(df_check['ano'] == ano_config) & (df_check['trimestre'] == trim_config)]
         ) > 0
 
         if trimestre_existe:
-            ano_usar, trim_usar = PNAD_ANO, PNAD_TRIMESTRE
+            ano_usar, trim_usar = ano_config, trim_config
         else:
             ano_usar = int(df_check.iloc[0]['ano'])
             trim_usar = int(df_check.iloc[0]['trimestre'])
-            logger.warning(f"AVISO: {PNAD_ANO} Q{PNAD_TRIMESTRE} indisponível. Usando {ano_usar} Q{trim_usar}")
+            logger.warning(f"AVISO: {ano_config} Q{trim_config} indisponível. Usando {ano_usar} Q{trim_usar}")
 
     except Exception as e:
         logger.error(f"Erro ao verificar trimestres: {e}")
-        ano_usar = PNAD_ANO
-        trim_usar = PNAD_TRIMESTRE
+        ano_usar = ano_config
+        trim_usar = trim_config
+
+    if trimestre_fixo and (ano_usar, trim_usar) != (ano, trimestre):
+        raise ValueError(f"{ano} Q{trimestre} ainda não disponível no BigQuery")
+
+    # Pesos replicados (opcionais) entram como colunas extras da mesma query
+    cols_replicas = "".join(
+        f",\n        v1028{i:03d} AS {col}" for i, col in enumerate(PESOS_REPLICADOS_COLS, 1)
+    ) if replicas else ""
 
     # Query principal — inclui TODOS ocupados com código de ocupação válido
     query = f"""
@@ -109,7 +148,7 @@ def download_pnad(reauth=False):
         vd4020 AS rendimento_efetivo,
         vd4031 AS horas_habituais,
         vd4035 AS horas_efetivas,
-        v1028  AS peso
+        v1028  AS peso{cols_replicas}
     FROM `basedosdados.br_ibge_pnadc.microdados`
     WHERE ano = {ano_usar}
       AND trimestre = {trim_usar}
@@ -117,7 +156,7 @@ def download_pnad(reauth=False):
     """
 
     logger.info(f"Executando query para {ano_usar} Q{trim_usar} (pode demorar 2-5 min)...")
-    df = bd.read_sql(query, billing_project_id=GCP_PROJECT_ID, reauth=reauth)
+    df = read_sql(query, billing_project_id=GCP_PROJECT_ID, reauth=reauth)
 
     logger.info(f"Download concluído: {len(df):,} observações")
     logger.info(f"Colunas: {list(df.columns)}")
@@ -125,7 +164,7 @@ def download_pnad(reauth=False):
     # Salvar
     ano_real = int(df['ano'].iloc[0])
     trim_real = int(df['trimestre'].iloc[0])
-    output_path = DATA_RAW / f"pnad_{ano_real}q{trim_real}.parquet"
+    output_path = raw_pnad_path(ano_real, trim_real)
     df.to_parquet(output_path, index=False)
     logger.info(f"Salvo em: {output_path}")
 
@@ -140,4 +179,11 @@ if __name__ == "__main__":
     reauth = '--reauth' in sys.argv
     if reauth:
         logger.info("Modo reauth ativado - será solicitada autenticação")
-    download_pnad(reauth=reauth)
+    replicas = '--replicas' in sys.argv or PNAD_PESOS_REPLICADOS
+    if replicas:
+        logger.info(f"Incluindo {N_REPLICAS} pesos replicados bootstrap")
+    ano, trimestre = None, None
+    if '--trimestre' in sys.argv:
+        i = sys.argv.index('--trimestre')
+        ano, trimestre = int(sys.argv[i + 1]), int(sys.argv[i + 2])
+    download_pnad(reauth=reauth, replicas=replicas, ano=ano, trimestre=trimestre)
@@ -15,6 +15,7 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
+from src.utils.reference_cache import read_excel_cached
 
 logging.basicConfig(
     level=logging.INFO,
@@ -41,7 +42,7 @@ def process_ilo():
     download_ilo_if_needed()
     
     logger.info(f"Lendo arquivo: {ILO_FILE}")
-    df_raw = pd.read_excel(ILO_FILE)
+    df_raw = read_excel_cached(ILO_FILE)  # Parquet em cache após a 1ª leitura
     
     logger.info(f"Linhas raw (tarefas): {len(df_raw):,}")
     logger.info(f"Colunas disponíveis: {list(df_raw.columns)}")
@@ -1,7 +1,7 @@
 """
 Script 03: Limpeza e criação de variáveis derivadas PNAD
 Entrada: data/raw/pnad_2025q3.parquet (ou trimestre disponível)
-Saída: data/processed/pnad_clean.csv
+Saída: data/processed/pnad_clean.parquet (tipos de src/utils/schema.py)
 """
 
 import logging
@@ -15,7 +15,8 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
-from src.utils.weighted_stats import weighted_quantile
+from src.utils.weighted_stats import weighted_quantiles
+from src.utils.schema import write_parquet
 
 logging.basicConfig(
     level=logging.INFO,
@@ -37,10 +38,15 @@ def find_pnad_file():
     logger.info(f"Usando arquivo: {latest_file.name}")
     return latest_file
 
-def clean_pnad():
-    """Limpa e prepara dados PNAD"""
+def clean_pnad(input_path=None, output_path=None):
+    """Limpa e prepara dados PNAD
 
-    input_path = find_pnad_file()
+    Por padrão lê o parquet mais recente de data/raw/ e grava
+    data/processed/pnad_clean.parquet; o modo incremental (script 10) informa
+    os caminhos de um trimestre específico.
+    """
+
+    input_path = input_path or find_pnad_file()
     logger.info(f"Lendo: {input_path}")
     df = pd.read_parquet(input_path)
 
@@ -103,13 +109,9 @@ def clean_pnad():
 
     # Winsorização de renda (percentis ponderados 1 e 99) — APENAS para quem tem renda
     mask_renda = df['tem_renda'] == 1
-    p01 = weighted_quantile(
-        df.loc[mask_renda, 'rendimento_habitual'],
-        df.loc[mask_renda, 'peso'], 0.01
-    )
-    p99 = weighted_quantile(
+    p01, p99 = weighted_quantiles(
         df.loc[mask_renda, 'rendimento_habitual'],
-        df.loc[mask_renda, 'peso'], 0.99
+        df.loc[mask_renda, 'peso'], [0.01, 0.99]
     )
     df['rendimento_winsor'] = df['rendimento_habitual'].clip(lower=p01, upper=p99)
     logger.info(f"Winsorização ponderada: P1 = R$ {p01:,.0f}, P99 = R$ {p99:,.0f}")
@@ -156,8 +158,8 @@ def clean_pnad():
     logger.info(f"Horas efetivas:  {n_horas_efe:,} ({n_horas_efe/len(df):.1%})")
 
     # Salvar
-    output_path = DATA_PROCESSED / "pnad_clean.csv"
-    df.to_csv(output_path, index=False)
+    output_path = output_path or DATA_PROCESSED / "pnad_clean.parquet"
+    df = write_parquet(df, output_path)
     logger.info(f"\nSalvo em: {output_path}")
     logger.info(f"df_pnad: {df.shape[0]:,} linhas x {df.shape[1]} colunas")
 
@@ -1,6 +1,6 @@
 """
 Script 04: Crosswalk hierárquico COD → ISCO-08
-Entrada: data/processed/pnad_clean.csv, data/processed/ilo_exposure_clean.csv
+Entrada: data/processed/pnad_clean.parquet, data/processed/ilo_exposure_clean.csv
 Saída: Log com estatísticas de match por nível
 """
 
@@ -15,6 +15,8 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
+from src.utils.schema import read_parquet
+from src.utils.occupation_crosswalk import HierarchicalCrosswalk, lookup_by_code
 
 logging.basicConfig(
     level=logging.INFO,
@@ -45,55 +47,35 @@ def create_ilo_aggregations(df_ilo):
     return ilo_4d, ilo_3d, ilo_2d, ilo_1d, ilo_gradient_4d
 
 def hierarchical_crosswalk(df_pnad, ilo_4d, ilo_3d, ilo_2d, ilo_1d, ilo_gradient_4d):
-    """Aplica crosswalk hierárquico em 4 níveis"""
+    """Aplica crosswalk hierárquico em 4 níveis (arrays densos por nível)"""
 
     logger.info("\n=== CROSSWALK HIERÁRQUICO ===")
 
-    # Inicializar colunas
-    df_pnad['exposure_score'] = np.nan
-    df_pnad['exposure_gradient'] = None
-    df_pnad['match_level'] = None
-
-    # Nível 1: 4-digit
-    mask_4d = df_pnad['cod_ocupacao'].isin(ilo_4d.keys())
-    df_pnad.loc[mask_4d, 'exposure_score'] = df_pnad.loc[mask_4d, 'cod_ocupacao'].map(ilo_4d)
-    df_pnad.loc[mask_4d, 'exposure_gradient'] = df_pnad.loc[mask_4d, 'cod_ocupacao'].map(ilo_gradient_4d)
-    df_pnad.loc[mask_4d, 'match_level'] = '4-digit'
-    logger.info(f"Match 4-digit: {mask_4d.sum():,} ({mask_4d.mean():.1%})")
-
-    # Nível 2: 3-digit
-    mask_missing = df_pnad['exposure_score'].isna()
-    cod_3d = df_pnad.loc[mask_missing, 'cod_ocupacao'].str[:3]
-    mask_3d = cod_3d.isin(ilo_3d.keys())
-    idx_3d = mask_missing[mask_missing].index[mask_3d.values]
-    df_pnad.loc[idx_3d, 'exposure_score'] = cod_3d[mask_3d].map(ilo_3d).values
-    df_pnad.loc[idx_3d, 'exposure_gradient'] = 'Sem classificação'
-    df_pnad.loc[idx_3d, 'match_level'] = '3-digit'
-    logger.info(f"Match 3-digit: {len(idx_3d):,} ({len(idx_3d)/len(df_pnad):.1%})")
-
-    # Nível 3: 2-digit
-    mask_missing = df_pnad['exposure_score'].isna()
-    cod_2d = df_pnad.loc[mask_missing, 'cod_ocupacao'].str[:2]
-    mask_2d = cod_2d.isin(ilo_2d.keys())
-    idx_2d = mask_missing[mask_missing].index[mask_2d.values]
-    df_pnad.loc[idx_2d, 'exposure_score'] = cod_2d[mask_2d].map(ilo_2d).values
-    df_pnad.loc[idx_2d, 'exposure_gradient'] = 'Sem classificação'
-    df_pnad.loc[idx_2d, 'match_level'] = '2-digit'
-    logger.info(f"Match 2-digit: {len(idx_2d):,} ({len(idx_2d)/len(df_pnad):.1%})")
-
-    # Nível 4: 1-digit
-    mask_missing = df_pnad['exposure_score'].isna()
-    cod_1d = df_pnad.loc[mask_missing, 'cod_ocupacao'].str[:1]
-    mask_1d = cod_1d.isin(ilo_1d.keys())
-    idx_1d = mask_missing[mask_missing].index[mask_1d.values]
-    df_pnad.loc[idx_1d, 'exposure_score'] = cod_1d[mask_1d].map(ilo_1d).values
-    df_pnad.loc[idx_1d, 'exposure_gradient'] = 'Sem classificação'
-    df_pnad.loc[idx_1d, 'match_level'] = '1-digit'
-    logger.info(f"Match 1-digit: {len(idx_1d):,} ({len(idx_1d)/len(df_pnad):.1%})")
-
-    # Sem match
+    crosswalk = HierarchicalCrosswalk([
+        ('4-digit', 4, ilo_4d),
+        ('3-digit', 3, ilo_3d),
+        ('2-digit', 2, ilo_2d),
+        ('1-digit', 1, ilo_1d),
+    ])
+    resultado = crosswalk.match(df_pnad['cod_ocupacao'])
+
+    # Gradiente oficial ILO só no match 4-digit; demais níveis e sem match
+    # ficam 'Sem classificação'
+    gradiente = lookup_by_code(df_pnad['cod_ocupacao'], pd.Series(
+        ilo_gradient_4d, dtype=object, name='exposure_gradient'))['exposure_gradient']
+    if 'Sem classificação' not in gradiente.cat.categories:
+        gradiente = gradiente.cat.add_categories('Sem classificação')
+    df_pnad['exposure_score'] = resultado['value']
+    df_pnad['exposure_gradient'] = gradiente.where(resultado['match_level'] == '4-digit',
+                                                   'Sem classificação')
+    df_pnad['match_level'] = resultado['match_level']
+
+    contagens = resultado['match_level'].value_counts()
+    for nivel in crosswalk.names:
+        n = contagens.get(nivel, 0)
+        logger.info(f"Match {nivel}: {n:,} ({n/len(df_pnad):.1%})")
+
     n_sem_match = df_pnad['exposure_score'].isna().sum()
-    df_pnad.loc[df_pnad['exposure_score'].isna(), 'exposure_gradient'] = 'Sem classificação'
     logger.info(f"Sem match:     {n_sem_match:,} ({n_sem_match/len(df_pnad):.1%})")
 
     return df_pnad
@@ -152,19 +134,18 @@ def validate_crosswalk(df):
 
     return coverage
 
-def run_crosswalk():
-    """Executa crosswalk completo"""
+def run_crosswalk(pnad_path=None):
+    """Executa crosswalk completo (padrão: data/processed/pnad_clean.parquet)"""
 
     # Carregar dados
-    df_pnad = pd.read_csv(DATA_PROCESSED / "pnad_clean.csv")
+    df_pnad = read_parquet(pnad_path or DATA_PROCESSED / "pnad_clean.parquet")
     df_ilo = pd.read_csv(DATA_PROCESSED / "ilo_exposure_clean.csv")
 
     # Garantir que isco_08_str seja string
     df_ilo['isco_08_str'] = df_ilo['isco_08_str'].astype(str).str.zfill(4)
 
-    # Garantir que cod_ocupacao seja string com 4 dígitos
-    df_pnad['cod_ocupacao'] = df_pnad['cod_ocupacao'].astype(str).str.zfill(4)
-
+    # cod_ocupacao já vem com 4 dígitos (categórica no Parquet); o crosswalk
+    # resolve as categorias e leva o resultado às linhas pelos códigos
     logger.info(f"PNAD: {len(df_pnad):,} observações")
     logger.info(f"ILO: {len(df_ilo):,} ocupações")
 
@@ -1,12 +1,12 @@
 """
 Script 05: Merge final e criação da base consolidada
 Entrada: Dados do crosswalk (scripts 03 + 04)
-Saída: data/output/pnad_ilo_merged.csv
+Saída: data/output/pnad_ilo_merged.parquet (tipos de src/utils/schema.py)
+       data/output/cubo/*.parquet (cubo de agregação lido pelos scripts 06, 07 e 09)
+       data/output/cubo_trimestral/{ano}q{trimestre}/ (histórico do script 10)
 """
 
 import logging
-import pandas as pd
-import numpy as np
 import sys
 from pathlib import Path
 
@@ -15,7 +15,10 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
-from src.utils.weighted_stats import weighted_mean, weighted_qcut
+from src.utils.weighted_stats import weighted_qcut
+from src.utils.cube import CUBE_DIR, load_pnad_cube
+from src.utils.schema import write_parquet
+from src.utils.quarters import QUARTER_CUBE_DIR, save_quarter_cube
 
 # Importar crosswalk
 import importlib.util
@@ -85,13 +88,18 @@ def add_sector_aggregation(df):
 
     return df
 
-def merge_and_finalize():
-    """Executa merge final e salva base consolidada"""
+def merge_and_finalize(pnad_path=None, output_path=None):
+    """Executa merge final e salva base consolidada
+
+    Por padrão lê data/processed/pnad_clean.parquet e grava
+    data/output/pnad_ilo_merged.parquet; o modo incremental (script 10) informa
+    os caminhos de um trimestre específico.
+    """
 
     logger.info("=== MERGE FINAL ===\n")
 
     # Executar crosswalk
-    df, coverage = run_crosswalk()
+    df, coverage = run_crosswalk(pnad_path)
 
     # Checkpoint de qualidade do merge
     n_com_score = df['exposure_score'].notna().sum()
@@ -106,7 +114,7 @@ def merge_and_finalize():
 
     # Distribuição por gradiente ILO (potential25)
     logger.info("\nDistribuição por gradiente ILO (potential25):")
-    for grad, peso in df.groupby('exposure_gradient')['peso'].sum().sort_values(ascending=False).items():
+    for grad, peso in df.groupby('exposure_gradient', observed=True)['peso'].sum().sort_values(ascending=False).items():
         logger.info(f"  {grad}: {peso/1e6:.1f} milhões")
 
     # Quintis e decis ponderados
@@ -129,13 +137,13 @@ def merge_and_finalize():
         'peso',
         'exposure_score', 'exposure_gradient', 'match_level',
         'quintil_exposure', 'decil_exposure',
-    ]
+    ] + PESOS_REPLICADOS_COLS  # presentes apenas se baixados com --replicas
 
     df_final = df[[c for c in cols_output if c in df.columns]]
 
     # Salvar
-    output_path = DATA_OUTPUT / "pnad_ilo_merged.csv"
-    df_final.to_csv(output_path, index=False)
+    output_path = output_path or DATA_OUTPUT / "pnad_ilo_merged.parquet"
+    df_final = write_parquet(df_final, output_path)
 
     # Resumo final
     logger.info(f"\n{'=' * 60}")
@@ -155,6 +163,23 @@ def merge_and_finalize():
 
     return df_final
 
+def save_cubes(df_final):
+    """Cubo de agregação da base consolidada e cópia no histórico trimestral.
+
+    Tabelas, figuras e mapas somam células do cubo em vez de reler os
+    microdados; o histórico alimenta as séries do script 10.
+    """
+    cube = load_pnad_cube(rebuild=True)
+    for name, cells in cube.items():
+        logger.info(f"Cuboide {name:<15} {len(cells):>8,} células")
+    logger.info(f"Cubo salvo em:     {CUBE_DIR}")
+
+    ano, trimestre = int(df_final['ano'].iloc[0]), int(df_final['trimestre'].iloc[0])
+    save_quarter_cube(cube, ano, trimestre)
+    logger.info(f"Histórico:         {QUARTER_CUBE_DIR} ({ano} Q{trimestre})")
+    return cube
+
 if __name__ == "__main__":
     df = merge_and_finalize()
+    save_cubes(df)
     print("\nMerge concluído com sucesso!")
@@ -1,7 +1,8 @@
 """
 Script 06: Geração de tabelas descritivas
-Entrada: data/output/pnad_ilo_merged.csv
-Saída: outputs/tables/tabela{1..10}_*.csv + .tex
+Entrada: data/output/cubo/*.parquet (cubo de agregação; ver src/utils/cube.py)
+         data/output/pnad_ilo_merged.parquet (apenas a tabela 11, com pesos replicados)
+Saída: outputs/tables/tabela{1..11}_*.csv + .tex (+ tabela4b_desigualdade_uf)
 """
 
 import logging
@@ -15,8 +16,11 @@ sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
 from src.utils.weighted_stats import (
-    weighted_mean, weighted_std, weighted_quantile, gini_coefficient
+    cube_stats, grouped_weighted_quantiles, grouped_inequality,
+    find_replicate_cols, replicate_tables,
 )
+from src.utils.cube import MERGED_PATH, add_cube_columns, load_pnad_cube
+from src.utils.schema import parquet_columns, read_parquet
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,11 +34,12 @@ logger = logging.getLogger(__name__)
 
 
 def load_data():
-    path = DATA_OUTPUT / "pnad_ilo_merged.csv"
-    logger.info(f"Carregando: {path}")
-    df = pd.read_csv(path)
-    logger.info(f"Observações: {len(df):,} | Colunas: {df.shape[1]}")
-    return df
+    """Cubo de agregação (data/output/cubo): todas as tabelas, exceto a 11,
+    somam células do cubo em vez de reler os microdados."""
+    cube = load_pnad_cube()
+    for name, cells in cube.items():
+        logger.info(f"Cuboide {name}: {len(cells):,} células")
+    return cube
 
 
 def save_table(df_table, name, caption=None):
@@ -51,24 +56,19 @@ def save_table(df_table, name, caption=None):
 # =========================================================================
 # Tabela 1 — Exposição por Grande Grupo Ocupacional
 # =========================================================================
-def table1_exposicao_grupos(df):
+def table1_exposicao_grupos(cube):
     logger.info("\n=== Tabela 1: Exposição por Grande Grupo ===")
-    mask = df['exposure_score'].notna() & df['grande_grupo'].notna()
-    dfs = df[mask]
-
-    rows = []
-    for grupo in sorted(dfs['grande_grupo'].unique()):
-        sub = dfs[dfs['grande_grupo'] == grupo]
-        rows.append({
-            'Grande Grupo': grupo,
-            'Exposição Média': weighted_mean(sub['exposure_score'], sub['peso']),
-            'Desvio-Padrão': weighted_std(sub['exposure_score'], sub['peso']),
-            'Trabalhadores (milhões)': sub['peso'].sum() / 1e6,
-            '% Força de Trabalho': sub['peso'].sum() / dfs['peso'].sum() * 100,
-        })
-
-    result = pd.DataFrame(rows).sort_values('Exposição Média', ascending=False)
-    result = result.set_index('Grande Grupo')
+    stats = cube_stats(
+        cube, 'grande_grupo', 'exposure_score', stats=['mean', 'std', 'weight']
+    )['exposure_score']
+    result = pd.DataFrame({
+        'Exposição Média': stats['mean'],
+        'Desvio-Padrão': stats['std'],
+        'Trabalhadores (milhões)': stats['weight'] / 1e6,
+        '% Força de Trabalho': stats['weight'] / stats['weight'].sum() * 100,
+    })
+    result.index.name = 'Grande Grupo'
+    result = result.sort_values('Exposição Média', ascending=False)
     result = result.round(3)
 
     for _, row in result.iterrows():
@@ -83,37 +83,31 @@ def table1_exposicao_grupos(df):
 # =========================================================================
 # Tabela 2 — Perfil Socioeconômico por Quintil de Exposição
 # =========================================================================
-def table2_perfil_quintis(df):
+def table2_perfil_quintis(cube):
     logger.info("\n=== Tabela 2: Perfil por Quintil ===")
-    mask = df['quintil_exposure'].notna()
-    dfs = df[mask]
-
-    rows = []
-    for quintil in QUINTIL_ORDER:
-        sub = dfs[dfs['quintil_exposure'] == quintil]
-        if len(sub) == 0:
-            continue
-        sub_renda = sub[sub['tem_renda'] == 1]
-        rows.append({
-            'Quintil': quintil,
-            'Rendimento Médio (R$)': weighted_mean(
-                sub_renda['rendimento_habitual'], sub_renda['peso']
-            ) if len(sub_renda) > 0 else np.nan,
-            'Rendimento Mediano (R$)': weighted_quantile(
-                sub_renda['rendimento_habitual'], sub_renda['peso'], 0.50
-            ) if len(sub_renda) > 0 else np.nan,
-            '% Formal': weighted_mean(sub['formal'], sub['peso']) * 100,
-            '% Mulheres': weighted_mean(
-                (sub['sexo_texto'] == 'Mulher').astype(int), sub['peso']
-            ) * 100,
-            '% Negros': weighted_mean(
-                (sub['raca_agregada'] == 'Negra').astype(int), sub['peso']
-            ) * 100,
-            'Idade Média': weighted_mean(sub['idade'], sub['peso']),
-            'Pop. (milhões)': sub['peso'].sum() / 1e6,
-        })
-
-    result = pd.DataFrame(rows).set_index('Quintil').round(1)
+    # Rendimento só entra nas estatísticas para quem tem renda declarada
+    # (renda_declarada e o cuboide dist_renda)
+    stats = cube_stats(
+        cube, 'quintil_exposure',
+        ['renda_declarada', 'formal', 'mulher', 'negra', 'idade'],
+        stats=['mean', 'weight']
+    )
+    medianas = grouped_weighted_quantiles(
+        cube['dist_renda'], 'quintil_exposure', 'rendimento_habitual', qs=[0.50]
+    )
+
+    result = pd.DataFrame({
+        'Rendimento Médio (R$)': stats[('renda_declarada', 'mean')],
+        'Rendimento Mediano (R$)': medianas['p50'],
+        '% Formal': stats[('formal', 'mean')] * 100,
+        '% Mulheres': stats[('mulher', 'mean')] * 100,
+        '% Negros': stats[('negra', 'mean')] * 100,
+        'Idade Média': stats[('idade', 'mean')],
+        'Pop. (milhões)': stats[('mulher', 'weight')] / 1e6,
+    })
+    result = result.reindex([q for q in QUINTIL_ORDER if q in result.index])
+    result.index.name = 'Quintil'
+    result = result.round(1)
 
     for _, row in result.iterrows():
         logger.info(f"  {row.name}: R$ {row['Rendimento Médio (R$)']:,.0f} | "
@@ -127,28 +121,22 @@ def table2_perfil_quintis(df):
 # =========================================================================
 # Tabela 3 — Região × Setor
 # =========================================================================
-def table3_regiao_setor(df):
+def table3_regiao_setor(cube):
     logger.info("\n=== Tabela 3: Região x Setor ===")
-    mask = df['exposure_score'].notna()
-    dfs = df[mask]
-
-    pivot = dfs.groupby(['regiao', 'setor_agregado']).apply(
-        lambda x: weighted_mean(x['exposure_score'], x['peso'])
-    ).unstack(fill_value=np.nan)
-
-    # Adicionar marginais
-    for regiao in pivot.index:
-        sub = dfs[dfs['regiao'] == regiao]
-        pivot.loc[regiao, 'Média Região'] = weighted_mean(
-            sub['exposure_score'], sub['peso']
-        )
-    media_setor = {}
-    for setor in [c for c in pivot.columns if c != 'Média Região']:
-        sub = dfs[dfs['setor_agregado'] == setor]
-        if len(sub) > 0:
-            media_setor[setor] = weighted_mean(sub['exposure_score'], sub['peso'])
-    media_setor['Média Região'] = weighted_mean(dfs['exposure_score'], dfs['peso'])
-    pivot.loc['Média Setor'] = media_setor
+    # Células e marginais somando o cubo: 'Total' em setor_agregado é a
+    # média da região; 'Total' em regiao é a média do setor.
+    means = cube_stats(
+        cube, ['regiao', 'setor_agregado'], 'exposure_score', margins=True
+    )[('exposure_score', 'mean')]
+    pivot = means.unstack()
+
+    setores = [c for c in pivot.columns if c != 'Total']
+    regioes = [r for r in pivot.index if r != 'Total']
+    pivot = pivot.loc[regioes + ['Total'], setores + ['Total']]
+    pivot = pivot.rename(index={'Total': 'Média Setor'},
+                         columns={'Total': 'Média Região'})
+    pivot.index.name = 'regiao'
+    pivot.columns.name = 'setor_agregado'
 
     pivot = pivot.round(3)
     logger.info(f"  Dimensões: {pivot.shape[0]} x {pivot.shape[1]}")
@@ -161,38 +149,30 @@ def table3_regiao_setor(df):
 # =========================================================================
 # Tabela 4 — Desigualdade na Exposição
 # =========================================================================
-def table4_desigualdade(df):
+def table4_desigualdade(cube):
     logger.info("\n=== Tabela 4: Desigualdade ===")
-    mask = df['exposure_score'].notna()
-    dfs = df[mask]
-
-    gini_exp = gini_coefficient(dfs['exposure_score'], dfs['peso'])
-
-    p90 = weighted_quantile(dfs['exposure_score'], dfs['peso'], 0.90)
-    p10 = weighted_quantile(dfs['exposure_score'], dfs['peso'], 0.10)
-    ratio_p90_p10 = p90 / p10 if p10 > 0 else np.nan
-
-    q5 = dfs[dfs['quintil_exposure'] == 'Q5 (Alta)']
-    q1 = dfs[dfs['quintil_exposure'] == 'Q1 (Baixa)']
-    mean_q5 = weighted_mean(q5['exposure_score'], q5['peso'])
-    mean_q1 = weighted_mean(q1['exposure_score'], q1['peso'])
+    # Gini, Theil e P90/P10 por UF + Brasil (linha 'Total') a partir dos
+    # cuboides de distribuição (valor como dimensão; n e Σw² por célula)
+    cells = {'count_col': 'n', 'weight2_col': 'peso2'}
+    ineq_exp = grouped_inequality(cube['dist_exposicao'], 'sigla_uf', 'exposure_score',
+                                  margins=True, **cells)
+    ineq_renda = grouped_inequality(cube['dist_renda'], 'sigla_uf', 'rendimento_habitual',
+                                    margins=True, **cells)
+    gini_exp = ineq_exp.loc['Total', 'gini']
+    ratio_p90_p10 = ineq_exp.loc['Total', 'p90_p10']
+    gini_renda = ineq_renda.loc['Total', 'gini']
+
+    por_quintil = cube_stats(cube, 'quintil_exposure', ['exposure_score', 'renda_declarada'])
+    mean_q5, mean_q1 = por_quintil[('exposure_score', 'mean')].reindex(['Q5 (Alta)', 'Q1 (Baixa)'])
     ratio_q5_q1_exp = mean_q5 / mean_q1 if mean_q1 > 0 else np.nan
 
-    n_alta = dfs[dfs['exposure_gradient'].isin(HIGH_EXPOSURE_GRADIENTS)]['peso'].sum()
-    pct_alta = n_alta / dfs['peso'].sum() * 100
+    pct_alta = cube_stats(cube, None, 'alta_exposicao').iloc[0][('alta_exposicao', 'mean')] * 100
 
     # Razão renda Q5/Q1
-    mask_renda = dfs['tem_renda'] == 1
-    q5r = dfs[(dfs['quintil_exposure'] == 'Q5 (Alta)') & mask_renda]
-    q1r = dfs[(dfs['quintil_exposure'] == 'Q1 (Baixa)') & mask_renda]
-    mean_renda_q5 = weighted_mean(q5r['rendimento_habitual'], q5r['peso'])
-    mean_renda_q1 = weighted_mean(q1r['rendimento_habitual'], q1r['peso'])
+    mean_renda_q5, mean_renda_q1 = por_quintil[('renda_declarada', 'mean')].reindex(
+        ['Q5 (Alta)', 'Q1 (Baixa)'])
     ratio_renda = mean_renda_q5 / mean_renda_q1 if mean_renda_q1 > 0 else np.nan
 
-    # Gini da renda
-    renda_sub = dfs[mask_renda]
-    gini_renda = gini_coefficient(renda_sub['rendimento_habitual'], renda_sub['peso'])
-
     metrics = {
         'Gini Exposição': gini_exp,
         'Razão P90/P10 (Exposição)': ratio_p90_p10,
@@ -211,20 +191,31 @@ def table4_desigualdade(df):
 
     save_table(result, 'tabela4_desigualdade',
                'Métricas de Desigualdade na Exposição à IA')
+
+    # Desigualdade por UF
+    por_uf = pd.DataFrame({
+        'Gini Exposição': ineq_exp['gini'],
+        'Theil Exposição': ineq_exp['theil'],
+        'Razão P90/P10 (Exposição)': ineq_exp['p90_p10'],
+        'Gini Renda': ineq_renda['gini'],
+        'Theil Renda': ineq_renda['theil'],
+        'Razão P90/P10 (Renda)': ineq_renda['p90_p10'],
+    })
+    por_uf.index.name = 'UF'
+    por_uf = por_uf.round(4)
+    save_table(por_uf, 'tabela4b_desigualdade_uf',
+               'Desigualdade na Exposição à IA e na Renda por UF')
     return result
 
 
 # =========================================================================
 # Tabela 5 — Comparação com Literatura
 # =========================================================================
-def table5_comparacao(df):
+def table5_comparacao(cube):
     logger.info("\n=== Tabela 5: Comparação com Literatura ===")
-    mask = df['exposure_score'].notna()
-    dfs = df[mask]
-
-    exp_media = weighted_mean(dfs['exposure_score'], dfs['peso'])
-    pct_alta = dfs[dfs['exposure_gradient'].isin(HIGH_EXPOSURE_GRADIENTS)][
-        'peso'].sum() / dfs['peso'].sum() * 100
+    total = cube_stats(cube, None, ['exposure_score', 'alta_exposicao']).iloc[0]
+    exp_media = total[('exposure_score', 'mean')]
+    pct_alta = total[('alta_exposicao', 'mean')] * 100
 
     rows = [
         {
@@ -259,29 +250,26 @@ def table5_comparacao(df):
 # =========================================================================
 # Tabela 6 — Exposição por Setor (NOVA)
 # =========================================================================
-def table6_exposicao_setores(df):
+def table6_exposicao_setores(cube):
     logger.info("\n=== Tabela 6: Exposição por Setor ===")
-    mask = df['exposure_score'].notna()
-    dfs = df[mask]
-    total_peso = dfs['peso'].sum()
-
-    rows = []
-    for setor in sorted(dfs['setor_agregado'].unique()):
-        sub = dfs[dfs['setor_agregado'] == setor]
-        n_alta = sub[sub['exposure_gradient'].isin(HIGH_EXPOSURE_GRADIENTS)]['peso'].sum()
-        is_critico = setor in SETORES_CRITICOS_IA
-        rows.append({
-            'Setor': setor,
-            'Exposição Média': weighted_mean(sub['exposure_score'], sub['peso']),
-            'Desvio-Padrão': weighted_std(sub['exposure_score'], sub['peso']),
-            'Trabalhadores (milhões)': sub['peso'].sum() / 1e6,
-            '% Força de Trabalho': sub['peso'].sum() / total_peso * 100,
-            '% Alta Exposição': n_alta / sub['peso'].sum() * 100 if sub['peso'].sum() > 0 else 0,
-            'Setor Crítico IA': 'Sim' if is_critico else '',
-        })
-
-    result = pd.DataFrame(rows).sort_values('Exposição Média', ascending=False)
-    result = result.set_index('Setor').round(3)
+    total_peso = cube_stats(cube, None, 'exposure_score', stats='weight').iloc[0, 0]
+
+    stats = cube_stats(
+        cube, 'setor_agregado', ['exposure_score', 'alta_exposicao'],
+        stats=['mean', 'std', 'weight']
+    )
+    result = pd.DataFrame({
+        'Exposição Média': stats[('exposure_score', 'mean')],
+        'Desvio-Padrão': stats[('exposure_score', 'std')],
+        'Trabalhadores (milhões)': stats[('exposure_score', 'weight')] / 1e6,
+        '% Força de Trabalho': stats[('exposure_score', 'weight')] / total_peso * 100,
+        '% Alta Exposição': stats[('alta_exposicao', 'mean')].fillna(0) * 100,
+    })
+    result['Setor Crítico IA'] = [
+        'Sim' if setor in SETORES_CRITICOS_IA else '' for setor in result.index
+    ]
+    result.index.name = 'Setor'
+    result = result.sort_values('Exposição Média', ascending=False).round(3)
 
     for _, row in result.iterrows():
         flag = " *" if row['Setor Crítico IA'] == 'Sim' else ""
@@ -296,24 +284,21 @@ def table6_exposicao_setores(df):
 # =========================================================================
 # Tabela 7 — Exposição por Gênero e Raça (NOVA)
 # =========================================================================
-def table7_genero_raca(df):
+def table7_genero_raca(cube):
     logger.info("\n=== Tabela 7: Exposição por Gênero e Raça ===")
-    mask = df['exposure_score'].notna()
-    dfs = df[mask]
 
     def stats_by_group(col):
-        rows = []
-        for val in sorted(dfs[col].dropna().unique()):
-            sub = dfs[dfs[col] == val]
-            n_alta = sub[sub['exposure_gradient'].isin(HIGH_EXPOSURE_GRADIENTS)]['peso'].sum()
-            rows.append({
-                'Grupo': val,
-                'Exposição Média': weighted_mean(sub['exposure_score'], sub['peso']),
-                'Desvio-Padrão': weighted_std(sub['exposure_score'], sub['peso']),
-                'Trabalhadores (milhões)': sub['peso'].sum() / 1e6,
-                '% Alta Exposição': n_alta / sub['peso'].sum() * 100,
-            })
-        return rows
+        stats = cube_stats(
+            cube, col, ['exposure_score', 'alta_exposicao'],
+            stats=['mean', 'std', 'weight']
+        )
+        return [{
+            'Grupo': val,
+            'Exposição Média': row[('exposure_score', 'mean')],
+            'Desvio-Padrão': row[('exposure_score', 'std')],
+            'Trabalhadores (milhões)': row[('alta_exposicao', 'weight')] / 1e6,
+            '% Alta Exposição': row[('alta_exposicao', 'mean')] * 100,
+        } for val, row in stats.iterrows()]
 
     rows_sexo = stats_by_group('sexo_texto')
     rows_raca = stats_by_group('raca_agregada')
@@ -342,28 +327,23 @@ def table7_genero_raca(df):
 # =========================================================================
 # Tabela 8 — Exposição Formal vs Informal (NOVA)
 # =========================================================================
-def table8_formalidade(df):
+def table8_formalidade(cube):
     logger.info("\n=== Tabela 8: Formal vs Informal ===")
-    mask = df['exposure_score'].notna()
-    dfs = df[mask]
-
-    rows = []
-    for val, label in [(1, 'Formal'), (0, 'Informal')]:
-        sub = dfs[dfs['formal'] == val]
-        sub_renda = sub[sub['tem_renda'] == 1]
-        n_alta = sub[sub['exposure_gradient'].isin(HIGH_EXPOSURE_GRADIENTS)]['peso'].sum()
-        rows.append({
-            'Tipo': label,
-            'Exposição Média': weighted_mean(sub['exposure_score'], sub['peso']),
-            'Desvio-Padrão': weighted_std(sub['exposure_score'], sub['peso']),
-            'Trabalhadores (milhões)': sub['peso'].sum() / 1e6,
-            '% Alta Exposição': n_alta / sub['peso'].sum() * 100,
-            'Rendimento Médio (R$)': weighted_mean(
-                sub_renda['rendimento_habitual'], sub_renda['peso']
-            ) if len(sub_renda) > 0 else np.nan,
-        })
-
-    result = pd.DataFrame(rows).set_index('Tipo').round(3)
+    # Rendimento só entra na média para quem tem renda declarada
+    stats = cube_stats(
+        cube, 'formal', ['exposure_score', 'alta_exposicao', 'renda_declarada'],
+        stats=['mean', 'std', 'weight']
+    ).reindex([1, 0])
+
+    result = pd.DataFrame({
+        'Exposição Média': stats[('exposure_score', 'mean')],
+        'Desvio-Padrão': stats[('exposure_score', 'std')],
+        'Trabalhadores (milhões)': stats[('alta_exposicao', 'weight')] / 1e6,
+        '% Alta Exposição': stats[('alta_exposicao', 'mean')] * 100,
+        'Rendimento Médio (R$)': stats[('renda_declarada', 'mean')],
+    })
+    result.index = pd.Index(['Formal', 'Informal'], name='Tipo')
+    result = result.round(3)
 
     for _, row in result.iterrows():
         logger.info(f"  {row.name}: Exp {row['Exposição Média']:.3f} | "
@@ -377,22 +357,21 @@ def table8_formalidade(df):
 # =========================================================================
 # Tabela 9 — Exposição por Idade e Instrução (NOVA)
 # =========================================================================
-def table9_idade_instrucao(df):
+def table9_idade_instrucao(cube):
     logger.info("\n=== Tabela 9: Idade e Instrução ===")
-    mask = df['exposure_score'].notna()
-    dfs = df[mask]
 
     def stats_by_col(col, label_map=None):
+        stats = cube_stats(
+            cube, col, ['exposure_score', 'alta_exposicao'], stats=['mean', 'weight']
+        )
         rows = []
-        for val in sorted(dfs[col].dropna().unique()):
-            sub = dfs[dfs[col] == val]
-            n_alta = sub[sub['exposure_gradient'].isin(HIGH_EXPOSURE_GRADIENTS)]['peso'].sum()
+        for val, row in stats.iterrows():
             label = label_map[val] if label_map and val in label_map else str(val)
             rows.append({
                 'Grupo': label,
-                'Exposição Média': weighted_mean(sub['exposure_score'], sub['peso']),
-                'Trabalhadores (milhões)': sub['peso'].sum() / 1e6,
-                '% Alta Exposição': n_alta / sub['peso'].sum() * 100,
+                'Exposição Média': row[('exposure_score', 'mean')],
+                'Trabalhadores (milhões)': row[('alta_exposicao', 'weight')] / 1e6,
+                '% Alta Exposição': row[('alta_exposicao', 'mean')] * 100,
             })
         return rows
 
@@ -421,26 +400,22 @@ def table9_idade_instrucao(df):
 # =========================================================================
 # Tabela 10 — Exposição por Região (NOVA)
 # =========================================================================
-def table10_regiao(df):
+def table10_regiao(cube):
     logger.info("\n=== Tabela 10: Exposição por Região ===")
-    mask = df['exposure_score'].notna()
-    dfs = df[mask]
-
-    rows = []
-    for regiao in ['Norte', 'Nordeste', 'Centro-Oeste', 'Sudeste', 'Sul']:
-        sub = dfs[dfs['regiao'] == regiao]
-        n_alta = sub[sub['exposure_gradient'].isin(HIGH_EXPOSURE_GRADIENTS)]['peso'].sum()
-        n_nao_exp = sub[sub['exposure_gradient'] == 'Not Exposed']['peso'].sum()
-        rows.append({
-            'Região': regiao,
-            'Exposição Média': weighted_mean(sub['exposure_score'], sub['peso']),
-            'Desvio-Padrão': weighted_std(sub['exposure_score'], sub['peso']),
-            'Trabalhadores (milhões)': sub['peso'].sum() / 1e6,
-            '% Alta Exposição': n_alta / sub['peso'].sum() * 100,
-            '% Não Exposto': n_nao_exp / sub['peso'].sum() * 100,
-        })
-
-    result = pd.DataFrame(rows).set_index('Região').round(3)
+    stats = cube_stats(
+        cube, 'regiao', ['exposure_score', 'alta_exposicao', 'nao_exposto'],
+        stats=['mean', 'std', 'weight']
+    ).reindex(['Norte', 'Nordeste', 'Centro-Oeste', 'Sudeste', 'Sul'])
+
+    result = pd.DataFrame({
+        'Exposição Média': stats[('exposure_score', 'mean')],
+        'Desvio-Padrão': stats[('exposure_score', 'std')],
+        'Trabalhadores (milhões)': stats[('alta_exposicao', 'weight')] / 1e6,
+        '% Alta Exposição': stats[('alta_exposicao', 'mean')] * 100,
+        '% Não Exposto': stats[('nao_exposto', 'mean')] * 100,
+    })
+    result.index.name = 'Região'
+    result = result.round(3)
 
     for _, row in result.iterrows():
         logger.info(f"  {row.name}: {row['Exposição Média']:.3f} "
@@ -451,6 +426,87 @@ def table10_regiao(df):
     return result
 
 
+# =========================================================================
+# Tabela 11 — Erros Padrão do Desenho (pesos replicados bootstrap)
+# =========================================================================
+# Agrupamentos das tabelas 1-3 e 6-10; as médias de todos saem de um único
+# produto matricial sobre os 200 pesos replicados.
+SE_GROUPINGS = {
+    'Tabela 1': 'grande_grupo',
+    'Tabela 2': 'quintil_exposure',
+    'Tabela 3': ['regiao', 'setor_agregado'],
+    'Tabela 6': 'setor_agregado',
+    'Tabela 7 (sexo)': 'sexo_texto',
+    'Tabela 7 (raça)': 'raca_agregada',
+    'Tabela 8': 'formal',
+    'Tabela 9 (idade)': 'faixa_etaria',
+    'Tabela 9 (instrução)': 'nivel_instrucao',
+    'Tabela 10': 'regiao',
+}
+
+
+def table11_erros_padrao(df=None):
+    """Única tabela que lê os microdados: os pesos replicados não estão no cubo.
+    Sem ``df``, lê de pnad_ilo_merged.parquet apenas as colunas usadas, e só
+    se o arquivo tiver as réplicas (verificado nos metadados)."""
+    logger.info("\n=== Tabela 11: Erros Padrão (pesos replicados) ===")
+    if df is None:
+        header = pd.DataFrame(columns=parquet_columns(MERGED_PATH))
+        rep_cols = find_replicate_cols(header)
+        if rep_cols:
+            dims = [c for by in SE_GROUPINGS.values()
+                    for c in ([by] if isinstance(by, str) else by)]
+            df = read_parquet(MERGED_PATH, dims + rep_cols + [
+                'peso', 'exposure_score', 'exposure_gradient', 'rendimento_habitual',
+                'tem_renda', 'sexo_texto', 'raca_agregada',
+            ])
+    rep_cols = find_replicate_cols(df) if df is not None else []
+    if not rep_cols:
+        logger.info("  Sem pesos replicados nos dados (rode 01_download_pnad.py "
+                    "--replicas) — tabela ignorada")
+        return None
+
+    dfs = add_cube_columns(df[df['exposure_score'].notna()])
+    value_cols = ['exposure_score', 'alta_exposicao', 'renda_declarada']
+    labels = {
+        'exposure_score': 'Exposição Média',
+        'alta_exposicao': '% Alta Exposição',
+        'renda_declarada': 'Rendimento Médio (R$)',
+    }
+
+    tables = replicate_tables(dfs, SE_GROUPINGS, value_cols, rep_cols=rep_cols,
+                              stats=['mean', 'weight'], margins=True)
+
+    rows = []
+    for tabela, stats in tables.items():
+        for grupo, row in stats.iterrows():
+            grupo = ' × '.join(map(str, grupo)) if isinstance(grupo, tuple) else str(grupo)
+            for col in value_cols:
+                escala = 100 if col == 'alta_exposicao' else 1
+                est, se = row[(col, 'mean')] * escala, row[(col, 'mean_se')] * escala
+                rows.append({
+                    'Tabela': tabela,
+                    'Grupo': grupo,
+                    'Indicador': labels[col],
+                    'Estimativa': est,
+                    'Erro Padrão': se,
+                    'CV (%)': np.nan if np.isclose(est, 0) else se / abs(est) * 100,
+                    'Trabalhadores (milhões)': row[(col, 'weight')] / 1e6,
+                    'EP Trab. (milhões)': row[(col, 'weight_se')] / 1e6,
+                })
+
+    result = pd.DataFrame(rows).set_index(['Tabela', 'Grupo', 'Indicador']).round(4)
+    logger.info(f"  {len(rep_cols)} réplicas | {len(result):,} estimativas")
+
+    total = result.xs(('Tabela 1', 'Total', 'Exposição Média'))
+    logger.info(f"  Exposição média Brasil: {total['Estimativa']:.3f} "
+                f"(EP {total['Erro Padrão']:.4f})")
+
+    save_table(result, 'tabela11_erros_padrao',
+               'Erros Padrão por Pesos Replicados Bootstrap (PNAD Contínua)')
+    return result
+
+
 # =========================================================================
 # Geração completa
 # =========================================================================
@@ -459,18 +515,19 @@ def generate_all_tables():
     logger.info("GERAÇÃO DE TABELAS DESCRITIVAS")
     logger.info("=" * 60)
 
-    df = load_data()
-
-    table1_exposicao_grupos(df)
-    table2_perfil_quintis(df)
-    table3_regiao_setor(df)
-    table4_desigualdade(df)
-    table5_comparacao(df)
-    table6_exposicao_setores(df)
-    table7_genero_raca(df)
-    table8_formalidade(df)
-    table9_idade_instrucao(df)
-    table10_regiao(df)
+    cube = load_data()
+
+    table1_exposicao_grupos(cube)
+    table2_perfil_quintis(cube)
+    table3_regiao_setor(cube)
+    table4_desigualdade(cube)
+    table5_comparacao(cube)
+    table6_exposicao_setores(cube)
+    table7_genero_raca(cube)
+    table8_formalidade(cube)
+    table9_idade_instrucao(cube)
+    table10_regiao(cube)
+    table11_erros_padrao()
 
     logger.info("\n" + "=" * 60)
     logger.info("TODAS AS TABELAS GERADAS COM SUCESSO")
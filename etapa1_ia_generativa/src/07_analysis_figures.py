@@ -1,6 +1,6 @@
 """
 Script 07: Geração das 8 figuras de análise
-Entrada: data/output/pnad_ilo_merged.csv
+Entrada: data/output/cubo/*.parquet (cubo de agregação; ver src/utils/cube.py)
 Saída: outputs/figures/*.png e *.pdf
 """
 
@@ -19,6 +19,7 @@ sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
 from src.utils.weighted_stats import *
+from src.utils.cube import load_pnad_cube
 
 logging.basicConfig(
     level=logging.INFO,
@@ -39,37 +40,35 @@ sns.set_style("whitegrid")
 
 
 def load_data():
-    """Carrega base consolidada"""
-    df = pd.read_csv(DATA_OUTPUT / "pnad_ilo_merged.csv")
-    logger.info(f"Dados carregados: {len(df):,} observações")
-    return df
+    """Carrega o cubo de agregação (as figuras não releem os microdados)"""
+    cube = load_pnad_cube()
+    logger.info(f"Cubo carregado: {sum(len(c) for c in cube.values()):,} células")
+    return cube
 
 
 # ---------------------------------------------------------------------------
 # Figuras 1-4: Atualizadas
 # ---------------------------------------------------------------------------
 
-def figure1_distribuicao(df):
+def figure1_distribuicao(cube):
     """FIGURA 1: Distribuição da Exposição (histograma + gradientes ILO)"""
 
     logger.info("\n=== FIGURA 1: Distribuição da Exposição ===")
 
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 5))
 
-    mask = df['exposure_score'].notna()
-    subset = df[mask]
-
-    # Painel A: Histograma ponderado
+    # Painel A: Histograma ponderado (células UF × score somam nos mesmos bins)
+    dist = cube['dist_exposicao']
     ax1.hist(
-        subset['exposure_score'],
-        weights=subset['peso'] / 1e6,
+        dist['exposure_score'],
+        weights=dist['peso'] / 1e6,
         bins=50,
         edgecolor='black',
         alpha=0.7,
         color='steelblue'
     )
 
-    media = weighted_mean(subset['exposure_score'], subset['peso'])
+    media = cube_stats(cube, None, 'exposure_score').iloc[0, 0]
     ax1.axvline(media, color='red', linestyle='--', linewidth=2,
                 label=f'Média: {media:.3f}')
 
@@ -80,7 +79,9 @@ def figure1_distribuicao(df):
 
     # Painel B: Barras por gradiente (6 gradientes oficiais, excluir "Sem classificação")
     gradient_display = [g for g in GRADIENT_ORDER if g != 'Sem classificação']
-    gradient_counts = subset.groupby('exposure_gradient')['peso'].sum() / 1e6
+    gradient_counts = cube_stats(
+        cube, 'exposure_gradient', 'exposure_score', stats='weight'
+    )[('exposure_score', 'weight')] / 1e6
     gradient_counts = gradient_counts.reindex(
         [g for g in gradient_display if g in gradient_counts.index]
     )
@@ -111,18 +112,14 @@ def figure1_distribuicao(df):
     plt.close()
 
 
-def figure2_heatmap(df):
+def figure2_heatmap(cube):
     """FIGURA 2: Heatmap Região x Setor (17 setores x 5 regiões)"""
 
     logger.info("\n=== FIGURA 2: Heatmap Região x Setor ===")
 
-    mask = df['exposure_score'].notna() & df['setor_agregado'].notna()
-    subset = df[mask]
-
-    def calc_weighted_mean(group):
-        return weighted_mean(group['exposure_score'], group['peso'])
-
-    pivot = subset.groupby(['setor_agregado', 'regiao']).apply(calc_weighted_mean).unstack()
+    pivot = cube_stats(
+        cube, ['setor_agregado', 'regiao'], 'exposure_score'
+    )[('exposure_score', 'mean')].unstack()
 
     # Ordenar setores por exposição média decrescente
     pivot['_mean'] = pivot.mean(axis=1)
@@ -162,18 +159,15 @@ def figure2_heatmap(df):
     plt.close()
 
 
-def figure3_renda(df):
+def figure3_renda(cube):
     """FIGURA 3: Perfil Salarial por Decil de Exposição"""
 
     logger.info("\n=== FIGURA 3: Renda por Exposição ===")
 
-    # Filtrar: apenas quem tem renda E decil definido
-    mask = (df['tem_renda'] == 1) & df['decil_exposure'].notna()
-    subset = df[mask]
-
-    renda_decil = subset.groupby('decil_exposure').apply(
-        lambda x: weighted_mean(x['rendimento_habitual'], x['peso'])
-    )
+    # Apenas quem tem renda (renda_declarada) E decil definido
+    renda_decil = cube_stats(
+        cube, 'decil_exposure', 'renda_declarada'
+    )[('renda_declarada', 'mean')].rename('rendimento_habitual')
 
     # Garantir ordem D1..D10
     renda_decil = renda_decil.reindex([d for d in DECIL_ORDER if d in renda_decil.index])
@@ -213,7 +207,7 @@ def figure3_renda(df):
     plt.close()
 
 
-def figure4_decomposicao(df):
+def figure4_decomposicao(cube):
     """FIGURA 4: Decomposição Demográfica por Gradiente (4 painéis)"""
 
     logger.info("\n=== FIGURA 4: Decomposição Demográfica ===")
@@ -222,8 +216,8 @@ def figure4_decomposicao(df):
 
     # Usar 6 gradientes oficiais (sem "Sem classificação")
     gradient_display = [g for g in GRADIENT_ORDER if g != 'Sem classificação']
-    mask = df['exposure_gradient'].isin(gradient_display)
-    subset = df[mask]
+    cells = cube['perfil']
+    subset = cells[cells['exposure_gradient'].isin(gradient_display)]
 
     # Labels PT para eixo Y
     def _reindex(frame):
@@ -302,20 +296,18 @@ def figure4_decomposicao(df):
 # Figuras 5-8: Novas
 # ---------------------------------------------------------------------------
 
-def figure5_setores(df):
+def figure5_setores(cube):
     """FIGURA 5: Exposição por Setor (barras horizontais, highlight setores críticos)"""
 
     logger.info("\n=== FIGURA 5: Exposição por Setor ===")
 
-    mask = df['exposure_score'].notna() & df['setor_agregado'].notna()
-    subset = df[mask]
-
-    setor_stats = subset.groupby('setor_agregado').apply(
-        lambda x: pd.Series({
-            'exposure_mean': weighted_mean(x['exposure_score'], x['peso']),
-            'pop_milhoes': x['peso'].sum() / 1e6,
-        })
-    ).sort_values('exposure_mean')
+    stats = cube_stats(
+        cube, 'setor_agregado', 'exposure_score', stats=['mean', 'weight']
+    )['exposure_score']
+    setor_stats = pd.DataFrame({
+        'exposure_mean': stats['mean'],
+        'pop_milhoes': stats['weight'] / 1e6,
+    }).sort_values('exposure_mean')
 
     fig, ax = plt.subplots(figsize=(10, 10))
 
@@ -359,20 +351,17 @@ def figure5_setores(df):
     plt.close()
 
 
-def figure6_genero_raca(df):
+def figure6_genero_raca(cube):
     """FIGURA 6: Exposição por Gênero e Raça dentro de cada Quintil"""
 
     logger.info("\n=== FIGURA 6: Gênero e Raça por Quintil ===")
 
-    mask = df['exposure_score'].notna() & df['quintil_exposure'].notna()
-    subset = df[mask]
-
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
 
     # Painel A: Por sexo dentro de cada quintil
-    sexo_quintil = subset.groupby(['quintil_exposure', 'sexo_texto']).apply(
-        lambda x: weighted_mean(x['exposure_score'], x['peso'])
-    ).unstack()
+    sexo_quintil = cube_stats(
+        cube, ['quintil_exposure', 'sexo_texto'], 'exposure_score'
+    )[('exposure_score', 'mean')].unstack()
     sexo_quintil = sexo_quintil.reindex([q for q in QUINTIL_ORDER if q in sexo_quintil.index])
 
     sexo_quintil.plot(kind='bar', ax=ax1, color=['lightblue', 'lightpink'],
@@ -384,9 +373,9 @@ def figure6_genero_raca(df):
     ax1.set_xticklabels(ax1.get_xticklabels(), rotation=0)
 
     # Painel B: Por raça dentro de cada quintil
-    raca_quintil = subset.groupby(['quintil_exposure', 'raca_agregada']).apply(
-        lambda x: weighted_mean(x['exposure_score'], x['peso'])
-    ).unstack()
+    raca_quintil = cube_stats(
+        cube, ['quintil_exposure', 'raca_agregada'], 'exposure_score'
+    )[('exposure_score', 'mean')].unstack()
     raca_quintil = raca_quintil.reindex([q for q in QUINTIL_ORDER if q in raca_quintil.index])
 
     raca_quintil.plot(kind='bar', ax=ax2, color=['#d4a574', '#8b6914', '#a9a9a9'],
@@ -412,20 +401,15 @@ def figure6_genero_raca(df):
     plt.close()
 
 
-def figure7_idade_instrucao(df):
+def figure7_idade_instrucao(cube):
     """FIGURA 7: Exposição por Faixa Etária e Nível de Instrução"""
 
     logger.info("\n=== FIGURA 7: Idade e Instrução ===")
 
-    mask = df['exposure_score'].notna()
-    subset = df[mask]
-
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
 
     # Painel A: Por faixa etária
-    idade_stats = subset.groupby('faixa_etaria').apply(
-        lambda x: weighted_mean(x['exposure_score'], x['peso'])
-    )
+    idade_stats = cube_stats(cube, 'faixa_etaria', 'exposure_score')[('exposure_score', 'mean')]
     # Garantir ordem
     idade_stats = idade_stats.reindex([l for l in IDADE_LABELS if l in idade_stats.index])
 
@@ -441,13 +425,16 @@ def figure7_idade_instrucao(df):
         ax1.text(i, v + 0.003, f'{v:.3f}', ha='center', fontsize=9)
 
     # Painel B: Por nível de instrução
-    subset_instr = subset[subset['nivel_instrucao'].notna()].copy()
-    subset_instr['nivel_instrucao_label'] = subset_instr['nivel_instrucao'].astype(int).map(NIVEL_INSTRUCAO_MAP)
-
-    instrucao_stats = subset_instr.groupby('nivel_instrucao_label').apply(
-        lambda x: weighted_mean(x['exposure_score'], x['peso'])
+    cells = cube['perfil']
+    cells = cells[cells['nivel_instrucao'].notna()]
+    cells = cells.assign(
+        nivel_instrucao_label=cells['nivel_instrucao'].astype(int).map(NIVEL_INSTRUCAO_MAP)
     )
 
+    instrucao_stats = cube_stats(
+        cells, 'nivel_instrucao_label', 'exposure_score'
+    )[('exposure_score', 'mean')]
+
     # Ordenar por nível (usar ordem do mapa)
     instrucao_order = [NIVEL_INSTRUCAO_MAP[k] for k in sorted(NIVEL_INSTRUCAO_MAP.keys())]
     instrucao_stats = instrucao_stats.reindex([i for i in instrucao_order if i in instrucao_stats.index])
@@ -477,23 +464,21 @@ def figure7_idade_instrucao(df):
     plt.close()
 
 
-def figure8_formalidade_renda(df):
+def figure8_formalidade_renda(cube):
     """FIGURA 8: Formalidade e Renda (2 painéis)"""
 
     logger.info("\n=== FIGURA 8: Formalidade e Renda ===")
 
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
 
-    mask = df['exposure_score'].notna()
-    subset = df[mask]
-
     # Painel A: Exposição média formal vs informal
-    formal_stats = subset.groupby('formal').apply(
-        lambda x: pd.Series({
-            'exposure_mean': weighted_mean(x['exposure_score'], x['peso']),
-            'pop_milhoes': x['peso'].sum() / 1e6,
-        })
-    )
+    stats = cube_stats(
+        cube, 'formal', 'exposure_score', stats=['mean', 'weight']
+    )['exposure_score']
+    formal_stats = pd.DataFrame({
+        'exposure_mean': stats['mean'],
+        'pop_milhoes': stats['weight'] / 1e6,
+    })
     formal_labels = ['Informal', 'Formal']
 
     bars = ax1.bar(formal_labels, formal_stats['exposure_mean'],
@@ -507,12 +492,9 @@ def figure8_formalidade_renda(df):
     ax1.grid(axis='y', alpha=0.3)
 
     # Painel B: Rendimento médio por quintil, split formal/informal
-    mask_renda = (df['tem_renda'] == 1) & df['quintil_exposure'].notna()
-    subset_renda = df[mask_renda]
-
-    renda_formal = subset_renda.groupby(['quintil_exposure', 'formal']).apply(
-        lambda x: weighted_mean(x['rendimento_habitual'], x['peso'])
-    ).unstack()
+    renda_formal = cube_stats(
+        cube, ['quintil_exposure', 'formal'], 'renda_declarada'
+    )[('renda_declarada', 'mean')].unstack()
     renda_formal = renda_formal.reindex([q for q in QUINTIL_ORDER if q in renda_formal.index])
     renda_formal.columns = ['Informal', 'Formal']
 
@@ -551,16 +533,16 @@ def generate_all_figures():
     logger.info("GERAÇÃO DE FIGURAS - ETAPA 1")
     logger.info("=" * 60)
 
-    df = load_data()
+    cube = load_data()
 
-    figure1_distribuicao(df)
-    figure2_heatmap(df)
-    figure3_renda(df)
-    figure4_decomposicao(df)
-    figure5_setores(df)
-    figure6_genero_raca(df)
-    figure7_idade_instrucao(df)
-    figure8_formalidade_renda(df)
+    figure1_distribuicao(cube)
+    figure2_heatmap(cube)
+    figure3_renda(cube)
+    figure4_decomposicao(cube)
+    figure5_setores(cube)
+    figure6_genero_raca(cube)
+    figure7_idade_instrucao(cube)
+    figure8_formalidade_renda(cube)
 
     logger.info("\n" + "=" * 60)
     logger.info("TODAS AS 8 FIGURAS GERADAS COM SUCESSO")
@@ -1,6 +1,6 @@
 """
 Script 08: Tabela Detalhada de Exposicao a IA por Classificacao Ocupacional COD
-Entrada: data/raw/Estrutura Ocupacao COD.xls, data/processed/pnad_ilo_merged.csv
+Entrada: data/raw/Estrutura Ocupacao COD.xls, data/output/pnad_ilo_merged.parquet
 Saida: outputs/tables/tabela_detalhada_cod.csv e .pdf
 """
 
@@ -16,6 +16,8 @@ sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import DATA_RAW, DATA_OUTPUT, OUTPUTS_TABLES, OUTPUTS_LOGS, GRANDES_GRUPOS
 from src.utils.weighted_stats import weighted_mean, weighted_std
+from src.utils.schema import read_parquet
+from src.utils.reference_cache import read_excel_cached
 
 # Para geracao de PDF
 import matplotlib.pyplot as plt
@@ -41,11 +43,12 @@ def read_cod_structure(path):
     logger.info(f"Lendo estrutura COD de: {path}")
     
     # Ler arquivo XLS (formato antigo .xls), pulando a primeira linha e usando a segunda como header
+    # (convertido para Parquet no cache de referência na primeira leitura)
     try:
-        df_cod = pd.read_excel(path, sheet_name='Estrutura COD', engine='xlrd', header=1)
+        df_cod = read_excel_cached(path, sheet_name='Estrutura COD', engine='xlrd', header=1)
     except Exception as e:
         logger.warning(f"Erro com xlrd, tentando openpyxl: {e}")
-        df_cod = pd.read_excel(path, sheet_name='Estrutura COD', engine='openpyxl', header=1)
+        df_cod = read_excel_cached(path, sheet_name='Estrutura COD', engine='openpyxl', header=1)
     
     # Renomear colunas para nomes padronizados
     df_cod.columns = ['Grande Grupo', 'Subgrupo principal', 'Subgrupo', 'Grupo de base', 'Denominacao']
@@ -122,7 +125,7 @@ def calculate_exposure_by_level(df, cod_names):
     """
     logger.info("\n=== CALCULANDO EXPOSICAO POR NIVEL ===")
     
-    df['cod_ocupacao'] = df['cod_ocupacao'].astype(str).str.zfill(4)
+    df['cod_ocupacao'] = df['cod_ocupacao'].astype(str)  # categórica, já com 4 dígitos
     df['cod_1d'] = df['cod_ocupacao'].str[:1]
     df['cod_2d'] = df['cod_ocupacao'].str[:2]
     df['cod_3d'] = df['cod_ocupacao'].str[:3]
@@ -413,7 +416,8 @@ def run_tabela_detalhada():
     
     # 2. Carregar dados PNAD
     logger.info("\nCarregando dados PNAD...")
-    df = pd.read_csv(DATA_OUTPUT / "pnad_ilo_merged.csv")
+    df = read_parquet(DATA_OUTPUT / "pnad_ilo_merged.parquet",
+                      ['cod_ocupacao', 'peso', 'exposure_score', 'match_level'])
     logger.info(f"Dados carregados: {len(df):,} observacoes")
     
     # 3. Calcular exposicao por nivel
@@ -1,6 +1,6 @@
 """
 Script 09: Geração de mapas coropléticos de exposição à IA
-Entrada: data/processed/pnad_ilo_merged.csv
+Entrada: data/output/cubo/ (cubo de agregação de pnad_ilo_merged.parquet)
 Saída: outputs/figures/mapa_*.png e *.pdf
 """
 
@@ -19,7 +19,8 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
-from src.utils.weighted_stats import weighted_mean
+from src.utils.weighted_stats import cube_stats, grouped_inequality
+from src.utils.cube import load_pnad_cube
 
 logging.basicConfig(
     level=logging.INFO,
@@ -47,14 +48,15 @@ COLORMAPS = {
     'not_exposed': 'Greens',
     'exposicao_baixa': 'Blues',
     'exposicao_media_grad': 'Oranges',
-    'exposicao_alta': 'Reds'
+    'exposicao_alta': 'Reds',
+    'gini_exposicao': 'Purples'
 }
 
 
 def load_data():
-    df = pd.read_csv(DATA_OUTPUT / "pnad_ilo_merged.csv")
-    logger.info(f"Dados carregados: {len(df):,} obs")
-    return df
+    cube = load_pnad_cube()
+    logger.info(f"Cubo carregado: {int(cube['geografia']['n'].sum()):,} obs")
+    return cube
 
 
 def load_geodata():
@@ -74,53 +76,40 @@ def create_regions_geodata(states_gdf):
     return gpd.GeoDataFrame(regions_list, crs=states_gdf.crs)
 
 
-def aggregate_by_state(df):
-    results = []
-    for uf in df['sigla_uf'].unique():
-        subset = df[df['sigla_uf'] == uf]
-        total = subset['peso'].sum()
-        exp = weighted_mean(subset['exposure_score'], subset['peso'])
-        
-        gradient_groups = {
-            'pct_not_exposed':     ['Not Exposed'],
-            'pct_exposicao_baixa': ['Minimal Exposure', 'Exposed: Gradient 1', 'Exposed: Gradient 2'],
-            'pct_exposicao_media': ['Exposed: Gradient 3'],
-            'pct_exposicao_alta':  ['Exposed: Gradient 4'],
-        }
-        pct = {}
-        for key, labels in gradient_groups.items():
-            p = subset[subset['exposure_gradient'].isin(labels)]['peso'].sum()
-            pct[key] = (p / total * 100) if total > 0 else 0
-
-        results.append({
-            'sigla_uf': uf, 'regiao': subset['regiao'].iloc[0],
-            'exposicao_media': exp, **pct
-        })
-    return pd.DataFrame(results)
-
-
-def aggregate_by_region(df):
-    results = []
-    for regiao in df['regiao'].unique():
-        subset = df[df['regiao'] == regiao]
-        total = subset['peso'].sum()
-        exp = weighted_mean(subset['exposure_score'], subset['peso'])
-        
-        gradient_groups = {
-            'pct_not_exposed':     ['Not Exposed'],
-            'pct_exposicao_baixa': ['Minimal Exposure', 'Exposed: Gradient 1', 'Exposed: Gradient 2'],
-            'pct_exposicao_media': ['Exposed: Gradient 3'],
-            'pct_exposicao_alta':  ['Exposed: Gradient 4'],
-        }
-        pct = {}
-        for key, labels in gradient_groups.items():
-            p = subset[subset['exposure_gradient'].isin(labels)]['peso'].sum()
-            pct[key] = (p / total * 100) if total > 0 else 0
-
-        results.append({
-            'regiao': regiao, 'exposicao_media': exp, **pct
-        })
-    return pd.DataFrame(results)
+GRADIENT_GROUPS = {
+    'pct_not_exposed':     ['Not Exposed'],
+    'pct_exposicao_baixa': ['Minimal Exposure', 'Exposed: Gradient 1', 'Exposed: Gradient 2'],
+    'pct_exposicao_media': ['Exposed: Gradient 3'],
+    'pct_exposicao_alta':  ['Exposed: Gradient 4'],
+}
+
+
+def aggregate_by(cube, key):
+    """Exposição média, Gini da exposição e % por faixa de gradiente por ``key``."""
+    result = pd.DataFrame({
+        'exposicao_media': cube_stats(cube, key, 'exposure_score')[('exposure_score', 'mean')]
+    })
+    # Percentuais sobre o total de pesos do grupo (inclusive sem exposure_score)
+    cells = cube['geografia']
+    total = cells.groupby(key)['peso'].sum()
+    for k, labels in GRADIENT_GROUPS.items():
+        in_group = cells['peso'].where(cells['exposure_gradient'].isin(labels), 0.0)
+        result[k] = in_group.groupby(cells[key]).sum() / total * 100
+    result['gini_exposicao'] = grouped_inequality(
+        cube['dist_exposicao'], key, 'exposure_score', count_col='n', weight2_col='peso2'
+    )['gini']
+    return result.reset_index()
+
+
+def aggregate_by_state(cube):
+    result = aggregate_by(cube, 'sigla_uf')
+    regiao = cube['geografia'].groupby('sigla_uf')['regiao'].first()
+    result.insert(1, 'regiao', result['sigla_uf'].map(regiao))
+    return result
+
+
+def aggregate_by_region(cube):
+    return aggregate_by(cube, 'regiao')
 
 
 def create_map(gdf, metric, title, cmap, label_col, fmt='.1f', pct=True, fname=None):
@@ -163,12 +152,12 @@ def generate_all_maps():
     logger.info("GERAÇÃO DE MAPAS")
     logger.info("=" * 50)
     
-    df = load_data()
+    cube = load_data()
     states = load_geodata()
     regions = create_regions_geodata(states)
     
-    sd = aggregate_by_state(df)
-    rd = aggregate_by_region(df)
+    sd = aggregate_by_state(cube)
+    rd = aggregate_by_region(cube)
     sd.to_csv(OUTPUTS_TABLES / "tabela_mapa_estados.csv", index=False)
     rd.to_csv(OUTPUTS_TABLES / "tabela_mapa_regioes.csv", index=False)
     
@@ -210,6 +199,13 @@ def generate_all_maps():
     create_map(rm, 'pct_exposicao_alta', 'Exposição Alta à IA (%) por Região\nExposed: Gradient 4 - Brasil 3T/2025',
                'Reds', 'name_region', '.1f', True, 'mapa_c5_exposicao_alta_regiao')
     
+    # C6: Desigualdade (Gini) da exposição
+    logger.info("\n=== C6: Gini da Exposição ===")
+    create_map(sm, 'gini_exposicao', 'Desigualdade na Exposição à IA (Gini) por Estado\nBrasil 3T/2025',
+               'Purples', 'abbrev_state', '.3f', False, 'mapa_c6_gini_exposicao_estado')
+    create_map(rm, 'gini_exposicao', 'Desigualdade na Exposição à IA (Gini) por Região\nBrasil 3T/2025',
+               'Purples', 'name_region', '.3f', False, 'mapa_c6_gini_exposicao_regiao')
+
     logger.info("\n" + "=" * 50)
     logger.info("MAPAS GERADOS!")
     logger.info("=" * 50)
@@ -0,0 +1,178 @@
+"""
+Script 10: Modo incremental por trimestre e séries temporais
+Entrada: data/raw/pnad_{ano}q{trimestre}.parquet (baixado se ausente)
+         data/output/cubo_trimestral/ (cubos dos trimestres já processados)
+Saída: data/processed/trimestres/pnad_clean_{ano}q{trimestre}.parquet
+       data/output/trimestres/pnad_ilo_merged_{ano}q{trimestre}.parquet
+       data/output/cubo_trimestral/{ano}q{trimestre}/*.parquet
+       outputs/tables/tabela12_serie_trimestral.csv e .tex
+
+Uso:
+    python src/10_serie_trimestral.py --trimestre 2025 4   # processa 2025 Q4 e atualiza as séries
+    python src/10_serie_trimestral.py                      # apenas recalcula as séries
+
+Acrescentar um trimestre processa somente as linhas dele (limpeza 03,
+crosswalk 04, merge 05) e grava seu cubo no histórico; séries e variações
+trimestrais saem apenas dos cubos, sem reler microdados. O script 05
+também registra no histórico o trimestre da base consolidada.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from config.settings import *
+from src.utils.cube import build_pnad_cube_from_parquet
+from src.utils.quarters import (
+    available_quarters, load_quarter_cubes, quarter_deltas, quarter_paths,
+    quarterly_population, quarterly_stats, save_quarter_cube,
+)
+from src.utils.weighted_stats import cube_value_cols, pick_cuboid
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler(OUTPUTS_LOGS / '10_serie_trimestral.log'),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# Scripts numerados não são importáveis pelo nome
+import importlib.util
+
+def _load_script(name):
+    spec = importlib.util.spec_from_file_location(name, Path(__file__).parent / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Agrupamentos das séries: cada um é servido pelo cuboide que o contém
+SERIES_GROUPINGS = {
+    'Brasil': None,
+    'Região': 'regiao',
+    'Setor': 'setor_agregado',
+    'Grande Grupo': 'grande_grupo',
+    'Sexo': 'sexo_texto',
+    'Raça': 'raca_agregada',
+    'Faixa Etária': 'faixa_etaria',
+    'Formalidade': 'formal',
+    'Instrução': 'nivel_instrucao',
+}
+
+SERIES_VALUES = {
+    'exposure_score': 'Exposição Média',
+    'alta_exposicao': '% Alta Exposição',
+    'rendimento_habitual': 'Rendimento Médio (R$)',
+    'horas_habituais': 'Horas Habituais',
+}
+
+
+# =========================================================================
+# Ingestão de um trimestre
+# =========================================================================
+def ingest_quarter(ano, trimestre, reauth=False):
+    """Processa apenas as linhas de um trimestre e grava seu cubo no histórico."""
+    logger.info(f"\n=== Processando {ano} Q{trimestre} ===")
+    download = _load_script("01_download_pnad")
+    clean = _load_script("03_clean_pnad")
+    merge = _load_script("05_merge_data")
+
+    raw_path = download.raw_pnad_path(ano, trimestre)
+    if not raw_path.exists():
+        download.download_pnad(reauth=reauth, ano=ano, trimestre=trimestre)
+
+    clean_path, merged_path = quarter_paths(ano, trimestre)
+    clean_path.parent.mkdir(parents=True, exist_ok=True)
+    merged_path.parent.mkdir(parents=True, exist_ok=True)
+
+    clean.clean_pnad(raw_path, clean_path)
+    merge.merge_and_finalize(clean_path, merged_path)
+
+    cube = build_pnad_cube_from_parquet(merged_path)
+    save_quarter_cube(cube, ano, trimestre)
+    logger.info(f"Cubo de {ano} Q{trimestre}: "
+                + ", ".join(f"{name} {len(cells):,}" for name, cells in cube.items()))
+    return cube
+
+
+# =========================================================================
+# Tabela 12 — Séries trimestrais e variações
+# =========================================================================
+def table12_serie_trimestral(cube):
+    """Séries por grupo e variação sobre o trimestre anterior, só com cubos."""
+    logger.info("\n=== Tabela 12: Séries Trimestrais ===")
+    value_cols = [c for c in SERIES_VALUES
+                  if all(c in cube_value_cols(cube[name]) for name in ('perfil', 'geografia'))]
+
+    parts = []
+    for agrupamento, by in SERIES_GROUPINGS.items():
+        stats = quarterly_stats(cube, by, value_cols).xs('mean', axis=1, level=1)
+        cells = pick_cuboid(cube, ['ano', 'trimestre'] + ([] if by is None else [by]), value_cols)
+        stats['Trabalhadores (milhões)'] = quarterly_population(cells, by) / 1e6
+        if 'alta_exposicao' in stats:
+            stats['alta_exposicao'] *= 100
+        stats = stats.rename(columns=SERIES_VALUES)
+        deltas = quarter_deltas(stats).add_prefix('Δ ')
+
+        result = stats.join(deltas).reset_index()
+        result.insert(0, 'Agrupamento', agrupamento)
+        result.insert(1, 'Grupo', 'Brasil' if by is None else result.pop(by).astype(str))
+        parts.append(result)
+
+    result = pd.concat(parts, ignore_index=True).rename(
+        columns={'ano': 'Ano', 'trimestre': 'Trimestre'}
+    ).set_index(['Agrupamento', 'Grupo', 'Ano', 'Trimestre']).round(4)
+
+    brasil = result.xs('Brasil', level='Agrupamento')
+    for (_, ano, trimestre), row in brasil.iterrows():
+        delta = row['Δ Exposição Média']
+        logger.info(f"  {ano} Q{trimestre}: exposição {row['Exposição Média']:.4f}"
+                    + ("" if pd.isna(delta) else f" (Δ {delta:+.4f})"))
+
+    save_table(result, 'tabela12_serie_trimestral',
+               'Exposição à IA Generativa por Trimestre e Variação Trimestral')
+    return result
+
+
+def save_table(df_table, name, caption=None):
+    csv_path = OUTPUTS_TABLES / f"{name}.csv"
+    tex_path = OUTPUTS_TABLES / f"{name}.tex"
+    df_table.to_csv(csv_path, index=True)
+    if caption:
+        df_table.to_latex(tex_path, caption=caption, escape=False)
+    else:
+        df_table.to_latex(tex_path, escape=False)
+    logger.info(f"  Salvo: {csv_path.name}, {tex_path.name}")
+
+
+def main():
+    logger.info("=" * 60)
+    logger.info("SÉRIES TRIMESTRAIS (MODO INCREMENTAL)")
+    logger.info("=" * 60)
+
+    if '--trimestre' in sys.argv:
+        i = sys.argv.index('--trimestre')
+        ingest_quarter(int(sys.argv[i + 1]), int(sys.argv[i + 2]),
+                       reauth='--reauth' in sys.argv)
+
+    quarters = available_quarters()
+    if not quarters:
+        logger.error("Histórico vazio: rode 05_merge_data.py ou use --trimestre ANO TRI")
+        return None
+    logger.info(f"Trimestres no histórico: "
+                + ", ".join(f"{ano} Q{trimestre}" for ano, trimestre in quarters))
+
+    cube = load_quarter_cubes(quarters)
+    return table12_serie_trimestral(cube)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Cubo de agregação PNAD × exposição (etapa 1)
+
+Tabelas (06), figuras (07) e mapas (09) agregam os mesmos microdados pelas
+mesmas dimensões. O cubo materializa uma vez as somas aditivas (ver
+weighted_stats.cube) em quatro cuboides, gravados em data/output/cubo/:
+
+    perfil          quintil/decil/gradiente × sexo × raça × idade × formal × instrução
+    geografia       região/UF × setor × grande grupo × gradiente
+    dist_exposicao  região/UF × exposure_score (histograma, Gini, P90/P10)
+    dist_renda      UF × quintil × rendimento, só quem tem renda
+                    (mediana e Gini da renda)
+
+Colunas derivadas seguem as máscaras das tabelas: indicadores de
+exposição e renda_declarada são NaN quando exposure_score é NaN. Colunas
+de valores ausentes na base mesclada são ignoradas.
+"""
+
+import logging
+
+from config.settings import DATA_OUTPUT, HIGH_EXPOSURE_GRADIENTS
+from src.utils.schema import read_parquet
+from src.utils.weighted_stats import build_cube, load_cube, save_cube
+
+logger = logging.getLogger(__name__)
+
+CUBE_DIR = DATA_OUTPUT / "cubo"
+MERGED_PATH = DATA_OUTPUT / "pnad_ilo_merged.parquet"
+
+CUBOIDS = {
+    'perfil': (
+        ['quintil_exposure', 'decil_exposure', 'exposure_gradient', 'sexo_texto',
+         'raca_agregada', 'faixa_etaria', 'formal', 'nivel_instrucao'],
+        ['exposure_score', 'alta_exposicao', 'renda_declarada',
+         'formal', 'mulher', 'negra', 'idade', 'rendimento_habitual', 'horas_habituais'],
+    ),
+    'geografia': (
+        ['regiao', 'sigla_uf', 'setor_agregado', 'grande_grupo', 'exposure_gradient'],
+        ['exposure_score', 'alta_exposicao', 'nao_exposto',
+         'rendimento_habitual', 'horas_habituais'],
+    ),
+    'dist_exposicao': (['regiao', 'sigla_uf', 'exposure_score'], []),
+    'dist_renda': (['sigla_uf', 'quintil_exposure', 'rendimento_habitual'], []),
+}
+
+
+def add_cube_columns(df):
+    """Indicadores e valores derivados usados pelas tabelas e figuras."""
+    has_exp = df['exposure_score'].notna()
+    return df.assign(
+        alta_exposicao=df['exposure_gradient'].isin(HIGH_EXPOSURE_GRADIENTS)
+                                               .astype(float).where(has_exp),
+        nao_exposto=(df['exposure_gradient'] == 'Not Exposed').astype(float).where(has_exp),
+        renda_declarada=df['rendimento_habitual'].where((df['tem_renda'] == 1) & has_exp),
+        mulher=(df['sexo_texto'] == 'Mulher').astype(int),
+        negra=(df['raca_agregada'] == 'Negra').astype(int),
+    )
+
+
+def build_pnad_cube(df):
+    """Constrói os cuboides de CUBOIDS a partir dos microdados mesclados."""
+    df = add_cube_columns(df)
+    has_exp = df['exposure_score'].notna()
+    subsets = {
+        'dist_exposicao': df[has_exp],
+        'dist_renda': df[has_exp & (df['tem_renda'] == 1)],
+    }
+    return {
+        name: build_cube(subsets.get(name, df), dims, [c for c in values if c in df.columns])
+        for name, (dims, values) in CUBOIDS.items()
+    }
+
+
+def build_pnad_cube_from_parquet(path):
+    """Relê uma base mesclada (só as colunas usadas) e constrói o cubo."""
+    logger.info(f"Construindo cubo a partir de {path.name}...")
+    needed = {'peso', 'exposure_gradient', 'rendimento_habitual', 'tem_renda',
+              'sexo_texto', 'raca_agregada', 'idade'}
+    for dims, values in CUBOIDS.values():
+        needed.update(dims, values)
+    return build_pnad_cube(read_parquet(path, sorted(needed)))
+
+
+def load_pnad_cube(rebuild=False):
+    """Lê o cubo; reconstrói a partir de pnad_ilo_merged.parquet se estiver
+    ausente, incompleto ou mais antigo que os microdados.
+
+    A reconstrução relê o Parquet (e não o DataFrame em memória do script
+    05) para que as dimensões tenham os mesmos tipos vistos pelos consumidores.
+    """
+    paths = [CUBE_DIR / f"{name}.parquet" for name in CUBOIDS]
+    if not rebuild and all(p.exists() for p in paths):
+        if (not MERGED_PATH.exists()
+                or min(p.stat().st_mtime for p in paths) >= MERGED_PATH.stat().st_mtime):
+            return load_cube(CUBE_DIR)
+
+    cube = build_pnad_cube_from_parquet(MERGED_PATH)
+    save_cube(cube, CUBE_DIR)
+    return cube
+
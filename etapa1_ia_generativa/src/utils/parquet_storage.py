@@ -0,0 +1,16 @@
+"""
+Perfis de gravação Parquet (fast_write, archive, scan)
+
+Reexporta o pacote compartilhado parquet_storage (raiz do repositório).
+Não adicionar funções aqui: a implementação única fica em parquet_storage/.
+"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from parquet_storage import *  # noqa: E402,F401,F403
+from parquet_storage import __all__  # noqa: E402,F401
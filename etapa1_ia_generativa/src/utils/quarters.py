@@ -0,0 +1,102 @@
+"""
+Histórico trimestral de agregados (modo incremental)
+
+Cada trimestre processado guarda seu cubo (ver src/utils/cube.py) em
+data/output/cubo_trimestral/{ano}q{trimestre}/, e os microdados limpos e
+mesclados desse trimestre em data/processed/trimestres/ e
+data/output/trimestres/. Séries temporais e variações trimestrais somam
+células desses cubos, sem reler microdados: acrescentar um trimestre custa
+apenas o processamento das linhas dele.
+"""
+
+import re
+
+import pandas as pd
+
+from config.settings import DATA_OUTPUT, DATA_PROCESSED
+from src.utils.cube import CUBOIDS
+from src.utils.weighted_stats import cube_stats, save_cube
+
+QUARTER_CUBE_DIR = DATA_OUTPUT / "cubo_trimestral"
+QUARTER_CLEAN_DIR = DATA_PROCESSED / "trimestres"
+QUARTER_MERGED_DIR = DATA_OUTPUT / "trimestres"
+
+PERIOD_DIMS = ['ano', 'trimestre']
+
+
+def quarter_key(ano, trimestre):
+    """Rótulo de um trimestre: (2025, 3) → '2025q3'."""
+    return f"{ano}q{trimestre}"
+
+
+def quarter_paths(ano, trimestre):
+    """Caminhos (limpo, mesclado) dos microdados de um trimestre."""
+    key = quarter_key(ano, trimestre)
+    return (QUARTER_CLEAN_DIR / f"pnad_clean_{key}.parquet",
+            QUARTER_MERGED_DIR / f"pnad_ilo_merged_{key}.parquet")
+
+
+def save_quarter_cube(cube, ano, trimestre):
+    """Grava (ou substitui) o cubo de um trimestre no histórico."""
+    save_cube(cube, QUARTER_CUBE_DIR / quarter_key(ano, trimestre))
+
+
+def available_quarters():
+    """Trimestres com cubo completo no histórico, em ordem cronológica."""
+    quarters = []
+    for path in QUARTER_CUBE_DIR.glob("*q*"):
+        match = re.fullmatch(r"(\d{4})q(\d)", path.name)
+        if match and all((path / f"{name}.parquet").exists() for name in CUBOIDS):
+            quarters.append((int(match.group(1)), int(match.group(2))))
+    return sorted(quarters)
+
+
+def load_quarter_cubes(quarters=None, cuboids=None):
+    """Cubos de vários trimestres empilhados: {nome: células com ano e trimestre}.
+
+    Parâmetros:
+        quarters : lista de (ano, trimestre); padrão: todos os disponíveis
+        cuboids  : nomes dos cuboides a ler; padrão: todos de CUBOIDS
+    """
+    quarters = available_quarters() if quarters is None else quarters
+    cube = {}
+    for name in cuboids or CUBOIDS:
+        parts = []
+        for ano, trimestre in quarters:
+            cells = pd.read_parquet(QUARTER_CUBE_DIR / quarter_key(ano, trimestre) / f"{name}.parquet")
+            parts.append(cells.assign(ano=ano, trimestre=trimestre)[
+                PERIOD_DIMS + list(cells.columns)
+            ])
+        if parts:
+            cube[name] = pd.concat(parts, ignore_index=True)
+    return cube
+
+
+def quarterly_stats(cube, by, value_cols, stats=('mean',)):
+    """``cube_stats`` por trimestre: índice (ano, trimestre, *by)."""
+    by = [] if by is None else ([by] if isinstance(by, str) else list(by))
+    return cube_stats(cube, PERIOD_DIMS + by, value_cols, stats)
+
+
+def quarterly_population(cells, by):
+    """Σ peso por trimestre (e ``by``), inclusive linhas sem score."""
+    by = [] if by is None else ([by] if isinstance(by, str) else list(by))
+    return cells.groupby(PERIOD_DIMS + by, observed=True, sort=True)['peso'].sum()
+
+
+def quarter_deltas(series):
+    """Variação em relação ao trimestre imediatamente anterior, por grupo.
+
+    ``series`` é indexada por (ano, trimestre, *grupos); a variação é NaN
+    quando o trimestre anterior não está no histórico (não compara com o
+    último trimestre disponível se houver lacunas).
+    """
+    flat = series.reset_index()
+    groups = [c for c in series.index.names if c not in PERIOD_DIMS]
+    values = list(series.columns)
+    flat['_periodo'] = flat['ano'] * 4 + flat['trimestre']
+    previous = flat[groups + ['_periodo'] + values].assign(_periodo=flat['_periodo'] + 1)
+    merged = flat[groups + ['_periodo']].merge(previous, on=groups + ['_periodo'], how='left')
+    deltas = pd.DataFrame(series.to_numpy() - merged[values].to_numpy(),
+                          index=series.index, columns=series.columns)
+    return deltas
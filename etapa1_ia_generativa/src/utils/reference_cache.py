@@ -0,0 +1,16 @@
+"""
+Cache de tabelas de referência (planilhas Excel → Parquet)
+
+Reexporta o pacote compartilhado reference_cache (raiz do repositório).
+Não adicionar funções aqui: a implementação única fica em reference_cache/.
+"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from reference_cache import *  # noqa: E402,F401,F403
+from reference_cache import __all__  # noqa: E402,F401
@@ -0,0 +1,108 @@
+"""
+Esquema tipado dos intermediários Parquet (pnad_clean, pnad_ilo_merged)
+
+Em CSV os tipos se perdiam a cada gravação: códigos com zero à esquerda
+viravam inteiros (cod_ocupacao '0110' → 110, grupamento_atividade
+'01101' → 1101, lido depois como CNAE '11') e cada leitor refazia as
+conversões. Os intermediários são Parquet com tipos explícitos:
+
+    category   rótulos e códigos textuais (codificados por dicionário)
+    Int8/int8  códigos numéricos e indicadores 0/1 (Int8 admite ausentes)
+    int16      ano, idade
+    float32    rendimentos, horas e pesos replicados: valores inteiros em
+               reais e horas são exatos em float32 (até 2^24), e os pesos
+               replicados só entram em erros padrão
+    float64    peso e exposure_score (somas, quantis e Gini exatos do cubo)
+
+Colunas fora do esquema são gravadas como estão. ``read_parquet`` lê só
+as colunas pedidas (projeção), ignorando as ausentes no arquivo.
+"""
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from config.settings import PESOS_REPLICADOS_COLS
+
+PNAD_SCHEMA = {
+    # Identificação
+    'ano': 'int16',
+    'trimestre': 'int8',
+    'sigla_uf': 'category',
+    'regiao': 'category',
+    # Demografia
+    'sexo': 'Int8',
+    'sexo_texto': 'category',
+    'idade': 'int16',
+    'faixa_etaria': 'category',
+    'raca_cor': 'Int8',
+    'raca_agregada': 'category',
+    'nivel_instrucao': 'Int8',
+    # Ocupação e setor (códigos textuais preservam zeros à esquerda)
+    'cod_ocupacao': 'category',
+    'grande_grupo': 'category',
+    'grupamento_atividade': 'category',
+    'setor_agregado': 'category',
+    'setor_critico_ia': 'int8',
+    'posicao_ocupacao': 'Int8',
+    'formal': 'int8',
+    # Renda e horas
+    'tem_renda': 'int8',
+    'rendimento_habitual': 'float32',
+    'rendimento_winsor': 'float32',
+    'rendimento_efetivo': 'float32',
+    'horas_habituais': 'float32',
+    'horas_efetivas': 'float32',
+    'faixa_renda_sm': 'category',
+    # Peso e exposição
+    'peso': 'float64',
+    'exposure_score': 'float64',
+    'exposure_gradient': 'category',
+    'match_level': 'category',
+    'quintil_exposure': 'category',
+    'decil_exposure': 'category',
+}
+PNAD_SCHEMA.update({col: 'float32' for col in PESOS_REPLICADOS_COLS})
+
+
+def apply_schema(df, schema=PNAD_SCHEMA):
+    """Converte as colunas de ``df`` presentes em ``schema`` para os tipos declarados.
+
+    Códigos lidos como texto ('1', '05') viram números; valores não
+    numéricos em colunas numéricas levantam ValueError, assim como
+    ausentes em colunas inteiras não anuláveis (int8/int16).
+    """
+    typed = {}
+    for col, dtype in schema.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        values = df[col]
+        if dtype != 'category':
+            if not pd.api.types.is_numeric_dtype(values):
+                values = pd.to_numeric(values.astype(object))
+        typed[col] = values.astype(dtype)
+    return df.assign(**typed) if typed else df
+
+
+def write_parquet(df, path, schema=PNAD_SCHEMA):
+    """Grava ``df`` em Parquet com os tipos de ``schema``; retorna o DataFrame tipado."""
+    df = apply_schema(df, schema)
+    df.to_parquet(path, index=False)
+    return df
+
+
+def parquet_columns(path):
+    """Colunas de um arquivo Parquet (lê apenas os metadados)."""
+    return pq.read_schema(path).names
+
+
+def read_parquet(path, columns=None):
+    """Lê um intermediário Parquet, opcionalmente só com ``columns``.
+
+    Colunas repetidas são lidas uma vez; as que não existem no arquivo são
+    ignoradas (ex.: pesos replicados quando o download foi feito sem
+    --replicas).
+    """
+    if columns is not None:
+        available = set(parquet_columns(path))
+        columns = [c for c in dict.fromkeys(columns) if c in available]
+    return pd.read_parquet(path, columns=columns)
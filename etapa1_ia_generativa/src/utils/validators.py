@@ -6,12 +6,15 @@ import pandas as pd
 import numpy as np
 
 
+PNAD_REQUIRED_COLS = ['cod_ocupacao', 'peso', 'rendimento_habitual', 'idade', 'sigla_uf']
+
+
 def validate_pnad_download(df):
     """Valida download da PNAD"""
     errors = []
     
     # Verificar colunas essenciais
-    required_cols = ['cod_ocupacao', 'peso', 'rendimento_habitual', 'idade', 'sigla_uf']
+    required_cols = PNAD_REQUIRED_COLS
     for col in required_cols:
         if col not in df.columns:
             errors.append(f"Coluna ausente: {col}")
@@ -29,6 +32,28 @@ def validate_pnad_download(df):
     return len(errors) == 0, errors
 
 
+def validate_pnad_parquet(path):
+    """
+    Valida o parquet bruto da PNAD pelos rodapés (sem carregar o arquivo).
+
+    Mesmas verificações de validate_pnad_download: colunas e linhas saem
+    dos metadados; as UFs, das estatísticas de row group de sigla_uf (a
+    coluna só é lida se as estatísticas não bastarem).
+    """
+    from .parquet_storage import ParquetStats, validate_parquet
+
+    stats = ParquetStats(path)
+    _, errors = validate_parquet(path, required_columns=PNAD_REQUIRED_COLS,
+                                 min_rows=100000, stats=stats)
+
+    if 'sigla_uf' in stats.schema.names:
+        ufs = stats.counts_by('sigla_uf').index.dropna()
+        if len(ufs) != 27:
+            errors.append(f"UFs incompletas: {len(ufs)}/27")
+
+    return len(errors) == 0, errors
+
+
 def validate_ilo_scores(df):
     """Valida scores ILO processados"""
     errors = []
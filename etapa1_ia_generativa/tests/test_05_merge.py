@@ -17,13 +17,13 @@ from config.settings import *
 def test_merged_data():
     """Testa integridade da base final"""
     
-    file_path = DATA_PROCESSED / "pnad_ilo_merged.csv"
+    file_path = DATA_OUTPUT / "pnad_ilo_merged.parquet"
     
     # Teste 1: Arquivo existe
     assert file_path.exists(), f"Arquivo não encontrado: {file_path}"
     print("✓ Arquivo existe")
     
-    df = pd.read_csv(file_path)
+    df = pd.read_parquet(file_path)
     
     # Teste 2: Colunas essenciais
     required = [
@@ -64,6 +64,11 @@ def test_merged_data():
     assert 50 < pop < 150, f"População fora do esperado: {pop:.1f}M"
     print(f"✓ População: {pop:.1f} milhões")
     
+    # Teste 8: Tipos do esquema (códigos com zero à esquerda preservados)
+    assert isinstance(df['cod_ocupacao'].dtype, pd.CategoricalDtype), "cod_ocupacao não é categórica"
+    assert df['cod_ocupacao'].astype(str).str.len().eq(4).all(), "cod_ocupacao sem 4 dígitos"
+    print("✓ Tipos do esquema preservados")
+    
     print("\n🎉 TODOS OS TESTES PASSARAM - BASE FINAL OK!")
     return True
 
@@ -9,7 +9,8 @@ ROOT_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from etapa2_anthropic_index.config.settings import *
-from etapa2_anthropic_index.src.utils.aggregation import calculate_indices, weighted_mean
+from etapa2_anthropic_index.src.utils.aggregation import calculate_indices
+from weighted_stats import weighted_mean
 
 # Configuração de Logging
 logging.basicConfig(
@@ -1,12 +1,6 @@
 import numpy as np
 import pandas as pd
 
-def weighted_mean(values, weights):
-    """Calcula a média ponderada de uma série de valores."""
-    if len(values) == 0:
-        return 0
-    return np.average(values, weights=weights)
-
 def calculate_indices(df_task):
     """
     Calcula os shares de automation e augmentation com base nos modos de colaboração.
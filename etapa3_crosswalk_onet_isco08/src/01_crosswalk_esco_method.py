@@ -9,6 +9,8 @@ ROOT_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from etapa3_crosswalk_onet_isco08.config.settings import *
+from weighted_stats import weighted_mean
+from reference_cache import read_excel_cached
 
 # Configuração de Logging
 logging.basicConfig(
@@ -21,17 +23,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def weighted_mean(values, weights):
-    """Calcula a média ponderada de uma série de valores."""
-    valid = ~(pd.isna(values) | pd.isna(weights))
-    if valid.sum() == 0:
-        return np.nan
-    v = values[valid]
-    w = weights[valid]
-    if w.sum() == 0:
-        return v.mean()
-    return np.average(v, weights=w)
-
 def extract_isco_code_from_uri(uri):
     """
     Extrai o código ISCO-08 da URI do conceito ESCO.
@@ -138,11 +129,11 @@ def run_esco_crosswalk():
             logger.info("ATIVANDO FALLBACK: Usando cadeia SOC 2018 -> SOC 2010 -> ISCO-08 (arquivos locais)")
             
             # Carregar arquivos legados
-            df_10_18 = pd.read_excel(CROSSWALK_SOC_10_18, skiprows=7) # Header na linha 8 (index 7)
+            df_10_18 = read_excel_cached(CROSSWALK_SOC_10_18, skiprows=7) # Header na linha 8 (index 7)
             df_10_18 = df_10_18.iloc[:, [0, 1, 2, 3]]
             df_10_18.columns = ['soc_2010_code', 'soc_2010_title', 'soc_2018_code', 'soc_2018_title']
             
-            df_soc_isco = pd.read_excel(CROSSWALK_SOC_ISCO, sheet_name='2010 SOC to ISCO-08', skiprows=7)
+            df_soc_isco = read_excel_cached(CROSSWALK_SOC_ISCO, sheet_name='2010 SOC to ISCO-08', skiprows=7)
             df_soc_isco.columns = ['soc_2010_code', 'soc_2010_title', 'part', 'isco_08_code', 'isco_08_title', 'comment']
             
             # Limpeza
@@ -215,7 +206,7 @@ def run_esco_crosswalk():
         df_merged['usage_volume'] = 1.0
         
     def agg_func(x):
-        return weighted_mean(x, df_merged.loc[x.index, 'usage_volume'])
+        return weighted_mean(x, df_merged.loc[x.index, 'usage_volume'], zero_weight='unweighted')
 
     agg_rules = {col: agg_func for col in cols_to_agg}
     agg_rules['usage_volume'] = 'sum'
@@ -9,6 +9,7 @@ ROOT_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from etapa3_crosswalk_onet_isco08.config.settings import *
+from reference_cache import read_excel_cached
 
 # Configuração de Logging
 logging.basicConfig(
@@ -24,12 +25,12 @@ logger = logging.getLogger(__name__)
 def read_cod_structure(path):
     """Lê a estrutura COD e retorna um mapeamento de códigos e denominações."""
     logger.info(f"Lendo estrutura COD de: {path}")
-    # Mesma lógica do Script 08 da Etapa 1
+    # Mesma lógica do Script 08 da Etapa 1 (e mesma entrada no cache de referência)
     try:
-        df_cod = pd.read_excel(path, sheet_name='Estrutura COD', engine='xlrd', header=1)
+        df_cod = read_excel_cached(path, sheet_name='Estrutura COD', engine='xlrd', header=1)
     except Exception as e:
         logger.warning(f"Erro com xlrd, tentando openpyxl: {e}")
-        df_cod = pd.read_excel(path, sheet_name='Estrutura COD', engine='openpyxl', header=1)
+        df_cod = read_excel_cached(path, sheet_name='Estrutura COD', engine='openpyxl', header=1)
     
     df_cod.columns = ['grande_grupo', 'subgrupo_principal', 'subgrupo', 'grupo_base', 'denominacao']
     
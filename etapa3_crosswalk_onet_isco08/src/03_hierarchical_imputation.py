@@ -9,6 +9,8 @@ ROOT_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from etapa3_crosswalk_onet_isco08.config.settings import *
+from weighted_stats import weighted_mean
+from occupation_crosswalk import HierarchicalCrosswalk
 
 # Configuração de Logging
 logging.basicConfig(
@@ -21,17 +23,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def weighted_mean(values, weights):
-    """Calcula a média ponderada segura."""
-    mask = ~(pd.isna(values) | pd.isna(weights))
-    if mask.sum() == 0:
-        return np.nan
-    v = values[mask]
-    w = weights[mask]
-    if w.sum() == 0:
-        return v.mean()
-    return np.average(v, weights=w)
-
 def run_hierarchical_imputation():
     """
     Realiza a imputação hierárquica para preencher lacunas nos índices ISCO-08/COD.
@@ -88,7 +79,7 @@ def run_hierarchical_imputation():
         for col in metrics_cols:
             if col in df_isco.columns:
                 # Usar lambda para aplicar weighted_mean
-                results[col] = grouped.apply(lambda x: weighted_mean(x[col], x['usage_volume']))
+                results[col] = grouped.apply(lambda x: weighted_mean(x[col], x['usage_volume'], zero_weight='unweighted'))
         return pd.DataFrame(results)
 
     logger.info("Calculando médias de grupos hierárquicos...")
@@ -106,45 +97,32 @@ def run_hierarchical_imputation():
     mask_missing = df['automation_index_cai'].isna()
     logger.info(f"Ocupações sem dados diretos: {mask_missing.sum()} ({mask_missing.mean():.1%})")
     
-    # Passo 2: Imputação Nível 3 Dígitos (Pai)
-    # Iterar sobre os missing e tentar buscar no avg_3d
-    logger.info("Executando imputação Nível 3 (Subgrupo)...")
-    
-    count_imp_3d = 0
-    for idx in df[mask_missing].index:
-        cod_3d = df.loc[idx, 'cod_3d']
-        
-        if cod_3d in avg_3d.index:
-            # Temos média para este grupo!
-            for col in metrics_cols:
-                if col in avg_3d.columns:
-                    df.loc[idx, col] = avg_3d.loc[cod_3d, col]
-            
-            df.loc[idx, 'imputation_method'] = 'hierarchical_3d_mean'
-            df.loc[idx, 'imputation_note'] = f'Media do subgrupo {cod_3d}'
-            count_imp_3d += 1
-            
+    # Passos 2 e 3: Imputação Nível 3 Dígitos (Pai) → Nível 2 Dígitos (Avô)
+    # Cada ocupação sem dados recebe todas as métricas do primeiro nível com
+    # automation_index_cai definido
+    logger.info("Executando imputação Nível 3 (Subgrupo) e Nível 2 (Grande Grupo)...")
+
+    crosswalk = HierarchicalCrosswalk([
+        ('hierarchical_3d_mean', 3, avg_3d),
+        ('hierarchical_2d_mean', 2, avg_2d),
+    ], key='automation_index_cai')
+    imputado = crosswalk.match(df.loc[mask_missing, 'cod_cod'], level_column='imputation_method')
+
+    if 'imputation_note' not in df.columns:
+        df['imputation_note'] = None
+    notas = {
+        'hierarchical_3d_mean': 'Media do subgrupo ' + df['cod_3d'],
+        'hierarchical_2d_mean': 'Media do grande grupo ' + df['cod_2d'],
+    }
+    for metodo, nota in notas.items():
+        idx = imputado.index[imputado['imputation_method'] == metodo]
+        df.loc[idx, crosswalk.columns] = imputado.loc[idx, crosswalk.columns]
+        df.loc[idx, 'imputation_method'] = metodo
+        df.loc[idx, 'imputation_note'] = nota[idx]
+
+    count_imp_3d = (imputado['imputation_method'] == 'hierarchical_3d_mean').sum()
+    count_imp_2d = (imputado['imputation_method'] == 'hierarchical_2d_mean').sum()
     logger.info(f"Imputados via Nível 3: {count_imp_3d}")
-    
-    # Atualizar máscara de missing
-    mask_missing = df['automation_index_cai'].isna()
-    
-    # Passo 3: Imputação Nível 2 Dígitos (Avô)
-    logger.info("Executando imputação Nível 2 (Grande Grupo)...")
-    
-    count_imp_2d = 0
-    for idx in df[mask_missing].index:
-        cod_2d = df.loc[idx, 'cod_2d']
-        
-        if cod_2d in avg_2d.index:
-            for col in metrics_cols:
-                if col in avg_2d.columns:
-                    df.loc[idx, col] = avg_2d.loc[cod_2d, col]
-            
-            df.loc[idx, 'imputation_method'] = 'hierarchical_2d_mean'
-            df.loc[idx, 'imputation_note'] = f'Media do grande grupo {cod_2d}'
-            count_imp_2d += 1
-            
     logger.info(f"Imputados via Nível 2: {count_imp_2d}")
     
     # Passo 4: Imputação de Zeros (Ocupações Elementares/Manuais sem dados)
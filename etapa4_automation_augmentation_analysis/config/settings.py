@@ -4,12 +4,12 @@ from pathlib import Path
 # Caminhos Base
 ROOT_DIR = Path(__file__).parent.parent.parent
 ETAPA4_DIR = ROOT_DIR / "etapa4_automation_augmentation_analysis"
-ETAPA1_DATA = ROOT_DIR / "etapa1_ia_generativa" / "data" / "processed"
+ETAPA1_OUTPUT = ROOT_DIR / "etapa1_ia_generativa" / "data" / "output"
 ETAPA3_DATA = ROOT_DIR / "etapa3_crosswalk_onet_isco08" / "outputs"
 ETAPA1_RAW = ROOT_DIR / "etapa1_ia_generativa" / "data" / "raw"
 
 # Inputs de Dados
-PNAD_ILO_MERGED = ETAPA1_DATA / "pnad_ilo_merged.csv"
+PNAD_ILO_MERGED = ETAPA1_OUTPUT / "pnad_ilo_merged.parquet"
 ANTHROPIC_INDICES = ETAPA3_DATA / "cod_automation_augmentation_index_final.csv"
 COD_STRUCTURE = ETAPA1_RAW / "Estrutura Ocupação COD.xls"
 
@@ -9,6 +9,9 @@ ROOT_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from etapa4_automation_augmentation_analysis.config.settings import *
+from etapa4_automation_augmentation_analysis.src.utils.cube import (
+    ANTHROPIC_CATEGORIES, CUBE_DIR, MERGED_PATH, load_anthropic_cube,
+)
 
 # Configuração de Logging
 logging.basicConfig(
@@ -32,8 +35,9 @@ def run_merge():
         return
     
     logger.info(f"Lendo PNAD+ILO de: {PNAD_ILO_MERGED}")
-    df_pnad = pd.read_csv(PNAD_ILO_MERGED)
-    df_pnad['cod_ocupacao'] = df_pnad['cod_ocupacao'].astype(str).str.zfill(4)
+    df_pnad = pd.read_parquet(PNAD_ILO_MERGED)
+    # Parquet tipado da etapa 1: cod_ocupacao já tem 4 dígitos (categórica)
+    df_pnad['cod_ocupacao'] = df_pnad['cod_ocupacao'].astype(str)
     logger.info(f"PNAD carregada: {len(df_pnad):,} linhas")
 
     # 2. Carregar Índices Anthropic (Etapa 3)
@@ -68,11 +72,17 @@ def run_merge():
     coverage = df_merged['automation_index_cai'].notna().mean()
     logger.info(f"Cobertura dos índices na PNAD: {coverage:.1%}")
 
-    # 5. Salvar Resultado Consolidado
-    output_path = DATA_PROCESSED / "pnad_anthropic_merged.csv"
-    df_merged.to_csv(output_path, index=False)
-    logger.info(f"Base consolidada salva em: {output_path}")
+    # 5. Salvar Resultado Consolidado (Parquet; tipos da etapa 1 preservados)
+    df_merged = df_merged.astype({c: 'category' for c in ANTHROPIC_CATEGORIES})
+    df_merged.to_parquet(MERGED_PATH, index=False)
+    logger.info(f"Base consolidada salva em: {MERGED_PATH}")
     logger.info(f"Colunas finais: {df_merged.columns.tolist()}")
 
+    # 6. Cubo de agregação usado pelos scripts 02, 04 e 05
+    cube = load_anthropic_cube(rebuild=True)
+    for name, cells in cube.items():
+        logger.info(f"Cubo {name}: {len(cells):,} células")
+    logger.info(f"Cubo salvo em: {CUBE_DIR}")
+
 if __name__ == "__main__":
     run_merge()
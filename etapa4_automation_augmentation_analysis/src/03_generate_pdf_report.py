@@ -12,7 +12,7 @@ ROOT_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from etapa4_automation_augmentation_analysis.config.settings import *
-from etapa4_automation_augmentation_analysis.src.utils.weighted_stats import weighted_mean
+from weighted_stats import weighted_mean
 
 # Configuração de Logging
 logging.basicConfig(
@@ -11,7 +11,8 @@ ROOT_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from etapa4_automation_augmentation_analysis.config.settings import *
-from etapa4_automation_augmentation_analysis.src.utils.weighted_stats import weighted_mean
+from etapa4_automation_augmentation_analysis.src.utils.cube import MERGED_PATH, load_anthropic_cube
+from weighted_stats import cube_stats
 
 # Configuração de Logging
 logging.basicConfig(
@@ -28,21 +29,18 @@ logger = logging.getLogger(__name__)
 sns.set_theme(style="whitegrid")
 plt.rcParams['figure.dpi'] = 300
 
-def plot_automation_augmentation_distribution(df):
+def plot_automation_augmentation_distribution(cube):
     """Cria gráfico de barras mostrando a dualidade por Grande Grupo."""
     logger.info("Plotando distribuição por Grande Grupo...")
     
     # Criar coluna de nome do grupo
-    df['grande_grupo_nome'] = df['cod_ocupacao'].astype(str).str[0].map(GRANDES_GRUPOS)
+    cells = cube['ocupacao']
+    cells['grande_grupo_nome'] = cells['cod_ocupacao'].astype(str).str[0].map(GRANDES_GRUPOS)
     
     # Calcular médias ponderadas
-    def agg_weighted(x):
-        return weighted_mean(x, df.loc[x.index, 'peso'])
-
-    summary = df.groupby('grande_grupo_nome').agg({
-        'automation_share_cai': agg_weighted,
-        'augmentation_share_cai': agg_weighted
-    }).reset_index()
+    summary = cube_stats(
+        cells, 'grande_grupo_nome', ['automation_share_cai', 'augmentation_share_cai']
+    ).xs('mean', axis=1, level=1).reset_index()
     
     # Derreter para formato long para o seaborn
     plot_df = summary.melt(id_vars='grande_grupo_nome', 
@@ -64,19 +62,17 @@ def plot_automation_augmentation_distribution(df):
     plt.savefig(OUTPUTS_FIGURES / "distribuicao_ia_grande_grupo.png")
     plt.close()
 
-def plot_salary_vs_ia(df):
+def plot_salary_vs_ia(cube):
     """Scatterplot de Salário vs. Automation Index."""
     logger.info("Plotando Salário vs. Impacto IA...")
     
     # Agrupar por ocupação para não poluir o scatterplot individual
-    def agg_weighted(x):
-        return weighted_mean(x, df.loc[x.index, 'peso'])
-
-    occ_df = df.groupby('cod_ocupacao').agg({
-        'automation_index_cai': agg_weighted,
-        'rendimento_todos': agg_weighted,
-        'peso': 'sum'
-    }).reset_index()
+    cells = cube['ocupacao']
+    occ_df = cube_stats(
+        cells, 'cod_ocupacao', ['automation_index_cai', 'rendimento_todos']
+    ).xs('mean', axis=1, level=1).join(
+        cells.groupby('cod_ocupacao')['peso'].sum()
+    ).reset_index()
     
     # Filtrar rendimentos muito baixos ou NaNs
     occ_df = occ_df[occ_df['rendimento_todos'] > 0]
@@ -98,16 +94,13 @@ def plot_salary_vs_ia(df):
     plt.savefig(OUTPUTS_FIGURES / "salario_vs_ia_index.png")
     plt.close()
 
-def plot_regional_impact(df):
+def plot_regional_impact(cube):
     """Mapa de calor regional do impacto IA."""
     logger.info("Plotando impacto regional...")
     
-    def agg_weighted(x):
-        return weighted_mean(x, df.loc[x.index, 'peso'])
-
-    regiao_df = df.groupby('regiao').agg({
-        'automation_index_cai': agg_weighted
-    }).sort_values('automation_index_cai').reset_index()
+    regiao_df = cube_stats(
+        cube['ocupacao'], 'regiao', 'automation_index_cai'
+    ).xs('mean', axis=1, level=1).sort_values('automation_index_cai').reset_index()
 
     plt.figure(figsize=(10, 6))
     sns.barplot(data=regiao_df, x='automation_index_cai', y='regiao', palette='coolwarm')
@@ -121,16 +114,15 @@ def plot_regional_impact(df):
 
 def run_figures():
     """Gera todos os gráficos da Etapa 4."""
-    merged_path = DATA_PROCESSED / "pnad_anthropic_merged.csv"
-    if not merged_path.exists():
-        logger.error(f"Base consolidada não encontrada: {merged_path}")
+    if not MERGED_PATH.exists():
+        logger.error(f"Base consolidada não encontrada: {MERGED_PATH}")
         return
     
-    df = pd.read_csv(merged_path)
+    cube = load_anthropic_cube()
     
-    plot_automation_augmentation_distribution(df)
-    plot_salary_vs_ia(df)
-    plot_regional_impact(df)
+    plot_automation_augmentation_distribution(cube)
+    plot_salary_vs_ia(cube)
+    plot_regional_impact(cube)
     
     logger.info("Gráficos gerados com sucesso!")
 
@@ -12,7 +12,8 @@ ROOT_DIR = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from etapa4_automation_augmentation_analysis.config.settings import *
-from etapa4_automation_augmentation_analysis.src.utils.weighted_stats import *
+from etapa4_automation_augmentation_analysis.src.utils.cube import load_anthropic_cube
+from weighted_stats import *
 
 # Configuração de Logging
 logging.basicConfig(
@@ -33,48 +34,28 @@ plt.rcParams['axes.labelsize'] = 12
 sns.set_style("whitegrid")
 
 def load_data():
-    """Carrega base consolidada da Etapa 4"""
-    path = DATA_PROCESSED / "pnad_anthropic_merged.csv"
-    df = pd.read_csv(path)
-    logger.info(f"Dados carregados: {len(df):,} observações")
-    return df
+    """Carrega o cubo de agregação da base consolidada da Etapa 4"""
+    cube = load_anthropic_cube()
+    logger.info(f"Cubo carregado: {int(cube['perfil']['n'].sum()):,} observações")
+    return cube
 
-def define_impact_categories(df):
-    """
-    Define categorias de impacto (bins) para o Automation Index.
-    - Alto Aprimoramento: < -0.3
-    - Aprimoramento: -0.3 a -0.05
-    - Neutro: -0.05 a 0.05
-    - Automação: 0.05 a 0.3
-    - Alta Automação: > 0.3
-    """
-    def classify(val):
-        if pd.isna(val): return 'Sem Dados'
-        if val < -0.3: return 'Alto Aprimoramento'
-        if val < -0.05: return 'Aprimoramento'
-        if val < 0.05: return 'Neutro'
-        if val < 0.3: return 'Automação'
-        return 'Alta Automação'
-    
-    df['ia_impact_category'] = df['automation_index_cai'].apply(classify)
-    return df
-
-def figure1_distribuicao_ia(df):
+def figure1_distribuicao_ia(cube):
     """FIGURA 1: Distribuição do Impacto IA (Claude.ai)"""
     logger.info("\n=== FIGURA 1: Distribuição do Impacto IA ===")
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
     
-    # Painel A: Histograma ponderado
+    # Painel A: Histograma ponderado (uma célula por valor do índice)
+    dist = cube['dist_automacao']
     ax1.hist(
-        df['automation_index_cai'].dropna(),
-        weights=df.loc[df['automation_index_cai'].notna(), 'peso'] / 1e6,
+        dist['automation_index_cai'].dropna(),
+        weights=dist.loc[dist['automation_index_cai'].notna(), 'peso'] / 1e6,
         bins=40,
         edgecolor='black',
         alpha=0.7,
         color='teal'
     )
-    media = weighted_mean(df['automation_index_cai'], df['peso'])
+    media = cube_stats(cube['perfil'], None, 'automation_index_cai').iloc[0, 0]
     ax1.axvline(media, color='red', linestyle='--', linewidth=2, label=f'Média: {media:.2f}')
     ax1.axvline(0, color='black', linewidth=1)
     ax1.set_xlabel('Automation Index (Claude.ai)')
@@ -85,8 +66,8 @@ def figure1_distribuicao_ia(df):
     # Painel B: Dominância por plataforma
     # Comparar Claude.ai vs 1P API (dominant mode)
     # Agrupar por dominante e somar pesos
-    cai_dom = df.groupby('dominant_mode_cai')['peso'].sum() / 1e6
-    api_dom = df.groupby('dominant_mode_api')['peso'].sum() / 1e6
+    cai_dom = dist.groupby('dominant_mode_cai')['peso'].sum() / 1e6
+    api_dom = dist.groupby('dominant_mode_api')['peso'].sum() / 1e6
     
     dom_df = pd.DataFrame({
         'Claude.ai': cai_dom,
@@ -106,18 +87,15 @@ def figure1_distribuicao_ia(df):
         fig.savefig(OUTPUTS_FIGURES / f'fig1_distribuicao_ia.{ext}', dpi=300, bbox_inches='tight')
     plt.close()
 
-def figure2_heatmaps_setor_regiao(df):
+def figure2_heatmaps_setor_regiao(cube):
     """FIGURA 2: Heatmaps Regionais e Setoriais"""
     logger.info("\n=== FIGURA 2: Heatmaps Regionais e Setoriais ===")
     
-    def calc_weighted_mean_auto(group):
-        return weighted_mean(group['automation_index_cai'], group['peso'])
-    
-    def calc_weighted_mean_aug(group):
-        return weighted_mean(group['augmentation_share_cai'], group['peso'])
-
-    pivot_auto = df.groupby(['regiao', 'setor_agregado']).apply(calc_weighted_mean_auto, include_groups=False).unstack()
-    pivot_aug = df.groupby(['regiao', 'setor_agregado']).apply(calc_weighted_mean_aug, include_groups=False).unstack()
+    means = cube_stats(
+        cube['ocupacao'], ['regiao', 'setor_agregado'], ['automation_index_cai', 'augmentation_share_cai']
+    )
+    pivot_auto = means[('automation_index_cai', 'mean')].unstack()
+    pivot_aug = means[('augmentation_share_cai', 'mean')].unstack()
     
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 16))
     
@@ -136,31 +114,34 @@ def figure2_heatmaps_setor_regiao(df):
         fig.savefig(OUTPUTS_FIGURES / f'fig2_heatmaps_ia.{ext}', dpi=300, bbox_inches='tight')
     plt.close()
 
-def figure3_renda_decil_ia(df):
+def figure3_renda_decil_ia(cube):
     """FIGURA 3: Rendimento Médio por Decil de Impacto IA"""
     logger.info("\n=== FIGURA 3: Renda por Decil de IA ===")
     
     # Criar decit de Automation Index
-    df_valid = df[df['automation_index_cai'].notna()].copy()
+    df_valid = cube['dist_automacao']
+    df_valid = df_valid[df_valid['automation_index_cai'].notna()].copy()
+    
+    # Decis por contagem de observações (não ponderados), como pd.qcut nos
+    # microdados: os cortes saem dos valores repetidos pelo nº de linhas
+    valores = pd.Series(np.repeat(df_valid['automation_index_cai'].to_numpy(),
+                                  df_valid['n'].to_numpy()))
     
     # Usar qcut com tratamento para duplicatas e rótulos
     try:
         # Tentar criar 10 decis
-        res, bins = pd.qcut(df_valid['automation_index_cai'], 10, retbins=True, duplicates='drop')
+        res, bins = pd.qcut(valores, 10, retbins=True, duplicates='drop')
         n_bins = len(bins) - 1
         labels = [f'D{i}' for i in range(1, n_bins + 1)]
-        df_valid['decil_auto'] = pd.qcut(df_valid['automation_index_cai'], 10, labels=labels, duplicates='drop')
+        df_valid['decil_auto'] = pd.cut(df_valid['automation_index_cai'], bins, labels=labels, include_lowest=True)
     except Exception as e:
         logger.warning(f"Erro ao criar decis: {e}. Usando quartis como fallback.")
-        res, bins = pd.qcut(df_valid['automation_index_cai'], 4, retbins=True, duplicates='drop')
+        res, bins = pd.qcut(valores, 4, retbins=True, duplicates='drop')
         n_bins = len(bins) - 1
         labels = [f'Q{i}' for i in range(1, n_bins + 1)]
-        df_valid['decil_auto'] = pd.qcut(df_valid['automation_index_cai'], 4, labels=labels, duplicates='drop')
+        df_valid['decil_auto'] = pd.cut(df_valid['automation_index_cai'], bins, labels=labels, include_lowest=True)
     
-    renda_decil = df_valid.groupby('decil_auto', observed=True).apply(
-        lambda x: weighted_mean(x['rendimento_todos'], x['peso']),
-        include_groups=False
-    )
+    renda_decil = cube_stats(df_valid, 'decil_auto', 'rendimento_todos')[('rendimento_todos', 'mean')]
     
     fig, ax = plt.subplots(figsize=(10, 6))
     sns.barplot(x=renda_decil.index, y=renda_decil.values, color='steelblue', edgecolor='black', alpha=0.8, ax=ax)
@@ -181,13 +162,14 @@ def figure3_renda_decil_ia(df):
         fig.savefig(OUTPUTS_FIGURES / f'fig3_renda_decil_ia.{ext}', dpi=300, bbox_inches='tight')
     plt.close()
 
-def figure4_decomposicao_demografica_ia(df):
+def figure4_decomposicao_demografica_ia(cube):
     """FIGURA 4: Decomposição Demográfica por Categoria de Impacto"""
     logger.info("\n=== FIGURA 4: Decomposição Demográfica IA ===")
     
-    df = define_impact_categories(df)
+    # Categorias de define_impact_categories já são dimensão do cuboide
+    cells = cube['perfil']
     cat_order = ['Alto Aprimoramento', 'Aprimoramento', 'Neutro', 'Automação', 'Alta Automação']
-    df_subset = df[df['ia_impact_category'] != 'Sem Dados'].copy()
+    df_subset = cells[cells['ia_impact_category'] != 'Sem Dados'].copy()
     
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
     
@@ -231,16 +213,17 @@ def figure4_decomposicao_demografica_ia(df):
         fig.savefig(OUTPUTS_FIGURES / f'fig4_decomposicao_ia.{ext}', dpi=300, bbox_inches='tight')
     plt.close()
 
-def figure5_comparativo_ilo_anthropic(df):
+def figure5_comparativo_ilo_anthropic(cube):
     """FIGURA 5: Anthropic vs ILO (Validação)"""
     logger.info("\n=== FIGURA 5: Anthropic vs ILO ===")
     
     # Agrupar por ocupação para scatterplot
-    occ_df = df.groupby('cod_ocupacao').agg({
-        'automation_index_cai': lambda x: weighted_mean(x, df.loc[x.index, 'peso']),
-        'exposure_score': lambda x: weighted_mean(x, df.loc[x.index, 'peso']),
-        'peso': 'sum'
-    }).dropna().reset_index()
+    cells = cube['ocupacao']
+    occ_df = cube_stats(
+        cells, 'cod_ocupacao', ['automation_index_cai', 'exposure_score']
+    ).xs('mean', axis=1, level=1).join(
+        cells.groupby('cod_ocupacao')['peso'].sum()
+    ).dropna().reset_index()
     
     plt.figure(figsize=(10, 8))
     sns.scatterplot(data=occ_df, x='exposure_score', y='automation_index_cai', size='peso', sizes=(20, 500), alpha=0.5, color='purple')
@@ -265,13 +248,13 @@ def main():
     logger.info("GERAÇÃO DE VISUALIZAÇÕES AVANÇADAS - ETAPA 4")
     logger.info("=" * 60)
     
-    df = load_data()
+    cube = load_data()
     
-    figure1_distribuicao_ia(df)
-    figure2_heatmaps_setor_regiao(df)
-    figure3_renda_decil_ia(df)
-    figure4_decomposicao_demografica_ia(df)
-    figure5_comparativo_ilo_anthropic(df)
+    figure1_distribuicao_ia(cube)
+    figure2_heatmaps_setor_regiao(cube)
+    figure3_renda_decil_ia(cube)
+    figure4_decomposicao_demografica_ia(cube)
+    figure5_comparativo_ilo_anthropic(cube)
     
     logger.info("\n" + "=" * 60)
     logger.info("✓ VISUALIZAÇÕES GERADAS COM SUCESSO!")
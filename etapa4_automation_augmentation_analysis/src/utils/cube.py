@@ -0,0 +1,97 @@
+"""
+Cubo de agregação PNAD × índices Anthropic (etapa 4)
+
+Tabelas (02), figuras (04) e visualizações avançadas (05) agregam a base
+pnad_anthropic_merged.parquet pelas mesmas dimensões. O cubo materializa as
+somas aditivas (ver weighted_stats.cube) em três cuboides, gravados em
+data/processed/cubo/:
+
+    ocupacao         ocupação COD (+ método de imputação) × região × setor
+    perfil           sexo × raça × instrução × formal × categoria de impacto
+    dist_automacao   automation_index_cai × modo dominante (Claude.ai, API)
+                     (histograma, decis de automação)
+"""
+
+import logging
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from etapa4_automation_augmentation_analysis.config.settings import DATA_PROCESSED
+from weighted_stats import build_cube, load_cube, save_cube
+
+logger = logging.getLogger(__name__)
+
+CUBE_DIR = DATA_PROCESSED / "cubo"
+MERGED_PATH = DATA_PROCESSED / "pnad_anthropic_merged.parquet"
+
+# Colunas textuais dos índices Anthropic gravadas como categóricas; as da
+# etapa 1 chegam tipadas de pnad_ilo_merged.parquet
+ANTHROPIC_CATEGORIES = [
+    'cod_ocupacao', 'dominant_mode_cai', 'dominant_mode_api',
+    'imputation_method', 'imputation_note',
+]
+
+# Colunas de valores materializadas (as ausentes na base são ignoradas)
+CUBE_VALUES = [
+    'automation_index_cai', 'automation_share_cai', 'augmentation_share_cai',
+    'exposure_score', 'rendimento_todos', 'rendimento_habitual', 'horas_habituais',
+]
+
+CUBOIDS = {
+    'ocupacao': (['cod_ocupacao', 'imputation_method', 'regiao', 'setor_agregado'], CUBE_VALUES),
+    'perfil': (['sexo_texto', 'raca_agregada', 'nivel_instrucao', 'formal',
+                'ia_impact_category'], CUBE_VALUES),
+    'dist_automacao': (['automation_index_cai', 'dominant_mode_cai', 'dominant_mode_api'],
+                       ['rendimento_todos']),
+}
+
+
+def define_impact_categories(df):
+    """
+    Define categorias de impacto (bins) para o Automation Index.
+    - Alto Aprimoramento: < -0.3
+    - Aprimoramento: -0.3 a -0.05
+    - Neutro: -0.05 a 0.05
+    - Automação: 0.05 a 0.3
+    - Alta Automação: > 0.3
+    """
+    def classify(val):
+        if pd.isna(val): return 'Sem Dados'
+        if val < -0.3: return 'Alto Aprimoramento'
+        if val < -0.05: return 'Aprimoramento'
+        if val < 0.05: return 'Neutro'
+        if val < 0.3: return 'Automação'
+        return 'Alta Automação'
+
+    df['ia_impact_category'] = df['automation_index_cai'].apply(classify)
+    return df
+
+
+def build_anthropic_cube(df):
+    """Constrói os cuboides de CUBOIDS a partir da base consolidada."""
+    df = define_impact_categories(df)
+    return {
+        name: build_cube(df, dims, [c for c in values if c in df.columns])
+        for name, (dims, values) in CUBOIDS.items()
+    }
+
+
+def load_anthropic_cube(rebuild=False):
+    """Lê o cubo; reconstrói a partir de pnad_anthropic_merged.parquet se
+    estiver ausente, incompleto ou mais antigo que a base consolidada (lendo
+    só as colunas usadas)."""
+    paths = [CUBE_DIR / f"{name}.parquet" for name in CUBOIDS]
+    if not rebuild and all(p.exists() for p in paths):
+        if (not MERGED_PATH.exists()
+                or min(p.stat().st_mtime for p in paths) >= MERGED_PATH.stat().st_mtime):
+            return load_cube(CUBE_DIR)
+
+    logger.info(f"Construindo cubo a partir de {MERGED_PATH.name}...")
+    needed = {'peso'}
+    for dims, values in CUBOIDS.values():
+        needed.update(dims, values)
+    columns = [c for c in pq.read_schema(MERGED_PATH).names if c in needed]
+    cube = build_anthropic_cube(pd.read_parquet(MERGED_PATH, columns=columns))
+    save_cube(cube, CUBE_DIR)
+    return cube
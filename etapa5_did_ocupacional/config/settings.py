@@ -18,11 +18,24 @@ OUTPUTS_LOGS = ROOT_DIR / "outputs" / "logs"
 for dir_path in [DATA_RAW, DATA_PROCESSED, DATA_EXTERNAL, OUTPUTS_TABLES, OUTPUTS_FIGURES, OUTPUTS_LOGS]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
+# Painel em datasets Parquet particionados por ano=/trimestre= (ver utils/panel_io.py)
+PANEL_RAW = DATA_RAW / "pnad_panel_raw"  # um download por trimestre + _manifest.json
+PANEL_CLEAN = DATA_PROCESSED / "pnad_panel_clean"
+PANEL_VARIABLES = DATA_PROCESSED / "pnad_panel_variables"
+PANEL_EXPOSURE = DATA_PROCESSED / "pnad_panel_exposure"
+PANEL_DID_READY = DATA_PROCESSED / "pnad_panel_did_ready"
+
+# Cache de médias/EPs por (periodo × tratamento × outcome) — ver utils/trends.py
+TREND_SERIES_PATH = DATA_PROCESSED / "trend_series.parquet"
+
 # ============================================
 # GOOGLE CLOUD
 # ============================================
 GCP_PROJECT_ID = "mestrado-pnad-2026"
 
+# Consultas simultâneas no download por trimestre (script 01)
+DOWNLOAD_WORKERS = 4
+
 # ============================================
 # DID TEMPORAL CONFIGURATION
 # ============================================
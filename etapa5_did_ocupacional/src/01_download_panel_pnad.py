@@ -6,23 +6,48 @@ Este script baixa 16 trimestres de dados da PNAD Contínua (2021Q1 a 2024Q4)
 para análise Difference-in-Differences do impacto da IA Generativa no mercado
 de trabalho brasileiro.
 
-Entrada: Query BigQuery
-Saída: data/raw/pnad_panel_2021q1_2024q4.parquet
+Entrada: Query BigQuery (uma por trimestre)
+Saída: data/raw/pnad_panel_raw/ (particionado por ano=/trimestre=, com _manifest.json)
 Dependências: basedosdados, config/settings.py
+
+Cada trimestre é uma consulta própria, executada em paralelo
+(DOWNLOAD_WORKERS simultâneas) e gravada direto na sua partição. O
+_manifest.json registra os trimestres concluídos: uma execução interrompida
+ou com falha retoma só os que faltam, e ampliar QUARTERS (ex.: até 2025)
+baixa só os trimestres novos. Mudar a query ou PANEL_SCHEMA invalida o
+manifesto. Cada partição é gravada nos tipos de PANEL_SCHEMA (códigos como
+dicionário), iguais em todos os trimestres.
+
+Uso:
+    python src/01_download_panel_pnad.py                 # baixa o que falta
+    python src/01_download_panel_pnad.py --workers 8     # mais consultas simultâneas
+    python src/01_download_panel_pnad.py --refazer       # ignora o manifesto
+    python src/01_download_panel_pnad.py --reauth
+
+Com QUERY_BACKEND=duckdb a query roda no armazém local de Parquet
+(python -m query_backend sintetico, na raiz do repositório), sem BigQuery.
 """
 
+import hashlib
+import json
 import logging
-import basedosdados as bd
+import os
 import pandas as pd
+import pyarrow as pa
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
-from tqdm import tqdm
 
 # Adicionar diretório raiz ao path
 ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
+from utils.panel_io import PARTITION_COLS
+from utils.parquet_storage import ParquetStats, write_parquet
+from utils.query_backend import get_backend, read_sql
+from utils.schema import PANEL_SCHEMA, apply_schema
 
 # Setup logging
 logging.basicConfig(
@@ -35,137 +60,272 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MANIFEST_PATH = PANEL_RAW / "_manifest.json"
+
+CRITICAL_VARS = ['cod_ocupacao', 'idade', 'sexo', 'peso']
+
+QUERY_TEMPLATE = """
+SELECT
+    ano,
+    trimestre,
+    sigla_uf,
+    v2007 AS sexo,
+    v2009 AS idade,
+    v2010 AS raca,
+    vd3004 AS nivel_instrucao,
+    vd3005 AS anos_estudo,
+    v4010 AS cod_ocupacao,
+    vd4002 AS condicao_ocupacao,
+    vd4008 AS posicao_ocupacao,
+    vd4009 AS tipo_vinculo,
+    vd4016 AS rendimento_habitual,
+    vd4035 AS horas_trabalhadas,
+    v1028 AS peso
+FROM `basedosdados.br_ibge_pnadc.microdados`
+WHERE ano = {ano}
+  AND trimestre = {trimestre}
+  AND v2009 >= 18 AND v2009 <= 65  -- Idade trabalhadora
+  AND v4010 IS NOT NULL             -- Código de ocupação válido
+"""
+
+# Identifica a query e os tipos gravados no manifesto: partições baixadas com
+# outra query ou outro PANEL_SCHEMA são refeitas
+QUERY_FINGERPRINT = hashlib.sha256(
+    (QUERY_TEMPLATE + repr(sorted(PANEL_SCHEMA.items()))).encode()
+).hexdigest()[:12]
+
+
+def quarter_key(ano, tri):
+    return f"{ano}Q{tri}"
+
+
+def partition_path(ano, tri):
+    return PANEL_RAW / f"ano={ano}" / f"trimestre={tri}" / "part-0.parquet"
+
 
-def download_all_quarters(reauth=False, save_individual=True):
+def load_manifest(force=False):
     """
-    Baixa todos os 16 trimestres (2021Q1-2024Q4) em uma única query do BigQuery.
+    Lê o manifesto de trimestres baixados.
+
+    Entradas de outra query (QUERY_FINGERPRINT) ou cuja partição não existe
+    mais são descartadas; force=True descarta todas.
+    """
+
+    empty = {'query': QUERY_FINGERPRINT, 'trimestres': {}}
+    if force or not MANIFEST_PATH.exists():
+        return empty
+
+    manifest = json.loads(MANIFEST_PATH.read_text())
+    if manifest.get('query') != QUERY_FINGERPRINT:
+        logger.info("Query mudou desde o último download: todos os trimestres serão refeitos")
+        return empty
+
+    manifest['trimestres'] = {
+        key: entry for key, entry in manifest['trimestres'].items()
+        if partition_path(entry['ano'], entry['trimestre']).exists()
+    }
+    return manifest
+
+
+def save_manifest(manifest):
+    """Grava o manifesto de forma atômica (arquivo temporário + rename)."""
+    tmp = MANIFEST_PATH.with_name('.' + MANIFEST_PATH.name + '.tmp')
+    tmp.write_text(json.dumps(manifest, indent=2, ensure_ascii=False))
+    os.replace(tmp, MANIFEST_PATH)
+
+
+def quarter_table(df):
+    """
+    Trimestre baixado → tabela Arrow nos tipos de PANEL_SCHEMA.
+
+    Os tipos vêm do esquema, não dos valores do trimestre: uma coluna toda
+    nula em um trimestre tem o mesmo tipo que nos demais, e as partições
+    são lidas em conjunto. ano/trimestre ficam só no caminho da partição.
+    """
+
+    table = pa.Table.from_pandas(apply_schema(df.drop(columns=PARTITION_COLS)),
+                                 preserve_index=False)
+    # Código todo nulo: category sem categorias sairia como dicionário de null
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type) and pa.types.is_null(field.type.value_type):
+            tipo = pa.dictionary(field.type.index_type, pa.string())
+            table = table.set_column(i, pa.field(field.name, tipo), pa.nulls(len(table), tipo))
+    return table
+
+
+def download_quarter(ano, tri, reauth=False):
+    """
+    Baixa um trimestre e grava sua partição (ano=/trimestre=/part-0.parquet).
+
+    A gravação é atômica: uma interrupção não deixa partição pela metade.
+
+    Retorna:
+    --------
+    dict : entrada do manifesto (contagens usadas em validate_download)
+    """
+
+    query = QUERY_TEMPLATE.format(ano=int(ano), trimestre=int(tri))
+    df = read_sql(query, billing_project_id=GCP_PROJECT_ID, reauth=reauth)
+
+    path = write_parquet(quarter_table(df), partition_path(ano, tri))
+
+    return {
+        'ano': int(ano),
+        'trimestre': int(tri),
+        'n_obs': int(len(df)),
+        'populacao': float(df['peso'].sum()),
+        'ufs': sorted(df['sigla_uf'].dropna().unique().tolist()),
+        'missing': {var: int(df[var].isna().sum()) for var in CRITICAL_VARS},
+        'arquivo': str(path.relative_to(PANEL_RAW)),
+        'baixado_em': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def download_all_quarters(reauth=False, workers=DOWNLOAD_WORKERS, force=False, quarters=QUARTERS):
+    """
+    Baixa os trimestres do painel que ainda não estão no manifesto.
 
     Parâmetros:
     -----------
     reauth : bool
-        Se True, força reautenticação com Google Cloud
-    save_individual : bool
-        Se True, salva arquivos parquet individuais por trimestre (além do painel completo)
+        Se True, força reautenticação com Google Cloud (feita na primeira
+        consulta, antes de abrir as demais em paralelo)
+    workers : int
+        Número máximo de consultas simultâneas
+    force : bool
+        Se True, ignora o manifesto e baixa todos os trimestres de novo
+    quarters : list of (ano, trimestre)
+        Trimestres do painel (padrão: QUARTERS de config/settings.py)
 
     Retorna:
     --------
-    DataFrame : Dados do painel completo
+    dict : manifesto com todos os trimestres baixados
     """
 
+    first, last = quarter_key(*quarters[0]), quarter_key(*quarters[-1])
     logger.info("="*70)
-    logger.info("DOWNLOAD DE PAINEL PNAD CONTÍNUA (2021Q1 - 2024Q4)")
+    logger.info(f"DOWNLOAD DE PAINEL PNAD CONTÍNUA ({first} - {last})")
     logger.info("="*70)
-    logger.info(f"Projeto GCP: {GCP_PROJECT_ID}")
-    logger.info(f"Total de trimestres: {len(QUARTERS)}")
-    logger.info(f"Período: 2021Q1 a 2024Q4 (pré e pós ChatGPT)")
+    logger.info(f"Projeto GCP: {GCP_PROJECT_ID} (backend de consultas: {get_backend()})")
+    logger.info(f"Total de trimestres: {len(quarters)}")
+    logger.info(f"Destino: {PANEL_RAW}")
     logger.info("")
 
-    # Construir query única para todos os trimestres
-    query = """
-    SELECT
-        ano,
-        trimestre,
-        sigla_uf,
-        v2007 AS sexo,
-        v2009 AS idade,
-        v2010 AS raca,
-        vd3004 AS nivel_instrucao,
-        vd3005 AS anos_estudo,
-        v4010 AS cod_ocupacao,
-        vd4002 AS condicao_ocupacao,
-        vd4008 AS posicao_ocupacao,
-        vd4009 AS tipo_vinculo,
-        vd4016 AS rendimento_habitual,
-        vd4035 AS horas_trabalhadas,
-        v1028 AS peso
-    FROM `basedosdados.br_ibge_pnadc.microdados`
-    WHERE ano BETWEEN 2021 AND 2024
-      AND v2009 >= 18 AND v2009 <= 65  -- Idade trabalhadora
-      AND v4010 IS NOT NULL             -- Código de ocupação válido
-    ORDER BY ano, trimestre
-    """
-
-    logger.info("Executando query no BigQuery...")
-    logger.info("⏳ Isso pode demorar 3-7 minutos para ~70-80M observações, aguarde...")
+    PANEL_RAW.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(force=force)
+    pending = [(ano, tri) for ano, tri in quarters
+               if quarter_key(ano, tri) not in manifest['trimestres']]
 
-    try:
-        df = bd.read_sql(query, billing_project_id=GCP_PROJECT_ID, reauth=reauth)
-        logger.info(f"✓ Download concluído: {len(df):,} observações")
-    except Exception as e:
-        logger.error(f"Erro no download: {e}")
-        logger.error("Dica: Se erro de autenticação, execute com --reauth")
-        raise
-
-    # Validação básica
-    logger.info("")
-    logger.info("Validando download...")
-    validate_download(df)
-
-    # Salvar painel completo
-    output_path = DATA_RAW / "pnad_panel_2021q1_2024q4.parquet"
-    logger.info(f"Salvando painel completo em: {output_path}")
-    df.to_parquet(output_path, index=False)
-
-    # Salvar trimestres individuais (opcional, para debug)
-    if save_individual:
-        logger.info("Salvando trimestres individuais...")
-        for (ano, tri) in tqdm(QUARTERS, desc="Salvando arquivos"):
-            df_quarter = df[(df['ano'] == ano) & (df['trimestre'] == tri)]
-            if len(df_quarter) > 0:
-                quarter_path = DATA_RAW / f"pnad_{ano}q{tri}.parquet"
-                df_quarter.to_parquet(quarter_path, index=False)
-
-    logger.info("")
-    logger.info("="*70)
-    logger.info("DOWNLOAD CONCLUÍDO COM SUCESSO")
-    logger.info("="*70)
+    logger.info(f"Já baixados (manifesto): {len(quarters) - len(pending)}")
+    logger.info(f"A baixar: {len(pending)} trimestres, até {workers} em paralelo")
+    if not pending:
+        return manifest
 
-    return df
+    failures = {}
 
+    def record(ano, tri, entry):
+        manifest['trimestres'][quarter_key(ano, tri)] = entry
+        save_manifest(manifest)
+        done = sum(quarter_key(*q) in manifest['trimestres'] for q in quarters)
+        logger.info(f"  ✓ {quarter_key(ano, tri)}: {entry['n_obs']:,} observações "
+                    f"[{done}/{len(quarters)}]")
 
-def validate_download(df):
+    # Com reauth, a autenticação acontece numa consulta só
+    if reauth:
+        ano, tri = pending.pop(0)
+        try:
+            record(ano, tri, download_quarter(ano, tri, reauth=True))
+        except Exception as e:
+            logger.error(f"Erro no download de {quarter_key(ano, tri)}: {e}")
+            raise
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(download_quarter, ano, tri): (ano, tri) for ano, tri in pending}
+        for future in as_completed(futures):
+            ano, tri = futures[future]
+            try:
+                record(ano, tri, future.result())
+            except Exception as e:
+                failures[quarter_key(ano, tri)] = e
+                logger.error(f"  ✗ {quarter_key(ano, tri)}: {e}")
+
+    if failures:
+        logger.error("")
+        logger.error(f"{len(failures)} trimestre(s) falharam: {sorted(failures)}")
+        logger.error("Execute o script de novo para baixar só os que faltam "
+                     "(dica: se erro de autenticação, use --reauth)")
+        raise RuntimeError(f"Download incompleto: {sorted(failures)}")
+
+    return manifest
+
+
+def validate_download(manifest, quarters=QUARTERS):
     """
-    Valida qualidade do download.
+    Valida qualidade do download a partir das contagens do manifesto.
+
+    As partições em disco são conferidas com o manifesto pelos rodapés
+    Parquet (linhas e colunas, sem ler os dados).
 
     Verificações:
-    - Todos os 16 trimestres presentes
+    - Todos os trimestres presentes
+    - Partições em disco com as linhas do manifesto e as variáveis críticas
     - Mínimo de observações por trimestre
     - Todas as 27 UFs presentes
     - População representada razoável
     """
 
-    # Verificar trimestres presentes
-    quarters_present = df.groupby(['ano', 'trimestre']).size()
-    n_quarters = len(quarters_present)
+    entries = [manifest['trimestres'][quarter_key(ano, tri)] for ano, tri in quarters
+               if quarter_key(ano, tri) in manifest['trimestres']]
 
-    logger.info(f"  Trimestres baixados: {n_quarters}/16")
+    # Verificar trimestres presentes
+    n_quarters = len(entries)
+    logger.info(f"  Trimestres baixados: {n_quarters}/{len(quarters)}")
 
-    if n_quarters < 16:
-        missing = set(QUARTERS) - set(quarters_present.index)
+    if n_quarters < len(quarters):
+        missing = [quarter_key(*q) for q in quarters if quarter_key(*q) not in manifest['trimestres']]
         logger.warning(f"  ⚠️ Trimestres ausentes: {missing}")
     else:
-        logger.info(f"  ✓ Todos os 16 trimestres presentes")
+        logger.info(f"  ✓ Todos os {len(quarters)} trimestres presentes")
+
+    # Conferir manifesto × partições em disco (rodapés)
+    on_disk = pd.Series(dtype='int64')
+    if entries:
+        stats = ParquetStats(PANEL_RAW)
+        on_disk = stats.counts_by(PARTITION_COLS)
+        missing_cols = stats.missing_columns(CRITICAL_VARS)
+        if missing_cols:
+            logger.warning(f"  ⚠️ Variáveis críticas ausentes nos arquivos: {missing_cols}")
 
     # Verificar observações por trimestre
     logger.info("")
     logger.info("  Observações por trimestre:")
-    for (ano, tri), count in quarters_present.items():
-        status = "✓" if count >= MIN_OBS_PER_QUARTER else "⚠️"
-        logger.info(f"    {status} {ano}Q{tri}: {count:,}")
+    for entry in entries:
+        n_disk = int(on_disk.get((entry['ano'], entry['trimestre']), 0))
+        status = "✓" if entry['n_obs'] >= MIN_OBS_PER_QUARTER and n_disk == entry['n_obs'] else "⚠️"
+        extra = "" if n_disk == entry['n_obs'] else f" (em disco: {n_disk:,})"
+        logger.info(f"    {status} {entry['ano']}Q{entry['trimestre']}: {entry['n_obs']:,}{extra}")
 
     # Verificar UFs
-    ufs_present = df['sigla_uf'].nunique()
-    logger.info(f"  UFs presentes: {ufs_present}/{N_UFS}")
+    ufs = set().union(*(entry['ufs'] for entry in entries)) if entries else set()
+    logger.info(f"  UFs presentes: {len(ufs)}/{N_UFS}")
 
-    if ufs_present < N_UFS:
-        missing_ufs = set(REGIAO_MAP.keys()) - set(df['sigla_uf'].unique())
+    if len(ufs) < N_UFS:
+        missing_ufs = set(REGIAO_MAP.keys()) - ufs
         logger.warning(f"  ⚠️ UFs ausentes: {missing_ufs}")
     else:
         logger.info(f"  ✓ Todas as {N_UFS} UFs presentes")
 
+    summary = pd.DataFrame({
+        'ano': [entry['ano'] for entry in entries],
+        'trimestre': [entry['trimestre'] for entry in entries],
+        'n_obs': [entry['n_obs'] for entry in entries],
+        'populacao': [entry['populacao'] for entry in entries],
+        'n_ufs': [len(entry['ufs']) for entry in entries],
+    }).set_index(['ano', 'trimestre'])
+
     # População representada
-    pop_total = df['peso'].sum() / 1e6
-    pop_per_quarter = df.groupby(['ano', 'trimestre'])['peso'].sum().mean() / 1e6
+    pop_total = summary['populacao'].sum() / 1e6
+    pop_per_quarter = summary['populacao'].mean() / 1e6
 
     logger.info(f"  População total representada: {pop_total:.1f} milhões")
     logger.info(f"  População média por trimestre: {pop_per_quarter:.1f} milhões")
@@ -173,21 +333,15 @@ def validate_download(df):
     # Verificar valores missing críticos
     logger.info("")
     logger.info("  Valores missing em variáveis críticas:")
-    critical_vars = ['cod_ocupacao', 'idade', 'sexo', 'peso']
-    for var in critical_vars:
-        missing_pct = df[var].isna().mean() * 100
+    n_total = max(summary['n_obs'].sum(), 1)
+    for var in CRITICAL_VARS:
+        missing_pct = sum(entry['missing'][var] for entry in entries) / n_total * 100
         status = "✓" if missing_pct < 1 else "⚠️"
         logger.info(f"    {status} {var}: {missing_pct:.2f}%")
 
     logger.info("")
 
-    # Retornar tabela de resumo
-    summary = df.groupby(['ano', 'trimestre']).agg({
-        'peso': ['count', 'sum'],
-        'sigla_uf': 'nunique'
-    }).round(0)
-
-    summary.columns = ['n_obs', 'populacao', 'n_ufs']
+    # Tabela de resumo
     summary['populacao'] = (summary['populacao'] / 1e6).round(1)
 
     summary_path = OUTPUTS_TABLES / 'download_summary.csv'
@@ -198,16 +352,28 @@ def validate_download(df):
 
 
 if __name__ == "__main__":
-    import sys
 
     # Usar reauth=True se passar argumento --reauth
     reauth = '--reauth' in sys.argv
+    force = '--refazer' in sys.argv
+    workers = DOWNLOAD_WORKERS
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
 
     if reauth:
         logger.info("🔐 Modo reauth ativado - será solicitada autenticação Google Cloud")
 
     # Executar download
-    df = download_all_quarters(reauth=reauth, save_individual=True)
+    manifest = download_all_quarters(reauth=reauth, workers=workers, force=force)
 
-    logger.info(f"Arquivo principal: {DATA_RAW / 'pnad_panel_2021q1_2024q4.parquet'}")
+    # Validação básica
+    logger.info("")
+    logger.info("Validando download...")
+    validate_download(manifest)
+
+    logger.info("")
+    logger.info("="*70)
+    logger.info("DOWNLOAD CONCLUÍDO COM SUCESSO")
+    logger.info("="*70)
+    logger.info(f"Painel bruto: {PANEL_RAW}")
     logger.info("Próximo passo: python src/02_clean_panel_data.py")
@@ -2,13 +2,18 @@
 Script 02: Limpeza de dados do painel PNAD
 ===========================================
 
-Entrada: data/raw/pnad_panel_2021q1_2024q4.parquet
-Saída: data/processed/pnad_panel_clean.parquet
+Entrada: data/raw/pnad_panel_raw/ (particionado por ano=/trimestre=, script 01)
+Saída: data/processed/pnad_panel_clean/ (particionado por ano=/trimestre=)
+
+Códigos são lidos e mantidos como category (ver utils/schema.py): limpeza e
+padronização operam sobre as categorias, não linha a linha.
 """
 
 import logging
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
 import sys
 from pathlib import Path
 
@@ -16,6 +21,8 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
+from utils.panel_io import read_panel, write_panel
+from utils.schema import CODE_COLUMNS, apply_schema, memory_report, recode_categories
 
 logging.basicConfig(
     level=logging.INFO,
@@ -31,14 +38,21 @@ logger = logging.getLogger(__name__)
 def load_panel():
     """Carrega painel bruto"""
     logger.info("Carregando painel PNAD...")
-    path = DATA_RAW / "pnad_panel_2021q1_2024q4.parquet"
+    path = PANEL_RAW
 
-    if not path.exists():
-        logger.error(f"Arquivo não encontrado: {path}")
+    if not any(path.glob('ano=*/trimestre=*/*.parquet')):
+        logger.error(f"Painel bruto não encontrado: {path}")
         logger.error("Execute primeiro: python src/01_download_panel_pnad.py")
         raise FileNotFoundError(path)
 
-    df = pd.read_parquet(path)
+    # Colunas de códigos em texto vêm do Parquet direto como category
+    schema = ds.dataset(path, partitioning='hive').schema
+    dictionary = [
+        col for col in CODE_COLUMNS
+        if col in schema.names and (pa.types.is_string(schema.field(col).type)
+                                    or pa.types.is_large_string(schema.field(col).type))
+    ]
+    df = read_panel(path, read_dictionary=dictionary)
     logger.info(f"Carregado: {len(df):,} observações")
     return df
 
@@ -74,12 +88,10 @@ def clean_panel_data(df):
         if var in df.columns:
             df[var] = pd.to_numeric(df[var], errors='coerce')
 
-    # Strings (para códigos)
-    vars_string = ['cod_ocupacao', 'sigla_uf', 'sexo', 'raca',
-                   'condicao_ocupacao', 'tipo_vinculo', 'posicao_ocupacao']
+    # Códigos: category de strings (strip aplicado às categorias)
+    vars_string = [var for var in CODE_COLUMNS if var in df.columns]
     for var in vars_string:
-        if var in df.columns:
-            df[var] = df[var].astype(str).str.strip()
+        df[var] = recode_categories(df[var], lambda c: c.astype(str).str.strip())
 
     logger.info("  ✓ Tipos convertidos")
 
@@ -116,10 +128,15 @@ def clean_panel_data(df):
     logger.info("Padronizando códigos...")
 
     # COD ocupação: garantir 4 dígitos
-    df['cod_ocupacao'] = df['cod_ocupacao'].str[:4].str.zfill(4)
+    df['cod_ocupacao'] = recode_categories(df['cod_ocupacao'], lambda c: c.str[:4].str.zfill(4))
 
     # UF: uppercase
-    df['sigla_uf'] = df['sigla_uf'].str.upper()
+    df['sigla_uf'] = recode_categories(df['sigla_uf'], lambda c: c.str.upper())
+
+    # Tipos compactos; categorias de linhas filtradas são descartadas
+    df = apply_schema(df.reset_index(drop=True))
+    for var in vars_string:
+        df[var] = df[var].cat.remove_unused_categories()
 
     logger.info("  ✓ Códigos padronizados")
 
@@ -184,17 +201,18 @@ if __name__ == "__main__":
 
     # Carregar dados brutos
     df = load_panel()
+    memory_report(df, '02 bruto')
 
     # Limpar
     df = clean_panel_data(df)
+    memory_report(df, '02 limpo')
 
     # Validar estrutura
     validate_panel_structure(df)
 
     # Salvar
-    output_path = DATA_PROCESSED / "pnad_panel_clean.parquet"
-    logger.info(f"Salvando dados limpos em: {output_path}")
-    df.to_parquet(output_path, index=False)
+    logger.info(f"Salvando dados limpos em: {PANEL_CLEAN}")
+    write_panel(df, PANEL_CLEAN)
 
     logger.info("")
     logger.info("="*70)
@@ -9,8 +9,11 @@ Cria TODAS as variáveis necessárias para Difference-in-Differences:
 - Variáveis de educação (superior, medio)
 - Variáveis regionais (regiao, grande_grupo)
 
-Entrada: data/processed/pnad_panel_clean.parquet
-Saída: data/processed/pnad_panel_variables.parquet
+Entrada: data/processed/pnad_panel_clean/
+Saída: data/processed/pnad_panel_variables/ (particionado por ano=/trimestre=)
+
+Dummies são int8 e rótulos (periodo, regiao, grande_grupo) são category,
+derivados das categorias dos códigos (ver utils/schema.py).
 """
 
 import logging
@@ -23,6 +26,8 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
+from utils.panel_io import read_panel, write_panel
+from utils.schema import apply_schema, memory_report, recode_categories
 
 logging.basicConfig(
     level=logging.INFO,
@@ -40,7 +45,7 @@ def create_temporal_variables(df):
     Cria variáveis temporais para DiD.
 
     Variáveis criadas:
-    - periodo: String "2021T1" para gráficos
+    - periodo: Categórica "2021T1" para gráficos
     - periodo_num: Numérico 20211 para cálculos
     - tempo_relativo: Distância do período de referência (-7, -6, ..., 0, 1, 2, ...)
     - post: Dummy = 1 se período >= PERIODO_TRATAMENTO
@@ -50,18 +55,23 @@ def create_temporal_variables(df):
 
     df = df.copy()
 
-    # Período como string (para gráficos e legibilidade)
-    df['periodo'] = df['ano'].astype(str) + 'T' + df['trimestre'].astype(str)
-
     # Período numérico (para ordenação e cálculos)
-    df['periodo_num'] = df['ano'] * 10 + df['trimestre']
+    periodo_num = df['ano'].astype('int32') * 10 + df['trimestre']
+
+    # Período como rótulo (para gráficos e legibilidade): categorias em ordem
+    periodos = np.sort(periodo_num.unique())
+    df['periodo'] = pd.Categorical.from_codes(
+        np.searchsorted(periodos, periodo_num),
+        [f"{p // 10}T{p % 10}" for p in periodos]
+    )
+    df['periodo_num'] = periodo_num
 
     # Tempo relativo ao período de referência (2022T4)
     # -7 = 2021T1, -6 = 2021T2, ..., 0 = 2022T4, 1 = 2023T1, ..., 8 = 2024T4
     df['tempo_relativo'] = df['periodo_num'] - PERIODO_REFERENCIA
 
     # Dummy pós-tratamento (ChatGPT lançado nov/2022, efeitos a partir de 2023T1)
-    df['post'] = (df['periodo_num'] >= PERIODO_TRATAMENTO).astype(int)
+    df['post'] = (df['periodo_num'] >= PERIODO_TRATAMENTO).astype('int8')
 
     # Verificação
     n_pre = (df['post'] == 0).sum()
@@ -94,14 +104,14 @@ def create_outcome_variables(df):
     df = df.copy()
 
     # Ocupado (VD4002: 1 = ocupado, 2 = desocupado)
-    df['ocupado'] = (df['condicao_ocupacao'] == '1').astype(int)
+    df['ocupado'] = (df['condicao_ocupacao'] == '1').astype('int8')
 
     # Formal (VD4009: 01-04 = formal, demais = informal)
     # 01 = Empregado com carteira
     # 02 = Militar
     # 03 = Estatutário
     # 04 = Empregador
-    df['formal'] = df['tipo_vinculo'].isin(POSICAO_FORMAL).astype(int)
+    df['formal'] = df['tipo_vinculo'].isin(POSICAO_FORMAL).astype('int8')
 
     # Informal (complemento)
     df['informal'] = 1 - df['formal']
@@ -142,13 +152,13 @@ def create_demographic_variables(df):
     df = df.copy()
 
     # Sexo: mulher (V2007: 1=Masculino, 2=Feminino)
-    df['mulher'] = (df['sexo'] == '2').astype(int)
+    df['mulher'] = (df['sexo'] == '2').astype('int8')
 
     # Raça: negro ou pardo (V2010: 1=Branca, 2=Preta, 3=Amarela, 4=Parda, 5=Indígena)
-    df['negro_pardo'] = df['raca'].isin(['2', '4']).astype(int)
+    df['negro_pardo'] = df['raca'].isin(['2', '4']).astype('int8')
 
     # Raça agregada (para análise)
-    df['raca_agregada'] = df['raca'].map(RACA_AGREGADA_MAP)
+    df['raca_agregada'] = recode_categories(df['raca'], RACA_AGREGADA_MAP)
 
     # Faixas etárias
     df['faixa_etaria'] = pd.cut(
@@ -159,13 +169,13 @@ def create_demographic_variables(df):
     )
 
     # Jovem (para heterogeneidade - comparável com Brynjolfsson)
-    df['jovem'] = (df['idade'] <= IDADE_JOVEM).astype(int)
+    df['jovem'] = (df['idade'] <= IDADE_JOVEM).astype('int8')
 
     # Jovem estrito (22-25, exatamente como Brynjolfsson)
     df['jovem_estrito'] = (
         (df['idade'] >= IDADE_JOVEM_ESTRITO[0]) &
         (df['idade'] <= IDADE_JOVEM_ESTRITO[1])
-    ).astype(int)
+    ).astype('int8')
 
     # Estatísticas
     logger.info(f"  % Mulher: {df['mulher'].mean():.1%}")
@@ -191,13 +201,13 @@ def create_education_variables(df):
     df = df.copy()
 
     # Superior completo (VD3004 >= 7 ou anos_estudo >= 15)
-    df['superior'] = (df['anos_estudo'] >= 15).astype(int)
+    df['superior'] = (df['anos_estudo'] >= 15).astype('int8')
 
     # Médio completo
-    df['medio'] = (df['anos_estudo'] >= 11).astype(int)
+    df['medio'] = (df['anos_estudo'] >= 11).astype('int8')
 
     # Fundamental completo
-    df['fundamental'] = (df['anos_estudo'] >= 9).astype(int)
+    df['fundamental'] = (df['anos_estudo'] >= 9).astype('int8')
 
     # Estatísticas
     logger.info(f"  % Superior: {df['superior'].mean():.1%}")
@@ -222,11 +232,11 @@ def create_regional_variables(df):
     df = df.copy()
 
     # Região
-    df['regiao'] = df['sigla_uf'].map(REGIAO_MAP)
+    df['regiao'] = recode_categories(df['sigla_uf'], REGIAO_MAP)
 
     # Grande grupo ocupacional (primeiro dígito do COD)
-    df['grande_grupo_cod'] = df['cod_ocupacao'].str[0]
-    df['grande_grupo'] = df['grande_grupo_cod'].map(GRANDES_GRUPOS)
+    df['grande_grupo_cod'] = recode_categories(df['cod_ocupacao'], lambda c: c.str[0])
+    df['grande_grupo'] = recode_categories(df['grande_grupo_cod'], GRANDES_GRUPOS)
 
     # Estatísticas
     logger.info("  Distribuição por região:")
@@ -318,7 +328,7 @@ if __name__ == "__main__":
 
     # Carregar dados limpos
     logger.info("Carregando dados limpos...")
-    df = pd.read_parquet(DATA_PROCESSED / "pnad_panel_clean.parquet")
+    df = read_panel(PANEL_CLEAN)
     logger.info(f"Carregado: {len(df):,} observações\n")
 
     # Criar variáveis
@@ -336,15 +346,16 @@ if __name__ == "__main__":
     df = create_education_variables(df)
     logger.info("")
     df = create_regional_variables(df)
+    df = apply_schema(df)
+    memory_report(df, '03 variáveis')
 
     # Sumário
     create_variable_summary(df)
 
     # Salvar
-    output_path = DATA_PROCESSED / "pnad_panel_variables.parquet"
     logger.info("")
-    logger.info(f"Salvando em: {output_path}")
-    df.to_parquet(output_path, index=False)
+    logger.info(f"Salvando em: {PANEL_VARIABLES}")
+    write_panel(df, PANEL_VARIABLES)
 
     logger.info("")
     logger.info("="*70)
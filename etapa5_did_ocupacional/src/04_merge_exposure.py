@@ -5,10 +5,10 @@ Script 04: Merge com índice de exposição à IA
 Faz merge do painel PNAD com o índice de exposição à IA Generativa.
 
 Entrada:
-- data/processed/pnad_panel_variables.parquet
+- data/processed/pnad_panel_variables/
 - ../etapa3_crosswalk_onet_isco08/outputs/cod_automation_augmentation_index_final.csv
 
-Saída: data/processed/pnad_panel_exposure.parquet
+Saída: data/processed/pnad_panel_exposure/ (particionado por ano=/trimestre=)
 """
 
 import logging
@@ -21,7 +21,9 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
-from utils.weighted_stats import weighted_mean
+from utils.panel_io import read_panel, write_panel
+from utils.occupation_crosswalk import codes_to_int, lookup_by_code
+from utils.schema import apply_schema, memory_report, recode_categories
 
 logging.basicConfig(
     level=logging.INFO,
@@ -112,27 +114,35 @@ def merge_exposure(pnad_df, exposure_df):
     logger.info("MERGE PNAD × EXPOSIÇÃO")
     logger.info("="*70)
 
-    n_antes = len(pnad_df)
-
     # Garantir que códigos estão padronizados
-    pnad_df['cod_ocupacao'] = pnad_df['cod_ocupacao'].astype(str).str.zfill(4)
+    pnad_df['cod_ocupacao'] = recode_categories(pnad_df['cod_ocupacao'],
+                                                lambda c: c.astype(str).str.zfill(4))
     exposure_df['cod_cod'] = exposure_df['cod_cod'].astype(str).str.zfill(4)
 
-    # Merge (left join para manter todos os registros do PNAD)
     logger.info(f"PNAD observações: {len(pnad_df):,}")
     logger.info(f"Exposure ocupações: {len(exposure_df)}")
 
-    df = pnad_df.merge(
-        exposure_df,
-        left_on='cod_ocupacao',
-        right_on='cod_cod',
-        how='left'
-    )
+    # Código repetido no índice (mesma convenção de lookup_by_code: '110' = '0110')
+    codigos = codes_to_int(exposure_df['cod_cod'])
+    repetidos = exposure_df['cod_cod'][pd.Series(codigos).duplicated(keep=False).to_numpy()
+                                       & (codigos >= 0)]
+    if len(repetidos):
+        repetidos = sorted(repetidos.unique())
+        logger.error(f"ERRO: Índice de exposição com {len(repetidos)} códigos repetidos")
+        raise ValueError(f"Códigos duplicados na tabela de índices: {repetidos[:20]}")
+
+    # Left join sem join: o índice é resolvido nas poucas centenas de
+    # categorias de cod_ocupacao e levado às linhas com take dos códigos
+    # da category (cada coluna extra do índice custa um take de inteiros)
+    atributos = lookup_by_code(pnad_df['cod_ocupacao'],
+                               exposure_df.set_index('cod_cod', drop=False))
+
+    # cod_cod (chave do índice) com as categorias do painel, nula sem match
+    atributos['cod_cod'] = pnad_df['cod_ocupacao'].where(atributos['cod_cod'].notna())
 
-    # Verificar que não duplicou observações
-    if len(df) != n_antes:
-        logger.error(f"ERRO: Merge duplicou observações! {n_antes:,} → {len(df):,}")
-        raise ValueError("Merge duplicou observações")
+    df = pnad_df
+    for col in atributos.columns:
+        df[col] = atributos[col]
 
     logger.info(f"Merge concluído: {len(df):,} observações")
 
@@ -183,7 +193,7 @@ def validate_coverage(df):
         # Amostrar populações sem match
         unmatched_stats = (
             df[df['exposure_score'].isna()]
-            .groupby('cod_ocupacao')
+            .groupby('cod_ocupacao', observed=True)
             .agg({
                 'peso': 'sum',
                 'grande_grupo': 'first'
@@ -227,23 +237,23 @@ if __name__ == "__main__":
 
     # Carregar dados
     logger.info("Carregando painel PNAD...")
-    pnad_df = pd.read_parquet(DATA_PROCESSED / "pnad_panel_variables.parquet")
+    pnad_df = read_panel(PANEL_VARIABLES)
     logger.info(f"Carregado: {len(pnad_df):,} observações\n")
 
     # Carregar índice de exposição
     exposure_df = load_exposure_index()
 
     # Merge
-    df = merge_exposure(pnad_df, exposure_df)
+    df = apply_schema(merge_exposure(pnad_df, exposure_df))
+    memory_report(df, '04 exposição')
 
     # Validar cobertura
     coverage = validate_coverage(df)
 
     # Salvar
-    output_path = DATA_PROCESSED / "pnad_panel_exposure.parquet"
     logger.info("")
-    logger.info(f"Salvando em: {output_path}")
-    df.to_parquet(output_path, index=False)
+    logger.info(f"Salvando em: {PANEL_EXPOSURE}")
+    write_panel(df, PANEL_EXPOSURE)
 
     logger.info("")
     logger.info("="*70)
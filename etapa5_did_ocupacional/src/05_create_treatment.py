@@ -8,8 +8,8 @@ Cria variáveis de tratamento baseadas na exposição à IA:
 - Quintis de exposição
 - Interações DiD (post × tratamento)
 
-Entrada: data/processed/pnad_panel_exposure.parquet
-Saída: data/processed/pnad_panel_did_ready.parquet (FINAL ANALYTIC DATASET)
+Entrada: data/processed/pnad_panel_exposure/
+Saída: data/processed/pnad_panel_did_ready/ (FINAL ANALYTIC DATASET, particionado por ano=/trimestre=)
 """
 
 import logging
@@ -22,7 +22,9 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
-from utils.weighted_stats import weighted_quantile
+from utils.panel_io import read_panel, write_panel
+from utils.schema import apply_schema, memory_report
+from utils.weighted_stats import weighted_quantiles
 
 logging.basicConfig(
     level=logging.INFO,
@@ -60,16 +62,16 @@ def compute_treatment_thresholds(df):
 
     logger.info(f"  N com exposure_score: {len(df_pre):,}")
 
-    # Computar percentis ponderados
-    thresholds = {}
+    # Computar percentis ponderados (uma única ordenação para todos)
+    values = weighted_quantiles(
+        df_pre['exposure_score'],
+        df_pre['peso'],
+        list(PERCENTILE_THRESHOLDS.values())
+    )
+    thresholds = dict(zip(PERCENTILE_THRESHOLDS.keys(), values))
 
     for name, percentil in PERCENTILE_THRESHOLDS.items():
-        threshold = weighted_quantile(
-            df_pre['exposure_score'],
-            df_pre['peso'],
-            percentil
-        )
-        thresholds[name] = threshold
+        threshold = thresholds[name]
 
         # Nome legível
         pct_label = int((1 - percentil) * 100)  # 0.80 → Top 20%
@@ -102,7 +104,7 @@ def create_treatment_dummies(df, thresholds):
     for name, threshold in thresholds.items():
         # Usar o nome diretamente do dicionário
         # name já vem como 'alta_exp_10', 'alta_exp_20', 'alta_exp_25'
-        df[name] = (df['exposure_score'] >= threshold).astype(int)
+        df[name] = (df['exposure_score'] >= threshold).astype('int8')
 
         # Contar
         n_treated = df[name].sum()
@@ -132,13 +134,12 @@ def create_quintile_categories(df):
     df_with_exposure = df[df['exposure_score'].notna()].copy()
 
     # Criar quintis ponderados
-    # Nota: pd.qcut não suporta pesos nativamente, então usamos weighted_quantile
-    from utils.weighted_stats import weighted_quantile
-
-    quintile_thresholds = [
-        weighted_quantile(df_with_exposure['exposure_score'], df_with_exposure['peso'], q)
-        for q in [0.20, 0.40, 0.60, 0.80]
-    ]
+    # Nota: pd.qcut não suporta pesos nativamente, então usamos weighted_quantiles
+    quintile_thresholds = list(weighted_quantiles(
+        df_with_exposure['exposure_score'],
+        df_with_exposure['peso'],
+        [0.20, 0.40, 0.60, 0.80]
+    ))
 
     # Criar bins (removendo duplicatas)
     all_bins = [-np.inf] + quintile_thresholds + [np.inf]
@@ -235,7 +236,7 @@ def validate_treatment_assignment(df):
 
     # 1. Tratamento constante dentro de ocupação?
     variation_within_occ = (
-        df.groupby('cod_ocupacao')['alta_exp']
+        df.groupby('cod_ocupacao', observed=True)['alta_exp']
         .nunique()
     )
 
@@ -304,7 +305,7 @@ if __name__ == "__main__":
 
     # Carregar dados
     logger.info("Carregando painel com exposição...")
-    df = pd.read_parquet(DATA_PROCESSED / "pnad_panel_exposure.parquet")
+    df = read_panel(PANEL_EXPOSURE)
     logger.info(f"Carregado: {len(df):,} observações\n")
 
     logger.info("="*70)
@@ -324,20 +325,20 @@ if __name__ == "__main__":
 
     # 4. Criar interações DiD
     df = create_did_interactions(df)
+    df = apply_schema(df)
+    memory_report(df, '05 did_ready')
 
     # 5. Validar
     validate_treatment_assignment(df)
 
     # Salvar dataset final
-    output_path = DATA_PROCESSED / "pnad_panel_did_ready.parquet"
-
     logger.info("")
     logger.info("="*70)
     logger.info("DATASET FINAL PARA ANÁLISE DID")
     logger.info("="*70)
-    logger.info(f"Salvando em: {output_path}")
+    logger.info(f"Salvando em: {PANEL_DID_READY}")
 
-    df.to_parquet(output_path, index=False)
+    write_panel(df, PANEL_DID_READY)
 
     logger.info("")
     logger.info(f"✓ Dataset pronto: {len(df):,} observações")
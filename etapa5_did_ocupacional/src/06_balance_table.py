@@ -2,10 +2,12 @@
 Script 06: Tabela de Balanço de Covariáveis (Pré-Tratamento)
 =============================================================
 
-Entrada: data/processed/pnad_panel_did_ready.parquet
+Entrada: data/processed/pnad_panel_did_ready/ (apenas as colunas usadas)
 Saídas:
 - outputs/tables/balance_table_pre.csv
 - outputs/tables/balance_table_pre.tex
+- outputs/tables/balance_diagnostics_by_post.csv
+- outputs/tables/balance_diagnostics_by_quarter.csv
 - outputs/figures/love_plot.png
 """
 
@@ -19,8 +21,9 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
-from utils.weighted_stats import weighted_mean, weighted_std, weighted_diff_normalized
+from utils.weighted_stats import covariate_balance
 from utils.plotting import plot_love_plot
+from utils.panel_io import read_panel
 
 logging.basicConfig(
     level=logging.INFO,
@@ -33,72 +36,79 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Covariáveis a comparar
+COVARIATES = {
+    'idade': 'Idade (anos)',
+    'mulher': 'Mulher (%)',
+    'negro_pardo': 'Negro/Pardo (%)',
+    'superior': 'Superior completo (%)',
+    'medio': 'Médio completo (%)',
+    'rendimento_habitual': 'Rendimento (R$)',
+    'horas_trabalhadas': 'Horas trabalhadas',
+    'formal': 'Formal (%)',
+    'ocupado': 'Taxa de ocupação (%)'
+}
+
+
 def compute_balance_statistics(df, treatment_var='alta_exp'):
     """Calcula estatísticas de balanço para período pré-tratamento"""
 
     logger.info("Computando estatísticas de balanço...")
 
     # Filtrar período pré
-    df_pre = df[df['post'] == 0].copy()
+    df_pre = df[df['post'] == 0]
 
     logger.info(f"  Usando {len(df_pre):,} observações do período pré-tratamento")
 
-    # Covariáveis a comparar
-    covariates = {
-        'idade': 'Idade (anos)',
-        'mulher': 'Mulher (%)',
-        'negro_pardo': 'Negro/Pardo (%)',
-        'superior': 'Superior completo (%)',
-        'medio': 'Médio completo (%)',
-        'rendimento_habitual': 'Rendimento (R$)',
-        'horas_trabalhadas': 'Horas trabalhadas',
-        'formal': 'Formal (%)',
-        'ocupado': 'Taxa de ocupação (%)'
-    }
-
-    results = []
-
-    for var, label in covariates.items():
-        if var not in df_pre.columns:
-            continue
-
-        # Remover missing
-        df_var = df_pre[[var, treatment_var, 'peso']].dropna()
-
-        # Separar grupos
-        treated = df_var[df_var[treatment_var] == 1]
-        control = df_var[df_var[treatment_var] == 0]
-
-        # Médias
-        mean_t = weighted_mean(treated[var], treated['peso'])
-        mean_c = weighted_mean(control[var], control['peso'])
-
-        # Desvios padrão
-        std_t = weighted_std(treated[var], treated['peso'])
-        std_c = weighted_std(control[var], control['peso'])
-
-        # Diferença normalizada
-        std_diff = weighted_diff_normalized(
-            treated[var], treated['peso'],
-            control[var], control['peso']
-        )
-
-        results.append({
-            'Variável': label,
-            'Controle': mean_c,
-            'Tratamento': mean_t,
-            'Diferença': mean_t - mean_c,
-            'std_diff': std_diff,
-            'Balanceado': '✓' if abs(std_diff) < BALANCE_THRESHOLD else '⚠️'
-        })
-
-    stats_df = pd.DataFrame(results)
+    # Todas as covariáveis de uma vez (médias, variâncias, std diff, KS)
+    balance = covariate_balance(df_pre, list(COVARIATES), treatment_var)
+
+    stats_df = pd.DataFrame({
+        'Variável': balance.index.map(COVARIATES),
+        'Controle': balance['mean_c'].to_numpy(),
+        'Tratamento': balance['mean_t'].to_numpy(),
+        'Diferença': balance['diff'].to_numpy(),
+        'std_diff': balance['std_diff'].to_numpy(),
+        'var_ratio': balance['var_ratio'].to_numpy(),
+        'ks': balance['ks'].to_numpy(),
+    })
+    stats_df['Balanceado'] = np.where(stats_df['std_diff'].abs() < BALANCE_THRESHOLD, '✓', '⚠️')
 
     logger.info(f"  Computadas estatísticas para {len(stats_df)} covariáveis")
 
     return stats_df
 
 
+def compute_balance_diagnostics(df):
+    """Balanço para todos os cortes de tratamento, por pré/pós e por trimestre
+
+    Uma única execução cobre alta_exp_10/20/25 (PERCENTILE_THRESHOLDS).
+    """
+
+    logger.info("")
+    logger.info("Computando diagnósticos de balanço por período e corte...")
+
+    treatments = [t for t in PERCENTILE_THRESHOLDS if t in df.columns]
+    outputs = {}
+    for nome, by in [('post', 'post'), ('quarter', ['ano', 'trimestre'])]:
+        balance = covariate_balance(df, list(COVARIATES), treatments, by=by)
+        csv_path = OUTPUTS_TABLES / f'balance_diagnostics_by_{nome}.csv'
+        balance.round(4).to_csv(csv_path)
+        logger.info(f"  {len(balance):,} linhas salvas em: {csv_path}")
+        outputs[nome] = balance
+
+    # Resumo: maior |std diff| por corte e período
+    resumo = (
+        outputs['post']['std_diff'].abs()
+        .groupby(level=['treatment', 'post']).max()
+        .unstack('post')
+    )
+    logger.info("\n  max |std diff| por corte (colunas: post)")
+    logger.info("\n" + resumo.round(3).to_string())
+
+    return outputs
+
+
 def create_balance_table(stats_df, format='both'):
     """Cria tabela de balanço formatada"""
 
@@ -113,9 +123,11 @@ def create_balance_table(stats_df, format='both'):
     display_df['Tratamento'] = display_df['Tratamento'].round(2)
     display_df['Diferença'] = display_df['Diferença'].round(2)
     display_df['Diff. Normalizada'] = display_df['std_diff'].round(3)
+    display_df['Razão Var.'] = display_df['var_ratio'].round(3)
+    display_df['KS'] = display_df['ks'].round(3)
 
     display_df = display_df[['Variável', 'Controle', 'Tratamento', 'Diferença',
-                             'Diff. Normalizada', 'Balanceado']]
+                             'Diff. Normalizada', 'Razão Var.', 'KS', 'Balanceado']]
 
     logger.info("\n" + display_df.to_string(index=False))
 
@@ -147,7 +159,9 @@ if __name__ == "__main__":
 
     # Carregar dados
     logger.info("Carregando dataset DiD final...")
-    df = pd.read_parquet(DATA_PROCESSED / "pnad_panel_did_ready.parquet")
+    df = read_panel(PANEL_DID_READY, columns=[
+        'ano', 'trimestre', 'post', 'peso', 'alta_exp', *PERCENTILE_THRESHOLDS, *COVARIATES
+    ])
     logger.info(f"Carregado: {len(df):,} observações\n")
 
     # Computar estatísticas
@@ -156,6 +170,9 @@ if __name__ == "__main__":
     # Criar tabela
     table = create_balance_table(stats_df)
 
+    # Diagnósticos por período para todos os cortes
+    compute_balance_diagnostics(df)
+
     # Love plot
     logger.info("")
     logger.info("Gerando Love Plot...")
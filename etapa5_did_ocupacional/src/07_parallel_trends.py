@@ -4,7 +4,9 @@ Script 07: Análise de Tendências Paralelas
 
 Validação visual e estatística da hipótese de tendências paralelas.
 
-Entrada: data/processed/pnad_panel_did_ready.parquet
+Entrada: data/processed/pnad_panel_did_ready/
+Cache:   data/processed/trend_series.parquet (médias/EPs por período e grupo;
+         reconstruído quando o painel é mais recente)
 Saídas:
 - outputs/figures/parallel_trends_*.png (individual por outcome)
 - outputs/figures/parallel_trends_all_outcomes.png (painel)
@@ -13,6 +15,7 @@ Saídas:
 
 import logging
 import pandas as pd
+import numpy as np
 import sys
 from pathlib import Path
 
@@ -21,7 +24,8 @@ sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
 from utils.plotting import plot_parallel_trends, plot_multi_panel_trends
-from utils.validators import validate_parallel_trends_assumption
+from utils.trends import load_trend_series
+from utils.validators import validate_parallel_trends_from_series
 
 logging.basicConfig(
     level=logging.INFO,
@@ -34,7 +38,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def generate_all_trend_plots(df, outcomes=None, treatment='alta_exp'):
+def generate_all_trend_plots(trends, outcomes=None, treatment='alta_exp'):
     """Gera gráficos individuais para cada outcome"""
 
     if outcomes is None:
@@ -48,14 +52,14 @@ def generate_all_trend_plots(df, outcomes=None, treatment='alta_exp'):
         save_path = OUTPUTS_FIGURES / f"parallel_trends_{outcome}.png"
 
         try:
-            plot_parallel_trends(df, outcome, treatment, save_path=save_path)
+            plot_parallel_trends(trends, outcome, treatment, save_path=save_path)
         except Exception as e:
             logger.error(f"  Erro ao plotar {outcome}: {e}")
 
     logger.info(f"  ✓ {len(outcomes)} gráficos individuais gerados")
 
 
-def generate_multi_panel(df, outcomes=None, treatment='alta_exp'):
+def generate_multi_panel(trends, outcomes=None, treatment='alta_exp'):
     """Gera painel 2×2 com múltiplos outcomes"""
 
     if outcomes is None:
@@ -66,12 +70,12 @@ def generate_multi_panel(df, outcomes=None, treatment='alta_exp'):
 
     save_path = OUTPUTS_FIGURES / "parallel_trends_all_outcomes.png"
 
-    plot_multi_panel_trends(df, outcomes, treatment, save_path=save_path)
+    plot_multi_panel_trends(trends, outcomes, treatment, save_path=save_path)
 
     logger.info(f"  ✓ Painel salvo em: {save_path}")
 
 
-def statistical_test_parallel_trends(df, outcomes=None, treatment='alta_exp'):
+def statistical_test_parallel_trends(trends, outcomes=None, treatment='alta_exp'):
     """Testa estatisticamente tendências paralelas"""
 
     if outcomes is None:
@@ -85,7 +89,7 @@ def statistical_test_parallel_trends(df, outcomes=None, treatment='alta_exp'):
     for outcome in outcomes:
         logger.info(f"  Testando: {outcome}")
 
-        p_value, message = validate_parallel_trends_assumption(df, outcome, treatment)
+        p_value, message = validate_parallel_trends_from_series(trends, outcome, treatment)
 
         results.append({
             'Outcome': outcome,
@@ -109,10 +113,12 @@ def statistical_test_parallel_trends(df, outcomes=None, treatment='alta_exp'):
 
 if __name__ == "__main__":
 
-    # Carregar dados
-    logger.info("Carregando dataset DiD final...")
-    df = pd.read_parquet(DATA_PROCESSED / "pnad_panel_did_ready.parquet")
-    logger.info(f"Carregado: {len(df):,} observações\n")
+    # Séries de tendência (cache; microdados só são lidos se o cache estiver desatualizado)
+    logger.info("Carregando séries de tendência...")
+    trends = load_trend_series(PANEL_DID_READY,
+                               TREND_SERIES_PATH, OUTCOMES,
+                               treatments=['alta_exp', *PERCENTILE_THRESHOLDS])
+    logger.info(f"Carregado: {len(trends):,} células (período × grupo × outcome)\n")
 
     logger.info("="*70)
     logger.info("ANÁLISE DE TENDÊNCIAS PARALELAS")
@@ -120,13 +126,13 @@ if __name__ == "__main__":
     logger.info("")
 
     # Gráficos individuais
-    generate_all_trend_plots(df)
+    generate_all_trend_plots(trends)
 
     # Painel multi-outcome
-    generate_multi_panel(df)
+    generate_multi_panel(trends)
 
     # Testes estatísticos
-    test_results = statistical_test_parallel_trends(df)
+    test_results = statistical_test_parallel_trends(trends)
 
     logger.info("")
     logger.info("="*70)
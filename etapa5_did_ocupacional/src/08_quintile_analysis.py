@@ -4,10 +4,13 @@ Script 08: Análise por Quintis de Exposição
 
 Estatísticas descritivas por quintil de exposição à IA.
 
-Entrada: data/processed/pnad_panel_did_ready.parquet
+Entrada: data/processed/pnad_panel_did_ready/ (apenas as colunas usadas)
 Saídas:
 - outputs/tables/quintile_characteristics_pre.csv
 - outputs/tables/quintile_characteristics_pre.tex
+- outputs/tables/inequality_by_quarter.csv
+- outputs/tables/inequality_by_uf_quarter.csv
+- outputs/tables/lorenz_income_by_year.csv
 - outputs/figures/exposure_distribution_by_quintile.png
 - outputs/figures/outcomes_by_quintile.png
 """
@@ -24,7 +27,8 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import *
-from utils.weighted_stats import weighted_mean
+from utils.weighted_stats import weighted_mean, grouped_inequality, grouped_lorenz
+from utils.panel_io import read_panel
 
 logging.basicConfig(
     level=logging.INFO,
@@ -36,6 +40,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Colunas lidas do painel (estatísticas por quintil, desigualdade e box plot)
+COLUMNS = ['ano', 'trimestre', 'sigla_uf', 'post', 'peso', 'quintil_exp', 'exposure_score',
+           'idade', 'mulher', 'negro_pardo', 'superior', 'rendimento_habitual',
+           'horas_trabalhadas', 'formal', 'ocupado']
+
 
 def compute_quintile_statistics(df):
     """Calcula estatísticas por quintil (período pré)"""
@@ -128,6 +137,51 @@ def create_quintile_table(stats_df, format='both'):
         logger.info(f"LaTeX salvo em: {latex_path}")
 
 
+def compute_inequality_panel(df):
+    """Gini/Theil/P90-P10 de exposição e renda por trimestre e por UF × trimestre
+
+    Usa grouped_inequality (um lexsort por variável para todos os grupos),
+    em vez de um gini_coefficient por subconjunto.
+    """
+
+    logger.info("")
+    logger.info("Computando desigualdade por trimestre e por UF...")
+
+    renda = df[df['rendimento_habitual'] > 0]
+    variaveis = [('exposure', df, 'exposure_score'), ('renda', renda, 'rendimento_habitual')]
+    colunas = ['gini', 'theil', 'p90_p10', 'weight']
+
+    outputs = {}
+    for nome, keys in [('quarter', ['ano', 'trimestre']),
+                       ('uf_quarter', ['sigla_uf', 'ano', 'trimestre'])]:
+        partes = []
+        for prefixo, dados, col in variaveis:
+            ineq = grouped_inequality(dados, keys, col)[colunas]
+            partes.append(ineq.add_prefix(f'{prefixo}_'))
+        table = pd.concat(partes, axis=1).reset_index()
+        table['exposure_weight'] = table['exposure_weight'] / 1e6
+        table['renda_weight'] = table['renda_weight'] / 1e6
+        table = table.rename(columns={'exposure_weight': 'exposure_pop_m',
+                                      'renda_weight': 'renda_pop_m'})
+
+        csv_path = OUTPUTS_TABLES / f'inequality_by_{nome}.csv'
+        table.round(4).to_csv(csv_path, index=False)
+        logger.info(f"  {len(table)} linhas salvas em: {csv_path}")
+        outputs[nome] = table
+
+    by_quarter = outputs['quarter']
+    logger.info("\n" + by_quarter[['ano', 'trimestre', 'exposure_gini', 'renda_gini',
+                                   'renda_p90_p10']].round(3).to_string(index=False))
+
+    # Curvas de Lorenz da renda por ano (21 pontos)
+    lorenz = grouped_lorenz(renda, 'ano', 'rendimento_habitual', points=21)
+    lorenz_path = OUTPUTS_TABLES / 'lorenz_income_by_year.csv'
+    lorenz.round(4).to_csv(lorenz_path)
+    logger.info(f"  Lorenz salvo em: {lorenz_path}")
+
+    return outputs
+
+
 def plot_exposure_by_quintile(df, save_path=None):
     """Box plot de exposição por quintil"""
 
@@ -158,7 +212,7 @@ if __name__ == "__main__":
 
     # Carregar dados
     logger.info("Carregando dataset DiD final...")
-    df = pd.read_parquet(DATA_PROCESSED / "pnad_panel_did_ready.parquet")
+    df = read_panel(PANEL_DID_READY, columns=COLUMNS)
     logger.info(f"Carregado: {len(df):,} observações\n")
 
     # Computar estatísticas
@@ -167,6 +221,9 @@ if __name__ == "__main__":
     # Criar tabela
     create_quintile_table(stats_df)
 
+    # Desigualdade por trimestre e UF
+    compute_inequality_panel(df)
+
     # Box plot
     plot_exposure_by_quintile(df, save_path=OUTPUTS_FIGURES / 'exposure_distribution_by_quintile.png')
 
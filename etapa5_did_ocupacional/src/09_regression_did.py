@@ -26,9 +26,10 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import (
-    DATA_PROCESSED, OUTPUTS_TABLES, OUTPUTS_LOGS,
+    OUTPUTS_TABLES, OUTPUTS_LOGS, PANEL_DID_READY,
     OUTCOMES_VALID, PLAUSIBILITY_THRESHOLDS, MIN_CLUSTERS
 )
+from utils.panel_io import read_panel
 
 # Logging setup
 logging.basicConfig(
@@ -430,7 +431,7 @@ def main():
         sys.exit(1)
 
     # Load data
-    data_path = DATA_PROCESSED / "pnad_panel_did_ready.parquet"
+    data_path = PANEL_DID_READY
     logger.info(f"Loading data: {data_path}")
 
     if not data_path.exists():
@@ -438,7 +439,7 @@ def main():
         logger.error("Run Phase 3 scripts first (01-08)")
         sys.exit(1)
 
-    df = pd.read_parquet(data_path)
+    df = read_panel(data_path)
     logger.info(f"Loaded: {len(df):,} observations")
     logger.info(f"Columns: {list(df.columns)}")
 
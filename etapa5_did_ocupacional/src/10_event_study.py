@@ -24,10 +24,11 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import (
-    DATA_PROCESSED, OUTPUTS_TABLES, OUTPUTS_FIGURES, OUTPUTS_LOGS,
+    OUTPUTS_TABLES, OUTPUTS_FIGURES, OUTPUTS_LOGS, PANEL_DID_READY,
     OUTCOMES_VALID, EVENT_STUDY_REFERENCE, MIN_CLUSTERS,
     COLOR_PRE, COLOR_POST, FIGURE_DPI
 )
+from utils.panel_io import read_panel
 
 # Logging setup
 logging.basicConfig(
@@ -393,14 +394,14 @@ def main():
         sys.exit(1)
 
     # Load data
-    data_path = DATA_PROCESSED / "pnad_panel_did_ready.parquet"
+    data_path = PANEL_DID_READY
     logger.info(f"Loading data: {data_path}")
 
     if not data_path.exists():
         logger.error(f"File not found: {data_path}")
         sys.exit(1)
 
-    df = pd.read_parquet(data_path)
+    df = read_panel(data_path)
     logger.info(f"Loaded: {len(df):,} observations")
 
     # Create event study dummies
@@ -32,10 +32,11 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import (
-    DATA_PROCESSED, OUTPUTS_TABLES, OUTPUTS_FIGURES, OUTPUTS_LOGS,
+    OUTPUTS_TABLES, OUTPUTS_FIGURES, OUTPUTS_LOGS, PANEL_DID_READY,
     OUTCOMES_VALID, HETEROGENEITY_GROUPS, EVENT_STUDY_REFERENCE,
     PLAUSIBILITY_THRESHOLDS, MIN_CLUSTERS
 )
+from utils.panel_io import read_panel
 
 # Logging setup
 logging.basicConfig(
@@ -551,8 +552,7 @@ def main():
 
     # Load data
     logger.info("\nLoading data...")
-    data_path = DATA_PROCESSED / 'pnad_panel_did_ready.parquet'
-    df = pd.read_parquet(data_path)
+    df = read_panel(PANEL_DID_READY)
     logger.info(f"✓ Loaded {len(df):,} observations")
 
     # Note: Only use valid outcomes (informal excluded after script 09 found zero variance)
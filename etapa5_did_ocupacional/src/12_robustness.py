@@ -25,10 +25,11 @@ ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
 from config.settings import (
-    DATA_PROCESSED, OUTPUTS_TABLES, OUTPUTS_LOGS,
+    OUTPUTS_TABLES, OUTPUTS_LOGS, PANEL_DID_READY,
     OUTCOMES_VALID, ROBUSTNESS_CUTOFFS, PLACEBO_PERIODS,
     PLAUSIBILITY_THRESHOLDS, MIN_CLUSTERS
 )
+from utils.panel_io import period_filter, read_panel
 
 # Logging setup
 logging.basicConfig(
@@ -42,6 +43,14 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Placebo e pré-tendências usam apenas trimestres anteriores a 2022T4
+PRE_PERIOD_END = 20224
+
+# Colunas usadas pelas regressões além do outcome e dos cortes de tratamento
+REGRESSION_COLUMNS = ['post', 'periodo', 'periodo_num', 'cod_ocupacao',
+                      'idade', 'mulher', 'negro_pardo', 'superior', 'medio', 'peso']
+
+
 # ============================================
 # AUXILIARY FUNCTIONS
 # ============================================
@@ -313,7 +322,8 @@ def placebo_test(df, outcome, fake_period='2021T4'):
     Parameters:
     -----------
     df : DataFrame
-        Dados completos
+        Dados do pré-período (ou completos; trimestres a partir de 2022T4
+        são descartados)
     outcome : str
         Variável dependente
     fake_period : str
@@ -336,8 +346,7 @@ def placebo_test(df, outcome, fake_period='2021T4'):
     df_placebo['post_placebo'] = (df_placebo['periodo_num'] >= fake_period_num).astype(int)
 
     # Filter to pre-treatment period only (before actual treatment)
-    actual_treatment = 20224  # 2022T4
-    df_placebo = df_placebo[df_placebo['periodo_num'] < actual_treatment].copy()
+    df_placebo = df_placebo[df_placebo['periodo_num'] < PRE_PERIOD_END].copy()
 
     logger.info(f"Using {len(df_placebo):,} observations from pre-treatment period")
 
@@ -457,7 +466,8 @@ def differential_trends_test(df, outcome):
     Parameters:
     -----------
     df : DataFrame
-        Dados completos
+        Dados do pré-período (ou completos; trimestres a partir de 2022T4
+        são descartados)
     outcome : str
         Variável dependente
 
@@ -472,8 +482,7 @@ def differential_trends_test(df, outcome):
     import pyfixest as pf
 
     # Filter to pre-period only
-    actual_treatment = 20224  # 2022T4
-    df_pre = df[df['periodo_num'] < actual_treatment].copy()
+    df_pre = df[df['periodo_num'] < PRE_PERIOD_END].copy()
 
     logger.info(f"Using {len(df_pre):,} observations from pre-treatment period")
 
@@ -558,16 +567,22 @@ def main():
     if not check_pyfixest_installed():
         return
 
-    # Load data
-    logger.info("\nLoading data...")
-    data_path = DATA_PROCESSED / 'pnad_panel_did_ready.parquet'
-    df = pd.read_parquet(data_path)
-    logger.info(f"✓ Loaded {len(df):,} observations")
-
     # Only use valid outcomes
     outcomes_to_use = [o for o in OUTCOMES_VALID if o in ['ln_renda', 'horas_trabalhadas']]
     logger.info(f"\nOutcomes to test: {outcomes_to_use}")
 
+    # Load data (only the columns used by the regressions)
+    logger.info("\nLoading data...")
+    df = read_panel(PANEL_DID_READY,
+                    columns=REGRESSION_COLUMNS + ROBUSTNESS_CUTOFFS + outcomes_to_use)
+    logger.info(f"✓ Loaded {len(df):,} observations")
+
+    # Pre-period partitions only, for placebo and differential trends
+    df_pre = read_panel(PANEL_DID_READY,
+                        columns=REGRESSION_COLUMNS + ['alta_exp'] + outcomes_to_use,
+                        filters=period_filter(end=PRE_PERIOD_END))
+    logger.info(f"✓ Loaded {len(df_pre):,} pre-period observations")
+
     # Get main results for comparison (from script 09)
     logger.info("\nLoading main results from script 09...")
     try:
@@ -610,7 +625,7 @@ def main():
             logger.info(f"\n✓ Test 1 complete: {len(cutoffs_df)} cutoffs tested")
 
         # 2. Placebo test
-        placebo_result = placebo_test(df, outcome, fake_period='2021T4')
+        placebo_result = placebo_test(df_pre, outcome, fake_period='2021T4')
         if placebo_result:
             all_placebo_results.append(placebo_result)
             logger.info(f"✓ Test 2 complete: Placebo {'PASSED' if placebo_result['placebo_pass'] else 'FAILED'}")
@@ -622,7 +637,7 @@ def main():
             logger.info(f"✓ Test 3 complete: Estimated without IT occupations")
 
         # 4. Differential trends
-        trends_result = differential_trends_test(df, outcome)
+        trends_result = differential_trends_test(df_pre, outcome)
         if trends_result:
             all_trends_results.append(trends_result)
             logger.info(f"✓ Test 4 complete: Differential trends {'OK' if trends_result['trends_ok'] else 'DETECTED'}")
@@ -0,0 +1,16 @@
+"""
+Crosswalk hierárquico de códigos ocupacionais (arrays inteiros por nível)
+
+Reexporta o pacote compartilhado occupation_crosswalk (raiz do repositório).
+Não adicionar funções aqui: a implementação única fica em occupation_crosswalk/.
+"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from occupation_crosswalk import *  # noqa: E402,F401,F403
+from occupation_crosswalk import __all__  # noqa: E402,F401
@@ -0,0 +1,123 @@
+"""
+Leitura e gravação do painel em datasets Parquet particionados
+
+Os datasets intermediários do painel (limpo, variáveis, exposição e
+did_ready) são gravados como diretórios particionados por trimestre:
+
+    pnad_panel_did_ready/ano=2021/trimestre=1/part-0.parquet
+    ...
+
+A leitura aceita lista de colunas (projeção) e filtros em ano/trimestre
+aplicados pelo pyarrow antes de abrir os arquivos: um teste de placebo no
+pré-período lê só os trimestres pré, e um diagnóstico de um outcome lê só
+as colunas dele.
+"""
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from utils.parquet_storage import write_partitions
+from utils.schema import PANEL_SCHEMA
+
+PARTITION_COLS = ['ano', 'trimestre']
+
+
+def write_panel(df, path, profile=None):
+    """
+    Grava o painel como dataset particionado por ano=/trimestre=.
+
+    O diretório é recriado por inteiro, para não sobrarem trimestres de
+    execuções anteriores. As linhas são agrupadas por trimestre numa única
+    ordenação e os arquivos gravados em paralelo (write_partitions), com o
+    perfil Parquet `profile` (padrão: PARQUET_PROFILE; ver parquet_storage).
+    """
+
+    path = Path(path)
+    if path.exists():
+        shutil.rmtree(path)
+    write_partitions(df, PARTITION_COLS, path, profile=profile)
+    return path
+
+
+def panel_columns(path):
+    """Colunas do dataset (inclusive ano e trimestre), lidas dos metadados."""
+    return ds.dataset(path, partitioning='hive').schema.names
+
+
+def period_filter(start=None, end=None):
+    """
+    Filtro pyarrow (forma normal disjuntiva) para start <= período < end.
+
+    Parâmetros:
+    -----------
+    start, end : int ou None
+        Períodos no formato de periodo_num (ex.: 20224 = 2022T4); None
+        deixa o limite aberto
+
+    Exemplo:
+    --------
+    period_filter(end=PERIODO_TRATAMENTO)  # apenas trimestres pré
+    """
+
+    lower = [[]] if start is None else [
+        [('ano', '>', start // 10)],
+        [('ano', '=', start // 10), ('trimestre', '>=', start % 10)],
+    ]
+    upper = [[]] if end is None else [
+        [('ano', '<', end // 10)],
+        [('ano', '=', end // 10), ('trimestre', '<', end % 10)],
+    ]
+    clauses = [lo + up for lo in lower for up in upper]
+    return clauses if any(clauses) else None
+
+
+def read_panel(path, columns=None, filters=None, read_dictionary=None):
+    """
+    Lê o dataset do painel com projeção de colunas e filtros pushdown.
+
+    Parâmetros:
+    -----------
+    path : Path
+        Diretório do dataset (ex.: PANEL_DID_READY)
+    columns : list ou None
+        Colunas a ler; ausentes no dataset são ignoradas
+    filters : list ou None
+        Filtros pyarrow, ex. period_filter(end=20224) ou
+        [('ano', '=', 2023)]; filtros em ano/trimestre descartam
+        partições inteiras sem lê-las
+    read_dictionary : list ou None
+        Colunas de texto lidas direto como category
+
+    Retorna:
+    --------
+    DataFrame com ano e trimestre nos tipos de PANEL_SCHEMA (e nas
+    primeiras posições quando todas as colunas são lidas)
+
+    Colunas category de PANEL_SCHEMA gravadas como texto (chaves de
+    ordenação do perfil scan) voltam como category, com categorias em
+    ordem lexicográfica.
+    """
+
+    schema = ds.dataset(path, partitioning='hive').schema
+    if columns is not None:
+        columns = [c for c in dict.fromkeys(columns) if c in schema.names]
+    text_codes = [f.name for f in schema
+                  if PANEL_SCHEMA.get(f.name) == 'category' and pa.types.is_string(f.type)
+                  and (columns is None or f.name in columns)]
+    if text_codes:
+        read_dictionary = list(dict.fromkeys([*(read_dictionary or []), *text_codes]))
+    df = pd.read_parquet(path, columns=columns, filters=filters,
+                         read_dictionary=read_dictionary)
+
+    for col in text_codes:
+        df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    for col in PARTITION_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype(PANEL_SCHEMA[col])
+    if columns is None:
+        df = df[PARTITION_COLS + [c for c in df.columns if c not in PARTITION_COLS]]
+    return df
@@ -5,17 +5,18 @@ Funções de plotagem para análise DiD
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
-import pandas as pd
-from utils.weighted_stats import weighted_mean, weighted_se
+from utils.trends import select_trend
 
 
-def plot_parallel_trends(df, outcome, treatment='alta_exp', save_path=None):
+def plot_parallel_trends(trends, outcome, treatment='alta_exp', save_path=None):
     """
     Plota tendências paralelas (pré-tratamento) para validação visual do DiD.
 
     Parâmetros:
     -----------
-    df : DataFrame
+    trends : DataFrame
+        Séries de tendência (utils.trends.load_trend_series); microdados
+        também são aceitos, mas exigem um groupby completo a cada chamada
     outcome : str
         Variável dependente a plotar
     treatment : str
@@ -32,31 +33,8 @@ def plot_parallel_trends(df, outcome, treatment='alta_exp', save_path=None):
     sns.set_style("whitegrid")
     plt.rcParams['figure.dpi'] = 150
 
-    # Computar médias ponderadas por grupo e período
-    trends = []
-
-    for periodo in sorted(df['periodo'].unique()):
-        df_period = df[df['periodo'] == periodo]
-
-        # Grupo tratado
-        df_treated = df_period[df_period[treatment] == 1]
-        mean_treated = weighted_mean(df_treated[outcome], df_treated['peso'])
-        se_treated = weighted_se(df_treated[outcome], df_treated['peso'])
-
-        # Grupo controle
-        df_control = df_period[df_period[treatment] == 0]
-        mean_control = weighted_mean(df_control[outcome], df_control['peso'])
-        se_control = weighted_se(df_control[outcome], df_control['peso'])
-
-        trends.append({
-            'periodo': periodo,
-            'mean_treated': mean_treated,
-            'se_treated': se_treated,
-            'mean_control': mean_control,
-            'se_control': se_control
-        })
-
-    trends_df = pd.DataFrame(trends)
+    # Médias ponderadas e EPs por grupo e período (cache)
+    trends_df = select_trend(trends, outcome, treatment)
 
     # Criar figura
     fig, ax = plt.subplots(figsize=(14, 7))
@@ -184,13 +162,14 @@ def plot_love_plot(stats_df, save_path=None):
     return fig
 
 
-def plot_multi_panel_trends(df, outcomes, treatment='alta_exp', save_path=None):
+def plot_multi_panel_trends(trends, outcomes, treatment='alta_exp', save_path=None):
     """
     Cria painel 2×2 com tendências para múltiplos outcomes.
 
     Parâmetros:
     -----------
-    df : DataFrame
+    trends : DataFrame
+        Séries de tendência (utils.trends.load_trend_series)
     outcomes : list
         Lista de outcomes a plotar (max 4)
     treatment : str
@@ -203,27 +182,8 @@ def plot_multi_panel_trends(df, outcomes, treatment='alta_exp', save_path=None):
     for idx, outcome in enumerate(outcomes[:4]):
         ax = axes[idx]
 
-        # Computar tendências
-        trends = []
-        for periodo in sorted(df['periodo'].unique()):
-            df_period = df[df['periodo'] == periodo]
-
-            mean_treated = weighted_mean(
-                df_period[df_period[treatment] == 1][outcome],
-                df_period[df_period[treatment] == 1]['peso']
-            )
-            mean_control = weighted_mean(
-                df_period[df_period[treatment] == 0][outcome],
-                df_period[df_period[treatment] == 0]['peso']
-            )
-
-            trends.append({
-                'periodo': periodo,
-                'mean_treated': mean_treated,
-                'mean_control': mean_control
-            })
-
-        trends_df = pd.DataFrame(trends)
+        # Tendências do cache
+        trends_df = select_trend(trends, outcome, treatment)
 
         # Plotar
         periodos = trends_df['periodo'].tolist()
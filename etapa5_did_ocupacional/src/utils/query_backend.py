@@ -0,0 +1,16 @@
+"""
+Backend de consultas (BigQuery ou DuckDB local)
+
+Reexporta o pacote compartilhado query_backend (raiz do repositório).
+Não adicionar funções aqui: a implementação única fica em query_backend/.
+"""
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from query_backend import *  # noqa: E402,F401,F403
+from query_backend import __all__  # noqa: E402,F401
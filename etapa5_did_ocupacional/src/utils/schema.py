@@ -0,0 +1,133 @@
+"""
+Esquema compacto do painel em memória
+
+Com ~80M linhas, cada coluna int64/float64 custa ~640 MB e cada coluna de
+códigos em strings Python vários GB. O painel usa tipos compactos:
+
+    category   códigos textuais (cod_ocupacao, sigla_uf, sexo, raca, ...)
+               e rótulos (periodo, regiao, grande_grupo): códigos int8/int16
+               por linha + um dicionário pequeno
+    int8       dummies 0/1, trimestre, tempo_relativo
+    int16      ano, idade (int16: I(idade**2) nas fórmulas não transborda)
+    int32      periodo_num
+    float32    outcomes contínuos: rendimento e horas são inteiros (exatos
+               em float32 até 2^24), logs com ~7 dígitos significativos
+    float64    peso e exposure_score (thresholds e quantis ponderados exatos)
+
+Os tipos são preservados nos datasets Parquet (category → dicionário).
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CODE_COLUMNS = ['cod_ocupacao', 'sigla_uf', 'sexo', 'raca', 'nivel_instrucao',
+                'condicao_ocupacao', 'tipo_vinculo', 'posicao_ocupacao']
+
+DUMMY_COLUMNS = ['post', 'ocupado', 'formal', 'informal', 'mulher', 'negro_pardo',
+                 'jovem', 'jovem_estrito', 'superior', 'medio', 'fundamental',
+                 'alta_exp_10', 'alta_exp_20', 'alta_exp_25', 'alta_exp',
+                 'did', 'did_10', 'did_25']
+
+PANEL_SCHEMA = {
+    # Identificação e tempo
+    'ano': 'int16',
+    'trimestre': 'int8',
+    'periodo': 'category',
+    'periodo_num': 'int32',
+    'tempo_relativo': 'int8',
+    # Códigos e rótulos
+    **{col: 'category' for col in CODE_COLUMNS},
+    'regiao': 'category',
+    'raca_agregada': 'category',
+    'grande_grupo_cod': 'category',
+    'grande_grupo': 'category',
+    'imputation_method': 'category',
+    # Numéricas
+    'idade': 'int16',
+    'anos_estudo': 'float32',
+    'rendimento_habitual': 'float32',
+    'horas_trabalhadas': 'float32',
+    'ln_renda': 'float32',
+    'ln_horas': 'float32',
+    'peso': 'float64',
+    'exposure_score': 'float64',
+    # Dummies
+    **{col: 'int8' for col in DUMMY_COLUMNS},
+}
+
+
+def apply_schema(df, schema=PANEL_SCHEMA):
+    """
+    Converte as colunas de df presentes em schema para os tipos declarados.
+
+    Colunas fora do esquema ficam como estão. Ausentes em colunas inteiras
+    levantam erro (o esquema não usa inteiros anuláveis).
+    """
+
+    typed = {col: df[col].astype(dtype) for col, dtype in schema.items()
+             if col in df.columns and df[col].dtype != dtype}
+    return df.assign(**typed) if typed else df
+
+
+def recode_categories(series, mapping):
+    """
+    Aplica mapping (dict ou função sobre o Index de categorias) apenas às
+    categorias de series, sem materializar strings por linha.
+
+    Categorias que passam a coincidir são fundidas; valores sem
+    correspondência no dict viram NaN.
+
+    Exemplo:
+    --------
+    recode_categories(df['sigla_uf'], REGIAO_MAP)
+    recode_categories(df['cod_ocupacao'], lambda c: c.str[:4].str.zfill(4))
+    """
+
+    series = series.astype('category')
+    categories = series.cat.categories
+    if callable(mapping):
+        new = pd.Index(mapping(categories))
+    else:
+        new = categories.map(mapping)
+
+    missing = pd.isna(new)
+    labels, inverse = np.unique(np.asarray(new[~missing], dtype=object), return_inverse=True)
+    lookup = np.full(len(categories) + 1, -1, dtype=np.int64)
+    lookup[:-1][~missing] = inverse
+    codes = lookup[series.cat.codes.to_numpy()]  # código -1 (NaN) → última posição
+    return pd.Series(pd.Categorical.from_codes(codes, labels), index=series.index,
+                     name=series.name)
+
+
+def memory_report(df, stage, top=8):
+    """
+    Registra no log a memória do DataFrame (total e maiores colunas).
+
+    Parâmetros:
+    -----------
+    df : DataFrame
+    stage : str
+        Nome da etapa exibido no log (ex.: '02 limpeza')
+    top : int
+        Número de colunas detalhadas
+
+    Retorna:
+    --------
+    DataFrame com dtype e MB por coluna (ordem decrescente)
+    """
+
+    usage = df.memory_usage(index=True, deep=True)
+    report = pd.DataFrame({
+        'dtype': df.dtypes.astype(str).reindex(usage.index).fillna('index'),
+        'mb': usage / 1e6,
+    }).sort_values('mb', ascending=False)
+
+    logger.info(f"Memória [{stage}]: {report['mb'].sum():,.1f} MB "
+                f"({len(df):,} linhas × {df.shape[1]} colunas)")
+    for col, row in report.head(top).iterrows():
+        logger.info(f"    {col:<22} {row['dtype']:<10} {row['mb']:>10,.1f} MB")
+    return report
@@ -0,0 +1,119 @@
+"""
+Séries de tendência tratado × controle por período (cache em Parquet)
+
+Os gráficos de tendências paralelas e o teste de pré-tendências precisam
+apenas de média ponderada, N efetivo e erro padrão por célula
+(periodo × tratamento × outcome). Essas células são calculadas em um único
+groupby sobre os microdados e gravadas em um Parquet pequeno; os gráficos e
+testes leem o cache em vez de reprocessar o painel completo.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.panel_io import panel_columns, read_panel
+from utils.parquet_storage import write_parquet
+from utils.weighted_stats import grouped_weighted_stats
+
+TREND_COLUMNS = ['treatment', 'outcome', 'periodo', 'post', 'treated',
+                 'mean', 'se', 'n', 'n_eff', 'weight']
+
+
+def build_trend_series(df, outcomes, treatments='alta_exp', period_col='periodo',
+                       weight_col='peso'):
+    """
+    Calcula média ponderada, erro padrão e N efetivo por
+    (periodo × tratamento × outcome) em um groupby por variável de tratamento.
+
+    Parâmetros:
+    -----------
+    df : DataFrame
+        Microdados (ou apenas as colunas necessárias)
+    outcomes : list
+        Outcomes a resumir (ausentes são ignorados)
+    treatments : str ou list
+        Variável(is) de tratamento binária(s)
+
+    Retorna:
+    --------
+    DataFrame longo com as colunas de TREND_COLUMNS
+    """
+
+    treatments = [treatments] if isinstance(treatments, str) else list(treatments)
+    outcomes = [o for o in outcomes if o in df.columns]
+    has_post = 'post' in df.columns
+
+    parts = []
+    for treatment in treatments:
+        if treatment not in df.columns:
+            continue
+        keys = [period_col] + (['post'] if has_post else []) + [treatment]
+        stats = grouped_weighted_stats(df, keys, outcomes, weight_col,
+                                       stats=['mean', 'se', 'n', 'n_eff', 'weight'])
+        for outcome in outcomes:
+            cells = stats[outcome].reset_index()
+            cells = cells.rename(columns={period_col: 'periodo', treatment: 'treated'})
+            parts.append(cells.assign(treatment=treatment, outcome=outcome))
+
+    trends = pd.concat(parts, ignore_index=True)
+    if not has_post:
+        trends['post'] = np.nan
+    trends['periodo'] = trends['periodo'].astype(str)
+    trends['treated'] = trends['treated'].astype(int)
+    trends['n'] = trends['n'].astype(np.int64)
+    return trends[TREND_COLUMNS].sort_values(
+        ['treatment', 'outcome', 'periodo', 'treated']
+    ).reset_index(drop=True)
+
+
+def load_trend_series(source_path, cache_path, outcomes, treatments='alta_exp',
+                      rebuild=False):
+    """
+    Lê o cache de séries de tendência; reconstrói se estiver ausente,
+    desatualizado (source_path mais recente) ou sem as células pedidas.
+
+    Na reconstrução, lê do dataset de origem apenas as colunas necessárias.
+    """
+
+    source_path, cache_path = Path(source_path), Path(cache_path)
+    treatments = [treatments] if isinstance(treatments, str) else list(treatments)
+
+    available = set(panel_columns(source_path))
+    treatments = [t for t in treatments if t in available]
+    outcomes = [o for o in outcomes if o in available]
+
+    if (not rebuild and cache_path.exists()
+            and cache_path.stat().st_mtime >= source_path.stat().st_mtime):
+        trends = pd.read_parquet(cache_path)
+        if (set(treatments) <= set(trends['treatment'])
+                and set(outcomes) <= set(trends['outcome'])):
+            return trends
+
+    columns = [c for c in ['periodo', 'post', 'peso', *treatments, *outcomes] if c in available]
+    df = read_panel(source_path, columns=columns)
+
+    trends = build_trend_series(df, outcomes, treatments)
+    write_parquet(trends, cache_path)
+    return trends
+
+
+def select_trend(trends, outcome, treatment='alta_exp'):
+    """
+    Série larga de um outcome: uma linha por período com
+    mean_/se_/n_eff_ × treated/control e post (ordenada por período).
+
+    Aceita também microdados (colunas 'peso' e o outcome): nesse caso a série
+    é calculada na hora, sem cache.
+    """
+
+    if 'outcome' not in trends.columns:
+        trends = build_trend_series(trends, [outcome], treatment)
+
+    sub = trends[(trends['treatment'] == treatment) & (trends['outcome'] == outcome)]
+    wide = sub.pivot(index='periodo', columns='treated', values=['mean', 'se', 'n_eff'])
+    wide = wide.reindex(columns=pd.MultiIndex.from_product([['mean', 'se', 'n_eff'], [0, 1]]))
+    wide.columns = [f"{stat}_{'treated' if arm == 1 else 'control'}" for stat, arm in wide.columns]
+    wide['post'] = sub.groupby('periodo')['post'].first()
+    return wide.sort_index().reset_index()
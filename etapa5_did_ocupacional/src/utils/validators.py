@@ -5,6 +5,7 @@ Funções de validação para análise DiD
 import pandas as pd
 import numpy as np
 from utils.weighted_stats import weighted_mean
+from utils.trends import select_trend
 
 
 def validate_panel_completeness(df, required_quarters=16):
@@ -61,7 +62,7 @@ def validate_treatment_variation(df, treatment_var='alta_exp'):
     """
 
     # 1. Variação entre ocupações
-    treatment_by_occ = df.groupby('cod_ocupacao')[treatment_var].mean()
+    treatment_by_occ = df.groupby('cod_ocupacao', observed=True)[treatment_var].mean()
     n_treated_occ = (treatment_by_occ > 0.5).sum()
     n_control_occ = (treatment_by_occ < 0.5).sum()
 
@@ -69,7 +70,7 @@ def validate_treatment_variation(df, treatment_var='alta_exp'):
         return False, "Não há variação em tratamento entre ocupações"
 
     # 2. Constante dentro de ocupação?
-    variation_within = df.groupby('cod_ocupacao')[treatment_var].nunique()
+    variation_within = df.groupby('cod_ocupacao', observed=True)[treatment_var].nunique()
     n_varying = (variation_within > 1).sum()
 
     if n_varying > 0:
@@ -121,8 +122,11 @@ def validate_parallel_trends_assumption(df, outcome, treatment, n_pre_periods=8)
     # Remover missing
     df_pre = df_pre[[outcome, treatment, 'periodo', 'peso']].dropna()
 
-    # Criar dummies de período
-    period_dummies = pd.get_dummies(df_pre['periodo'], prefix='periodo')
+    # Criar dummies de período (só os períodos pré, se periodo for category)
+    periodo = df_pre['periodo']
+    if isinstance(periodo.dtype, pd.CategoricalDtype):
+        periodo = periodo.cat.remove_unused_categories()
+    period_dummies = pd.get_dummies(periodo, prefix='periodo')
 
     # Criar interações tratamento × período
     for col in period_dummies.columns:
@@ -159,6 +163,52 @@ def validate_parallel_trends_assumption(df, outcome, treatment, n_pre_periods=8)
         return None, f"Erro ao executar teste: {e}"
 
 
+def validate_parallel_trends_from_series(trends, outcome, treatment, n_pre_periods=8):
+    """
+    Teste de tendências paralelas a partir das séries de tendência em cache.
+
+    Usa apenas as células (periodo × tratamento) do período pré:
+    gap_p = média_tratado(p) − média_controle(p), com variância
+    EP_tratado² + EP_controle². Sob H0 (tendências paralelas) o gap é
+    constante; a estatística de Wald Σ (gap_p − gap_médio)² / var_p segue
+    χ² com (P − 1) graus de liberdade, onde gap_médio é a média ponderada
+    pelo inverso da variância.
+
+    Parâmetros:
+    -----------
+    trends : DataFrame
+        Séries de tendência (utils.trends.load_trend_series)
+    outcome : str
+    treatment : str
+    n_pre_periods : int
+        Número esperado de períodos pré-tratamento
+
+    Retorna:
+    --------
+    tuple : (p_valor, mensagem)
+    """
+
+    from scipy import stats
+
+    series = select_trend(trends, outcome, treatment)
+    pre = series[series['post'] == 0]
+
+    gap = (pre['mean_treated'] - pre['mean_control']).to_numpy()
+    var = (pre['se_treated'] ** 2 + pre['se_control'] ** 2).to_numpy()
+    valid = np.isfinite(gap) & np.isfinite(var) & (var > 0)
+    gap, var = gap[valid], var[valid]
+
+    if len(gap) < n_pre_periods:
+        return None, f"Apenas {len(gap)} períodos pré disponíveis (esperado: {n_pre_periods})"
+
+    gap_medio = np.sum(gap / var) / np.sum(1 / var)
+    wald = np.sum((gap - gap_medio) ** 2 / var)
+    dof = len(gap) - 1
+    p_value = float(stats.chi2.sf(wald, dof))
+
+    return p_value, f"Wald χ²({dof}) = {wald:.2f}, p = {p_value:.3f} (H0: gap pré-tratamento constante)"
+
+
 def validate_no_anticipation(df, outcome, treatment, periods_before=[-2, -1]):
     """
     Testa se há efeitos de antecipação (tratamento "vazando" para período pré).
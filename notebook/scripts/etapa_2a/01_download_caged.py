@@ -8,16 +8,36 @@ Duas estratégias de download disponíveis:
     (download paralelo via gRPC/Arrow). ~10x mais rápido que basedosdados.
   ESTRATÉGIA B (FALLBACK): Usa basedosdados (REST API). Mais lento, mas funcional.
 
+Os microdados são baixados em streaming: uma query por mês, lida em lotes
+Arrow (to_arrow_iterable) e gravada incrementalmente com um ParquetWriter.
+Cada row group tem no máximo CAGED_LINHAS_POR_ROW_GROUP linhas de um único
+mês, e a memória fica limitada a um row group mais os lotes em fila — o ano
+inteiro nunca é materializado em pandas. Compressão e codificação seguem o
+perfil PARQUET_PROFILE (parquet_storage); no perfil scan cada row group é
+ordenado por cbo_2002.
+
+Com QUERY_BACKEND=duckdb as mesmas queries rodam no armazém local de Parquet
+(python -m query_backend sintetico, na raiz do repositório), sem BigQuery.
+
 O script SEMPRE verifica se o parquet já existe antes de baixar.
 """
 
+import functools
+import os
 import sys
 import time
 from pathlib import Path
 
+import pyarrow as pa
+import pyarrow.parquet as pq
+
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from config import *
 
+sys.path.insert(0, str(REPO_ROOT))
+import parquet_storage
+import query_backend
+
 # ═══════════════════════════════════════════════════════════════════════════
 # CONFIGURAÇÃO DE ESTRATÉGIA
 # ═══════════════════════════════════════════════════════════════════════════
@@ -64,8 +84,22 @@ def download_basedosdados(query, descricao=""):
     return df
 
 
+def download_local(query, descricao=""):
+    """Backend local (QUERY_BACKEND=duckdb): DuckDB sobre o armazém de Parquet."""
+    print(f"  Executando query no armazém local{f' ({descricao})' if descricao else ''}...")
+    t0 = time.time()
+
+    df = query_backend.read_sql(query)
+
+    elapsed = time.time() - t0
+    print(f"  Concluído em {elapsed:.0f}s — {len(df):,} linhas")
+    return df
+
+
 def download(query, descricao=""):
-    """Dispatcher: escolhe estratégia A ou B."""
+    """Dispatcher: armazém local (QUERY_BACKEND=duckdb) ou estratégia A/B."""
+    if query_backend.get_backend() == "duckdb":
+        return download_local(query, descricao)
     if ESTRATEGIA == "A":
         try:
             return download_bigquery_rapido(query, descricao)
@@ -123,41 +157,164 @@ def verificar_cobertura():
     return df
 
 
+# ═══════════════════════════════════════════════════════════════════════════
+# DOWNLOAD EM STREAMING (lotes Arrow → Parquet)
+# ═══════════════════════════════════════════════════════════════════════════
+
+@functools.lru_cache(maxsize=None)
+def clientes_bigquery():
+    """Clientes BigQuery + Storage Read API (criados uma vez por execução)."""
+    from google.cloud import bigquery, bigquery_storage
+
+    return bigquery.Client(project=GCP_PROJECT_ID), bigquery_storage.BigQueryReadClient()
+
+
+def lotes_bigquery_rapido(query):
+    """Estratégia A: lotes Arrow da Storage Read API, no máximo CAGED_LOTES_EM_FILA em fila."""
+    client, bqstorage = clientes_bigquery()
+    resultado = client.query(query).result()
+    yield from resultado.to_arrow_iterable(bqstorage_client=bqstorage,
+                                           max_queue_size=CAGED_LOTES_EM_FILA)
+
+
+def lotes_basedosdados(query):
+    """Estratégia B: basedosdados não tem streaming — o mês vem inteiro e é fatiado.
+
+    A conversão usa SCHEMA_CAGED, e não os tipos inferidos pelo pandas (coluna
+    toda nula viraria null; inteiro com NaN viraria float64).
+    """
+    import basedosdados as bd
+
+    df = bd.read_sql(query, billing_project_id=GCP_PROJECT_ID)
+    yield from pa.Table.from_pandas(df[SCHEMA_CAGED.names], schema=SCHEMA_CAGED,
+                                    preserve_index=False).to_batches()
+
+
+def lotes_local(query):
+    """Backend local (QUERY_BACKEND=duckdb): lotes Arrow do DuckDB."""
+    with query_backend.LocalWarehouse() as wh:
+        yield from wh.iter_batches(query)
+
+
+def conformar_lote(lote, schema=SCHEMA_CAGED):
+    """Lote Arrow com as colunas e os tipos de schema (cast coluna a coluna)."""
+    return pa.RecordBatch.from_arrays(
+        [lote.column(campo.name).cast(campo.type) for campo in schema], schema=schema
+    )
+
+
+def gravar_ano_streaming(ano, lotes, parquet_path, schema=SCHEMA_CAGED):
+    """
+    Baixa um ano mês a mês e grava os lotes em parquet_path à medida que chegam.
+
+    Os lotes de cada mês são acumulados até CAGED_LINHAS_POR_ROW_GROUP linhas
+    e gravados como um row group (row groups nunca misturam meses). O arquivo
+    é escrito em um temporário e renomeado no fim: uma falha não deixa
+    caged_{ano}.parquet pela metade.
+
+    O arquivo tem sempre o schema dado (SCHEMA_CAGED), e cada lote é
+    convertido para ele: os tipos não dependem do primeiro mês baixado.
+
+    Retorna o número de linhas gravadas.
+    """
+    tmp = parquet_path.with_name('.' + parquet_path.name + '.tmp')
+    writer = None
+    n_total = 0
+
+    try:
+        for mes in range(1, 13):
+            query = f"""
+            SELECT {COLUNAS_CAGED}
+            FROM `basedosdados.br_me_caged.microdados_movimentacao`
+            WHERE ano = {ano} AND mes = {mes}
+            """
+            buffer, n_buffer, n_mes = [], 0, 0
+
+            for lote in lotes(query):
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp, schema,
+                                              **parquet_storage.write_options(schema))
+                buffer.append(conformar_lote(lote, schema))
+                n_buffer += lote.num_rows
+
+                if n_buffer >= CAGED_LINHAS_POR_ROW_GROUP:
+                    writer.write_table(parquet_storage.sort_table(pa.Table.from_batches(buffer)),
+                                       row_group_size=n_buffer)
+                    n_mes += n_buffer
+                    buffer, n_buffer = [], 0
+
+            if n_buffer:
+                writer.write_table(parquet_storage.sort_table(pa.Table.from_batches(buffer)),
+                                   row_group_size=n_buffer)
+                n_mes += n_buffer
+            del buffer
+
+            n_total += n_mes
+            print(f"    {ano}-{mes:02d}: {n_mes:,} linhas", flush=True)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
+        raise
+
+    if writer is None:
+        raise RuntimeError(f"CAGED {ano}: nenhuma linha retornada")
+    writer.close()
+    os.replace(tmp, parquet_path)
+    return n_total
+
+
+def resumo_parquet(ano):
+    """Linhas, tamanho e colunas de caged_{ano}.parquet, lidos só do rodapé."""
+    parquet_path = DATA_RAW / f"caged_{ano}.parquet"
+    meta = pq.ParquetFile(parquet_path).metadata
+    return {
+        'ano': ano,
+        'linhas': meta.num_rows,
+        'mb': parquet_path.stat().st_size / 1e6,
+        'colunas': meta.schema.to_arrow_schema().names,
+    }
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # DOWNLOAD ANO A ANO
 # ═══════════════════════════════════════════════════════════════════════════
 
 def download_caged_ano(ano):
-    """Baixar microdados de um ano. Pula se parquet já existe."""
+    """Baixar microdados de um ano em streaming. Pula se parquet já existe."""
     parquet_path = DATA_RAW / f"caged_{ano}.parquet"
 
     # ── Caminho rápido: já existe ──
     if parquet_path.exists():
-        size_mb = parquet_path.stat().st_size / 1e6
-        print(f"\n  [{ano}] JÁ EXISTE: {parquet_path.name} ({size_mb:.1f} MB)")
-        df_ano = pd.read_parquet(parquet_path)
-        print(f"  [{ano}] Carregado do disco: {len(df_ano):,} registros")
-        return df_ano
+        resumo = resumo_parquet(ano)
+        print(f"\n  [{ano}] JÁ EXISTE: {parquet_path.name} ({resumo['mb']:.1f} MB, "
+              f"{resumo['linhas']:,} registros)")
+        return resumo
 
     # ── Download do BigQuery ──
-    print(f"\n  [{ano}] Iniciando download...")
+    print(f"\n  [{ano}] Iniciando download (streaming mês a mês)...")
 
-    query = f"""
-    SELECT {COLUNAS_CAGED}
-    FROM `basedosdados.br_me_caged.microdados_movimentacao`
-    WHERE ano = {ano}
-    """
+    if query_backend.get_backend() == "duckdb":
+        lotes = lotes_local
+    elif ESTRATEGIA == "A":
+        lotes = lotes_bigquery_rapido
+    else:
+        lotes = lotes_basedosdados
 
     t0 = time.time()
-    df_ano = download(query, f"CAGED {ano}")
+    try:
+        n = gravar_ano_streaming(ano, lotes, parquet_path)
+    except Exception as e:
+        if lotes is not lotes_bigquery_rapido:
+            raise
+        print(f"  AVISO: Estratégia A falhou ({e}). Refazendo {ano} com fallback (basedosdados)...")
+        n = gravar_ano_streaming(ano, lotes_basedosdados, parquet_path)
     elapsed = time.time() - t0
 
-    # Salvar
-    df_ano.to_parquet(parquet_path, index=False)
-    size_mb = parquet_path.stat().st_size / 1e6
-    print(f"  [{ano}] Salvo: {parquet_path.name} ({size_mb:.1f} MB, {elapsed:.0f}s)")
-
-    return df_ano
+    resumo = resumo_parquet(ano)
+    print(f"  [{ano}] Salvo: {parquet_path.name} ({resumo['mb']:.1f} MB, {n:,} linhas, "
+          f"{elapsed:.0f}s)")
+    return resumo
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -171,6 +328,7 @@ def main():
     print(f"  Período: {ANO_INICIO}–{ANO_FIM}")
     print(f"  Projeto GCP: {GCP_PROJECT_ID}")
     print(f"  Estratégia: {'A (BigQuery Storage API — rápido)' if ESTRATEGIA == 'A' else 'B (basedosdados — fallback)'}")
+    print(f"  Backend de consultas: {query_backend.get_backend()}")
     print(f"  Destino: {DATA_RAW}")
 
     # ── Verificar o que já foi baixado ──
@@ -195,33 +353,31 @@ def main():
 
     # ── Download ano a ano ──
     print(f"\n--- Download dos microdados ---")
-    dfs_anuais = []
+    resumos = []
     t_total = time.time()
 
     for ano in range(ANO_INICIO, ANO_FIM + 1):
-        df_ano = download_caged_ano(ano)
-        dfs_anuais.append(df_ano)
+        resumos.append(download_caged_ano(ano))
 
     elapsed_total = time.time() - t_total
 
-    # ── Resumo (SEM concatenar — evita OOM com ~180M linhas) ──
+    # ── Resumo (só metadados dos arquivos — nada é carregado em memória) ──
     print(f"\n{'=' * 60}")
     print(f"RESUMO — Download CAGED")
     print(f"{'=' * 60}")
-    total_linhas = sum(len(df) for df in dfs_anuais)
+    total_linhas = sum(r['linhas'] for r in resumos)
     print(f"  Total: {total_linhas:,} movimentações ({ANO_INICIO}–{ANO_FIM})")
     print(f"  Tempo total: {elapsed_total:.0f}s")
-    for df_ano in dfs_anuais:
-        ano = int(df_ano['ano'].iloc[0])
-        print(f"    {ano}: {len(df_ano):,}")
-    print(f"  Colunas: {list(dfs_anuais[0].columns)}")
-    total_mb = sum((DATA_RAW / f"caged_{a}.parquet").stat().st_size for a in range(ANO_INICIO, ANO_FIM + 1)) / 1e6
-    print(f"  Total em disco: {total_mb:.0f} MB ({len(dfs_anuais)} arquivos)")
+    for r in resumos:
+        print(f"    {r['ano']}: {r['linhas']:,}")
+    print(f"  Colunas: {resumos[0]['colunas']}")
+    total_mb = sum(r['mb'] for r in resumos)
+    print(f"  Total em disco: {total_mb:.0f} MB ({len(resumos)} arquivos)")
     print(f"\n  NOTA: Arquivos mantidos separados por ano para evitar OOM na concatenação.")
     print(f"  Scripts downstream carregam ano a ano e processam incrementalmente.")
 
-    return dfs_anuais
+    return resumos
 
 
 if __name__ == "__main__":
-    df = main()
+    resumos = main()
@@ -3,84 +3,118 @@ Script 02: Verificar dados CAGED (CHECKPOINT)
 Entrada: data/raw/caged_{ano}.parquet
 Saída:   (prints de verificação — nenhum arquivo)
 
-Carrega ano a ano para evitar OOM.
+As verificações saem dos rodapés Parquet (parquet_storage.ParquetStats):
+linhas por ano e mês, colunas, preenchimento e faixas de valores vêm das
+estatísticas de row group, sem carregar os microdados. Só colunas cujas
+estatísticas não decidem a verificação são lidas (e apenas elas).
+
+Uso:
+    python 02_verificar_caged.py              # só rodapés
+    python 02_verificar_caged.py --detalhado  # + distribuição do saldo e CBOs únicos
+                                              #   (lê as duas colunas)
 """
 
 import sys
+import time
 from pathlib import Path
 
+import pyarrow.parquet as pq
+
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from config import *
 
+sys.path.insert(0, str(REPO_ROOT))
+from parquet_storage import ParquetStats
+
+COLUNAS_PREENCHIMENTO = ['cbo_2002', 'saldo_movimentacao', 'salario_mensal', 'idade', 'sexo']
+
+# Faixas plausíveis (valores fora são contados, não removidos)
+FAIXAS = {
+    'saldo_movimentacao': (-1, 1),
+    'idade': (10, 100),
+    'mes': (1, 12),
+}
+
 
 def main():
+    detalhado = '--detalhado' in sys.argv
+
     print("=" * 60)
     print("CHECKPOINT — Microdados CAGED")
     print("=" * 60)
+    t0 = time.time()
 
     # ── Verificar arquivos ──
-    total_registros = 0
-    registros_por_ano = {}
-
-    for ano in range(ANO_INICIO, ANO_FIM + 1):
-        p = DATA_RAW / f"caged_{ano}.parquet"
+    arquivos = {ano: DATA_RAW / f"caged_{ano}.parquet" for ano in range(ANO_INICIO, ANO_FIM + 1)}
+    for p in arquivos.values():
         if not p.exists():
             print(f"  ERRO: {p.name} não encontrado!")
             return
-        size_mb = p.stat().st_size / 1e6
-        df = pd.read_parquet(p)
-        registros_por_ano[ano] = len(df)
-        total_registros += len(df)
-        print(f"  {ano}: {len(df):,} registros ({size_mb:.0f} MB)")
 
-        # Liberar memória
-        del df
-
-    print(f"\n  Total: {total_registros:,} registros")
+    stats = {ano: ParquetStats(p) for ano, p in arquivos.items()}
+    for ano, p in arquivos.items():
+        size_mb = p.stat().st_size / 1e6
+        print(f"  {ano}: {stats[ano].num_rows:,} registros ({size_mb:.0f} MB)")
+    print(f"\n  Total: {sum(s.num_rows for s in stats.values()):,} registros")
 
     # ── Verificação detalhada ano a ano ──
     print(f"\n--- Verificação detalhada ---")
 
     todas_colunas = None
-    for ano in range(ANO_INICIO, ANO_FIM + 1):
-        df = pd.read_parquet(DATA_RAW / f"caged_{ano}.parquet")
+    for ano, p in arquivos.items():
         print(f"\n  [{ano}]")
+        stats_ano = stats[ano]
+        n = stats_ano.num_rows
 
-        # Colunas
+        # Colunas (schema do rodapé)
+        colunas = stats_ano.schema.names
         if todas_colunas is None:
-            todas_colunas = set(df.columns)
-            print(f"    Colunas: {list(df.columns)}")
-        else:
-            if set(df.columns) != todas_colunas:
-                print(f"    AVISO: Colunas diferentes! {set(df.columns) - todas_colunas}")
+            todas_colunas = set(colunas)
+            print(f"    Colunas: {colunas}")
+        elif set(colunas) != todas_colunas:
+            print(f"    AVISO: Colunas diferentes! {set(colunas) ^ todas_colunas}")
 
         # Meses cobertos
-        meses = sorted(df['mes'].dropna().unique())
-        print(f"    Meses: {len(meses)} — {list(meses)}")
+        meses = list(stats_ano.counts_by('mes').index)
+        print(f"    Meses: {len(meses)} — {meses}")
         if len(meses) != 12:
             print(f"    WARNING: Esperado 12 meses, encontrado {len(meses)}")
 
         # Preenchimento
-        for col in ['cbo_2002', 'saldo_movimentacao', 'salario_mensal', 'idade', 'sexo']:
-            if col in df.columns:
-                n_valid = df[col].notna().sum()
-                pct = n_valid / len(df) * 100
-                flag = "" if pct > 95 else " WARNING" if pct > 80 else " CRÍTICO"
-                print(f"    {col}: {pct:.1f}%{flag}")
-
-        # Saldo movimentação
-        if 'saldo_movimentacao' in df.columns:
-            saldo_vals = df['saldo_movimentacao'].value_counts()
-            for val, count in saldo_vals.items():
-                print(f"    saldo={val}: {count:,} ({count/len(df):.1%})")
-
-        # CBO
-        if 'cbo_2002' in df.columns:
-            n_cbo = df['cbo_2002'].nunique()
-            sample = df['cbo_2002'].dropna().astype(str).head(5).tolist()
-            print(f"    CBOs únicos: {n_cbo:,}, amostra: {sample}")
-
-        del df
+        presentes = [c for c in COLUNAS_PREENCHIMENTO if c in colunas]
+        nulos = stats_ano.null_counts(presentes)
+        for col in presentes:
+            pct = (n - nulos[col]) / n * 100
+            flag = "" if pct > 95 else " WARNING" if pct > 80 else " CRÍTICO"
+            print(f"    {col}: {pct:.1f}%{flag}")
+
+        # Faixas
+        for col, (lo, hi) in FAIXAS.items():
+            if col in colunas:
+                fora = stats_ano.rows_out_of_range(col, lo, hi)
+                vmin, vmax = stats_ano.value_range(col)
+                flag = "" if fora == 0 else f" WARNING: {fora:,} fora de [{lo}, {hi}]"
+                print(f"    {col}: [{vmin}, {vmax}]{flag}")
+
+        if detalhado:
+            # Saldo movimentação
+            if 'saldo_movimentacao' in colunas:
+                for val, count in stats_ano.counts_by('saldo_movimentacao').items():
+                    print(f"    saldo={val}: {count:,} ({count/n:.1%})")
+
+            # CBO
+            if 'cbo_2002' in colunas:
+                n_cbo = len(stats_ano.counts_by('cbo_2002'))
+                print(f"    CBOs únicos: {n_cbo:,}")
+
+        if 'cbo_2002' in colunas:
+            lote = next(pq.ParquetFile(p).iter_batches(batch_size=5, columns=['cbo_2002']))
+            print(f"    CBO amostra: {[str(c) for c in lote.column(0).to_pylist()]}")
+
+    lidas = sum(sum(s.scanned.values()) for s in stats.values())
+    n_rg = sum(s.num_row_groups for s in stats.values())
+    print(f"\n  Verificação em {time.time() - t0:.2f}s "
+          f"({n_rg} row groups; valores lidos dos dados: {lidas:,})")
 
     print(f"\n{'=' * 60}")
     print(f"CHECKPOINT CONCLUÍDO")
@@ -3,7 +3,12 @@ Script 03: Agregar microdados CAGED em painel mensal por ocupação
 Entrada: data/raw/caged_{ano}.parquet
 Saída:   data/processed/painel_caged_mensal.parquet
 
-Processa ano a ano para evitar OOM, agrega por CBO 4 dígitos × mês.
+Processa ano a ano e, dentro do ano, row group a row group (memória limitada).
+A leitura (leitura_caged.py) traz só as colunas usadas, com filtro de CBO,
+cbo_4d e flags calculados no scan Arrow, e agrega os row groups em paralelo.
+Médias e contagens são acumuladas como somas aditivas; percentis salariais
+vêm de um sketch de quantis mesclável (weighted_stats.sketch) por row group,
+validado contra o cálculo exato em uma amostra de células.
 OTIMIZADO: evita lambdas no groupby (que são ~100x mais lentos).
 """
 
@@ -13,6 +18,13 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from config import *
+from leitura_caged import cbo_4d_texto, ler_row_group, processar_row_groups
+
+sys.path.insert(0, str(REPO_ROOT))
+from parquet_storage import write_parquet
+from weighted_stats import GroupedQuantileSketch
+
+CHAVES = ['cbo_4d', 'ano', 'mes']
 
 
 def log(msg):
@@ -20,69 +32,120 @@ def log(msg):
     print(msg, flush=True)
 
 
+def validar_quantis(estimado, amostra):
+    """Compara a mediana do sketch com a mediana exata nas células amostradas."""
+    if len(amostra) == 0:
+        return
+    exata = amostra.groupby(CHAVES)['salario_mensal'].median()
+    comparacao = pd.DataFrame({'exata': exata, 'sketch': estimado['p50']}).dropna()
+
+    erros_rank = []
+    for chave, valores in amostra.dropna().groupby(CHAVES)['salario_mensal']:
+        v = np.sort(valores.to_numpy())
+        e = comparacao.loc[chave, 'sketch']
+        # Rank da estimativa dentro da distribuição exata (intervalo de empates)
+        lo = np.searchsorted(v, e, side='left') / len(v)
+        hi = np.searchsorted(v, e, side='right') / len(v)
+        erros_rank.append(max(0.0, lo - 0.5, 0.5 - hi))
+
+    erro_rel = ((comparacao['sketch'] - comparacao['exata']).abs()
+                / comparacao['exata'].abs().clip(lower=1))
+    max_rank = max(erros_rank) if erros_rank else 0.0
+    log(f"    Validação (amostra de {len(comparacao):,} células): "
+        f"erro de rank máx = {max_rank:.4f} | erro relativo mediano = {erro_rel.median():.2%}")
+    if max_rank > 2 * SKETCH_EPS:
+        log(f"    ⚠ Erro de rank acima de 2×eps ({2 * SKETCH_EPS}) — revisar SKETCH_EPS")
+
+
+def agregar_row_group(fragmento):
+    """Lê e agrega um row group (roda numa thread de processar_row_groups)."""
+    df_adm, df_des, n_lidas, n_validas = ler_row_group(fragmento)
+
+    # ── Somas aditivas (médias são recompostas ao final do ano) ──
+    parcial_adm = df_adm.groupby(CHAVES).agg(
+        admissoes=('saldo_movimentacao', 'count'),
+        soma_salario=('salario_mensal', 'sum'),
+        n_salario=('salario_mensal', 'count'),
+        soma_idade=('idade', 'sum'),
+        n_idade=('idade', 'count'),
+        soma_mulher=('is_mulher', 'sum'),
+        soma_superior=('is_superior', 'sum'),
+    )
+    parcial_des = df_des.groupby(CHAVES).agg(
+        desligamentos=('saldo_movimentacao', 'count'),
+        soma_salario=('salario_mensal', 'sum'),
+        n_salario=('salario_mensal', 'count'),
+    )
+
+    # ── Percentis salariais: sketch do row group + amostra para validação ──
+    sketch = GroupedQuantileSketch(CHAVES, eps=SKETCH_EPS).update(df_adm, 'salario_mensal')
+    na_amostra = df_adm['cbo_4d'] % AMOSTRA_VALIDACAO_CBO == 0
+    amostra = df_adm.loc[na_amostra, CHAVES + ['salario_mensal']]
+
+    contagens = (n_lidas, n_validas, len(df_adm), len(df_des))
+    return contagens, parcial_adm, parcial_des, sketch, amostra
+
+
 def processar_ano(ano):
-    """Carrega um ano e retorna painéis de admissões e desligamentos."""
+    """Agrega um ano row group a row group; retorna painéis de admissões e desligamentos."""
     t0 = time.time()
-    df = pd.read_parquet(DATA_RAW / f"caged_{ano}.parquet")
-    log(f"  [{ano}] Carregado: {len(df):,} registros ({time.time()-t0:.0f}s)")
-
-    # ── CBO 4 dígitos ──
-    df['cbo_2002'] = df['cbo_2002'].astype(str).str.strip()
-    df['cbo_4d'] = df['cbo_2002'].str[:4]
-
-    # Remover CBO inválidos
-    cbo_invalidos = ['0000', 'nan', '', 'None']
-    n_antes = len(df)
-    df = df[~df['cbo_4d'].isin(cbo_invalidos)]
-    df = df[df['cbo_4d'].str.len() == 4]
-    df = df[df['cbo_4d'].str.isdigit()]
-    n_depois = len(df)
+    sketch = GroupedQuantileSketch(CHAVES, eps=SKETCH_EPS)
+    parciais_adm, parciais_des, amostra = [], [], []
+    n_antes = n_depois = n_adm = n_des = n_row_groups = 0
+
+    resultados = processar_row_groups(DATA_RAW / f"caged_{ano}.parquet",
+                                      agregar_row_group, LEITURA_THREADS)
+    for contagens, parcial_adm, parcial_des, sketch_rg, amostra_rg in resultados:
+        lidas, validas, adm, des = contagens
+        n_antes += lidas
+        n_depois += validas
+        n_adm += adm
+        n_des += des
+        n_row_groups += 1
+        parciais_adm.append(parcial_adm)
+        parciais_des.append(parcial_des)
+        sketch.merge(sketch_rg)
+        amostra.append(amostra_rg)
+
+    log(f"  [{ano}] Lido: {n_antes:,} registros em {n_row_groups} row groups "
+        f"({LEITURA_THREADS} threads, {time.time()-t0:.0f}s)")
     log(f"  [{ano}] CBOs válidos: {n_depois:,} / {n_antes:,} ({n_depois/n_antes:.1%})")
-
-    # ── PRÉ-COMPUTAR flags booleanas (VETORIZADO — muito mais rápido que lambda) ──
-    df['is_mulher'] = (df['sexo'].astype(str) == '2').astype(float)
-    df['is_superior'] = df['grau_instrucao'].astype(str).isin(
-        ['9', '10', '11', '12', '13']).astype(float)
-
-    # ── Separar admissões e desligamentos ──
-    df_adm = df[df['saldo_movimentacao'] == 1]
-    df_des = df[df['saldo_movimentacao'] == -1]
-    log(f"  [{ano}] Admissões: {len(df_adm):,} | Desligamentos: {len(df_des):,}")
+    log(f"  [{ano}] Admissões: {n_adm:,} | Desligamentos: {n_des:,}")
 
     # ── Agregar admissões ──
-    # NOTA: 'median' removida do agg para performance (~10x mais rápido).
-    # Calculada separadamente depois via quantile.
     t1 = time.time()
-    painel_adm = df_adm.groupby(['cbo_4d', 'ano', 'mes']).agg(
-        admissoes=('saldo_movimentacao', 'count'),
-        salario_medio_adm=('salario_mensal', 'mean'),
-        idade_media_adm=('idade', 'mean'),
-        pct_mulher_adm=('is_mulher', 'mean'),
-        pct_superior_adm=('is_superior', 'mean'),
-    ).reset_index()
+    soma = pd.concat(parciais_adm).groupby(level=CHAVES).sum()
+    painel_adm = pd.DataFrame({
+        'admissoes': soma['admissoes'],
+        'salario_medio_adm': soma['soma_salario'] / soma['n_salario'],
+        'idade_media_adm': soma['soma_idade'] / soma['n_idade'],
+        'pct_mulher_adm': soma['soma_mulher'] / soma['admissoes'],
+        'pct_superior_adm': soma['soma_superior'] / soma['admissoes'],
+    })
     log(f"  [{ano}] Admissões agregadas: {len(painel_adm):,} ({time.time()-t1:.0f}s)")
 
-    # Mediana salarial (separada — mais rápida que dentro do agg)
+    # Percentis salariais a partir do sketch (memória limitada)
     t1 = time.time()
-    mediana = df_adm.groupby(['cbo_4d', 'ano', 'mes'])['salario_mensal'].median().reset_index()
-    mediana.columns = ['cbo_4d', 'ano', 'mes', 'salario_mediano_adm']
-    painel_adm = painel_adm.merge(mediana, on=['cbo_4d', 'ano', 'mes'], how='left')
-    log(f"  [{ano}] Mediana salarial: ({time.time()-t1:.0f}s)")
+    quantis = sketch.quantiles(list(QUANTIS_SALARIO_ADM.values()))
+    quantis.columns = list(QUANTIS_SALARIO_ADM.keys())
+    painel_adm = painel_adm.join(quantis).reset_index()
+    painel_adm['cbo_4d'] = cbo_4d_texto(painel_adm['cbo_4d'])
+    log(f"  [{ano}] Percentis salariais: {sketch.n_centroids:,} centróides ({time.time()-t1:.0f}s)")
+    validar_quantis(sketch.quantiles([0.5]), pd.concat(amostra))
 
     # ── Agregar desligamentos ──
     t1 = time.time()
-    painel_des = df_des.groupby(['cbo_4d', 'ano', 'mes']).agg(
-        desligamentos=('saldo_movimentacao', 'count'),
-        salario_medio_desl=('salario_mensal', 'mean'),
-    ).reset_index()
+    soma = pd.concat(parciais_des).groupby(level=CHAVES).sum()
+    painel_des = pd.DataFrame({
+        'desligamentos': soma['desligamentos'],
+        'salario_medio_desl': soma['soma_salario'] / soma['n_salario'],
+    }).reset_index()
+    painel_des['cbo_4d'] = cbo_4d_texto(painel_des['cbo_4d'])
     log(f"  [{ano}] Desligamentos agregados: {len(painel_des):,} ({time.time()-t1:.0f}s)")
 
     elapsed = time.time() - t0
     log(f"  [{ano}] Total: {elapsed:.0f}s")
 
-    # Liberar memória
-    del df, df_adm, df_des
-
     return painel_adm, painel_des
 
 
@@ -134,7 +197,7 @@ def main():
     painel['cbo_2d'] = painel['cbo_4d'].str[:2]
 
     # ── Salvar ──
-    painel.to_parquet(PAINEL_MENSAL_FILE, index=False)
+    write_parquet(painel, PAINEL_MENSAL_FILE)
     size_mb = PAINEL_MENSAL_FILE.stat().st_size / 1e6
 
     elapsed_total = time.time() - t_total
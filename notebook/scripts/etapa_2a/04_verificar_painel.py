@@ -2,6 +2,9 @@
 Script 04: Verificar painel agregado (CHECKPOINT)
 Entrada: data/processed/painel_caged_mensal.parquet
 Saída:   (prints de verificação — nenhum arquivo)
+
+Colunas, número de linhas e faixas (mes, post) são verificados pelo rodapé
+Parquet; só as colunas usadas nas estatísticas abaixo são carregadas.
 """
 
 import sys
@@ -10,14 +13,31 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from config import *
 
+sys.path.insert(0, str(REPO_ROOT))
+from parquet_storage import ParquetStats, validate_parquet
+
+COLUNAS_CHAVE = ['cbo_4d', 'ano', 'mes', 'periodo', 'periodo_num', 'post']
+COLUNAS_STATS = ['admissoes', 'desligamentos', 'saldo', 'salario_medio_adm']
+
 
 def main():
     print("=" * 60)
     print("CHECKPOINT — Painel Ocupação × Mês")
     print("=" * 60)
 
-    painel = pd.read_parquet(PAINEL_MENSAL_FILE)
-    print(f"Carregado: {len(painel):,} linhas")
+    # ── Rodapé: colunas, linhas e faixas sem ler os dados ──
+    stats = ParquetStats(PAINEL_MENSAL_FILE)
+    ok, erros = validate_parquet(PAINEL_MENSAL_FILE, required_columns=COLUNAS_CHAVE,
+                                 ranges={'mes': (1, 12), 'post': (0, 1)}, stats=stats)
+    print(f"Linhas (rodapé): {stats.num_rows:,}")
+    for erro in erros:
+        print(f"  ERRO: {erro}")
+    if not ok:
+        return
+
+    colunas = COLUNAS_CHAVE + [c for c in COLUNAS_STATS if c in stats.schema.names]
+    painel = pd.read_parquet(PAINEL_MENSAL_FILE, columns=colunas)
+    print(f"Carregado: {len(painel):,} linhas × {len(colunas)} colunas")
 
     # ── Dimensões ──
     n_ocup = painel['cbo_4d'].nunique()
@@ -38,8 +58,7 @@ def main():
 
     # ── Estatísticas descritivas ──
     print(f"\n--- Estatísticas descritivas ---")
-    cols_stats = ['admissoes', 'desligamentos', 'saldo', 'salario_medio_adm']
-    cols_disponíveis = [c for c in cols_stats if c in painel.columns]
+    cols_disponíveis = [c for c in COLUNAS_STATS if c in painel.columns]
     print(painel[cols_disponíveis].describe().round(2))
 
     # ── Série temporal ──
@@ -37,6 +37,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from config import *
 
+sys.path.insert(0, str(REPO_ROOT))
+from occupation_crosswalk import HierarchicalCrosswalk, correspondence_means
+from parquet_storage import write_parquet
+from reference_cache import read_excel_cached
+
 
 def log(msg):
     print(msg, flush=True)
@@ -68,7 +73,7 @@ def carregar_correspondencia_isco():
         log(f"AVISO: {ISCO_08_88_FILE} não encontrado.")
         return {}, {}
 
-    df = pd.read_excel(ISCO_08_88_FILE, sheet_name='ISCO-08 to 88')
+    df = read_excel_cached(ISCO_08_88_FILE, sheet_name='ISCO-08 to 88')
     df['isco08_4d'] = df['ISCO-08 code'].astype(str).str.strip().str.zfill(4)
     df['isco88_4d'] = df['ISCO-88 code'].astype(str).str.strip().str.zfill(4)
 
@@ -130,26 +135,27 @@ def crosswalk_2d(painel, df_ilo, ilo_2d, ilo_1d):
     log(f"PARTE A: Crosswalk 2 dígitos (PRINCIPAL)")
     log(f"{'=' * 60}")
 
-    # Match 2d direto
-    painel['exposure_score_2d'] = painel['cbo_2d'].map(ilo_2d)
-    painel['match_level_2d'] = np.where(painel['exposure_score_2d'].notna(), '2-digit', None)
-
-    n_2d = painel['exposure_score_2d'].notna().sum()
+    # Match 2d direto → fallback 1d (média do major group)
+    crosswalk = HierarchicalCrosswalk([
+        ('2-digit', 2, ilo_2d),
+        ('1-digit (fallback)', 1, ilo_1d),
+    ])
+    # Linhas sem match em nenhum nível ficam rotuladas como fallback 1d
+    # (score nulo), como antes: contagens por match_level_2d cobrem o painel
+    resultado = crosswalk.match(painel['cbo_4d'], unmatched='1-digit (fallback)')
+    painel['exposure_score_2d'] = resultado['value']
+    painel['match_level_2d'] = resultado['match_level']
+
+    n_2d = (painel['match_level_2d'] == '2-digit').sum()
     log(f"\n  Match 2d direto: {n_2d:,} / {len(painel):,} ({n_2d/len(painel):.1%})")
 
     # CBOs sem match 2d
-    sem_match_2d = sorted(painel[painel['exposure_score_2d'].isna()]['cbo_2d'].unique())
+    sem_match_2d = sorted(painel.loc[painel['match_level_2d'] != '2-digit', 'cbo_2d'].unique())
     if sem_match_2d:
         log(f"  CBO 2d sem match ISCO-08 2d: {sem_match_2d}")
 
-    # Fallback a 1d para linhas sem match 2d
-    mask_na = painel['exposure_score_2d'].isna()
-    if mask_na.any():
-        cbo_1d = painel.loc[mask_na, 'cbo_4d'].str[:1]
-        painel.loc[mask_na, 'exposure_score_2d'] = cbo_1d.map(ilo_1d).values
-        painel.loc[mask_na, 'match_level_2d'] = '1-digit (fallback)'
-
-        n_1d = painel.loc[mask_na, 'exposure_score_2d'].notna().sum()
+    n_1d = (painel['match_level_2d'] == '1-digit (fallback)').sum()
+    if n_1d:
         log(f"  Fallback 1d: {n_1d:,} linhas adicionais")
 
     # Reportar CBOs sem match em nenhum nível
@@ -203,116 +209,42 @@ def crosswalk_4d(painel, df_ilo, ilo_4d, ilo_3d, ilo_2d, ilo_1d,
     cbos_unicos = sorted(painel['cbo_4d'].unique())
     log(f"  CBOs 4d únicos no painel: {len(cbos_unicos)}")
 
-    # --- Construir score 4d para cada CBO 4d ---
-    cbo_score_4d = {}
-    cbo_match_level = {}
-
-    # Contadores por nível
-    counts = {
-        'N1_isco08_4d': 0,
-        'N2_via_isco88_4d': 0,
-        'N3_isco08_3d': 0,
-        'N4_via_isco88_3d': 0,
-        'N5_isco08_2d': 0,
-        'N6_isco08_1d': 0,
-        'sem_match': 0,
-    }
-
-    for cbo in cbos_unicos:
-        score = None
-        level = None
-
-        # ── Nível 1: CBO 4d = ISCO-08 4d (match direto) ──
-        if cbo in ilo_4d:
-            score = ilo_4d[cbo]
-            level = 'N1: ISCO-08 4d direto'
-            counts['N1_isco08_4d'] += 1
-
-        # ── Nível 2: CBO 4d = ISCO-88 4d → ISCO-08 via correspondência ──
-        if score is None and cbo in isco88_to_08:
-            isco08_candidates = isco88_to_08[cbo]
-            # Média dos scores dos candidatos ISCO-08 presentes no ILO
-            scores_cand = [ilo_4d[c] for c in isco08_candidates if c in ilo_4d]
-            if scores_cand:
-                score = np.mean(scores_cand)
-                level = 'N2: via ISCO-88→08 4d'
-                counts['N2_via_isco88_4d'] += 1
-
-        # ── Nível 3: CBO 3d = ISCO-08 3d (média do Minor Group) ──
-        if score is None:
-            cbo_3d = cbo[:3]
-            if cbo_3d in ilo_3d:
-                score = ilo_3d[cbo_3d]
-                level = 'N3: ISCO-08 3d'
-                counts['N3_isco08_3d'] += 1
-
-        # ── Nível 4: CBO 3d = ISCO-88 3d → ISCO-08 3d via correspondência ──
-        if score is None:
-            cbo_3d = cbo[:3]
-            if cbo_3d in isco88_3d_to_08_3d:
-                isco08_3d_candidates = isco88_3d_to_08_3d[cbo_3d]
-                scores_cand = [ilo_3d[c] for c in isco08_3d_candidates if c in ilo_3d]
-                if scores_cand:
-                    score = np.mean(scores_cand)
-                    level = 'N4: via ISCO-88→08 3d'
-                    counts['N4_via_isco88_3d'] += 1
-
-        # ── Nível 5: CBO 2d = ISCO-08 2d (média do Sub-major Group) ──
-        if score is None:
-            cbo_2d = cbo[:2]
-            if cbo_2d in ilo_2d:
-                score = ilo_2d[cbo_2d]
-                level = 'N5: ISCO-08 2d'
-                counts['N5_isco08_2d'] += 1
-
-        # ── Nível 6: CBO 1d = ISCO-08 1d (média do Major Group) ──
-        if score is None:
-            cbo_1d = cbo[:1]
-            if cbo_1d in ilo_1d:
-                score = ilo_1d[cbo_1d]
-                level = 'N6: ISCO-08 1d'
-                counts['N6_isco08_1d'] += 1
-
-        if score is not None:
-            cbo_score_4d[cbo] = score
-            cbo_match_level[cbo] = level
-        else:
-            counts['sem_match'] += 1
-            cbo_match_level[cbo] = 'sem match'
-
-    # ── Reportar resultados ──
+    # --- Níveis do fallback (N2/N4: média dos scores ISCO-08 correspondentes) ---
+    crosswalk = HierarchicalCrosswalk([
+        ('N1: ISCO-08 4d direto', 4, ilo_4d),
+        ('N2: via ISCO-88→08 4d', 4, correspondence_means(isco88_to_08, ilo_4d)),
+        ('N3: ISCO-08 3d', 3, ilo_3d),
+        ('N4: via ISCO-88→08 3d', 3, correspondence_means(isco88_3d_to_08_3d, ilo_3d)),
+        ('N5: ISCO-08 2d', 2, ilo_2d),
+        ('N6: ISCO-08 1d', 1, ilo_1d),
+    ])
+
+    # ── Reportar resultados (por CBO 4d único) ──
+    por_cbo = crosswalk.match(pd.Series(cbos_unicos), unmatched='sem match')
+    counts = por_cbo['match_level'].value_counts()
     log(f"\n  Fallback hierárquico — distribuição por nível:")
     total = len(cbos_unicos)
     log(f"    {'Nível':<30} {'Ocup':>6} {'%':>8}")
     log(f"    {'-'*46}")
-    log(f"    {'N1: ISCO-08 4d direto':<30} {counts['N1_isco08_4d']:>6} "
-        f"{counts['N1_isco08_4d']/total:>8.1%}")
-    log(f"    {'N2: via ISCO-88→08 4d':<30} {counts['N2_via_isco88_4d']:>6} "
-        f"{counts['N2_via_isco88_4d']/total:>8.1%}")
-    log(f"    {'N3: ISCO-08 3d':<30} {counts['N3_isco08_3d']:>6} "
-        f"{counts['N3_isco08_3d']/total:>8.1%}")
-    log(f"    {'N4: via ISCO-88→08 3d':<30} {counts['N4_via_isco88_3d']:>6} "
-        f"{counts['N4_via_isco88_3d']/total:>8.1%}")
-    log(f"    {'N5: ISCO-08 2d':<30} {counts['N5_isco08_2d']:>6} "
-        f"{counts['N5_isco08_2d']/total:>8.1%}")
-    log(f"    {'N6: ISCO-08 1d':<30} {counts['N6_isco08_1d']:>6} "
-        f"{counts['N6_isco08_1d']/total:>8.1%}")
-    log(f"    {'Sem match':<30} {counts['sem_match']:>6} "
-        f"{counts['sem_match']/total:>8.1%}")
+    for nivel in crosswalk.names:
+        log(f"    {nivel:<30} {counts[nivel]:>6} {counts[nivel]/total:>8.1%}")
+    log(f"    {'Sem match':<30} {counts['sem match']:>6} "
+        f"{counts['sem match']/total:>8.1%}")
     log(f"    {'-'*46}")
 
-    matched = sum(v for k, v in counts.items() if k != 'sem_match')
+    matched = total - counts['sem match']
     log(f"    {'TOTAL COM SCORE':<30} {matched:>6} {matched/total:>8.1%}")
 
     # Granularidade: % com informação genuinamente 4d (N1 + N2)
-    n_4d_genuine = counts['N1_isco08_4d'] + counts['N2_via_isco88_4d']
+    n_4d_genuine = counts[crosswalk.names[0]] + counts[crosswalk.names[1]]
     log(f"\n  Informação genuinamente 4d: {n_4d_genuine}/{total} ({n_4d_genuine/total:.1%})")
     log(f"  Informação ≤3d (fallback): {matched - n_4d_genuine}/{total} "
         f"({(matched - n_4d_genuine)/total:.1%})")
 
     # Aplicar ao painel
-    painel['exposure_score_4d'] = painel['cbo_4d'].map(cbo_score_4d)
-    painel['match_level_4d'] = painel['cbo_4d'].map(cbo_match_level)
+    resultado = crosswalk.match(painel['cbo_4d'], unmatched='sem match')
+    painel['exposure_score_4d'] = resultado['value']
+    painel['match_level_4d'] = resultado['match_level']
 
     coverage_4d = painel['exposure_score_4d'].notna().mean()
     log(f"\n  COBERTURA FINAL 4d (linhas no painel): {coverage_4d:.1%}")
@@ -396,7 +328,7 @@ def main():
     diagnostico_concordancia(painel)
 
     # Salvar
-    painel.to_parquet(PAINEL_CROSSWALK_FILE, index=False)
+    write_parquet(painel, PAINEL_CROSSWALK_FILE)
     size_mb = PAINEL_CROSSWALK_FILE.stat().st_size / 1e6
     log(f"\nSalvo: {PAINEL_CROSSWALK_FILE.name} ({size_mb:.1f} MB)")
     log(f"Colunas: {list(painel.columns)}")
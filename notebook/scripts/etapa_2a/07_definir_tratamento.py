@@ -10,6 +10,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from config import *
 
+sys.path.insert(0, str(REPO_ROOT))
+from parquet_storage import write_parquet
+
 
 def main():
     print("=" * 60)
@@ -96,7 +99,7 @@ def main():
     print(ct)
 
     # Salvar
-    painel.to_parquet(PAINEL_TRATAMENTO_FILE, index=False)
+    write_parquet(painel, PAINEL_TRATAMENTO_FILE)
     size_mb = PAINEL_TRATAMENTO_FILE.stat().st_size / 1e6
     print(f"\nSalvo: {PAINEL_TRATAMENTO_FILE.name} ({size_mb:.1f} MB)")
 
@@ -10,6 +10,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from config import *
 
+sys.path.insert(0, str(REPO_ROOT))
+from parquet_storage import write_parquet
+
 
 def periodo_num_to_months(pn):
     """Converter periodo_num (YYYYMM) para contagem absoluta de meses."""
@@ -101,7 +104,7 @@ def main():
     # ══════════════════════════════════════════════════════════════
     # PASSO 7: Salvar
     # ══════════════════════════════════════════════════════════════
-    painel_final.to_parquet(PAINEL_FINAL_PARQUET, index=False)
+    write_parquet(painel_final, PAINEL_FINAL_PARQUET)
     painel_final.to_csv(PAINEL_FINAL_CSV, index=False)
 
     # ══════════════════════════════════════════════════════════════
@@ -3,9 +3,11 @@ Configuração compartilhada — Etapa 2a
 Caminhos, parâmetros e constantes usadas por todos os scripts.
 """
 
+import os
 import warnings
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from pathlib import Path
 
 warnings.filterwarnings("ignore", category=FutureWarning)
@@ -52,24 +54,50 @@ SALARIO_MINIMO = {
 # ---------------------------------------------------------------------------
 # Colunas a selecionar do CAGED (BigQuery)
 # ---------------------------------------------------------------------------
-COLUNAS_CAGED = """
-    ano,
-    mes,
-    sigla_uf,
-    id_municipio,
-    cbo_2002,
-    categoria,
-    tipo_movimentacao,
-    saldo_movimentacao,
-    salario_mensal,
-    grau_instrucao,
-    idade,
-    sexo,
-    raca_cor,
-    cnae_2_secao,
-    cnae_2_subclasse,
-    tamanho_estabelecimento_janeiro
-"""
+# Tipos fixos de caged_{ano}.parquet (os do BigQuery). Todo lote baixado é
+# convertido para este schema: um mês com coluna toda nula, ou com NaN em
+# coluna inteira (fallback basedosdados via pandas), não muda o tipo do arquivo.
+SCHEMA_CAGED = pa.schema([
+    ('ano', pa.int64()),
+    ('mes', pa.int64()),
+    ('sigla_uf', pa.string()),
+    ('id_municipio', pa.string()),
+    ('cbo_2002', pa.string()),
+    ('categoria', pa.string()),
+    ('tipo_movimentacao', pa.string()),
+    ('saldo_movimentacao', pa.int64()),
+    ('salario_mensal', pa.float64()),
+    ('grau_instrucao', pa.string()),
+    ('idade', pa.int64()),
+    ('sexo', pa.string()),
+    ('raca_cor', pa.string()),
+    ('cnae_2_secao', pa.string()),
+    ('cnae_2_subclasse', pa.string()),
+    ('tamanho_estabelecimento_janeiro', pa.string()),
+])
+COLUNAS_CAGED = ",\n    ".join(SCHEMA_CAGED.names)
+
+# Download em streaming (script 01): linhas por row group do caged_{ano}.parquet
+# (limita a memória do download) e lotes Arrow em fila na Storage Read API
+CAGED_LINHAS_POR_ROW_GROUP = 500_000
+CAGED_LOTES_EM_FILA = 4
+
+# ---------------------------------------------------------------------------
+# Agregação streaming (script 03)
+# ---------------------------------------------------------------------------
+# Threads da leitura/agregação por row group (leitura_caged.py)
+LEITURA_THREADS = min(8, os.cpu_count() or 1)
+
+# Erro de rank máximo do sketch de quantis (0.005 → ±0,5 p.p. no percentil)
+SKETCH_EPS = 0.005
+
+# Percentis salariais das admissões por cbo_4d × mês (coluna → quantil)
+QUANTIS_SALARIO_ADM = {
+    'salario_mediano_adm': 0.50,
+}
+
+# Fração aproximada de CBOs cujas células são validadas contra o cálculo exato
+AMOSTRA_VALIDACAO_CBO = 50   # 1 a cada 50 códigos CBO 4d
 
 # ---------------------------------------------------------------------------
 # Arquivo ILO (processado na Etapa 1a)
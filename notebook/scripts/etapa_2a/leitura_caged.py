@@ -0,0 +1,95 @@
+"""
+Leitura de caged_{ano}.parquet para a agregação (script 03), com pushdown no Arrow.
+
+Em vez de ler as 16 colunas do download e limpar o CBO com operações de
+string do pandas, cada row group é lido como um fragmento pyarrow.dataset:
+  - projeção: só as 8 colunas referenciadas em PROJECAO saem do disco;
+    cbo_4d, is_mulher e is_superior são expressões calculadas no scan
+  - filtro: CBO válido (4 dígitos, diferente de '0000') aplicado no scan
+  - admissões / desligamentos separados por saldo_movimentacao ainda em Arrow
+cbo_4d chega ao pandas como int16 (agrupamentos sem hashing de strings); quem
+grava o painel volta ao texto de 4 dígitos com cbo_4d_texto.
+
+Os row groups são processados em paralelo (LEITURA_THREADS threads): leitura,
+decodificação e compute do Arrow liberam o GIL, e os resultados voltam na
+ordem dos row groups.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+GRAUS_SUPERIOR = ['9', '10', '11', '12', '13']
+
+
+def _texto(coluna):
+    return pc.field(coluna).cast(pa.string())
+
+
+_CBO_4D = pc.utf8_slice_codeunits(pc.utf8_trim_whitespace(_texto('cbo_2002')), 0, 4)
+
+# Colunas entregues ao pandas (só as colunas do download usadas aqui são lidas)
+PROJECAO = {
+    'cbo_4d': _CBO_4D,
+    'ano': pc.field('ano'),
+    'mes': pc.field('mes'),
+    'saldo_movimentacao': pc.field('saldo_movimentacao'),
+    'salario_mensal': pc.field('salario_mensal'),
+    'idade': pc.field('idade'),
+    'is_mulher': pc.is_in(_texto('sexo'), value_set=pa.array(['2'])).cast(pa.float64()),
+    'is_superior': pc.is_in(_texto('grau_instrucao'),
+                            value_set=pa.array(GRAUS_SUPERIOR)).cast(pa.float64()),
+}
+
+FILTRO_CBO_VALIDO = ((pc.utf8_length(_CBO_4D) == 4)
+                     & pc.utf8_is_digit(_CBO_4D)
+                     & (_CBO_4D != '0000'))
+
+
+def row_groups(path):
+    """Fragmentos de um arquivo Parquet, um por row group."""
+    return [rg for fragmento in ds.dataset(path, format='parquet').get_fragments()
+            for rg in fragmento.split_by_row_group()]
+
+
+def ler_row_group(fragmento):
+    """
+    Lê um row group com projeção e filtro de CBO no scan.
+
+    Retorna (admissões, desligamentos, linhas lidas, linhas com CBO válido);
+    os DataFrames têm as colunas de PROJECAO, com cbo_4d em int16.
+    """
+    n_lidas = sum(rg.num_rows for rg in fragmento.row_groups)
+    tabela = fragmento.to_table(columns=PROJECAO, filter=FILTRO_CBO_VALIDO, use_threads=False)
+    tabela = tabela.set_column(0, 'cbo_4d', pc.cast(tabela.column('cbo_4d'), pa.int16()))
+
+    saldo = tabela.column('saldo_movimentacao')
+    adm = tabela.filter(pc.equal(saldo, 1)).to_pandas()
+    des = tabela.filter(pc.equal(saldo, -1)).to_pandas()
+    return adm, des, n_lidas, tabela.num_rows
+
+
+def processar_row_groups(path, funcao, threads):
+    """
+    Aplica funcao(fragmento) a cada row group de path em `threads` threads.
+
+    Gera os resultados na ordem dos row groups, com no máximo 2 × threads
+    row groups em processamento ou aguardando consumo (memória limitada).
+    """
+    fragmentos = row_groups(path)
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as pool:
+        pendentes = deque()
+        for fragmento in fragmentos:
+            pendentes.append(pool.submit(funcao, fragmento))
+            if len(pendentes) >= 2 * threads:
+                yield pendentes.popleft().result()
+        while pendentes:
+            yield pendentes.popleft().result()
+
+
+def cbo_4d_texto(serie):
+    """cbo_4d int16 → texto de 4 dígitos ('0101', '2124', ...)."""
+    return serie.astype(int).astype(str).str.zfill(4)
@@ -0,0 +1,99 @@
+"""
+Teste: download do CAGED em streaming com schema fixo
+Executar: python -m pytest notebook/scripts/etapa_2a/tests  (não depende de BigQuery)
+"""
+
+import importlib.util
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Adicionar scripts da etapa 2a ao path
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from config import SCHEMA_CAGED
+
+spec = importlib.util.spec_from_file_location('download_caged', SCRIPTS_DIR / '01_download_caged.py')
+download_caged = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(download_caged)
+
+
+def _mes(mes, n=50):
+    """Mês do CAGED como o pandas devolve (tipos inferidos pelos valores)."""
+    rng = np.random.default_rng(mes)
+    df = pd.DataFrame({
+        col: rng.choice(['1', '2', '3'], n) for col in SCHEMA_CAGED.names
+    })
+    df['ano'] = 2021
+    df['mes'] = mes
+    df['saldo_movimentacao'] = rng.choice([1, -1], n)
+    df['salario_mensal'] = rng.lognormal(7.6, 0.6, n)
+    df['idade'] = rng.integers(14, 75, n)
+    if mes == 1:
+        df['cnae_2_secao'] = None                      # toda nula → tipo null
+        df['idade'] = None
+    elif mes == 2:
+        df['idade'] = df['idade'].where(rng.random(n) > 0.2)   # int com NaN → float64
+        df['salario_mensal'] = 1412                    # float inteiro → int64
+    return df
+
+
+def _mes_da_query(query):
+    return int(query.split('mes =')[1].split()[0])
+
+
+def test_meses_com_tipos_inferidos_diferentes():
+    """Fallback basedosdados: mês com coluna nula e mês com NaN em inteiros no mesmo arquivo"""
+    meses = {m: _mes(m) for m in range(1, 13)}
+    assert pd.api.types.is_float_dtype(meses[2]['idade'])
+    assert pd.api.types.is_integer_dtype(meses[2]['salario_mensal'])
+
+    # basedosdados falso: read_sql devolve o DataFrame do mês da query
+    sys.modules['basedosdados'] = types.SimpleNamespace(
+        read_sql=lambda query, billing_project_id=None: meses[_mes_da_query(query)])
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            destino = Path(tmp) / 'caged_2021.parquet'
+            n = download_caged.gravar_ano_streaming(2021, download_caged.lotes_basedosdados,
+                                                    destino)
+            df = pd.read_parquet(destino)
+            schema = pq.read_schema(destino)
+    finally:
+        del sys.modules['basedosdados']
+
+    assert n == 12 * 50
+    assert schema.remove_metadata().equals(SCHEMA_CAGED)
+    assert df.loc[df['mes'] == 1, ['idade', 'cnae_2_secao']].isna().all().all()
+    assert df.loc[df['mes'] == 2, 'idade'].isna().sum() == meses[2]['idade'].isna().sum()
+    assert (df.loc[df['mes'] == 2, 'salario_mensal'] == 1412.0).all()
+    print("✓ Meses com tipos inferidos diferentes gravados no schema fixo")
+
+
+def test_lotes_arrow_conformados():
+    """Lotes Arrow (BigQuery/DuckDB) com tipos divergentes convergem para SCHEMA_CAGED"""
+    lotes = {m: pa.Table.from_pandas(_mes(m), preserve_index=False).to_batches()
+             for m in range(1, 13)}
+    assert lotes[1][0].schema.field('idade').type == pa.null()
+    assert lotes[2][0].schema.field('idade').type == pa.float64()
+
+    def fonte(query):
+        yield from lotes[_mes_da_query(query)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        destino = Path(tmp) / 'caged_2021.parquet'
+        download_caged.gravar_ano_streaming(2021, fonte, destino)
+        assert pq.read_schema(destino).remove_metadata().equals(SCHEMA_CAGED)
+        assert pq.ParquetFile(destino).metadata.num_rows == 12 * 50
+    print("✓ Lotes Arrow com tipos divergentes convertidos para o schema fixo")
+
+
+if __name__ == "__main__":
+    test_meses_com_tipos_inferidos_diferentes()
+    test_lotes_arrow_conformados()
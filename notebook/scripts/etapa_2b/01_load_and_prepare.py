@@ -1,6 +1,7 @@
 """
 Etapa 2b.1 — Carregar painel do 2a, winsorizar salários e salvar painel pronto para DiD.
 Saída: data/output/painel_2b_ready.parquet
+       data/output/painel_2b_ready.arrow (cache mapeado pelos scripts 02+)
 """
 
 import sys
@@ -22,6 +23,7 @@ from config import (
     PAINEL_2B_FILE,
     TREATMENT_VAR,
 )
+from painel_cache import write_painel_cache
 
 
 def main():
@@ -79,6 +81,7 @@ def main():
     # ---------------------------------------------------------------------------
     df.to_parquet(PAINEL_2B_FILE, index=False)
     print(f"\nPainel salvo: {PAINEL_2B_FILE}")
+    print(f"Cache Arrow: {write_painel_cache(df)}")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
 """
 Etapa 2b.2 — Tabela de balanço (pré-tratamento).
-Lê painel_2b_ready.parquet, agrega por ocupação no pré, calcula diferença normalizada.
-Saída: outputs/tables/balance_table_pre.csv
+Lê painel_2b_ready (cache Arrow mapeado), agrega por ocupação no pré, calcula diferença normalizada.
+Saídas: outputs/tables/balance_table_pre.csv
+        outputs/tables/balance_diagnostics_by_post.csv
+        outputs/tables/balance_diagnostics_by_quarter.csv
 """
 
 import sys
@@ -14,7 +16,12 @@ SCRIPTS_DIR = Path(__file__).resolve().parent
 if str(SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPTS_DIR))
 
-from config import OUTPUTS_TABLES, PAINEL_2B_FILE
+from config import OUTPUTS_TABLES, REPO_ROOT
+from painel_cache import load_painel_2b
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+from weighted_stats import covariate_balance
 
 BALANCE_THRESHOLD = 0.25
 
@@ -30,14 +37,16 @@ COVARIATES = {
 }
 
 
-def main():
-    df = pd.read_parquet(PAINEL_2B_FILE)
-    df_pre = df[df["post"] == 0].copy()
+CUTOFFS = ["alta_exp", "alta_exp_10", "alta_exp_25"]
 
-    # Agregar por ocupação (médias no pré)
-    ocup_pre = df_pre.groupby("cbo_4d").agg(
+
+def agregar_ocupacao(df, chaves=()):
+    """Médias por ocupação (e por ``chaves`` de período, se informadas)."""
+    chaves = list(chaves)
+    tratamentos = {c: (c, "first") for c in CUTOFFS if c in df.columns}
+    return df.groupby(["cbo_4d", *chaves]).agg(
         exposure_score=("exposure_score_2d", "first"),
-        alta_exp=("alta_exp", "first"),
+        **tratamentos,
         admissoes_media=("admissoes", "mean"),
         desligamentos_media=("desligamentos", "mean"),
         saldo_media=("saldo", "mean"),
@@ -48,34 +57,48 @@ def main():
         n_meses=("periodo", "nunique"),
     ).reset_index()
 
-    results_balance = []
-    for var, label in COVARIATES.items():
-        treated = ocup_pre[ocup_pre["alta_exp"] == 1][var].dropna()
-        control = ocup_pre[ocup_pre["alta_exp"] == 0][var].dropna()
-
-        mean_t = treated.mean()
-        mean_c = control.mean()
-        diff = mean_t - mean_c
 
-        pooled_std = np.sqrt((treated.var() + control.var()) / 2)
-        std_diff = diff / pooled_std if pooled_std > 0 else np.nan
-
-        results_balance.append({
-            "Variável": label,
-            "Controle": mean_c,
-            "Tratamento": mean_t,
-            "Diferença": diff,
-            "Diff. Normalizada": std_diff,
-            "Balanceado": "✓" if abs(std_diff) < BALANCE_THRESHOLD else "⚠️",
-        })
-
-    df_balance = pd.DataFrame(results_balance)
+def main():
+    df = load_painel_2b()
+    df_pre = df[df["post"] == 0]
+
+    # Agregar por ocupação (médias no pré); unidade = ocupação, sem pesos
+    ocup_pre = agregar_ocupacao(df_pre)
+
+    balance = covariate_balance(ocup_pre, list(COVARIATES), "alta_exp",
+                                weight_col=None, ddof=1)
+    std_diff = balance["std_diff"].to_numpy()
+    df_balance = pd.DataFrame({
+        "Variável": balance.index.map(COVARIATES),
+        "Controle": balance["mean_c"].to_numpy(),
+        "Tratamento": balance["mean_t"].to_numpy(),
+        "Diferença": balance["diff"].to_numpy(),
+        "Diff. Normalizada": std_diff,
+        "Razão Var.": balance["var_ratio"].to_numpy(),
+        "KS": balance["ks"].to_numpy(),
+        "Balanceado": np.where(np.abs(std_diff) < BALANCE_THRESHOLD, "✓", "⚠️"),
+    })
     print("\nTabela de Balanço (Pré-Tratamento):")
     print(df_balance.to_string(index=False))
 
     df_balance.to_csv(OUTPUTS_TABLES / "balance_table_pre.csv", index=False)
     print(f"\nSalvo: {OUTPUTS_TABLES / 'balance_table_pre.csv'}")
 
+    # Diagnósticos por período (pré/pós e trimestre) para todos os cortes
+    df = df.assign(trimestre=(df["mes"] - 1) // 3 + 1)
+    cutoffs = [c for c in CUTOFFS if c in df.columns]
+    for nome, chaves in [("post", ["post"]), ("quarter", ["ano", "trimestre"])]:
+        ocup = agregar_ocupacao(df, chaves)
+        diag = covariate_balance(ocup, list(COVARIATES), cutoffs, weight_col=None,
+                                 by=chaves, ddof=1)
+        path = OUTPUTS_TABLES / f"balance_diagnostics_by_{nome}.csv"
+        diag.round(4).to_csv(path)
+        print(f"Salvo: {path} ({len(diag):,} linhas)")
+
+    resumo = diag["std_diff"].abs().groupby(level=["treatment", "ano", "trimestre"]).max()
+    print("\nmax |std diff| por corte e trimestre:")
+    print(resumo.unstack("treatment").round(3).to_string())
+
 
 if __name__ == "__main__":
     main()
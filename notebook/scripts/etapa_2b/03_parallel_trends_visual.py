@@ -8,7 +8,6 @@ import sys
 from pathlib import Path
 
 import matplotlib.pyplot as plt
-import pandas as pd
 import seaborn as sns
 
 SCRIPTS_DIR = Path(__file__).resolve().parent
@@ -20,8 +19,8 @@ from config import (
     COLORS,
     MES_TRATAMENTO,
     OUTPUTS_FIGURES,
-    PAINEL_2B_FILE,
 )
+from painel_cache import load_painel_2b
 
 
 def main():
@@ -36,7 +35,7 @@ def main():
         "figure.dpi": 150,
     })
 
-    df = pd.read_parquet(PAINEL_2B_FILE)
+    df = load_painel_2b()
 
     ts_grupo = df.groupby(["periodo_num", "alta_exp"]).agg(
         admissoes_total=("admissoes", "sum"),
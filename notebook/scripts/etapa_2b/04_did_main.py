@@ -16,9 +16,9 @@ if str(SCRIPTS_DIR) not in sys.path:
 from config import (
     OUTCOMES,
     OUTPUTS_TABLES,
-    PAINEL_2B_FILE,
     VCOV_SPEC,
 )
+from painel_cache import load_painel_2b
 
 
 def estimate_did(df, outcome, formula, label, vcov_spec=None):
@@ -61,8 +61,7 @@ def estimate_did(df, outcome, formula, label, vcov_spec=None):
 
 
 def main():
-    df = pd.read_parquet(PAINEL_2B_FILE)
-    df_reg = df.copy()
+    df_reg = load_painel_2b()
 
     numeric_cols = [
         "admissoes", "desligamentos", "saldo", "ln_admissoes",
@@ -19,15 +19,14 @@ from config import (
     BIN_MIN,
     OUTCOMES,
     OUTPUTS_TABLES,
-    PAINEL_2B_FILE,
     REFERENCE_PERIOD as REF_T,
     VCOV_SPEC,
 )
+from painel_cache import load_painel_2b
 
 
 def main():
-    df = pd.read_parquet(PAINEL_2B_FILE)
-    df_es = df.copy()
+    df_es = load_painel_2b()
 
     periodos_relativos = sorted(df_es["tempo_relativo_meses"].unique())
     print(f"Períodos relativos: {periodos_relativos[0]} a {periodos_relativos[-1]}")
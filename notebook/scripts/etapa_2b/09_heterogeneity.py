@@ -14,7 +14,8 @@ SCRIPTS_DIR = Path(__file__).resolve().parent
 if str(SCRIPTS_DIR) not in sys.path:
     sys.path.insert(0, str(SCRIPTS_DIR))
 
-from config import OUTCOMES, OUTPUTS_TABLES, PAINEL_2B_FILE, VCOV_SPEC
+from config import OUTCOMES, OUTPUTS_TABLES, VCOV_SPEC
+from painel_cache import load_painel_2b
 
 HETEROGENEITY_GROUPS = {
     "jovem_adm": "Idade (jovem ≤ 30)",
@@ -24,8 +25,7 @@ HETEROGENEITY_GROUPS = {
 
 
 def main():
-    df = pd.read_parquet(PAINEL_2B_FILE)
-    df_het = df.copy()
+    df_het = load_painel_2b()
 
     pre_mask = df_het["post"] == 0
     mediana_mulher = df_het.loc[pre_mask, "pct_mulher_adm"].median()
@@ -16,16 +16,15 @@ if str(SCRIPTS_DIR) not in sys.path:
 from config import (
     OUTCOMES,
     OUTPUTS_TABLES,
-    PAINEL_2B_FILE,
     PLACEBO_ANO,
     PLACEBO_MES,
     VCOV_SPEC,
 )
+from painel_cache import load_painel_2b
 
 
 def main():
-    df = pd.read_parquet(PAINEL_2B_FILE)
-    df_reg = df.copy()
+    df_reg = load_painel_2b()
     df_reg["post_alta"] = df_reg["post"] * df_reg["alta_exp"]
     df_reg["post_alta_4d"] = df_reg["post"] * df_reg["alta_exp_4d"]
 
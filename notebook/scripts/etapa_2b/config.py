@@ -28,6 +28,8 @@ for d in [DATA_OUTPUT, OUTPUTS_TABLES, OUTPUTS_FIGURES, OUTPUTS_LOGS]:
 # Arquivos de dados
 PAINEL_2A_FILE = DATA_OUTPUT / "painel_caged_did_ready.parquet"
 PAINEL_2B_FILE = DATA_OUTPUT / "painel_2b_ready.parquet"
+# Cópia Arrow IPC sem compressão, lida por memory-map (ver painel_cache.py)
+PAINEL_2B_ARROW = DATA_OUTPUT / "painel_2b_ready.arrow"
 
 # ---------------------------------------------------------------------------
 # Parâmetros de estimação DiD
@@ -0,0 +1,69 @@
+"""
+Cache Arrow IPC (Feather v2, sem compressão) do painel 2b, lido por memory-map.
+
+O 01 grava o painel também em painel_2b_ready.arrow. Os scripts 02+ rodam em
+subprocessos separados; em vez de cada um decodificar o Parquet para uma cópia
+privada, todos mapeiam o mesmo arquivo: colunas numéricas sem nulos viram
+arrays NumPy apontando para as páginas do arquivo (zero-copy, somente
+leitura), compartilhadas pelo page cache do sistema operacional. O arquivo
+é gravado em um único record batch, para que nenhuma coluna precise ser
+concatenada (copiada) na leitura.
+
+Para manter o zero-copy, NaN em colunas float é gravado como NaN (e não como
+nulo Arrow). Colunas de texto ainda são convertidas para objetos Python.
+Como as colunas mapeadas são somente leitura, quem altera o painel
+reatribui a coluna em vez de escrever nela (ver load_painel_2b).
+"""
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+
+from config import PAINEL_2B_ARROW, PAINEL_2B_FILE
+
+
+def write_painel_cache(df, path=PAINEL_2B_ARROW):
+    """Grava df como Arrow IPC sem compressão (substituição atômica)."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type) and table.column(i).null_count:
+            table = table.set_column(i, field, pc.fill_null(table.column(i), float("nan")))
+
+    tmp = path.with_suffix(".arrow.tmp")
+    feather.write_feather(table, tmp, compression="uncompressed",
+                          chunksize=max(table.num_rows, 1))
+    os.replace(tmp, path)
+    return path
+
+
+def load_painel_2b(columns=None):
+    """
+    Abre o painel 2b mapeando o cache Arrow em memória.
+
+    Sem cache (ou com cache mais antigo que o Parquet), lê o Parquet
+    normalmente.
+
+    As colunas zero-copy são somente leitura, e o pandas 2.x (sem
+    copy-on-write) não as copia antes de escrever: escrita in-place
+    (df.loc[mask, col] = v, df.iloc[i, j] = v, df[col] += 1,
+    df[col].fillna(..., inplace=True)) levanta "ValueError: assignment
+    destination is read-only". Para alterar uma coluna, reatribua-a
+    inteira (df[col] = df[col].where(...)), o que cria um array novo só
+    para ela, ou faça df[col] = df[col].copy() antes de escrever nela.
+    Criar colunas novas e filtrar linhas funcionam normalmente.
+    """
+    if not PAINEL_2B_ARROW.exists() or (
+        PAINEL_2B_FILE.exists()
+        and PAINEL_2B_ARROW.stat().st_mtime < PAINEL_2B_FILE.stat().st_mtime
+    ):
+        print(f"Cache Arrow ausente ou desatualizado; lendo {PAINEL_2B_FILE.name}")
+        return pd.read_parquet(PAINEL_2B_FILE, columns=columns)
+
+    source = pa.memory_map(str(PAINEL_2B_ARROW), "r")
+    table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas(split_blocks=True)
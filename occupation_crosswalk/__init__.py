@@ -0,0 +1,32 @@
+"""
+Crosswalk hierárquico de códigos ocupacionais (COD/CBO/SOC → ISCO-08)
+
+Um único motor para o fallback 4d → 3d → 2d → 1d das etapas: códigos
+convertidos para inteiros, um array denso por nível (NaN = sem valor) e
+uma resolução vetorizada nos códigos distintos, levada às linhas com take,
+com o nível usado (proveniência) por linha.
+
+Uso (com a raiz do repositório no sys.path):
+    from occupation_crosswalk import HierarchicalCrosswalk, lookup_by_code
+    cw = HierarchicalCrosswalk([('4-digit', 4, ilo_4d), ('3-digit', 3, ilo_3d),
+                                ('2-digit', 2, ilo_2d), ('1-digit', 1, ilo_1d)])
+    res = cw.match(df['cod_ocupacao'])        # value + match_level
+
+    # merge de atributos por código exato (left join sem join)
+    exp = lookup_by_code(df['cod_ocupacao'], exposure_df.set_index('cod_cod'))
+
+Usado em: etapa1 04_crosswalk (COD → ISCO-08), notebook etapa_2a 05
+(CBO → ISCO-08, com níveis via ISCO-88), etapa3 03 (imputação por
+subgrupo/grande grupo das métricas SOC → ISCO → COD) e etapa5
+04_merge_exposure (índice de exposição no painel).
+
+Módulos:
+    codes      codes_to_int, factorize_codes, lookup_by_code
+    hierarchy  HierarchicalCrosswalk, correspondence_means
+"""
+
+from .codes import codes_to_int, factorize_codes, lookup_by_code
+from .hierarchy import HierarchicalCrosswalk, correspondence_means
+
+__all__ = ['HierarchicalCrosswalk', 'codes_to_int', 'correspondence_means',
+           'factorize_codes', 'lookup_by_code']
@@ -0,0 +1,151 @@
+"""
+Códigos ocupacionais como inteiros e broadcast por código distinto
+
+Uma coluna de ocupação de microdados tem dezenas de milhões de linhas e
+poucas centenas de códigos distintos. As funções daqui fatoram a coluna uma
+vez (códigos da category, ou pd.factorize), resolvem o que for preciso nos
+códigos distintos e levam o resultado às linhas com um take de inteiros:
+
+    indices, distintos = factorize_codes(df['cod_ocupacao'])
+    valor_por_codigo = ...                     # len(distintos) + 1 (sentinela)
+    valor = valor_por_codigo[indices]          # índice -1 → sentinela
+
+Custo por coluna adicional: um array do tamanho do número de códigos e um
+take; nenhuma string por linha nem join por hash.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _parse_codes(uniques, digits):
+    """Códigos distintos (Index) → int64; -1 para inválidos."""
+    if len(uniques) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    if pd.api.types.is_numeric_dtype(uniques.dtype) and not pd.api.types.is_bool_dtype(uniques.dtype):
+        valores = uniques.to_numpy(dtype=np.float64)
+        ok = np.isfinite(valores) & (valores == np.floor(valores))
+        ok &= (valores >= 0) & (valores < 10 ** digits)
+        return np.where(ok, valores, -1).astype(np.int64)
+
+    texto = pd.Series(uniques.astype(str), dtype=object).str.strip()
+    ok = texto.str.fullmatch(rf'\d{{1,{digits}}}').fillna(False).to_numpy(dtype=bool)
+    inteiros = np.full(len(texto), -1, dtype=np.int64)
+    inteiros[ok] = texto[ok].astype(np.int64).to_numpy()
+    return inteiros
+
+
+def factorize_codes(codes, digits=4):
+    """
+    Fatora códigos ocupacionais: índice por linha e códigos distintos inteiros.
+
+    category usa os próprios códigos (int8/int16, sem cópia por linha);
+    demais tipos passam por pd.factorize uma vez. Códigos distintos seguem
+    a convenção de codes_to_int (texto curto = completado com zeros; -1 =
+    inválido).
+
+    Parâmetros
+    ----------
+    codes : array-like, pd.Series ou pd.Index
+        Códigos, um por linha
+    digits : int
+        Dígitos do código completo (padrão 4)
+
+    Retorna
+    -------
+    (np.ndarray, np.ndarray)
+        índices por linha (-1 = ausente) e códigos distintos em int64
+    """
+    serie = codes if isinstance(codes, pd.Series) else pd.Series(codes)
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        indices = serie.cat.codes.to_numpy()
+        uniques = serie.cat.categories
+    else:
+        indices, uniques = pd.factorize(serie, use_na_sentinel=True)
+        uniques = pd.Index(uniques)
+    return indices, _parse_codes(uniques, digits)
+
+
+def codes_to_int(codes, digits=4):
+    """
+    Códigos ocupacionais → array int64 (-1 = código ausente ou inválido).
+
+    Aceita texto ('0110', '2111'), inteiros, float com NaN ou category. Texto
+    curto equivale ao código completado com zeros à esquerda ('110' →
+    '0110', como .str.zfill(4)); texto não numérico ou com mais de digits
+    dígitos é inválido. A conversão é feita uma vez por código distinto
+    (factorize_codes) e expandida com take.
+
+    Parâmetros
+    ----------
+    codes : array-like, pd.Series ou pd.Index
+        Códigos, um por linha
+    digits : int
+        Dígitos do código completo (padrão 4)
+
+    Retorna
+    -------
+    np.ndarray (int64)
+    """
+    indices, distintos = factorize_codes(codes, digits)
+    # índice -1 (ausente) cai na última posição, que é -1
+    return np.append(distintos, -1)[indices]
+
+
+def lookup_by_code(codes, table, digits=4):
+    """
+    Colunas de table para cada linha de codes, resolvidas nos códigos distintos.
+
+    Equivale a um left join de codes com table pelo código, sem join: a
+    posição de cada código distinto em table é achada uma vez e cada coluna
+    é levada às linhas com take dos índices da fatoração. Texto em table
+    volta como category (códigos inteiros por linha).
+
+    Parâmetros
+    ----------
+    codes : pd.Series ou array-like
+        Códigos por linha (category de preferência); o índice de uma Series
+        é preservado
+    table : pd.DataFrame ou pd.Series
+        Indexada pelo código (texto ou int, convenção de codes_to_int);
+        códigos repetidos levantam ValueError
+    digits : int
+        Dígitos do código completo (padrão 4)
+
+    Retorna
+    -------
+    pd.DataFrame
+        Colunas de table; linhas sem código correspondente ficam nulas
+        (colunas inteiras viram float64)
+    """
+    if isinstance(table, pd.Series):
+        table = table.to_frame()
+    indices, distintos = factorize_codes(codes, digits)
+
+    chaves = codes_to_int(table.index, digits)
+    validas = chaves >= 0
+    chaves_validas = pd.Index(chaves[validas])
+    repetidas = chaves_validas[chaves_validas.duplicated()]
+    if len(repetidas):
+        raise ValueError(f"Códigos repetidos na tabela: {sorted(set(repetidas))[:10]}")
+
+    # linha de table de cada código distinto (-1 = sem correspondência) e
+    # sentinela na última posição para os ausentes
+    linhas = np.append(np.flatnonzero(validas), -1)
+    posicao = np.append(linhas[chaves_validas.get_indexer(distintos)], -1)
+
+    resultado = {}
+    for col in table.columns:
+        valores = table[col]
+        if pd.api.types.is_object_dtype(valores.dtype) or pd.api.types.is_string_dtype(valores.dtype):
+            valores = valores.astype('category')
+        if isinstance(valores.dtype, pd.CategoricalDtype):
+            por_codigo = np.append(valores.cat.codes.to_numpy(), -1)[posicao]
+            resultado[col] = pd.Categorical.from_codes(por_codigo[indices], dtype=valores.dtype)
+        else:
+            por_codigo = pd.api.extensions.take(valores.to_numpy(), posicao, allow_fill=True)
+            resultado[col] = por_codigo[indices]
+
+    indice = codes.index if isinstance(codes, pd.Series) else None
+    return pd.DataFrame(resultado, index=indice, columns=table.columns)
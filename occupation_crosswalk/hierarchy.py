@@ -0,0 +1,178 @@
+"""
+Crosswalk hierárquico de códigos ocupacionais em arrays inteiros
+
+Os códigos (COD, CBO 4d, ISCO-08, SOC → ISCO) viram inteiros uma única vez
+por código distinto (codes.factorize_codes). Cada nível do fallback (4d, 3d, 2d, 1d, ou níveis via
+correspondência) vira um array denso de 10**n posições indexado pelo
+prefixo inteiro do código, com NaN onde o nível não tem valor. A resolução
+de todas as linhas é um gather por nível:
+
+    prefixo = codigo // 10 ** (digits - n)
+    valor   = tabela_nivel[prefixo]          # NaN = nível sem valor
+
+e cada código fica com o primeiro nível (na ordem dada) com valor não nulo
+na coluna-chave. O índice do nível usado é a proveniência do match. A
+resolução é feita nos códigos distintos e levada às linhas com um take.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .codes import codes_to_int, factorize_codes
+
+
+def _as_frame(table):
+    if isinstance(table, pd.DataFrame):
+        return table
+    if isinstance(table, pd.Series):
+        return table.to_frame(table.name if table.name is not None else 'value')
+    return pd.Series(table, dtype=np.float64).to_frame('value')
+
+
+class HierarchicalCrosswalk:
+    """
+    Fallback hierárquico por nível de código em arrays densos.
+
+    Parâmetros
+    ----------
+    levels : list of (nome, n_digitos, tabela)
+        Níveis na ordem de preferência. tabela: dict, pd.Series ou
+        pd.DataFrame indexado pelo código do nível (texto ou int com
+        n_digitos dígitos: '011' ou 11 no nível 3d) → valor(es) numéricos.
+        Níveis via correspondência (ISCO-88 → ISCO-08) entram como qualquer
+        outro nível, com a tabela já agregada (correspondence_means)
+    digits : int
+        Dígitos dos códigos de entrada (padrão 4)
+    key : str, opcional
+        Coluna que decide o match quando as tabelas têm várias colunas
+        (padrão: a primeira). Linha sem valor na chave passa ao próximo
+        nível e, nele, recebe todas as colunas
+
+    Exemplo
+    -------
+    >>> cw = HierarchicalCrosswalk([('4-digit', 4, ilo_4d), ('3-digit', 3, ilo_3d),
+    ...                             ('2-digit', 2, ilo_2d), ('1-digit', 1, ilo_1d)])
+    >>> res = cw.match(df['cod_ocupacao'])   # colunas: value, match_level
+    """
+
+    def __init__(self, levels, digits=4, key=None):
+        if not levels:
+            raise ValueError("HierarchicalCrosswalk precisa de ao menos um nível")
+        self.digits = digits
+        self.names = []
+        self._levels = []
+
+        frames = [(nome, n, _as_frame(tabela)) for nome, n, tabela in levels]
+        self.columns = list(frames[0][2].columns)
+        self.key = self.columns[0] if key is None else key
+        if self.key not in self.columns:
+            raise KeyError(f"Coluna-chave ausente das tabelas: {self.key}")
+        self._key_pos = self.columns.index(self.key)
+
+        for nome, n, frame in frames:
+            if not 1 <= n <= digits:
+                raise ValueError(f"Nível {nome}: n_digitos deve estar em [1, {digits}], recebido {n}")
+            if nome in self.names:
+                raise ValueError(f"Nível repetido: {nome}")
+            frame = frame.reindex(columns=self.columns)
+            codigos = codes_to_int(frame.index, n)
+            validos = codigos >= 0
+            denso = np.full((10 ** n, len(self.columns)), np.nan)
+            denso[codigos[validos]] = frame.to_numpy(dtype=np.float64)[validos]
+            self.names.append(nome)
+            self._levels.append((n, denso))
+
+    def resolve(self, codes):
+        """
+        Resolve cada linha nos níveis.
+
+        Parâmetros
+        ----------
+        codes : array-like
+            Códigos de entrada (aceitos por codes_to_int)
+
+        Retorna
+        -------
+        (np.ndarray, np.ndarray)
+            valores float64 (linhas × colunas; NaN sem match) e nível int8
+            por linha (posição em self.names; -1 = sem match)
+        """
+        indices, distintos = factorize_codes(codes, self.digits)
+        valores, nivel = self._resolve_int(distintos)
+        # sentinela na última posição para índices -1 (código ausente)
+        valores = np.vstack([valores, np.full((1, len(self.columns)), np.nan)])
+        nivel = np.append(nivel, np.int8(-1))
+        return valores[indices], nivel[indices]
+
+    def _resolve_int(self, inteiros):
+        """Gathers por nível sobre códigos inteiros (-1 = inválido)."""
+        valores = np.full((len(inteiros), len(self.columns)), np.nan)
+        nivel = np.full(len(inteiros), -1, dtype=np.int8)
+        valido = inteiros >= 0
+
+        for i, (n, denso) in enumerate(self._levels):
+            prefixo = np.where(valido, inteiros // 10 ** (self.digits - n), 0)
+            candidato = denso[prefixo]
+            achou = (nivel < 0) & valido & ~np.isnan(candidato[:, self._key_pos])
+            valores[achou] = candidato[achou]
+            nivel[achou] = i
+        return valores, nivel
+
+    def match(self, codes, unmatched=None, level_column='match_level'):
+        """
+        DataFrame com os valores resolvidos e a proveniência por linha.
+
+        Parâmetros
+        ----------
+        codes : pd.Series ou array-like
+            Códigos de entrada; o índice de uma Series é preservado
+        unmatched : str, opcional
+            Rótulo de match_level para linhas sem match (padrão: nulo); se
+            for o nome de um nível (ex.: o último fallback), elas recebem
+            esse nível, sem categoria nova
+        level_column : str
+            Nome da coluna de proveniência (padrão 'match_level')
+
+        Retorna
+        -------
+        pd.DataFrame
+            Colunas das tabelas (float64) + level_column (category com os
+            nomes dos níveis na ordem dada)
+        """
+        valores, nivel = self.resolve(codes)
+        indice = codes.index if isinstance(codes, pd.Series) else None
+        resultado = pd.DataFrame(valores, columns=self.columns, index=indice)
+
+        categorias = list(self.names)
+        nivel = nivel.astype(np.int16)
+        if unmatched is not None:
+            if unmatched not in categorias:
+                categorias.append(unmatched)
+            nivel[nivel < 0] = categorias.index(unmatched)
+        resultado[level_column] = pd.Categorical.from_codes(nivel, categories=categorias)
+        return resultado
+
+
+def correspondence_means(mapping, table):
+    """
+    Média dos valores de table nos códigos correspondentes de cada origem.
+
+    Para níveis via tabela de correspondência (ex.: ISCO-88 → lista de
+    ISCO-08): o valor de cada código de origem é a média de table nos
+    destinos presentes; origens sem nenhum destino presente ficam de fora.
+
+    Parâmetros
+    ----------
+    mapping : dict
+        código de origem → lista de códigos de destino
+    table : dict ou pd.Series
+        código de destino → valor
+
+    Retorna
+    -------
+    pd.Series
+        Indexada pelo código de origem
+    """
+    pares = pd.Series(mapping, dtype=object).explode()
+    valores = pares.map(pd.Series(table, dtype=np.float64))
+    return valores.groupby(level=0).mean().dropna()
@@ -0,0 +1,129 @@
+"""
+Teste: crosswalk hierárquico em arrays inteiros
+Executar: python -m pytest occupation_crosswalk/tests
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adicionar raiz do repositório ao path
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+from occupation_crosswalk import (HierarchicalCrosswalk, codes_to_int, correspondence_means,
+                                  lookup_by_code)
+
+
+def _fallback_referencia(codigos, niveis):
+    """Fallback com dicts e fatias de texto (implementação anterior das etapas)."""
+    valores, origem = [], []
+    for cod in codigos:
+        valor, nivel = np.nan, None
+        if isinstance(cod, str) and cod.isdigit() and len(cod) == 4:
+            for nome, n, tabela in niveis:
+                v = tabela.get(cod[:n], np.nan)
+                if not np.isnan(v):
+                    valor, nivel = v, nome
+                    break
+        valores.append(valor)
+        origem.append(nivel)
+    return np.array(valores), origem
+
+
+def test_codes_to_int():
+    """Texto, inteiros, category e ausentes na mesma convenção"""
+    texto = pd.Series(['0110', '2111', ' 411', 'abc', None, '12345', '110'])
+    np.testing.assert_array_equal(codes_to_int(texto), [110, 2111, 411, -1, -1, -1, 110])
+    np.testing.assert_array_equal(codes_to_int(texto.astype('category')),
+                                  codes_to_int(texto))
+    np.testing.assert_array_equal(codes_to_int(pd.Series([110, 2111, 99999])), [110, 2111, -1])
+    np.testing.assert_array_equal(codes_to_int(pd.Series([110.0, np.nan, 2.5])), [110, -1, -1])
+    np.testing.assert_array_equal(codes_to_int(pd.Index(['01', '9']), digits=2), [1, 9])
+    print("✓ codes_to_int: texto, inteiros, category e inválidos")
+
+
+def test_igual_ao_fallback_com_dicts():
+    """Mesmo score e mesmo nível do fallback por fatias de texto"""
+    rng = np.random.default_rng(0)
+    isco = pd.Series(sorted({f"{x:04d}" for x in rng.integers(100, 9700, 300)}))
+    scores = pd.Series(rng.random(len(isco)), index=isco)
+    niveis = [(f'{n}-digit', n, scores.groupby(isco.str[:n].values).mean().to_dict())
+              for n in (4, 3, 2, 1)]
+    niveis[2][2]['55'] = np.nan  # NaN na tabela = nível sem valor
+
+    codigos = pd.Series(rng.choice([f"{x:04d}" for x in rng.integers(0, 10000, 800)]
+                                   + ['abc', None], 20_000))
+    esperado, origem = _fallback_referencia(codigos, niveis)
+
+    cw = HierarchicalCrosswalk(niveis)
+    res = cw.match(codigos)
+    np.testing.assert_array_equal(res['value'].to_numpy(), esperado)
+    assert list(res['match_level'].astype(object).where(res['match_level'].notna(), None)) == origem
+    assert res.index.equals(codigos.index)
+    assert list(res['match_level'].cat.categories) == cw.names
+
+    sem = cw.match(codigos, unmatched='sem match')['match_level']
+    assert (sem == 'sem match').sum() == sum(o is None for o in origem)
+    print("✓ Resolução vetorizada = fallback por dicts (score e proveniência)")
+
+
+def test_varias_colunas_e_correspondencia():
+    """Chave decide o nível; demais colunas vêm do mesmo nível; níveis via correspondência"""
+    avg_3d = pd.DataFrame({'indice': [0.5, np.nan], 'share': [0.1, 0.2]}, index=['011', '021'])
+    avg_2d = pd.DataFrame({'indice': [0.7, 0.9], 'share': [0.3, 0.4]}, index=['01', '02'])
+    cw = HierarchicalCrosswalk([('3d', 3, avg_3d), ('2d', 2, avg_2d)], key='indice')
+    res = cw.match(pd.Series(['0111', '0215', '0399'], index=[10, 20, 30]))
+    np.testing.assert_array_equal(res['indice'].to_numpy(), [0.5, 0.9, np.nan])
+    np.testing.assert_array_equal(res['share'].to_numpy(), [0.1, 0.4, np.nan])
+    assert list(res['match_level'].astype(object)) == ['3d', '2d', np.nan]
+    # Sem match rotulado como o último fallback (crosswalk_2d da etapa 2a): nenhum nulo
+    rotulado = cw.match(pd.Series(['0111', '0215', '0399']), unmatched='2d')['match_level']
+    assert list(rotulado) == ['3d', '2d', '2d'] and list(rotulado.cat.categories) == ['3d', '2d']
+
+    ilo_4d = {'1111': 0.2, '1112': 0.4}
+    via = correspondence_means({'0001': ['1111', '1112'], '0002': ['9999']}, ilo_4d)
+    assert list(via.index) == ['0001'] and np.isclose(via['0001'], 0.3)
+    print("✓ Tabelas com várias colunas (coluna-chave) e níveis via correspondência")
+
+
+def test_lookup_igual_ao_merge():
+    """lookup_by_code = left join por código (texto, category e int), sem duplicar linhas"""
+    rng = np.random.default_rng(1)
+    indice = pd.DataFrame({
+        'cod_cod': [f"{x:04d}" for x in rng.choice(10000, 300, replace=False)],
+        'exposure_score': rng.random(300),
+        'n_tarefas': rng.integers(1, 50, 300),
+        'imputation_method': rng.choice(['direct_match', 'hierarchical_3d_mean'], 300),
+    })
+    codigos = pd.Series(rng.choice(list(indice['cod_cod'][:200]) + ['0000', 'abc', None], 50_000),
+                        index=np.arange(50_000) * 2)
+    esperado = codigos.to_frame('cod').merge(indice, left_on='cod', right_on='cod_cod',
+                                              how='left').drop(columns=['cod', 'cod_cod'])
+
+    for entrada in (codigos, codigos.astype('category')):
+        res = lookup_by_code(entrada, indice.set_index('cod_cod'))
+        assert res.index.equals(codigos.index)
+        np.testing.assert_array_equal(res['exposure_score'], esperado['exposure_score'])
+        np.testing.assert_array_equal(res['n_tarefas'], esperado['n_tarefas'].astype(float))
+        assert isinstance(res['imputation_method'].dtype, pd.CategoricalDtype)
+        assert res['imputation_method'].astype(object).fillna('NA').tolist() == \
+            esperado['imputation_method'].fillna('NA').tolist()
+
+    # Códigos inteiros na tabela casam com texto nas linhas ('0110' = 110)
+    res = lookup_by_code(pd.Series(['0110', '110', '9']), pd.Series({110: 0.5, 9: 0.1}, name='s'))
+    np.testing.assert_array_equal(res['s'], [0.5, 0.5, 0.1])
+
+    with pytest.raises(ValueError):
+        lookup_by_code(codigos, pd.Series([1.0, 2.0], index=['0110', '110']))
+    print("✓ lookup_by_code = merge left por código (category, texto e inteiros)")
+
+
+if __name__ == "__main__":
+    test_codes_to_int()
+    test_igual_ao_fallback_com_dicts()
+    test_varias_colunas_e_correspondencia()
+    test_lookup_igual_ao_merge()
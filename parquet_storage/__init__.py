@@ -0,0 +1,42 @@
+"""
+Perfis de gravação Parquet compartilhados pelas etapas do projeto
+
+Uso (com a raiz do repositório no sys.path):
+    from parquet_storage import write_parquet
+    write_parquet(df, path)                   # perfil de PARQUET_PROFILE
+    write_parquet(df, path, profile='scan')
+
+Perfis: fast_write (padrão), archive, scan — ver profiles.py.
+
+Validação pelos rodapés (sem ler os dados):
+    stats = ParquetStats(paths)
+    stats.num_rows, stats.counts_by(['ano', 'mes']), stats.null_counts([...])
+
+Módulos:
+    profiles   definição dos perfis e opções de pq.write_table por schema
+    writer     write_parquet (gravação atômica de um arquivo)
+    partitions write_partitions (uma tabela em partições hive numa só passada)
+    validation ParquetStats / validate_parquet: contagens, nulos e faixas a
+               partir das estatísticas de row group
+
+Benchmark: python -m parquet_storage.benchmarks CAMINHO [CAMINHO ...]
+"""
+
+from .profiles import (
+    DEFAULT_PROFILE,
+    PROFILES,
+    default_profile,
+    get_profile,
+    row_group_size,
+    sort_table,
+    write_options,
+)
+from .partitions import write_partitions
+from .validation import ParquetStats, validate_parquet
+from .writer import write_parquet
+
+__all__ = [
+    'DEFAULT_PROFILE', 'PROFILES', 'default_profile', 'get_profile',
+    'row_group_size', 'sort_table', 'write_options', 'write_parquet', 'write_partitions',
+    'ParquetStats', 'validate_parquet',
+]
@@ -0,0 +1,136 @@
+"""
+Benchmark dos perfis de gravação Parquet sobre os painéis do projeto
+
+Para cada arquivo (ou dataset particionado) de entrada e cada perfil, grava
+uma cópia num diretório temporário e mede:
+    - tamanho do arquivo (MB)
+    - tempo de gravação (s)
+    - tempo de leitura filtrada (s, melhor de --repeticoes) e row groups
+      que sobrevivem ao filtro pelas estatísticas
+
+O filtro padrão é igualdade na primeira coluna de ocupação presente
+(cod_ocupacao, cbo_4d ou cbo_2002), com o valor da linha do meio da tabela.
+
+Uso:
+    python -m parquet_storage.benchmarks CAMINHO [CAMINHO ...]
+        [--perfis fast_write,archive,scan] [--filtro cbo_2002=252105]
+        [--linhas 10000000] [--repeticoes 3]
+
+Exemplos (a partir da raiz do repositório):
+    etapa5_did_ocupacional/data/processed/pnad_panel_did_ready
+    notebook/data/processed/painel_caged_mensal.parquet
+    notebook/data/raw/caged_2024.parquet
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .profiles import PROFILES, SORT_CANDIDATES
+from .writer import write_parquet
+
+
+def load_table(path, linhas=None):
+    """Arquivo ou diretório hive (ano=/trimestre=) como uma pa.Table."""
+    path = Path(path)
+    dataset = ds.dataset(path, format='parquet',
+                         partitioning='hive' if path.is_dir() else None)
+    tabela = dataset.head(linhas) if linhas else dataset.to_table()
+    return tabela.combine_chunks()
+
+
+def default_filter(tabela):
+    """(coluna, valor) do filtro padrão: ocupação da linha do meio."""
+    for col in SORT_CANDIDATES[:3]:
+        if col in tabela.schema.names:
+            valor = tabela.column(col)[tabela.num_rows // 2].as_py()
+            return col, valor
+    raise ValueError("Sem coluna de ocupação: informe --filtro coluna=valor")
+
+
+def _parse_filter(texto, schema):
+    col, _, valor = texto.partition('=')
+    tipo = schema.field(col).type
+    if pa.types.is_dictionary(tipo):
+        tipo = tipo.value_type
+    return col, pa.scalar(valor).cast(tipo).as_py()
+
+
+def benchmark_table(tabela, perfis, filtro, repeticoes=3):
+    """
+    Mede os perfis sobre tabela; filtro = (coluna, valor).
+
+    Retorna um DataFrame com uma linha por perfil.
+    """
+    col, valor = filtro
+    expressao = ds.field(col) == valor
+    linhas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for perfil in perfis:
+            arquivo = Path(tmp) / f'{perfil}.parquet'
+            t0 = time.perf_counter()
+            write_parquet(tabela, arquivo, profile=perfil)
+            t_escrita = time.perf_counter() - t0
+
+            tempos = []
+            for _ in range(repeticoes):
+                t0 = time.perf_counter()
+                lido = pq.read_table(arquivo, filters=[(col, '==', valor)])
+                tempos.append(time.perf_counter() - t0)
+
+            fragmento = next(ds.dataset(arquivo, format='parquet').get_fragments())
+            linhas.append({
+                'perfil': perfil,
+                'tamanho_mb': arquivo.stat().st_size / 1e6,
+                'escrita_s': t_escrita,
+                'leitura_filtrada_s': min(tempos),
+                'linhas_filtro': lido.num_rows,
+                'row_groups': fragmento.metadata.num_row_groups,
+                'row_groups_filtro': len(fragmento.split_by_row_group(expressao)),
+            })
+    return pd.DataFrame(linhas)
+
+
+def run(paths, perfis, filtro=None, linhas=None, repeticoes=3):
+    resultados = []
+    for path in paths:
+        t0 = time.perf_counter()
+        tabela = load_table(path, linhas)
+        filtro_tabela = (_parse_filter(filtro, tabela.schema) if filtro
+                         else default_filter(tabela))
+        print(f"\n{path}: {tabela.num_rows:,} linhas × {tabela.num_columns} colunas "
+              f"(carregado em {time.perf_counter() - t0:.1f}s)")
+        print(f"Filtro: {filtro_tabela[0]} == {filtro_tabela[1]!r}")
+
+        res = benchmark_table(tabela, perfis, filtro_tabela, repeticoes)
+        print(res.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+        resultados.append(res.assign(arquivo=str(path)))
+        del tabela
+    return pd.concat(resultados, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='+', help='arquivos .parquet ou datasets hive')
+    parser.add_argument('--perfis', default=','.join(PROFILES), help='perfis separados por vírgula')
+    parser.add_argument('--filtro', default=None, help='coluna=valor da leitura filtrada')
+    parser.add_argument('--linhas', type=int, default=None, help='usa só as primeiras N linhas')
+    parser.add_argument('--repeticoes', type=int, default=3, help='repetições da leitura')
+    args = parser.parse_args()
+
+    perfis = args.perfis.split(',')
+    for perfil in perfis:
+        if perfil not in PROFILES:
+            parser.error(f"perfil desconhecido: {perfil} (opções: {list(PROFILES)})")
+    run(args.paths, perfis, args.filtro, args.linhas, args.repeticoes)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Gravação de partições Parquet em uma única passada
+
+write_partitions divide uma tabela pelas colunas-chave (ano/trimestre, ano/mes,
+...) sem filtrar a tabela inteira uma vez por partição: as chaves são
+ordenadas uma vez (lexsort), as linhas reordenadas com um único take, e cada
+partição vira uma fatia contígua (sem cópia) gravada numa thread própria.
+
+Layout hive: <destino>/ano=2021/trimestre=1/part-0.parquet, com as
+colunas-chave só no caminho (ou também no arquivo, com drop_keys=False).
+Cada arquivo é gravado por write_parquet, com as opções do perfil.
+
+Usado pelo painel da etapa5 (utils/panel_io.write_panel, nos scripts 02 a
+05) e pelo espelho do armazém local (python -m query_backend espelhar
+--particoes ano,mes).
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .writer import write_parquet
+
+
+def _hive_path(destino, by, chave):
+    partes = [f"{col}={valor}" for col, valor in zip(by, chave)]
+    return Path(destino).joinpath(*partes, 'part-0.parquet')
+
+
+def write_partitions(data, by, destino, drop_keys=True, sort_by=None,
+                     threads=None, row_group_size=None, profile=None):
+    """
+    Grava uma partição Parquet por combinação de valores de `by`.
+
+    Parâmetros
+    ----------
+    data : pd.DataFrame ou pa.Table
+    by : str ou list
+        Colunas de partição (ex.: ['ano', 'trimestre'])
+    destino : Path
+        Diretório base
+    drop_keys : bool
+        Remove as colunas de `by` dos arquivos (padrão True: ficam só no
+        caminho)
+    sort_by : str ou list, opcional
+        Ordem das linhas dentro de cada partição (ex.: 'mes', para row
+        groups de um mês só)
+    threads : int, opcional
+        Gravações simultâneas (padrão: número de núcleos, até 8)
+    row_group_size : int, opcional
+        Linhas por row group (padrão: o do perfil)
+    profile : str, opcional
+        Perfil de gravação do parquet_storage (padrão: PARQUET_PROFILE);
+        no perfil scan a ordenação do perfil prevalece sobre sort_by
+
+    Retorna
+    -------
+    dict : {tupla de chaves: Path gravado}, na ordem das chaves
+
+    Cada arquivo é gravado num temporário e renomeado (write_parquet): uma
+    falha não deixa partição pela metade.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    sort_by = [] if sort_by is None else [sort_by] if isinstance(sort_by, str) else list(sort_by)
+    tabela = (pa.Table.from_pandas(data, preserve_index=False)
+              if isinstance(data, pd.DataFrame) else data)
+    if tabela.num_rows == 0:
+        return {}
+
+    # Uma ordenação pelas chaves (+ sort_by) e um único take
+    chaves = [tabela.column(col).to_numpy(zero_copy_only=False) for col in by]
+    extra = [tabela.column(col).to_numpy(zero_copy_only=False) for col in sort_by]
+    ordem = np.lexsort(extra[::-1] + chaves[::-1])
+    if not np.array_equal(ordem, np.arange(len(ordem))):
+        tabela = tabela.take(pa.array(ordem))
+        chaves = [k[ordem] for k in chaves]
+
+    # Limites das partições: onde alguma chave muda
+    muda = np.zeros(len(ordem), dtype=bool)
+    muda[0] = True
+    for k in chaves:
+        muda[1:] |= k[1:] != k[:-1]
+    inicios = np.flatnonzero(muda)
+    fins = np.append(inicios[1:], len(ordem))
+
+    if drop_keys:
+        tabela = tabela.drop_columns(by)
+
+    tarefas = {}
+    for ini, fim in zip(inicios, fins):
+        chave = tuple(k[ini].item() if hasattr(k[ini], 'item') else k[ini] for k in chaves)
+        tarefas[chave] = (tabela.slice(ini, fim - ini), _hive_path(destino, by, chave))
+
+    threads = threads or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        futuros = {chave: pool.submit(write_parquet, fatia, path, profile, row_group_size)
+                   for chave, (fatia, path) in tarefas.items()}
+        return {chave: futuro.result() for chave, futuro in futuros.items()}
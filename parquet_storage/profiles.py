@@ -0,0 +1,146 @@
+"""
+Perfis de gravação Parquet
+
+Cada perfil fixa compressão, tamanho de row group, codificação e ordenação:
+
+    fast_write  snappy, row groups grandes (padrão; equivale aos defaults do
+                pyarrow usados até aqui)
+    archive     zstd nível 9; dicionário em todas as colunas (até 4 MiB por
+                página de dicionário) e byte_stream_split só nos floats de alta
+                cardinalidade (ex.: renda; scores por ocupação, com poucas
+                centenas de valores, ficam no dicionário)
+    scan        zstd nível 1, row groups de 128k linhas ordenados por
+                ocupação e período, com page index (estatísticas por página):
+                filtros por ocupação/período descartam row groups e páginas;
+                colunas category da ordenação são gravadas como texto
+
+O perfil em uso vem de PARQUET_PROFILE (padrão: fast_write) ou do argumento
+profile das funções. O perfil scan reordena as linhas (ordenação estável).
+"""
+
+import os
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+# Chaves de ordenação do perfil scan, na ordem; usam-se as presentes na tabela
+# (etapa5: cod_ocupacao, periodo_num; CAGED: cbo_4d/cbo_2002, ano, mes)
+SORT_CANDIDATES = ['cod_ocupacao', 'cbo_4d', 'cbo_2002',
+                   'periodo_num', 'ano', 'trimestre', 'mes']
+
+PROFILES = {
+    'fast_write': {
+        'compression': 'snappy',
+        'row_group_size': 1 << 22,
+    },
+    'archive': {
+        'compression': 'zstd',
+        'compression_level': 9,
+        'row_group_size': 1 << 20,
+        'dictionary_pagesize_limit': 4 << 20,
+        # floats com mais valores distintos que esta fração das linhas:
+        # byte_stream_split sem dicionário
+        'byte_stream_split': 0.1,
+    },
+    'scan': {
+        'compression': 'zstd',
+        'compression_level': 1,
+        'row_group_size': 1 << 17,
+        'write_page_index': True,
+        'sort_by': SORT_CANDIDATES,
+    },
+}
+
+DEFAULT_PROFILE = 'fast_write'
+
+# Chaves do perfil que não são argumentos de pq.write_table
+_CHAVES_INTERNAS = {'row_group_size', 'byte_stream_split', 'sort_by'}
+
+
+def default_profile():
+    """Perfil em uso: PARQUET_PROFILE ou DEFAULT_PROFILE."""
+    return os.environ.get('PARQUET_PROFILE', DEFAULT_PROFILE)
+
+
+def get_profile(profile=None):
+    """Dicionário do perfil (nome ou None = default_profile())."""
+    nome = profile or default_profile()
+    if nome not in PROFILES:
+        raise ValueError(f"Perfil Parquet desconhecido: {nome} (opções: {list(PROFILES)})")
+    return PROFILES[nome]
+
+
+def _is_float(tipo):
+    if pa.types.is_dictionary(tipo):
+        return False
+    return pa.types.is_floating(tipo)
+
+
+def sort_columns(schema, profile=None):
+    """Colunas de ordenação do perfil presentes em schema (lista vazia se nenhuma)."""
+    return [c for c in get_profile(profile).get('sort_by', []) if c in schema.names]
+
+
+def _high_cardinality_floats(schema, table, min_ratio):
+    """Floats de table com mais de min_ratio · linhas valores distintos."""
+    if table is None or table.num_rows == 0:
+        return []
+    return [f.name for f in schema if _is_float(f.type)
+            and pc.count_distinct(table.column(f.name)).as_py() > min_ratio * table.num_rows]
+
+
+def write_options(schema, profile=None, table=None):
+    """
+    Argumentos de pq.write_table / pq.ParquetWriter para o perfil.
+
+    Dependem do schema (sorting_columns no perfil scan) e, no perfil
+    archive, dos dados: floats de alta cardinalidade em table usam
+    byte_stream_split sem dicionário; as demais colunas ficam com
+    dicionário (o writer cai para PLAIN se o dicionário estourar o limite).
+    Sem table (gravação em lotes com ParquetWriter), todas usam dicionário.
+    row_group_size não entra (passado à parte: row_group_size(profile)).
+    """
+    perfil = get_profile(profile)
+    opcoes = {k: v for k, v in perfil.items() if k not in _CHAVES_INTERNAS}
+
+    if perfil.get('byte_stream_split'):
+        floats = _high_cardinality_floats(schema, table, perfil['byte_stream_split'])
+        if floats:
+            opcoes['use_dictionary'] = [f.name for f in schema if f.name not in floats]
+            opcoes['use_byte_stream_split'] = floats
+
+    ordem = sort_columns(schema, profile)
+    if ordem:
+        opcoes['sorting_columns'] = pq.SortingColumn.from_ordering(
+            schema, [(c, 'ascending') for c in ordem])
+    return opcoes
+
+
+def row_group_size(profile=None):
+    """Linhas por row group do perfil."""
+    return get_profile(profile)['row_group_size']
+
+
+def sort_table(table, profile=None):
+    """
+    Ordena table pelas colunas de ordenação do perfil (estável; sem efeito
+    em perfis sem sort_by).
+
+    Colunas category (dicionário no Arrow) entre as de ordenação são
+    ordenadas e gravadas como texto: o pyarrow não usa as estatísticas de
+    row group para filtrar colunas dicionário. No arquivo elas continuam
+    com codificação de dicionário do Parquet (mesmo tamanho).
+    """
+    ordem = sort_columns(table.schema, profile)
+    if not ordem:
+        return table
+    for col in ordem:
+        tipo = table.schema.field(col).type
+        if pa.types.is_dictionary(tipo):
+            i = table.schema.get_field_index(col)
+            table = table.set_column(i, col, table.column(col).cast(tipo.value_type))
+    if table.num_rows < 2:
+        return table
+    indices = pc.sort_indices(table.select(ordem), sort_keys=[(c, 'ascending') for c in ordem])
+    return table.take(indices)
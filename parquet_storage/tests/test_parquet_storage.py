@@ -0,0 +1,154 @@
+"""
+Teste: perfis de gravação Parquet
+Executar: python -m pytest parquet_storage/tests
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+# Adicionar raiz do repositório ao path
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+from parquet_storage import PROFILES, ParquetStats, validate_parquet, write_parquet
+from parquet_storage.benchmarks import benchmark_table, default_filter
+
+
+def _painel(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'cod_ocupacao': pd.Categorical(rng.choice(['2512', '4110', '0110', '9112'], n)),
+        'periodo_num': rng.choice([20221, 20222, 20231], n).astype('int32'),
+        'id': np.arange(n),
+        'renda': rng.lognormal(7, 1, n),
+        'sigla_uf': rng.choice(['SP', 'RJ'], n),
+    })
+
+
+@pytest.mark.parametrize('perfil', list(PROFILES))
+def test_perfis_preservam_dados(perfil):
+    """Todo perfil devolve as mesmas linhas; scan ordena por ocupação e período"""
+    df = _painel()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_parquet(df, Path(tmp) / 'p.parquet', profile=perfil)
+        lido = pd.read_parquet(path)
+        meta = pq.ParquetFile(path).metadata
+
+        chaves = ['cod_ocupacao', 'periodo_num', 'id']
+        col = meta.row_group(0).column(list(df.columns).index('renda'))
+        if perfil == 'scan':
+            # Chave de ordenação category volta como texto
+            assert lido['cod_ocupacao'].dtype == object
+            assert lido[chaves].equals(lido[chaves].sort_values(chaves))
+            assert meta.num_row_groups == 1 and meta.row_group(0).sorting_columns
+            lido['cod_ocupacao'] = lido['cod_ocupacao'].astype('category')
+        elif perfil == 'archive':
+            assert col.compression == 'ZSTD' and 'BYTE_STREAM_SPLIT' in col.encodings
+        else:
+            assert col.compression == 'SNAPPY'
+        pd.testing.assert_frame_equal(lido.sort_values('id').reset_index(drop=True), df)
+        assert not list(Path(tmp).glob('.*.tmp'))
+    print(f"✓ Perfil {perfil}: dados preservados")
+
+
+def test_archive_menor_que_fast_write():
+    """archive ≤ fast_write num painel com scores repetidos por ocupação"""
+    rng = np.random.default_rng(2)
+    n = 200_000
+    ocupacao = rng.integers(0, 500, n)
+    df = pd.DataFrame({
+        'cod_ocupacao': pd.Categorical(ocupacao.astype(str)),
+        'exposure_score': rng.random(500)[ocupacao],
+        'augmentation_index_cai': rng.random(500)[ocupacao],
+        'ln_horas': np.log(rng.choice([20.0, 30.0, 40.0, 44.0, 48.0], n)),
+        'renda': rng.lognormal(7, 1, n),
+        'idade': rng.integers(14, 90, n).astype('int16'),
+    })
+    with tempfile.TemporaryDirectory() as tmp:
+        tamanhos = {p: write_parquet(df, Path(tmp) / f'{p}.parquet', profile=p).stat().st_size
+                    for p in ('fast_write', 'archive')}
+        meta = pq.ParquetFile(Path(tmp) / 'archive.parquet').metadata.row_group(0)
+        encodings = {meta.column(i).path_in_schema: meta.column(i).encodings
+                     for i in range(meta.num_columns)}
+    assert tamanhos['archive'] <= tamanhos['fast_write'], tamanhos
+    # Floats repetidos ficam no dicionário; só os de alta cardinalidade usam BSS
+    assert 'RLE_DICTIONARY' in encodings['exposure_score']
+    assert 'RLE_DICTIONARY' in encodings['ln_horas']
+    assert 'BYTE_STREAM_SPLIT' in encodings['renda']
+    print(f"✓ archive ({tamanhos['archive']:,} B) ≤ fast_write ({tamanhos['fast_write']:,} B)")
+
+
+def test_benchmark_descarta_row_groups():
+    """No perfil scan o filtro por ocupação lê menos row groups"""
+    df = pd.concat([_painel()] * 20, ignore_index=True)
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+
+    res = benchmark_table(tabela, ['fast_write', 'scan'], default_filter(tabela),
+                          repeticoes=1).set_index('perfil')
+    assert res['linhas_filtro'].nunique() == 1
+    assert res.loc['fast_write', 'row_groups_filtro'] == res.loc['fast_write', 'row_groups'] == 1
+    assert res.loc['scan', 'row_groups_filtro'] < res.loc['scan', 'row_groups']
+    print("✓ Benchmark: row groups descartados no perfil scan")
+
+
+def test_validacao_pelos_rodapes():
+    """Contagens, nulos e faixas pelos rodapés batem com o pandas; só o indeciso é lido"""
+    rng = np.random.default_rng(1)
+    n = 12_000
+    df = pd.DataFrame({
+        'mes': np.repeat(np.arange(1, 13), n // 12),
+        'idade': rng.integers(14, 90, n).astype(float),
+        'cbo_2002': rng.choice(['252105', '411010', None], n),
+    })
+    df.loc[::97, 'idade'] = np.nan
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'caged.parquet'
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=n // 12)
+        stats = ParquetStats(path)
+
+        assert stats.num_rows == n and stats.num_row_groups == 12
+        assert stats.counts_by('mes').equals(df['mes'].value_counts().sort_index()
+                                             .rename('linhas').rename_axis('mes'))
+        assert stats.null_counts(['idade', 'cbo_2002']).tolist() == df[['idade', 'cbo_2002']].isna().sum().tolist()
+        assert stats.value_range('idade') == (df['idade'].min(), df['idade'].max())
+        assert stats.rows_out_of_range('idade', 10, 100) == 0
+        assert stats.rows_out_of_range('mes', 1, 6) == (df['mes'] > 6).sum()
+        assert stats.scanned == {}
+
+        # Faixa que corta os row groups: só a coluna idade é lida
+        assert stats.rows_out_of_range('idade', 18, 65) == (~df['idade'].between(18, 65) & df['idade'].notna()).sum()
+        assert list(stats.scanned) == ['idade']
+
+        ok, erros = validate_parquet(path, ['mes', 'sexo'], min_rows=n + 1,
+                                     ranges={'idade': (14, 89)}, max_null_pct={'cbo_2002': 5}, stats=stats)
+        assert not ok and len(erros) == 3
+    print("✓ Validação pelos rodapés (leitura só das colunas indecisas)")
+
+
+def test_validacao_dataset_hive():
+    """Colunas de partição contam pelo caminho; sem leitura dos dados"""
+    df = pd.DataFrame({'ano': [2021] * 5 + [2022] * 3, 'trimestre': [1, 1, 2, 2, 2, 1, 1, 4],
+                       'peso': np.arange(8.0)})
+    with tempfile.TemporaryDirectory() as tmp:
+        pq.write_to_dataset(pa.Table.from_pandas(df), tmp, partition_cols=['ano', 'trimestre'])
+        stats = ParquetStats(Path(tmp))
+        contagens = stats.counts_by(['ano', 'trimestre'])
+        assert contagens.to_dict() == df.groupby(['ano', 'trimestre']).size().to_dict()
+        assert stats.scanned == {}
+    print("✓ Validação de dataset particionado")
+
+
+if __name__ == "__main__":
+    for perfil in PROFILES:
+        test_perfis_preservam_dados(perfil)
+    test_archive_menor_que_fast_write()
+    test_benchmark_descarta_row_groups()
+    test_validacao_pelos_rodapes()
+    test_validacao_dataset_hive()
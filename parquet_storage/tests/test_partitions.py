@@ -0,0 +1,69 @@
+"""
+Teste: gravação de partições Parquet numa só passada
+Executar: python -m pytest parquet_storage/tests
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Adicionar raiz do repositório ao path
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+from parquet_storage import write_partitions
+
+
+def _painel(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'ano': rng.integers(2021, 2023, n),
+        'trimestre': rng.integers(1, 5, n),
+        'mes': rng.integers(1, 13, n),
+        'id': np.arange(n),
+        'uf': rng.choice(['SP', 'RJ', 'MG'], n),
+    })
+
+
+def test_hive_igual_ao_filtro_por_mascara():
+    """Cada partição hive tem as mesmas linhas, na mesma ordem, que o filtro por máscara"""
+    df = _painel()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_partitions(df, ['ano', 'trimestre'], tmp, threads=3)
+        assert list(paths) == sorted(set(zip(df['ano'], df['trimestre'])))
+        for (ano, tri), path in paths.items():
+            assert path == Path(tmp) / f'ano={ano}' / f'trimestre={tri}' / 'part-0.parquet'
+            lido = pq.read_table(path).to_pandas()
+            assert 'ano' not in lido.columns
+            esperado = df[(df['ano'] == ano) & (df['trimestre'] == tri)].drop(columns=['ano', 'trimestre'])
+            pd.testing.assert_frame_equal(lido, esperado.reset_index(drop=True))
+        assert ds.dataset(tmp, partitioning='hive').count_rows() == len(df)
+        assert not list(Path(tmp).rglob('*.tmp'))
+    print("✓ Layout hive idêntico ao filtro por máscara")
+
+
+def test_chaves_no_arquivo_e_ordenacao():
+    """drop_keys=False mantém as chaves no arquivo; sort_by ordena dentro da partição"""
+    df = _painel()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_partitions(df, 'ano', tmp, drop_keys=False, sort_by='mes',
+                                 row_group_size=500)
+        assert [p.parent.name for p in paths.values()] == ['ano=2021', 'ano=2022']
+        lido = pd.read_parquet(paths[(2021,)])
+        assert (lido['ano'] == 2021).all() and lido['mes'].is_monotonic_increasing
+        assert pq.ParquetFile(paths[(2021,)]).metadata.row_group(0).num_rows == 500
+        # Estável: empates em mes preservam a ordem original
+        assert lido.groupby('mes')['id'].apply(lambda s: s.is_monotonic_increasing).all()
+
+        assert write_partitions(df.iloc[:0], 'ano', Path(tmp) / 'vazio') == {}
+    print("✓ Chaves no arquivo e ordenação estável")
+
+
+if __name__ == "__main__":
+    test_hive_igual_ao_filtro_por_mascara()
+    test_chaves_no_arquivo_e_ordenacao()
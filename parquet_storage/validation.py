@@ -0,0 +1,272 @@
+"""
+Validação de arquivos Parquet pelos rodapés (estatísticas de row group)
+
+Contagens de linhas, presença de colunas, nulos, faixas de códigos e
+contagens por período saem dos metadados de cada row group (num_rows,
+null_count, min, max), sem ler os dados. Só os row groups cujas
+estatísticas não decidem a verificação são lidos, e apenas nas colunas
+envolvidas:
+
+    - coluna sem estatísticas no row group
+    - faixa parcialmente fora do intervalo (min < lo <= max, por exemplo)
+    - contagem por valor num row group com mais de um valor (min != max)
+
+Os arquivos gravados pelo projeto (caged_{ano}.parquet com row groups de um
+mês; datasets do painel com ano=/trimestre= no caminho) respondem às
+verificações usuais só pelos rodapés.
+
+Uso:
+    stats = ParquetStats(DATA_RAW.glob('caged_*.parquet'))
+    stats.num_rows, stats.missing_columns(['cbo_2002'])
+    stats.counts_by(['ano', 'mes'])           # linhas por mês
+    stats.rows_out_of_range('idade', 14, 100)
+    stats.scanned                              # o que precisou ser lido
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+def _as_paths(path):
+    if isinstance(path, (str, Path)):
+        return Path(path)
+    return [str(p) for p in path]
+
+
+class ParquetStats:
+    """
+    Estatísticas de rodapé de um arquivo, lista de arquivos ou dataset hive.
+
+    Parâmetros
+    ----------
+    path : str, Path ou lista de caminhos
+        Arquivo .parquet, diretório particionado (ano=/trimestre=/...) ou
+        lista de arquivos
+
+    Atributos
+    ---------
+    row_groups : pd.DataFrame
+        Uma linha por (arquivo, row group, coluna): num_rows, null_count,
+        min, max (None quando o rodapé não tem a estatística)
+    schema : pa.Schema
+        Schema do dataset (inclusive colunas de partição)
+    scanned : dict
+        coluna → linhas lidas dos dados nas verificações feitas até aqui
+    """
+
+    def __init__(self, path):
+        caminhos = _as_paths(path)
+        if isinstance(caminhos, list) and not caminhos:
+            raise FileNotFoundError("Nenhum arquivo Parquet para validar")
+        dataset = ds.dataset(caminhos, format='parquet',
+                             partitioning='hive' if isinstance(caminhos, Path) and caminhos.is_dir()
+                             else None)
+        self.schema = dataset.schema
+        self.scanned = {}
+        self._arquivos = {}
+
+        linhas = []
+        for fragmento in dataset.get_fragments():
+            meta = fragmento.metadata
+            particao = ds.get_partition_keys(fragmento.partition_expression)
+            self._arquivos[fragmento.path] = particao
+            nomes = [meta.schema.column(j).name for j in range(meta.num_columns)]
+            for i in range(meta.num_row_groups):
+                rg = meta.row_group(i)
+                for col, valor in particao.items():
+                    linhas.append((fragmento.path, i, col, rg.num_rows, 0, valor, valor))
+                for j, col in enumerate(nomes):
+                    st = rg.column(j).statistics
+                    nulos = st.null_count if st is not None and st.has_null_count else None
+                    lo, hi = (st.min, st.max) if st is not None and st.has_min_max else (None, None)
+                    linhas.append((fragmento.path, i, col, rg.num_rows, nulos, lo, hi))
+        colunas = list(zip(*linhas)) or [()] * 7
+        self.row_groups = pd.DataFrame({
+            nome: pd.Series(valores, dtype=object if nome in ('min', 'max') else None)
+            for nome, valores in zip(['arquivo', 'row_group', 'coluna', 'num_rows',
+                                      'null_count', 'min', 'max'], colunas)
+        })
+
+    # ------------------------------------------------------------------
+    # Leitura de fallback (só as colunas e row groups indecisos)
+    # ------------------------------------------------------------------
+
+    def _scan(self, columns, row_groups):
+        """Lê columns nos (arquivo, row_group) indicados; DataFrame concatenado."""
+        partes = []
+        for arquivo, i in row_groups:
+            particao = self._arquivos[arquivo]
+            no_arquivo = [c for c in columns if c not in particao]
+            tabela = pq.ParquetFile(arquivo).read_row_group(i, columns=no_arquivo)
+            df = tabela.to_pandas()
+            for col in columns:
+                if col in particao:
+                    df[col] = particao[col]
+            partes.append(df[columns])
+            for col in no_arquivo:
+                self.scanned[col] = self.scanned.get(col, 0) + tabela.num_rows
+        if not partes:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(partes, ignore_index=True)
+
+    def _coluna(self, column):
+        if column not in self.schema.names:
+            raise KeyError(f"Coluna ausente no Parquet: {column}")
+        return self.row_groups[self.row_groups['coluna'] == column]
+
+    # ------------------------------------------------------------------
+    # Verificações
+    # ------------------------------------------------------------------
+
+    @property
+    def num_rows(self):
+        """Total de linhas (rodapés)."""
+        unicos = self.row_groups.drop_duplicates(['arquivo', 'row_group'])
+        return int(unicos['num_rows'].sum())
+
+    @property
+    def num_row_groups(self):
+        return len(self.row_groups.drop_duplicates(['arquivo', 'row_group']))
+
+    def missing_columns(self, required):
+        """Colunas de required ausentes do schema."""
+        return [c for c in required if c not in self.schema.names]
+
+    def null_counts(self, columns=None):
+        """Nulos por coluna (Series); row groups sem null_count são lidos."""
+        columns = self.schema.names if columns is None else columns
+        resultado = {}
+        for col in columns:
+            stats = self._coluna(col)
+            indecisos = stats[stats['null_count'].isna()]
+            n = int(stats['null_count'].dropna().sum())
+            if len(indecisos):
+                lidos = self._scan([col], indecisos[['arquivo', 'row_group']].itertuples(index=False))
+                n += int(lidos[col].isna().sum())
+            resultado[col] = n
+        return pd.Series(resultado, name='nulos', dtype='int64')
+
+    def value_range(self, column):
+        """(mínimo, máximo) da coluna; row groups sem min/max são lidos."""
+        stats = self._coluna(column)
+        com_stats = stats.dropna(subset=['min'])
+        valores = list(com_stats['min']) + list(com_stats['max'])
+        indecisos = stats[stats['min'].isna() & (stats['null_count'] != stats['num_rows'])]
+        # (row groups só de nulos não têm min/max e não precisam ser lidos)
+        if len(indecisos):
+            lidos = self._scan([column], indecisos[['arquivo', 'row_group']].itertuples(index=False))
+            valores += list(lidos[column].dropna())
+        if not valores:
+            return None, None
+        return min(valores), max(valores)
+
+    def rows_out_of_range(self, column, lo=None, hi=None):
+        """
+        Linhas não nulas de column fora de [lo, hi] (limites None = abertos).
+
+        Row groups inteiramente dentro (ou inteiramente fora) da faixa são
+        decididos pelo rodapé; os demais são lidos.
+        """
+        n, indecisos = 0, []
+        for r in self._coluna(column).itertuples(index=False):
+            if r.min is None and r.null_count == r.num_rows:
+                continue
+            if r.min is None or pd.isna(r.null_count):
+                indecisos.append((r.arquivo, r.row_group))
+            elif (lo is None or r.min >= lo) and (hi is None or r.max <= hi):
+                continue
+            elif (lo is not None and r.max < lo) or (hi is not None and r.min > hi):
+                n += int(r.num_rows - r.null_count)
+            else:
+                indecisos.append((r.arquivo, r.row_group))
+
+        if indecisos:
+            valores = self._scan([column], indecisos)[column].dropna()
+            fora = np.zeros(len(valores), dtype=bool)
+            if lo is not None:
+                fora |= (valores < lo).to_numpy()
+            if hi is not None:
+                fora |= (valores > hi).to_numpy()
+            n += int(fora.sum())
+        return n
+
+    def counts_by(self, columns):
+        """
+        Linhas por valor de columns (Series indexada pelos valores).
+
+        Row groups com um único valor em todas as colunas (min == max, sem
+        nulos) são contados pelo rodapé; os demais são lidos.
+        """
+        columns = [columns] if isinstance(columns, str) else list(columns)
+        chaves = ['arquivo', 'row_group']
+        largos = None
+        for col in columns:
+            stats = self._coluna(col).set_index(chaves)
+            unico = (stats['min'].notna() & (stats['null_count'] == 0)
+                     & (stats['min'] == stats['max']))
+            parte = pd.DataFrame({col: stats['min'].where(unico), f'_{col}': unico,
+                                  'num_rows': stats['num_rows']})
+            largos = parte if largos is None else largos.join(parte.drop(columns='num_rows'))
+
+        decididos = largos[[f'_{c}' for c in columns]].all(axis=1)
+        contagens = (largos[decididos].groupby(columns)['num_rows'].sum()
+                     if decididos.any() else pd.Series(dtype='int64'))
+        if (~decididos).any():
+            lidos = self._scan(columns, largos.index[~decididos])
+            extra = lidos.value_counts(subset=columns, dropna=False)
+            if len(columns) == 1:
+                extra.index = extra.index.get_level_values(0)
+            contagens = contagens.add(extra, fill_value=0) if len(contagens) else extra
+        contagens = contagens.astype('int64').sort_index()
+        contagens.index.names = columns
+        contagens.name = 'linhas'
+        return contagens
+
+
+def validate_parquet(path, required_columns=(), min_rows=None, ranges=None,
+                     max_null_pct=None, stats=None):
+    """
+    Verificações de rodapé num arquivo/dataset Parquet.
+
+    Parâmetros
+    ----------
+    path : caminho(s) aceitos por ParquetStats
+    required_columns : list
+        Colunas que devem existir
+    min_rows : int, opcional
+        Mínimo de linhas
+    ranges : dict, opcional
+        {coluna: (lo, hi)}; nenhuma linha fora da faixa
+    max_null_pct : dict, opcional
+        {coluna: pct máximo de nulos (0–100)}
+    stats : ParquetStats, opcional
+        Reaproveita rodapés já lidos
+
+    Retorna
+    -------
+    (bool, list) : (sem erros, mensagens de erro)
+    """
+    stats = stats or ParquetStats(path)
+    errors = [f"Coluna ausente: {c}" for c in stats.missing_columns(required_columns)]
+
+    if min_rows is not None and stats.num_rows < min_rows:
+        errors.append(f"Dados insuficientes: {stats.num_rows:,} linhas (mínimo {min_rows:,})")
+
+    for col, (lo, hi) in (ranges or {}).items():
+        if col in stats.schema.names:
+            n = stats.rows_out_of_range(col, lo, hi)
+            if n:
+                errors.append(f"{col}: {n:,} valores fora de [{lo}, {hi}]")
+
+    if max_null_pct:
+        presentes = [c for c in max_null_pct if c in stats.schema.names]
+        nulos = stats.null_counts(presentes) / max(stats.num_rows, 1) * 100
+        for col, pct in nulos.items():
+            if pct > max_null_pct[col]:
+                errors.append(f"{col}: {pct:.1f}% nulos (máximo {max_null_pct[col]}%)")
+
+    return len(errors) == 0, errors
@@ -0,0 +1,46 @@
+"""
+Gravação de um arquivo Parquet com um perfil (profiles.PROFILES)
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .profiles import row_group_size as profile_row_group_size
+from .profiles import sort_table, write_options
+
+
+def write_parquet(data, path, profile=None, row_group_size=None):
+    """
+    Grava data em path com as opções do perfil.
+
+    Parâmetros
+    ----------
+    data : pd.DataFrame ou pa.Table
+        DataFrames são gravados sem o índice (como to_parquet(index=False))
+    path : str ou Path
+    profile : str, opcional
+        'fast_write' | 'archive' | 'scan' (padrão: PARQUET_PROFILE)
+    row_group_size : int, opcional
+        Substitui o tamanho de row group do perfil
+
+    Retorna
+    -------
+    Path : arquivo gravado (temporário + rename: uma falha não deixa o
+    arquivo pela metade)
+    """
+    path = Path(path)
+    tabela = (pa.Table.from_pandas(data, preserve_index=False)
+              if isinstance(data, pd.DataFrame) else data)
+    tabela = sort_table(tabela, profile)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name('.' + path.name + '.tmp')
+    pq.write_table(tabela, tmp,
+                   row_group_size=row_group_size or profile_row_group_size(profile),
+                   **write_options(tabela.schema, profile, tabela))
+    os.replace(tmp, path)
+    return path
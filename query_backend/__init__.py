@@ -0,0 +1,37 @@
+"""
+Backend de consultas dos scripts de download (BigQuery ou DuckDB local)
+
+Os scripts de download (etapa1 01, etapa5 01, notebook etapa_2a 01) enviam
+SQL no dialeto do BigQuery com nomes `basedosdados.<dataset>.<tabela>`.
+Com o backend 'duckdb', a mesma SQL roda sobre um armazém local de
+arquivos Parquet (espelho do basedosdados ou dados sintéticos), sem
+latência de rede nem cobrança.
+
+Uso (com a raiz do repositório no sys.path):
+    from query_backend import read_sql
+    df = read_sql(query, billing_project_id=GCP_PROJECT_ID)
+
+Escolha do backend:
+    - variável de ambiente QUERY_BACKEND = 'bigquery' (padrão) | 'duckdb'
+    - ou set_backend(...) no código
+Armazém local: QUERY_BACKEND_DIR (padrão: <repo>/data/local_bigquery),
+com uma pasta por dataset e uma por tabela:
+    br_ibge_pnadc/microdados/*.parquet
+    br_me_caged/microdados_movimentacao/*.parquet
+
+Módulos:
+    backend    seleção do backend e read_sql
+    local      DuckDB sobre Parquet (tradução de nomes e INFORMATION_SCHEMA)
+    synthetic  tabelas sintéticas PNAD/CAGED no esquema do basedosdados
+    mirror     cópia de tabelas (ou recortes) do BigQuery para o armazém
+
+CLI: python -m query_backend {sintetico,espelhar,sql} ...
+"""
+
+from .backend import BACKENDS, get_backend, read_sql, set_backend
+from .local import LocalWarehouse, default_warehouse_dir, translate_sql
+
+__all__ = [
+    'BACKENDS', 'get_backend', 'read_sql', 'set_backend',
+    'LocalWarehouse', 'default_warehouse_dir', 'translate_sql',
+]
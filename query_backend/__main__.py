@@ -0,0 +1,88 @@
+"""
+CLI do armazém local
+
+Uso:
+    python -m query_backend sintetico [--pnad-trimestres 2021Q1-2025Q3] [--pnad-linhas 500000]
+                                      [--replicas] [--caged-anos 2021-2025] [--caged-linhas 1000000]
+    python -m query_backend espelhar br_ibge_pnadc microdados --projeto ID
+                                     [--where "ano = 2024"] [--nome 2024] [--particoes ano,mes]
+    python -m query_backend sql "SELECT COUNT(*) FROM `basedosdados.br_me_caged.microdados_movimentacao`"
+
+Armazém: --destino ou QUERY_BACKEND_DIR (padrão: <repo>/data/local_bigquery).
+"""
+
+import argparse
+import time
+
+from .local import LocalWarehouse, default_warehouse_dir
+
+
+def _trimestres(intervalo):
+    inicio, _, fim = intervalo.upper().partition('-')
+    (a0, t0), (a1, t1) = [map(int, p.split('Q')) for p in (inicio, fim or inicio)]
+    return [(a, t) for a in range(a0, a1 + 1) for t in range(1, 5)
+            if (a0, t0) <= (a, t) <= (a1, t1)]
+
+
+def _anos(intervalo):
+    inicio, _, fim = intervalo.partition('-')
+    return list(range(int(inicio), int(fim or inicio) + 1))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--destino', default=None, help='diretório do armazém')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p = sub.add_parser('sintetico', help='gera tabelas sintéticas PNAD/CAGED')
+    p.add_argument('--pnad-trimestres', default='2021Q1-2025Q3')
+    p.add_argument('--pnad-linhas', type=int, default=500_000, help='linhas por trimestre')
+    p.add_argument('--replicas', action='store_true', help='inclui v1028001…v1028200')
+    p.add_argument('--caged-anos', default='2021-2025')
+    p.add_argument('--caged-linhas', type=int, default=1_000_000, help='linhas por mês')
+    p.add_argument('--seed', type=int, default=0)
+
+    p = sub.add_parser('espelhar', help='copia tabela do BigQuery para o armazém')
+    p.add_argument('dataset')
+    p.add_argument('tabela')
+    p.add_argument('--projeto', required=True, help='billing project do GCP')
+    p.add_argument('--colunas', default='*')
+    p.add_argument('--where', default=None)
+    p.add_argument('--nome', default='espelho')
+    p.add_argument('--particoes', default=None,
+                   help='colunas de partição separadas por vírgula (ex.: ano,mes)')
+
+    p = sub.add_parser('sql', help='executa uma consulta no armazém local')
+    p.add_argument('query')
+
+    args = parser.parse_args(argv)
+    destino = args.destino or default_warehouse_dir()
+    t0 = time.time()
+
+    if args.comando == 'sintetico':
+        from .synthetic import gerar_caged, gerar_pnad
+        if args.pnad_linhas:
+            n = gerar_pnad(destino, _trimestres(args.pnad_trimestres), args.pnad_linhas,
+                           replicas=args.replicas, seed=args.seed)
+            print(f"PNAD: {n:,} linhas ({time.time() - t0:.0f}s)")
+        if args.caged_linhas:
+            n = gerar_caged(destino, _anos(args.caged_anos), args.caged_linhas, seed=args.seed)
+            print(f"CAGED: {n:,} linhas ({time.time() - t0:.0f}s)")
+        print(f"Armazém: {destino}")
+
+    elif args.comando == 'espelhar':
+        from .mirror import espelhar_tabela
+        path = espelhar_tabela(args.dataset, args.tabela, args.projeto, args.colunas,
+                               args.where, args.nome, destino,
+                               particoes=args.particoes and args.particoes.split(','))
+        print(f"Salvo: {path} ({time.time() - t0:.0f}s)")
+
+    else:
+        with LocalWarehouse(destino) as wh:
+            print(wh.read_sql(args.query).to_string())
+        print(f"({time.time() - t0:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Seleção do backend de consultas
+
+    - variável de ambiente QUERY_BACKEND = 'bigquery' | 'duckdb'
+    - ou set_backend(...) no código
+
+'bigquery' mantém o comportamento original (basedosdados.read_sql);
+'duckdb' executa a mesma SQL no armazém local (query_backend.local).
+"""
+
+import os
+
+BACKENDS = ('bigquery', 'duckdb')
+
+_backend = os.environ.get('QUERY_BACKEND', 'bigquery').lower()
+
+
+def set_backend(name):
+    """Define o backend de consultas ('bigquery' ou 'duckdb')."""
+    global _backend
+    name = name.lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {name} (opções: {BACKENDS})")
+    _backend = name
+
+
+def get_backend():
+    """Backend em uso ('bigquery' ou 'duckdb')."""
+    if _backend not in BACKENDS:
+        raise ValueError(f"QUERY_BACKEND inválido: {_backend} (opções: {BACKENDS})")
+    return _backend
+
+
+def read_sql(query, billing_project_id=None, reauth=False, warehouse=None):
+    """
+    Executa query no backend ativo e retorna um DataFrame.
+
+    Mesma assinatura de basedosdados.read_sql; no backend 'duckdb',
+    billing_project_id e reauth são ignorados e warehouse escolhe o
+    diretório do armazém (padrão: QUERY_BACKEND_DIR).
+    """
+    if get_backend() == 'duckdb':
+        from .local import LocalWarehouse
+        with LocalWarehouse(warehouse) as wh:
+            return wh.read_sql(query)
+
+    import basedosdados as bd
+    return bd.read_sql(query, billing_project_id=billing_project_id, reauth=reauth)
@@ -0,0 +1,126 @@
+"""
+Armazém local: DuckDB sobre arquivos Parquet no lugar do BigQuery
+
+Cada pasta <dataset>/<tabela>/ do armazém vira a view "<dataset>"."<tabela>"
+(todos os *.parquet da pasta, inclusive subpastas ano=/mes= no formato
+hive). A SQL dos scripts é traduzida apenas nos nomes:
+
+    `basedosdados.br_me_caged.microdados_movimentacao`
+        → "br_me_caged"."microdados_movimentacao"
+    `basedosdados.br_me_caged.INFORMATION_SCHEMA.TABLES` / .COLUMNS
+        → information_schema do DuckDB filtrado pelo dataset, com os
+          tipos nos nomes do BigQuery (INT64, STRING, FLOAT64, ...)
+
+O restante (SELECT, WHERE, GROUP BY, COUNT(DISTINCT ...), comentários --)
+é comum aos dois dialetos nas consultas do projeto.
+"""
+
+import os
+import re
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Tipos do DuckDB → nomes do BigQuery em INFORMATION_SCHEMA.COLUMNS
+BIGQUERY_TYPES = {
+    'BIGINT': 'INT64', 'INTEGER': 'INT64', 'SMALLINT': 'INT64', 'TINYINT': 'INT64',
+    'DOUBLE': 'FLOAT64', 'FLOAT': 'FLOAT64', 'VARCHAR': 'STRING',
+    'BOOLEAN': 'BOOL', 'DATE': 'DATE', 'TIMESTAMP': 'DATETIME',
+}
+
+_TABLE_REF = re.compile(r'`([\w.-]+)`')
+
+
+def default_warehouse_dir():
+    """Diretório do armazém: QUERY_BACKEND_DIR ou <repo>/data/local_bigquery."""
+    return Path(os.environ.get('QUERY_BACKEND_DIR', REPO_ROOT / 'data' / 'local_bigquery'))
+
+
+def _information_schema(dataset, view):
+    if view == 'TABLES':
+        return (f"(SELECT table_name, table_type FROM information_schema.tables "
+                f"WHERE table_schema = '{dataset}')")
+    if view == 'COLUMNS':
+        types = ' '.join(f"WHEN '{duck}' THEN '{bq}'" for duck, bq in BIGQUERY_TYPES.items())
+        return (f"(SELECT table_name, column_name, ordinal_position, is_nullable, "
+                f"CASE data_type {types} ELSE data_type END AS data_type "
+                f"FROM information_schema.columns WHERE table_schema = '{dataset}')")
+    raise ValueError(f"INFORMATION_SCHEMA.{view} não suportado no armazém local")
+
+
+def _translate_ref(match):
+    parts = match.group(1).split('.')
+    if len(parts) >= 3 and parts[-2].upper() == 'INFORMATION_SCHEMA':
+        return _information_schema(parts[-3], parts[-1].upper())
+    if len(parts) < 2:
+        raise ValueError(f"Referência sem dataset: `{match.group(1)}`")
+    return f'"{parts[-2]}"."{parts[-1]}"'
+
+
+def translate_sql(query):
+    """Traduz nomes de tabela do BigQuery (entre crases) para o armazém local."""
+    return _TABLE_REF.sub(_translate_ref, query)
+
+
+class LocalWarehouse:
+    """
+    Conexão DuckDB com uma view por tabela do armazém. read_sql devolve um
+    DataFrame; iter_batches devolve o resultado em lotes Arrow (streaming).
+
+    Parâmetros
+    ----------
+    path : str ou Path, opcional
+        Diretório do armazém (padrão: default_warehouse_dir())
+    threads : int, opcional
+        Threads do DuckDB (padrão: todos os núcleos)
+    """
+
+    def __init__(self, path=None, threads=None):
+        import duckdb
+
+        self.path = Path(path) if path is not None else default_warehouse_dir()
+        if not self.path.is_dir():
+            raise FileNotFoundError(
+                f"Armazém local não encontrado: {self.path} "
+                "(gere com: python -m query_backend sintetico)"
+            )
+        self.con = duckdb.connect()
+        self.con.execute("SET enable_progress_bar = false")
+        if threads:
+            self.con.execute(f"SET threads = {int(threads)}")
+
+        self.tables = {}
+        for table_dir in sorted(p for p in self.path.glob('*/*') if p.is_dir()):
+            if not any(table_dir.rglob('*.parquet')):
+                continue
+            dataset, table = table_dir.parent.name, table_dir.name
+            files = (table_dir.as_posix() + '/**/*.parquet').replace("'", "''")
+            self.con.execute(f'CREATE SCHEMA IF NOT EXISTS "{dataset}"')
+            self.con.execute(
+                f'CREATE VIEW "{dataset}"."{table}" AS '
+                f"SELECT * FROM read_parquet('{files}', union_by_name = true)"
+            )
+            self.tables[(dataset, table)] = table_dir
+
+    def read_sql(self, query):
+        """Executa a SQL (dialeto dos scripts) e retorna um DataFrame."""
+        return self.con.execute(translate_sql(query)).df()
+
+    def iter_batches(self, query, batch_size=100_000):
+        """
+        Executa a SQL e entrega o resultado em pyarrow.RecordBatch de até
+        batch_size linhas, sem materializar a tabela inteira.
+        """
+        result = self.con.execute(translate_sql(query))
+        # to_arrow_reader substitui fetch_record_batch no DuckDB >= 1.4
+        reader = getattr(result, 'to_arrow_reader', None) or result.fetch_record_batch
+        yield from reader(batch_size)
+
+    def close(self):
+        self.con.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
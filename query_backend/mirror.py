@@ -0,0 +1,64 @@
+"""
+Espelho de tabelas do basedosdados no armazém local
+
+Baixa uma tabela (ou um recorte dela) do BigQuery uma única vez e grava em
+<armazém>/<dataset>/<tabela>/<nome>.parquet; a partir daí os scripts de
+download rodam com QUERY_BACKEND=duckdb sobre a cópia.
+
+Com particoes (ex.: ['ano', 'mes'] no CAGED), a cópia vira um diretório
+<nome>/ano=2021/mes=1/part-0.parquet, gravado por write_partitions.
+"""
+
+import shutil
+from pathlib import Path
+
+from parquet_storage import write_partitions
+
+from .local import default_warehouse_dir
+
+
+def espelhar_tabela(dataset, tabela, billing_project_id, colunas='*', where=None,
+                    nome='espelho', destino=None, reauth=False, particoes=None):
+    """
+    Copia basedosdados.<dataset>.<tabela> para o armazém local.
+
+    Parâmetros
+    ----------
+    dataset, tabela : str
+        Ex.: 'br_ibge_pnadc', 'microdados'
+    billing_project_id : str
+        Projeto GCP cobrado pela consulta
+    colunas : str
+        Lista SQL de colunas (padrão: todas)
+    where : str, opcional
+        Filtro SQL do recorte, ex.: 'ano = 2024 AND trimestre = 4'
+    nome : str
+        Nome do arquivo; recortes diferentes da mesma tabela convivem
+        como arquivos distintos na pasta da tabela
+    particoes : list, opcional
+        Colunas de partição (ex.: ['ano', 'mes']); as colunas continuam
+        nos arquivos, como na tabela original
+
+    Retorna
+    -------
+    Path : arquivo (ou diretório, com particoes) gravado
+    """
+    import basedosdados as bd
+
+    query = f"SELECT {colunas} FROM `basedosdados.{dataset}.{tabela}`"
+    if where:
+        query += f" WHERE {where}"
+    df = bd.read_sql(query, billing_project_id=billing_project_id, reauth=reauth)
+
+    pasta = Path(destino or default_warehouse_dir()) / dataset / tabela
+    if particoes:
+        path = pasta / nome
+        if path.exists():
+            shutil.rmtree(path)
+        write_partitions(df, particoes, path, drop_keys=False)
+        return path
+
+    path = pasta / f'{nome}.parquet'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(path, index=False)
+    return path
@@ -0,0 +1,161 @@
+"""
+Tabelas sintéticas no esquema do basedosdados, para o armazém local
+
+    br_ibge_pnadc/microdados/{ano}q{tri}_{parte}.parquet
+    br_me_caged/microdados_movimentacao/{ano}_{mes}.parquet
+
+Tipos e códigos seguem o BigQuery: códigos como STRING ('1', '01', '2512'),
+ano/trimestre/mes/idade/horas como INT64, rendimentos e pesos como FLOAT64.
+Os códigos de ocupação PNAD vêm da planilha ILO na raiz do repositório
+(para o crosswalk da etapa1 casar), ou são sorteados se ela não existir.
+Os valores são aleatórios: servem para exercitar e medir o pipeline de
+ingestão em volume realista, não para resultados.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .local import REPO_ROOT
+
+UFS = ['RO', 'AC', 'AM', 'RR', 'PA', 'AP', 'TO', 'MA', 'PI', 'CE', 'RN', 'PB', 'PE',
+       'AL', 'SE', 'BA', 'MG', 'ES', 'RJ', 'SP', 'PR', 'SC', 'RS', 'MS', 'MT', 'GO', 'DF']
+
+ILO_FILE = REPO_ROOT / 'Final_Scores_ISCO08_Gmyrek_et_al_2025.xlsx'
+
+
+def _codigos_ocupacao(rng):
+    if ILO_FILE.exists():
+        codigos = pd.read_excel(ILO_FILE, usecols=['ISCO_08'])['ISCO_08'].dropna().unique()
+        return np.array([f"{int(c):04d}" for c in codigos])
+    return np.array([f"{c:04d}" for c in rng.choice(np.arange(110, 9629), 430, replace=False)])
+
+
+def _escrever(df, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(path, index=False)
+
+
+def gerar_pnad(destino, trimestres, linhas_por_trimestre=500_000, replicas=False,
+               linhas_por_arquivo=250_000, seed=0):
+    """
+    Gera br_ibge_pnadc.microdados para os trimestres pedidos.
+
+    Parâmetros
+    ----------
+    destino : Path
+        Diretório do armazém
+    trimestres : list of (ano, trimestre)
+    linhas_por_trimestre : int
+        Pessoas por trimestre (~40% sem ocupação: v4010 nulo)
+    replicas : bool
+        Inclui os 200 pesos replicados v1028001…v1028200
+    linhas_por_arquivo : int
+        Linhas por arquivo Parquet (limita a memória da geração)
+
+    Retorna
+    -------
+    int : total de linhas geradas
+    """
+    rng = np.random.default_rng(seed)
+    codigos = _codigos_ocupacao(rng)
+    atividades = np.array([f"{c:05d}" for c in rng.choice(np.arange(1101, 99000), 200,
+                                                          replace=False)])
+    pasta = Path(destino) / 'br_ibge_pnadc' / 'microdados'
+    total = 0
+
+    for ano, tri in trimestres:
+        for parte, inicio in enumerate(range(0, linhas_por_trimestre, linhas_por_arquivo)):
+            n = min(linhas_por_arquivo, linhas_por_trimestre - inicio)
+            ocupado = rng.random(n) < 0.6
+            renda = np.where(ocupado, rng.lognormal(7.7, 0.9, n).round(), np.nan)
+            horas = rng.integers(4, 70, n)
+            peso = rng.uniform(50, 500, n)
+
+            df = pd.DataFrame({
+                'ano': np.full(n, ano, dtype=np.int64),
+                'trimestre': np.full(n, tri, dtype=np.int64),
+                'sigla_uf': rng.choice(UFS, n),
+                'v1028': peso,
+                'v2007': rng.choice(['1', '2'], n),
+                'v2009': rng.integers(14, 91, n),
+                'v2010': rng.choice(['1', '2', '3', '4', '5', '9'], n,
+                                    p=[0.43, 0.10, 0.01, 0.45, 0.005, 0.005]),
+                'vd3004': rng.choice(list('1234567'), n),
+                'vd3005': rng.integers(0, 17, n).astype(str),
+                'v4010': pd.Series(rng.choice(codigos, n)).where(ocupado),
+                'v4013': pd.Series(rng.choice(atividades, n)).where(ocupado),
+                'vd4002': np.where(ocupado, '1', rng.choice(['2', None], n)),
+                'vd4008': pd.Series(rng.choice(list('1234567'), n)).where(ocupado),
+                'vd4009': pd.Series(rng.choice([f"{c:02d}" for c in range(1, 11)], n)).where(ocupado),
+                'vd4016': renda,
+                'vd4020': np.where(ocupado, renda * rng.uniform(0.8, 1.2, n), np.nan).round(),
+                'vd4031': pd.Series(horas).where(ocupado).astype('Int64'),
+                'vd4035': pd.Series(horas + rng.integers(-4, 5, n)).where(ocupado).astype('Int64'),
+            })
+            if replicas:
+                fatores = rng.exponential(1.0, (n, 200))
+                df = pd.concat([df, pd.DataFrame(
+                    peso[:, None] * fatores,
+                    columns=[f'v1028{i:03d}' for i in range(1, 201)],
+                )], axis=1)
+
+            _escrever(df, pasta / f'{ano}q{tri}_{parte}.parquet')
+            total += n
+    return total
+
+
+def gerar_caged(destino, anos, linhas_por_mes=1_000_000, n_cbos=2_500, seed=0):
+    """
+    Gera br_me_caged.microdados_movimentacao (um arquivo por mês).
+
+    Parâmetros
+    ----------
+    destino : Path
+        Diretório do armazém
+    anos : list of int
+    linhas_por_mes : int
+        Movimentações por mês (o CAGED real tem ~3-4 milhões)
+    n_cbos : int
+        Número de ocupações CBO 2002 (6 dígitos) distintas
+
+    Retorna
+    -------
+    int : total de linhas geradas
+    """
+    rng = np.random.default_rng(seed)
+    cbos = np.array([f"{c:06d}" for c in rng.choice(np.arange(100000, 999999), n_cbos,
+                                                    replace=False)])
+    municipios = np.array([f"{c:07d}" for c in rng.integers(1100015, 5300108, 2_000)])
+    subclasses = np.array([f"{c:07d}" for c in rng.choice(np.arange(111301, 9900800), 1_300,
+                                                          replace=False)])
+    pasta = Path(destino) / 'br_me_caged' / 'microdados_movimentacao'
+    n = linhas_por_mes
+    total = 0
+
+    for ano in anos:
+        for mes in range(1, 13):
+            saldo = rng.choice([1, -1], n)
+            df = pd.DataFrame({
+                'ano': np.full(n, ano, dtype=np.int64),
+                'mes': np.full(n, mes, dtype=np.int64),
+                'sigla_uf': rng.choice(UFS, n),
+                'id_municipio': rng.choice(municipios, n),
+                'cbo_2002': rng.choice(cbos, n),
+                'categoria': rng.choice(['101', '103', '105', '106', '111'], n),
+                'tipo_movimentacao': np.where(saldo > 0, rng.choice(['10', '20', '97'], n),
+                                              rng.choice(['31', '32', '40', '43'], n)),
+                'saldo_movimentacao': saldo.astype(np.int64),
+                'salario_mensal': rng.lognormal(7.6, 0.6, n).round(2),
+                'grau_instrucao': rng.choice([str(g) for g in range(1, 12)], n),
+                'idade': rng.integers(14, 75, n),
+                'sexo': rng.choice(['1', '3'], n),
+                'raca_cor': rng.choice(['1', '2', '3', '5', '6', '9'], n),
+                'cnae_2_secao': rng.choice(list('ABCDEFGHIJKLMNOPQRSTU'), n),
+                'cnae_2_subclasse': rng.choice(subclasses, n),
+                'tamanho_estabelecimento_janeiro': rng.choice([str(t) for t in range(1, 11)], n),
+            })
+            _escrever(df, pasta / f'{ano}_{mes:02d}.parquet')
+            total += n
+    return total
@@ -0,0 +1,73 @@
+"""
+Teste: backend de consultas local (DuckDB sobre Parquet)
+Executar: python -m pytest query_backend/tests  (gera um armazém sintético pequeno)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Adicionar raiz do repositório ao path
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+import query_backend as qb
+from query_backend.synthetic import gerar_caged, gerar_pnad
+
+
+def test_traducao_nomes():
+    """Nomes BigQuery entre crases viram views locais / information_schema"""
+    sql = qb.translate_sql("SELECT * FROM `basedosdados.br_me_caged.microdados_movimentacao`")
+    assert sql == 'SELECT * FROM "br_me_caged"."microdados_movimentacao"'
+    sql = qb.translate_sql("SELECT table_name FROM `basedosdados.br_me_caged.INFORMATION_SCHEMA.TABLES`")
+    assert "information_schema.tables" in sql and "'br_me_caged'" in sql
+    with pytest.raises(ValueError):
+        qb.translate_sql("SELECT * FROM `basedosdados.br_me_caged.INFORMATION_SCHEMA.VIEWS`")
+    print("✓ Tradução de nomes BigQuery → armazém local")
+
+
+def test_consultas_dos_scripts():
+    """As queries dos scripts de download rodam no armazém e batem com pandas"""
+    pytest.importorskip('duckdb')
+    with tempfile.TemporaryDirectory() as tmp:
+        gerar_pnad(tmp, [(2025, 2), (2025, 3)], linhas_por_trimestre=3000,
+                   linhas_por_arquivo=1000, replicas=True)
+        gerar_caged(tmp, [2021], linhas_por_mes=500, n_cbos=50)
+        pnad = pd.concat(pd.read_parquet(p) for p in Path(tmp).glob('br_ibge_pnadc/*/*.parquet'))
+
+        with qb.LocalWarehouse(tmp) as wh:
+            df = wh.read_sql("""
+            SELECT ano, trimestre, v4010 AS cod_ocupacao, v1028 AS peso,
+                v1028001 AS peso_rep001
+            FROM `basedosdados.br_ibge_pnadc.microdados`
+            WHERE ano = 2025
+              AND trimestre = 3
+              AND v4010 IS NOT NULL  -- ocupados
+            """)
+            esperado = pnad[(pnad['trimestre'] == 3) & pnad['v4010'].notna()]
+            assert len(df) == len(esperado)
+            assert abs(df['peso'].sum() - esperado['v1028'].sum()) < 1e-6 * esperado['v1028'].sum()
+
+            cobertura = wh.read_sql("""
+            SELECT ano, COUNT(DISTINCT mes) as n_meses, COUNT(*) as n_registros
+            FROM `basedosdados.br_me_caged.microdados_movimentacao`
+            GROUP BY ano
+            """)
+            assert cobertura.iloc[0].tolist() == [2021, 12, 6000]
+
+            colunas = wh.read_sql("""
+            SELECT column_name, data_type
+            FROM `basedosdados.br_me_caged.INFORMATION_SCHEMA.COLUMNS`
+            WHERE table_name = 'microdados_movimentacao'
+            ORDER BY ordinal_position
+            """).set_index('column_name')['data_type']
+            assert colunas['ano'] == 'INT64' and colunas['cbo_2002'] == 'STRING'
+    print("✓ Queries dos scripts de download conferem no armazém local")
+
+
+if __name__ == "__main__":
+    test_traducao_nomes()
+    test_consultas_dos_scripts()
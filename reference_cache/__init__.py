@@ -0,0 +1,24 @@
+"""
+Cache de tabelas de referência (planilhas Excel → Parquet)
+
+As etapas leem as mesmas planilhas de referência (scores ILO, Estrutura COD,
+correspondência ISCO 08↔88, crosswalks SOC) a cada execução, e abrir .xls /
+.xlsx custa segundos. read_excel_cached converte cada aba lida para Parquet
+uma única vez, com chave no conteúdo do arquivo (SHA-256) e nas opções de
+leitura; as leituras seguintes vêm do Parquet.
+
+Uso (com a raiz do repositório no sys.path):
+    from reference_cache import read_excel_cached
+    df = read_excel_cached(ILO_FILE)
+    df_cod = read_excel_cached(path, sheet_name='Estrutura COD', header=1)
+
+Cache: REFERENCE_CACHE_DIR (padrão: <repo>/data/reference_cache); pode ser
+apagado a qualquer momento.
+
+Módulos:
+    excel  read_excel_cached, cache_path, file_digest
+"""
+
+from .excel import cache_path, default_cache_dir, file_digest, read_excel_cached
+
+__all__ = ['cache_path', 'default_cache_dir', 'file_digest', 'read_excel_cached']
@@ -0,0 +1,174 @@
+"""
+Cache Parquet de planilhas Excel (uma aba por arquivo)
+
+read_excel_cached(path, sheet_name, **opcoes) devolve o mesmo DataFrame que
+pd.read_excel, mas só o primeiro carregamento abre a planilha: o resultado é
+gravado em <cache>/<arquivo>.<aba>.<sha do conteúdo>.<sha das opções>.parquet
+e as leituras seguintes vêm desse arquivo.
+
+A chave é o conteúdo da planilha (SHA-256), não a data de modificação: cópias
+do mesmo arquivo em etapas diferentes compartilham a entrada, e uma planilha
+substituída gera outra chave (a entrada antiga da mesma aba é apagada).
+
+Colunas object com tipos misturados (ex.: códigos ora int, ora texto, como na
+Estrutura COD) não cabem numa coluna Parquet: são gravadas como texto mais
+uma coluna de tipo por célula, e reconstruídas com os tipos originais.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Opções de pd.read_excel que não mudam o resultado (fora da chave)
+_OPCOES_NEUTRAS = {'engine'}
+
+# Tipos de célula reconstruídos em colunas mistas (código → conversor do texto)
+_TIPOS = {
+    'str': str,
+    'int': int,
+    'float': float,
+    'bool': lambda s: s == 'True',
+    'datetime': pd.Timestamp,
+}
+_PREFIXO_TIPO = '__tipo__'
+
+
+def default_cache_dir():
+    """Diretório do cache: REFERENCE_CACHE_DIR ou <repo>/data/reference_cache."""
+    return Path(os.environ.get('REFERENCE_CACHE_DIR', REPO_ROOT / 'data' / 'reference_cache'))
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 do conteúdo do arquivo (hex)."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _slug(texto):
+    return re.sub(r'[^\w-]+', '_', str(texto)).strip('_') or 'x'
+
+
+def cache_path(path, sheet_name=0, cache_dir=None, **opcoes):
+    """Arquivo Parquet do cache para (conteúdo de path, aba, opções de leitura)."""
+    path = Path(path)
+    chave_opcoes = {k: v for k, v in opcoes.items() if k not in _OPCOES_NEUTRAS}
+    sha_opcoes = hashlib.sha256(
+        json.dumps(chave_opcoes, sort_keys=True, default=repr).encode()
+    ).hexdigest()[:8]
+    pasta = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    nome = f"{_slug(path.stem)}.{_slug(sheet_name)}.{file_digest(path)[:16]}.{sha_opcoes}.parquet"
+    return pasta / nome
+
+
+def _tipo_celula(valor):
+    if isinstance(valor, (bool, np.bool_)):
+        return 'bool'
+    if isinstance(valor, (int, np.integer)):
+        return 'int'
+    if isinstance(valor, (float, np.floating)):
+        return 'float'
+    if isinstance(valor, (datetime.datetime, datetime.date)):
+        return 'datetime'
+    if isinstance(valor, str):
+        return 'str'
+    raise TypeError(f"Tipo de célula sem suporte no cache: {type(valor).__name__}")
+
+
+def _para_tabela(df):
+    """DataFrame → Table; colunas object mistas viram texto + coluna de tipos."""
+    df = df.copy()
+    df.columns = [str(c) for c in df.columns]
+    for col in list(df.columns):
+        serie = df[col]
+        if serie.dtype != object:
+            continue
+        validos = serie.dropna()
+        tipos = validos.map(_tipo_celula)
+        if tipos.nunique() <= 1 and (tipos.empty or tipos.iloc[0] == 'str'):
+            continue
+        df[col] = serie.where(serie.isna(), serie.astype(str))
+        df[_PREFIXO_TIPO + col] = tipos.reindex(serie.index)
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _de_tabela(tabela, colunas):
+    """Inverso de _para_tabela; colunas = nomes originais (com tipo)."""
+    df = tabela.to_pandas()
+    for col in [c for c in df.columns if c.startswith(_PREFIXO_TIPO)]:
+        alvo = col[len(_PREFIXO_TIPO):]
+        tipos = df.pop(col)
+        valores = df[alvo].astype(object)
+        for tipo, conversor in _TIPOS.items():
+            linhas = tipos == tipo
+            if linhas.any():
+                valores[linhas] = [conversor(v) for v in valores[linhas]]
+        df[alvo] = valores
+    # Células vazias: NaN como em pd.read_excel (o Arrow devolve None em texto)
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].where(df[col].notna(), np.nan)
+    df.columns = colunas
+    return df
+
+
+def read_excel_cached(path, sheet_name=0, cache_dir=None, **opcoes):
+    """
+    pd.read_excel com cache Parquet por conteúdo do arquivo.
+
+    Parâmetros
+    ----------
+    path : str ou Path
+        Planilha (.xls / .xlsx)
+    sheet_name : str ou int
+        Uma única aba (nome ou posição)
+    cache_dir : Path, opcional
+        Diretório do cache (padrão: default_cache_dir())
+    **opcoes
+        Repassadas a pd.read_excel (header, skiprows, usecols, engine, ...);
+        todas exceto engine entram na chave do cache
+
+    Retorna
+    -------
+    pd.DataFrame igual ao de pd.read_excel(path, sheet_name, **opcoes)
+    """
+    if sheet_name is None or isinstance(sheet_name, (list, tuple)):
+        raise ValueError("read_excel_cached lê uma aba por vez (sheet_name str ou int)")
+
+    destino = cache_path(path, sheet_name, cache_dir, **opcoes)
+    if destino.exists():
+        tabela = pq.read_table(destino)
+        colunas = json.loads(tabela.schema.metadata[b'reference_cache.columns'])
+        return _de_tabela(tabela, [tuple(c) if isinstance(c, list) else c for c in colunas])
+
+    df = pd.read_excel(path, sheet_name=sheet_name, **opcoes)
+
+    tabela = _para_tabela(df)
+    colunas = json.dumps(list(df.columns), default=str)
+    tabela = tabela.replace_schema_metadata({
+        **(tabela.schema.metadata or {}),
+        b'reference_cache.columns': colunas.encode(),
+        b'reference_cache.source': str(Path(path).resolve()).encode(),
+    })
+
+    # Entradas antigas da mesma planilha/aba/opções (conteúdo anterior) saem do cache
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    arquivo, aba, _, sha_opcoes, _ = destino.name.split('.')
+    for antiga in destino.parent.glob(f"{arquivo}.{aba}.*.{sha_opcoes}.parquet"):
+        antiga.unlink(missing_ok=True)
+
+    tmp = destino.with_name('.' + destino.name + '.tmp')
+    pq.write_table(tabela, tmp)
+    os.replace(tmp, destino)
+    return df
@@ -0,0 +1,83 @@
+"""
+Teste: cache Parquet de planilhas Excel
+Executar: python -m pytest reference_cache/tests
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Adicionar raiz do repositório ao path
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+from reference_cache import cache_path, read_excel_cached
+
+pytest.importorskip('openpyxl')
+
+
+def _planilha(path, denominacao='DIRETORES E GERENTES'):
+    """Aba no formato da Estrutura COD: códigos ora int, ora texto."""
+    df = pd.DataFrame({
+        'Grande Grupo': ['Grande Grupo', 1, np.nan, 2],
+        'Grupo de base': [np.nan, '0110', 1111, 2111.5],
+        'Denominação': ['Denominação', denominacao, np.nan, 'PROFISSIONAIS'],
+        'Score': [0.1, 0.2, np.nan, 0.4],
+    })
+    with pd.ExcelWriter(path) as writer:
+        df.to_excel(writer, sheet_name='Estrutura COD', index=False, startrow=1)
+
+
+def test_cache_igual_ao_excel():
+    """Segunda leitura vem do Parquet e é idêntica (inclusive tipos por célula)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx, cache = Path(tmp) / 'cod.xlsx', Path(tmp) / 'cache'
+        _planilha(xlsx)
+        esperado = pd.read_excel(xlsx, sheet_name='Estrutura COD', header=1)
+
+        primeiro = read_excel_cached(xlsx, sheet_name='Estrutura COD', header=1, cache_dir=cache)
+        assert cache_path(xlsx, 'Estrutura COD', cache, header=1).exists()
+
+        ler_excel = pd.read_excel
+        pd.read_excel = None  # a leitura em cache não pode abrir a planilha
+        try:
+            segundo = read_excel_cached(xlsx, sheet_name='Estrutura COD', header=1,
+                                        cache_dir=cache, engine='openpyxl')
+        finally:
+            pd.read_excel = ler_excel
+
+        for df in (primeiro, segundo):
+            pd.testing.assert_frame_equal(df, esperado)
+            for col in esperado.columns:
+                assert df[col].map(type).equals(esperado[col].map(type)), col
+    print("✓ Cache Parquet idêntico ao read_excel (colunas mistas preservadas)")
+
+
+def test_chave_por_conteudo():
+    """Planilha alterada gera nova entrada e a antiga é removida"""
+    with tempfile.TemporaryDirectory() as tmp:
+        xlsx, cache = Path(tmp) / 'cod.xlsx', Path(tmp) / 'cache'
+        _planilha(xlsx)
+        read_excel_cached(xlsx, sheet_name='Estrutura COD', header=1, cache_dir=cache)
+        antiga = cache_path(xlsx, 'Estrutura COD', cache, header=1)
+
+        _planilha(xlsx, denominacao='GERENTES')
+        df = read_excel_cached(xlsx, sheet_name='Estrutura COD', header=1, cache_dir=cache)
+        nova = cache_path(xlsx, 'Estrutura COD', cache, header=1)
+
+        assert nova != antiga and nova.exists() and not antiga.exists()
+        assert df['Denominação'].iloc[1] == 'GERENTES'
+
+        # Opções de leitura diferentes são outra entrada
+        read_excel_cached(xlsx, sheet_name='Estrutura COD', header=None, cache_dir=cache)
+        assert len(list(cache.glob('*.parquet'))) == 2
+    print("✓ Chave por conteúdo do arquivo e opções de leitura")
+
+
+if __name__ == "__main__":
+    test_cache_igual_ao_excel()
+    test_chave_por_conteudo()
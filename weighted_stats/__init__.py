@@ -0,0 +1,80 @@
+"""
+Estatísticas ponderadas compartilhadas por todas as etapas do projeto
+
+Uso (com a raiz do repositório no sys.path):
+    from weighted_stats import weighted_mean, grouped_weighted_stats
+
+Módulos:
+    core      funções escalares (média, desvio, EP, quantis, Gini, qcut)
+    grouped   estatísticas e quantis por grupo em uma única passada
+    inequality Gini, Theil, Lorenz e P90/P10 por grupo (um lexsort)
+    balance   balanço de covariáveis (médias, std diff, razão de variâncias, KS)
+    replicates erros padrão por pesos replicados bootstrap (v1028001…v1028200)
+    sketch    sketch de quantis mesclável para dados fora da memória
+    cube      cubo OLAP de somas aditivas (agregações sem reler microdados)
+    _kernels  kernels NumPy/Numba (backend escolhido em tempo de execução)
+
+Benchmark: python -m weighted_stats.benchmarks
+"""
+
+from ._kernels import get_backend, set_backend
+from .core import (
+    as_float_array,
+    gini_coefficient,
+    weighted_diff_normalized,
+    weighted_mean,
+    weighted_qcut,
+    weighted_quantile,
+    weighted_quantiles,
+    weighted_se,
+    weighted_stats_summary,
+    weighted_std,
+)
+from .grouped import (
+    GROUPED_STATS,
+    grouped_weighted_mean,
+    grouped_weighted_quantiles,
+    grouped_weighted_stats,
+    quantile_label,
+)
+from .balance import BALANCE_STATS, covariate_balance
+from .inequality import INEQUALITY_STATS, grouped_inequality, grouped_lorenz
+from .replicates import (
+    N_REPLICATES,
+    REPLICATE_PREFIX,
+    REPLICATE_STATS,
+    find_replicate_cols,
+    replicate_apply,
+    replicate_grouped_stats,
+    replicate_tables,
+    replicate_variance,
+    replicate_weight_cols,
+)
+from .sketch import GroupedQuantileSketch
+from .cube import (
+    CUBE_MOMENTS,
+    build_cube,
+    cube_dims,
+    cube_stats,
+    cube_value_cols,
+    load_cube,
+    pick_cuboid,
+    save_cube,
+)
+
+__all__ = [
+    'get_backend', 'set_backend',
+    'as_float_array', 'gini_coefficient', 'weighted_diff_normalized',
+    'weighted_mean', 'weighted_qcut', 'weighted_quantile', 'weighted_quantiles',
+    'weighted_se', 'weighted_stats_summary', 'weighted_std',
+    'GROUPED_STATS', 'grouped_weighted_mean', 'grouped_weighted_quantiles',
+    'grouped_weighted_stats', 'quantile_label',
+    'BALANCE_STATS', 'covariate_balance',
+    'INEQUALITY_STATS', 'grouped_inequality', 'grouped_lorenz',
+    'N_REPLICATES', 'REPLICATE_PREFIX', 'REPLICATE_STATS', 'find_replicate_cols',
+    'replicate_apply', 'replicate_grouped_stats', 'replicate_tables',
+    'replicate_variance', 'replicate_weight_cols',
+    'GroupedQuantileSketch',
+    'CUBE_MOMENTS', 'build_cube', 'cube_dims', 'cube_stats', 'cube_value_cols',
+    'load_cube', 'pick_cuboid', 'save_cube',
+]
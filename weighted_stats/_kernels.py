@@ -0,0 +1,103 @@
+"""
+Kernels numéricos de baixo nível (NumPy e, opcionalmente, Numba)
+
+O backend é escolhido em tempo de execução:
+    - variável de ambiente WEIGHTED_STATS_BACKEND = 'auto' | 'numpy' | 'numba'
+    - ou set_backend(...) no código
+'auto' usa Numba se estiver instalado e NumPy caso contrário.
+
+Todos os kernels recebem arrays float64 já convertidos e aplicam a mesma
+regra: observações com valor ou peso NaN são descartadas.
+"""
+
+import os
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Numba é opcional
+    numba = None
+
+BACKENDS = ('auto', 'numpy', 'numba')
+
+_backend = os.environ.get('WEIGHTED_STATS_BACKEND', 'auto').lower()
+
+
+def set_backend(name):
+    """Define o backend dos kernels ('auto', 'numpy' ou 'numba')."""
+    global _backend
+    name = name.lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {name} (opções: {BACKENDS})")
+    if name == 'numba' and numba is None:
+        raise ImportError("Backend 'numba' solicitado, mas numba não está instalado")
+    _backend = name
+
+
+def get_backend():
+    """Backend efetivamente em uso ('numpy' ou 'numba')."""
+    if _backend == 'numba' or (_backend == 'auto' and numba is not None):
+        return 'numba'
+    return 'numpy'
+
+
+# ---------------------------------------------------------------------------
+# Momentos ponderados: (n, Σw, Σw², média, variância populacional)
+# ---------------------------------------------------------------------------
+
+def _moments_numpy(x, w):
+    valid = ~(np.isnan(x) | np.isnan(w))
+    if not valid.all():
+        x = x[valid]
+        w = w[valid]
+    n = x.size
+    sw = w.sum()
+    sw2 = np.dot(w, w)
+    if n == 0 or sw == 0:
+        return n, sw, sw2, np.nan, np.nan
+    mean = np.dot(w, x) / sw
+    d = x - mean
+    var = np.dot(w, d * d) / sw
+    return n, sw, sw2, mean, var
+
+
+def _moments_python(x, w):
+    # Corpo compilado pelo Numba: duas passadas, sem arrays temporários
+    n = 0
+    sw = 0.0
+    sw2 = 0.0
+    swx = 0.0
+    for i in range(x.size):
+        xi = x[i]
+        wi = w[i]
+        if np.isnan(xi) or np.isnan(wi):
+            continue
+        n += 1
+        sw += wi
+        sw2 += wi * wi
+        swx += wi * xi
+    if n == 0 or sw == 0:
+        return n, sw, sw2, np.nan, np.nan
+    mean = swx / sw
+    swd2 = 0.0
+    for i in range(x.size):
+        xi = x[i]
+        wi = w[i]
+        if np.isnan(xi) or np.isnan(wi):
+            continue
+        d = xi - mean
+        swd2 += wi * d * d
+    return n, sw, sw2, mean, swd2 / sw
+
+
+_moments_numba = (
+    numba.njit(cache=True, nogil=True)(_moments_python) if numba is not None else None
+)
+
+
+def moments(x, w):
+    """Momentos ponderados de x com pesos w, descartando pares com NaN."""
+    if get_backend() == 'numba':
+        return _moments_numba(x, w)
+    return _moments_numpy(x, w)
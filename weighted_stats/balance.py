@@ -0,0 +1,172 @@
+"""
+Balanço de covariáveis entre tratamento e controle (vetorizado)
+
+Em vez de uma chamada de weighted_diff_normalized por covariável (quatro
+passadas de média/desvio cada), todas as covariáveis são tratadas como uma
+matriz: médias e variâncias por (período, tratamento) saem de um único
+groupby de momentos aditivos (grouped_weighted_stats) e a estatística KS de
+cada covariável sai de um lexsort por (período, valor).
+"""
+
+import numpy as np
+import pandas as pd
+
+from .grouped import grouped_weighted_stats
+
+
+BALANCE_STATS = ('mean_c', 'mean_t', 'diff', 'std_diff', 'var_ratio', 'ks',
+                 'n_c', 'n_t', 'weight_c', 'weight_t')
+
+
+def _grouped_ks(codes, n_groups, x, w, treated):
+    """KS ponderado (máx. |F_t − F_c|) de uma covariável em cada grupo."""
+    valid = ~(np.isnan(x) | np.isnan(w)) & (codes >= 0)
+    codes, x, w, treated = codes[valid], x[valid], w[valid], treated[valid]
+
+    order = np.lexsort((x, codes))
+    codes, x, w, treated = codes[order], x[order], w[order], treated[order]
+
+    w_t = np.where(treated, w, 0.0)
+    w_c = w - w_t
+    cum_t = np.concatenate([[0.0], np.cumsum(w_t)])
+    cum_c = np.concatenate([[0.0], np.cumsum(w_c)])
+
+    counts = np.bincount(codes, minlength=n_groups)
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    total_t = cum_t[ends] - cum_t[starts]
+    total_c = cum_c[ends] - cum_c[starts]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        f_t = (cum_t[1:] - cum_t[starts][codes]) / total_t[codes]
+        f_c = (cum_c[1:] - cum_c[starts][codes]) / total_c[codes]
+    # Avaliar as CDFs apenas no último elemento de cada bloco de empates
+    last = np.ones(len(x), dtype=bool)
+    last[:-1] = (x[1:] != x[:-1]) | (codes[1:] != codes[:-1])
+    dist = np.where(last, np.abs(f_t - f_c), 0.0)
+
+    ks = np.full(n_groups, np.nan)
+    nonempty = counts > 0
+    if nonempty.any():
+        ks[nonempty] = np.maximum.reduceat(dist, starts[nonempty])
+    ks[(total_t <= 0) | (total_c <= 0)] = np.nan
+    return ks
+
+
+def covariate_balance(df, covariates, treatment_col, weight_col='peso', by=None,
+                      ks=True, ddof=0):
+    """Tabela de balanço de covariáveis (tratamento = 1 vs controle = 0).
+
+    Para cada covariável (e cada grupo de ``by``, se informado) calcula:
+        mean_c, mean_t  médias ponderadas de controle e tratamento
+        diff            mean_t − mean_c
+        std_diff        diff / sqrt((var_t + var_c) / 2), como
+                        ``weighted_diff_normalized``
+        var_ratio       var_t / var_c
+        ks              estatística de Kolmogorov-Smirnov ponderada
+        n_*, weight_*   observações válidas e soma dos pesos por grupo
+
+    Cada covariável ignora as linhas em que ela, o peso ou o tratamento é NaN.
+
+    Parâmetros:
+        df            : pd.DataFrame
+        covariates    : lista de colunas (colunas ausentes são ignoradas)
+        treatment_col : coluna 0/1 do tratamento, ou lista de colunas para
+                        comparar vários cortes (ex.: alta_exp_10/20/25) —
+                        nesse caso o resultado ganha o nível 'treatment'
+        weight_col    : coluna de pesos, ou None para pesos unitários
+        by            : None, str ou lista de colunas de período (ex.: 'post',
+                        ['ano', 'trimestre'])
+        ks            : se False, não calcula KS (evita uma ordenação por covariável)
+        ddof          : 0 (padrão) usa variâncias populacionais; 1 usa a
+                        correção Σw / (Σw − 1), que com pesos unitários
+                        reproduz ``pd.Series.var()``
+
+    Retorna:
+        pd.DataFrame indexado por ([treatment,] *by, covariate) com as
+        colunas de BALANCE_STATS.
+    """
+    if isinstance(treatment_col, (list, tuple)):
+        parts = {
+            t: covariate_balance(df, covariates, t, weight_col, by, ks, ddof)
+            for t in treatment_col if t in df.columns
+        }
+        return pd.concat(parts, names=['treatment'])
+
+    covariates = [c for c in covariates if c in df.columns]
+    by = [] if by is None else ([by] if isinstance(by, str) else list(by))
+
+    if weight_col is None:
+        weight_col = '__peso__'
+        df = df.assign(**{weight_col: 1.0})
+    treat = '__tratamento__'
+    data = df[df[treatment_col].notna()]
+    data = data.assign(**{treat: data[treatment_col].astype(float)})
+    keys = by if by else [treat + '_total']
+    if not by:
+        data = data.assign(**{keys[0]: 'Total'})
+
+    stats = grouped_weighted_stats(data, keys + [treat], covariates, weight_col,
+                                   stats=['mean', 'std', 'weight', 'n'])
+    wide = stats.unstack(treat)
+    group_index = wide.index
+
+    def get(cov, stat, arm):
+        col = (cov, stat, float(arm))
+        if col in wide.columns:
+            values = wide[col].to_numpy(dtype=float)
+            return np.nan_to_num(values) if stat in ('n', 'weight') else values
+        return np.full(len(wide), 0.0 if stat in ('n', 'weight') else np.nan)
+
+    # Matrizes (grupos × covariáveis) por estatística e braço
+    cols = {}
+    for stat in ('mean', 'std', 'weight', 'n'):
+        for arm in (0, 1):
+            cols[stat, arm] = np.column_stack([get(c, stat, arm) for c in covariates]) \
+                if covariates else np.empty((len(wide), 0))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var = {}
+        for arm in (0, 1):
+            w = cols['weight', arm]
+            var[arm] = cols['std', arm] ** 2
+            if ddof:
+                var[arm] = np.where(w > ddof, var[arm] * w / (w - ddof), np.nan)
+        diff = cols['mean', 1] - cols['mean', 0]
+        pooled = np.sqrt((var[1] + var[0]) / 2)
+        matrices = {
+            'mean_c': cols['mean', 0],
+            'mean_t': cols['mean', 1],
+            'diff': diff,
+            'std_diff': np.where(pooled > 0, diff / pooled, np.nan),
+            'var_ratio': np.where(var[0] > 0, var[1] / var[0], np.nan),
+            'ks': np.full(diff.shape, np.nan),
+            'n_c': cols['n', 0],
+            'n_t': cols['n', 1],
+            'weight_c': cols['weight', 0],
+            'weight_t': cols['weight', 1],
+        }
+
+    if ks and covariates:
+        grouped = data.groupby([data[k] for k in keys], observed=True, sort=True)
+        codes = grouped.ngroup().to_numpy()
+        ks_index = grouped.size().index
+        w = data[weight_col].to_numpy(dtype=float)
+        treated = data[treat].to_numpy() == 1
+        ks_matrix = np.column_stack([
+            _grouped_ks(codes, len(ks_index), data[c].to_numpy(dtype=float), w, treated)
+            for c in covariates
+        ])
+        matrices['ks'] = pd.DataFrame(ks_matrix, index=ks_index).reindex(group_index).to_numpy()
+
+    groups = [g if isinstance(g, tuple) else (g,) for g in group_index]
+    index = pd.MultiIndex.from_tuples(
+        [(*g, c) for g in groups for c in covariates], names=keys + ['covariate']
+    )
+    result = pd.DataFrame({k: m.ravel() for k, m in matrices.items()}, index=index)
+    result['n_c'] = result['n_c'].astype(np.int64)
+    result['n_t'] = result['n_t'].astype(np.int64)
+
+    if not by:
+        result = result.droplevel(0)
+    return result
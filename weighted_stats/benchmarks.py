@@ -0,0 +1,141 @@
+"""
+Micro-benchmarks do pacote weighted_stats
+
+Compara, em dados sintéticos no formato PNAD (pesos ~ 50–500):
+    - implementação legada (indexação de pd.Series, np.average por chamada)
+    - backend NumPy e backend Numba (se instalado) das funções escalares
+    - groupby.apply(weighted_mean) vs grouped_weighted_stats
+    - quantis repetidos vs weighted_quantiles em uma ordenação
+
+Uso:
+    python -m weighted_stats.benchmarks [--n 1000000] [--grupos 500] [--repeticoes 5]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import _kernels
+from .core import weighted_mean, weighted_quantile, weighted_quantiles, weighted_std
+from .grouped import grouped_weighted_stats
+
+
+# ---------------------------------------------------------------------------
+# Implementações legadas (cópia das versões por etapa, para referência)
+# ---------------------------------------------------------------------------
+
+def _legacy_weighted_mean(values, weights):
+    mask = ~(pd.isna(values) | pd.isna(weights))
+    if mask.sum() == 0:
+        return np.nan
+    return np.average(values[mask], weights=weights[mask])
+
+
+def _legacy_weighted_std(values, weights):
+    mask = ~(pd.isna(values) | pd.isna(weights))
+    if mask.sum() == 0:
+        return np.nan
+    avg = np.average(values[mask], weights=weights[mask])
+    variance = np.average((values[mask] - avg) ** 2, weights=weights[mask])
+    return np.sqrt(variance)
+
+
+def _legacy_weighted_quantile(values, weights, quantile):
+    mask = ~(pd.isna(values) | pd.isna(weights))
+    if mask.sum() == 0:
+        return np.nan
+    sorted_idx = np.argsort(values[mask])
+    sorted_values = values[mask].iloc[sorted_idx]
+    sorted_weights = weights[mask].iloc[sorted_idx]
+    cumsum = np.cumsum(sorted_weights)
+    cutoff = quantile * cumsum.iloc[-1]
+    return sorted_values.iloc[np.searchsorted(cumsum, cutoff)]
+
+
+# ---------------------------------------------------------------------------
+# Execução
+# ---------------------------------------------------------------------------
+
+def make_data(n, n_groups, seed=42):
+    """DataFrame sintético com valor contínuo, pesos e uma chave de grupo."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'grupo': rng.integers(0, n_groups, n),
+        'valor': rng.lognormal(7.5, 0.8, n),
+        'peso': rng.uniform(50, 500, n),
+    })
+    df.loc[rng.random(n) < 0.05, 'valor'] = np.nan
+    return df
+
+
+def timeit(func, repeticoes):
+    """Melhor tempo (s) entre as repetições."""
+    best = np.inf
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run(n=1_000_000, n_groups=500, repeticoes=5):
+    df = make_data(n, n_groups)
+    v, w = df['valor'], df['peso']
+    resultados = []
+
+    def registrar(nome, func):
+        t = timeit(func, repeticoes)
+        resultados.append((nome, t))
+        print(f"  {nome:<48} {t * 1e3:>10.1f} ms", flush=True)
+
+    backends = ['numpy'] + (['numba'] if _kernels.numba is not None else [])
+    original = _kernels._backend
+
+    print(f"\nweighted_stats — benchmark (n={n:,}, grupos={n_groups}, "
+          f"melhor de {repeticoes})")
+    print("-" * 64)
+    try:
+        registrar("legado: weighted_mean (pd.Series)", lambda: _legacy_weighted_mean(v, w))
+        registrar("legado: weighted_std (pd.Series)", lambda: _legacy_weighted_std(v, w))
+        for backend in backends:
+            _kernels.set_backend(backend)
+            weighted_mean(v.to_numpy()[:10], w.to_numpy()[:10])   # compilação JIT
+            registrar(f"{backend}: weighted_mean", lambda: weighted_mean(v, w))
+            registrar(f"{backend}: weighted_std", lambda: weighted_std(v, w))
+    finally:
+        _kernels._backend = original
+
+    qs = np.arange(1, 10) / 10
+    registrar("legado: 9 × weighted_quantile (decis)",
+              lambda: [_legacy_weighted_quantile(v, w, q) for q in qs])
+    registrar("atual: 9 × weighted_quantile (decis)",
+              lambda: [weighted_quantile(v, w, q) for q in qs])
+    registrar("atual: weighted_quantiles (decis, 1 sort)",
+              lambda: weighted_quantiles(v, w, qs))
+
+    sub = df.iloc[: min(n, 200_000)]
+    registrar(f"legado: groupby.apply(weighted_mean) [{len(sub):,}]",
+              lambda: sub.groupby('grupo')[['valor', 'peso']].apply(
+                  lambda x: _legacy_weighted_mean(x['valor'], x['peso'])))
+    registrar(f"atual: grouped_weighted_stats mean [{len(sub):,}]",
+              lambda: grouped_weighted_stats(sub, 'grupo', 'valor'))
+    registrar("atual: grouped_weighted_stats mean/std/se [n]",
+              lambda: grouped_weighted_stats(df, 'grupo', 'valor', stats=['mean', 'std', 'se']))
+
+    return pd.DataFrame(resultados, columns=['caso', 'segundos'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=1_000_000, help='Número de linhas')
+    parser.add_argument('--grupos', type=int, default=500, help='Número de grupos')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições por caso')
+    args = parser.parse_args()
+    run(args.n, args.grupos, args.repeticoes)
+
+
+if __name__ == '__main__':
+    main()
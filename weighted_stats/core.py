@@ -0,0 +1,208 @@
+"""
+Estatísticas ponderadas escalares (média, desvio, erro padrão, quantis, Gini)
+
+Regras comuns a todas as funções:
+    - pares (valor, peso) com NaN em qualquer lado são descartados;
+    - sem observações válidas, ou com Σw = 0, o resultado é NaN
+      (exceto weighted_mean(..., zero_weight='unweighted'));
+    - entradas podem ser pd.Series, np.ndarray ou listas: tudo é convertido
+      para arrays float64 uma única vez, sem indexação de Series.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import _kernels
+
+
+def as_float_array(values):
+    """Converte Series/array/lista em np.ndarray float64 (NA → NaN)."""
+    if hasattr(values, 'to_numpy'):
+        return values.to_numpy(dtype=float, na_value=np.nan)
+    return np.asarray(values, dtype=float)
+
+
+def _valid_pairs(values, weights):
+    """Arrays (x, w) sem os pares que têm NaN."""
+    x = as_float_array(values)
+    w = as_float_array(weights)
+    valid = ~(np.isnan(x) | np.isnan(w))
+    if not valid.all():
+        x = x[valid]
+        w = w[valid]
+    return x, w
+
+
+def weighted_mean(values, weights, zero_weight='nan'):
+    """Calcula média ponderada
+
+    zero_weight : o que retornar quando Σw = 0 — 'nan' (padrão) ou
+                  'unweighted' (média simples dos valores válidos).
+    """
+    x = as_float_array(values)
+    w = as_float_array(weights)
+    n, sw, _, mean, _ = _kernels.moments(x, w)
+    if n > 0 and sw == 0 and zero_weight == 'unweighted':
+        return float(np.nanmean(np.where(np.isnan(w), np.nan, x)))
+    return mean
+
+
+def weighted_std(values, weights):
+    """Calcula desvio-padrão ponderado (populacional)"""
+    _, _, _, _, var = _kernels.moments(as_float_array(values), as_float_array(weights))
+    return np.sqrt(var)
+
+
+def weighted_se(values, weights):
+    """
+    Calcula erro padrão ponderado.
+
+    Usa o tamanho efetivo da amostra, N_eff = (Σw)² / Σw², como aproximação
+    (não considera o desenho amostral complexo). Requer ao menos 2 observações.
+    """
+    n, sw, sw2, _, var = _kernels.moments(as_float_array(values), as_float_array(weights))
+    if n < 2 or sw == 0:
+        return np.nan
+    n_eff = sw ** 2 / sw2
+    return np.sqrt(var) / np.sqrt(n_eff)
+
+
+def weighted_quantiles(values, weights, qs):
+    """Calcula vários quantis ponderados com uma única ordenação.
+
+    Ordena os valores uma vez, acumula os pesos e responde a todos os
+    quantis de ``qs`` com um único ``searchsorted`` sobre o peso acumulado.
+    Para cada q, retorna o menor valor cujo peso acumulado atinge
+    q × Σw (mesma regra de ``weighted_quantile``).
+
+    Parâmetros:
+        values  : array-like com os valores
+        weights : array-like com os pesos amostrais
+        qs      : array-like de quantis em [0, 1]
+
+    Retorna:
+        np.ndarray (float) com um valor por quantil; NaN se não houver dados
+    """
+    qs = np.atleast_1d(np.asarray(qs, dtype=float))
+    x, w = _valid_pairs(values, weights)
+    if x.size == 0:
+        return np.full(qs.shape, np.nan)
+
+    order = np.argsort(x)
+    sorted_x = x[order]
+    cumsum = np.cumsum(w[order])
+    if cumsum[-1] == 0:
+        return np.full(qs.shape, np.nan)
+
+    idx = np.searchsorted(cumsum, qs * cumsum[-1])
+    return sorted_x[np.minimum(idx, len(sorted_x) - 1)]
+
+
+def weighted_quantile(values, weights, quantile):
+    """Calcula quantil ponderado"""
+    return weighted_quantiles(values, weights, [quantile])[0]
+
+
+def gini_coefficient(values, weights):
+    """Calcula coeficiente de Gini ponderado"""
+    x, w = _valid_pairs(values, weights)
+    if x.size < 2:
+        return np.nan
+
+    sorted_idx = np.argsort(x, kind='stable')
+    sorted_x = x[sorted_idx]
+    sorted_w = w[sorted_idx]
+
+    cumsum_w = np.cumsum(sorted_w)
+    cumsum_wx = np.cumsum(sorted_w * sorted_x)
+
+    total_w = cumsum_w[-1]
+    total_wx = cumsum_wx[-1]
+    if total_w == 0 or total_wx == 0:
+        return np.nan
+
+    # Área sob curva de Lorenz
+    B = np.sum(cumsum_wx[:-1] * sorted_w[1:]) / (total_w * total_wx)
+
+    return 1 - 2 * B
+
+
+def weighted_qcut(values, weights, q, labels=None):
+    """Classificação em quantis ponderados por peso amostral.
+
+    Diferente de pd.qcut (que divide por contagem de linhas), esta função
+    calcula os breakpoints de modo que cada faixa represente ~1/q da
+    POPULAÇÃO (soma dos pesos), não da amostra.
+
+    Parâmetros:
+        values  : pd.Series com os valores a classificar
+        weights : pd.Series com os pesos amostrais
+        q       : int, número de quantis (5 = quintis, 10 = decis)
+        labels  : lista de labels (len == q), ou None para retornar inteiros 1..q
+
+    Retorna:
+        pd.Series (Categorical) com os labels atribuídos
+    """
+    x, w = _valid_pairs(values, weights)
+    inner = weighted_quantiles(x, w, np.arange(1, q) / q)
+    breakpoints = [x.min() - 1e-10, *inner, x.max() + 1e-10]
+
+    # Remover duplicatas mantendo ordem
+    breakpoints = sorted(set(breakpoints))
+
+    if labels is not None and len(labels) != len(breakpoints) - 1:
+        labels = None
+
+    result = pd.cut(values, bins=breakpoints, labels=labels, include_lowest=True)
+    return result
+
+
+def weighted_stats_summary(values, weights):
+    """Retorna dicionário com estatísticas resumidas"""
+    x = as_float_array(values)
+    w = as_float_array(weights)
+    p25, p50, p75 = weighted_quantiles(x, w, [0.25, 0.50, 0.75])
+    has_value = ~np.isnan(x)
+    return {
+        'mean': weighted_mean(x, w),
+        'std': weighted_std(x, w),
+        'p25': p25,
+        'p50': p50,
+        'p75': p75,
+        'n': int(has_value.sum()),
+        'population': np.nansum(w[has_value]),
+    }
+
+
+def weighted_diff_normalized(values_t, weights_t, values_c, weights_c):
+    """
+    Calcula diferença normalizada (standardized difference) para balance table.
+
+    Usado para avaliar desbalanceamento de covariáveis entre grupos de tratamento
+    e controle. Regra de ouro: valores > 0.25 indicam desbalanceamento substancial.
+
+    Parâmetros:
+    -----------
+    values_t : array-like
+        Valores do grupo de tratamento
+    weights_t : array-like
+        Pesos do grupo de tratamento
+    values_c : array-like
+        Valores do grupo de controle
+    weights_c : array-like
+        Pesos do grupo de controle
+
+    Retorna:
+    --------
+    float : Diferença normalizada
+    """
+    _, _, _, mean_t, var_t = _kernels.moments(as_float_array(values_t), as_float_array(weights_t))
+    _, _, _, mean_c, var_c = _kernels.moments(as_float_array(values_c), as_float_array(weights_c))
+
+    # Pooled standard deviation
+    pooled_std = np.sqrt((var_t + var_c) / 2)
+
+    if pooled_std > 0:
+        return (mean_t - mean_c) / pooled_std
+    else:
+        return np.nan
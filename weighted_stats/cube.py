@@ -0,0 +1,159 @@
+"""
+Cubo OLAP ponderado (somas aditivas materializadas)
+
+Tabelas, figuras e mapas agregam repetidamente os mesmos microdados pelas
+mesmas dimensões. Um cuboide guarda, para cada combinação observada das
+suas dimensões, somas aditivas:
+
+    n, <peso>, <peso>2               observações, Σw e Σw² da célula
+    <col>__n, __w, __w2, __wx, __wx2 por coluna de valor (linhas válidas)
+
+Qualquer agregação por um subconjunto das dimensões é a soma das células,
+de modo que as estatísticas de ``grouped_weighted_stats`` saem do cubo sem
+voltar aos microdados. Somas não são centradas: a variância é
+Σw·x²/Σw − média², com precisão de sobra para as escalas do projeto.
+
+Um cubo é um dict {nome: cuboide}. Cuboides cujas dimensões incluem a
+própria variável (ex.: sigla_uf × exposure_score) são distribuições
+ponderadas: quantis, Theil e Lorenz saem exatos das células, e Gini também
+com ``grouped_inequality(cells, ..., count_col='n', weight2_col='peso2')``.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .grouped import GROUPED_STATS, _add_margins, _stats_from_moments
+
+
+CUBE_MOMENTS = ('n', 'w', 'w2', 'wx', 'wx2')
+
+
+def build_cube(df, dims, value_cols=(), weight_col='peso'):
+    """Materializa um cuboide: somas aditivas por combinação de ``dims``.
+
+    Células com dimensão NaN são mantidas (dropna=False), para que somas
+    por outras dimensões continuem completas; ``cube_stats`` descarta NaN
+    apenas nas dimensões pedidas, como um groupby sobre os microdados.
+    Dimensões categóricas são gravadas com seus valores simples: as células
+    são poucas e um groupby sobre elas não gera categorias não observadas.
+
+    Parâmetros:
+        df         : pd.DataFrame com os microdados
+        dims       : lista de colunas de dimensão
+        value_cols : colunas de valores cujas somas são materializadas
+        weight_col : coluna de pesos amostrais (padrão 'peso')
+
+    Retorna:
+        pd.DataFrame com uma linha por célula: ``dims`` + n, <peso>,
+        <peso>2 + <col>__<momento> para cada momento de CUBE_MOMENTS
+    """
+    dims = [dims] if isinstance(dims, str) else list(dims)
+    value_cols = [value_cols] if isinstance(value_cols, str) else list(value_cols)
+
+    w_all = df[weight_col].to_numpy(dtype=float)
+    has_w = ~np.isnan(w_all)
+    w_all = np.where(has_w, w_all, 0.0)
+    sums = {'n': has_w.astype(np.int64), weight_col: w_all, f'{weight_col}2': w_all * w_all}
+    for col in value_cols:
+        x = df[col].to_numpy(dtype=float)
+        valid = has_w & ~np.isnan(x)
+        w = np.where(valid, w_all, 0.0)
+        wx = w * np.where(valid, x, 0.0)
+        sums[f'{col}__n'] = valid.astype(np.int64)
+        sums[f'{col}__w'] = w
+        sums[f'{col}__w2'] = w * w
+        sums[f'{col}__wx'] = wx
+        sums[f'{col}__wx2'] = wx * np.where(valid, x, 0.0)
+
+    cells = pd.DataFrame(sums, index=df.index).groupby(
+        [df[d] for d in dims], observed=True, dropna=False, sort=True
+    ).sum().reset_index()
+    for d in dims:
+        if isinstance(cells[d].dtype, pd.CategoricalDtype):
+            cells[d] = cells[d].astype(cells[d].cat.categories.dtype)
+    return cells
+
+
+def cube_value_cols(cells):
+    """Colunas de valores materializadas em um cuboide."""
+    return [c[:-len('__w')] for c in cells.columns if c.endswith('__w')]
+
+
+def cube_dims(cells, weight_col='peso'):
+    """Colunas de dimensão de um cuboide."""
+    fixed = {'n', weight_col, f'{weight_col}2'}
+    return [c for c in cells.columns if c not in fixed and '__' not in c]
+
+
+def pick_cuboid(cube, dims, value_cols=()):
+    """Menor cuboide de ``cube`` que contém ``dims`` e os momentos de ``value_cols``.
+
+    Cuboides de distribuição (sem colunas de valores) só são escolhidos por
+    nome, pois podem ter sido construídos a partir de um subconjunto.
+    """
+    dims = set([dims] if isinstance(dims, str) else dims)
+    value_cols = set([value_cols] if isinstance(value_cols, str) else value_cols)
+    candidates = [
+        cells for cells in cube.values()
+        if dims <= set(cube_dims(cells)) and value_cols <= set(cube_value_cols(cells))
+        and cube_value_cols(cells)
+    ]
+    if not candidates:
+        raise KeyError(f"Nenhum cuboide contém as dimensões {sorted(dims)} "
+                       f"e os valores {sorted(value_cols)}")
+    return min(candidates, key=len)
+
+
+def cube_stats(cube, by, value_cols, stats=('mean',), margins=False, margins_name='Total'):
+    """Estatísticas ponderadas por grupo a partir de um cubo (sem microdados).
+
+    Mesmo resultado de ``grouped_weighted_stats`` sobre os microdados que
+    geraram o cubo (a menos de arredondamento de ponto flutuante).
+
+    Parâmetros:
+        cube       : cuboide (DataFrame) ou cubo (dict); no dict é usado o
+                     menor cuboide que contém ``by`` e ``value_cols``
+        by         : str, lista de dimensões, ou None para o total geral
+                     (uma linha rotulada ``margins_name``)
+        value_cols : str ou lista de colunas de valores do cubo
+        stats      : subconjunto de GROUPED_STATS
+        margins    : se True, acrescenta linhas marginais como
+                     ``grouped_weighted_stats``
+
+    Retorna:
+        pd.DataFrame indexado por ``by`` com colunas (value_col, stat)
+    """
+    by = [] if by is None else ([by] if isinstance(by, str) else list(by))
+    value_cols = [value_cols] if isinstance(value_cols, str) else list(value_cols)
+    stats = [stats] if isinstance(stats, str) else list(stats)
+    unknown = set(stats) - set(GROUPED_STATS)
+    if unknown:
+        raise ValueError(f"Estatísticas desconhecidas: {sorted(unknown)}")
+
+    cells = pick_cuboid(cube, by, value_cols) if isinstance(cube, dict) else cube
+    moment_cols = [f'{col}__{m}' for col in value_cols for m in CUBE_MOMENTS]
+    if by:
+        sums = cells.groupby(by, observed=True, sort=True)[moment_cols].sum()
+        if margins:
+            sums.columns = pd.MultiIndex.from_tuples([tuple(c.split('__')) for c in moment_cols])
+            sums = _add_margins(sums, by, margins_name)
+    else:
+        sums = cells[moment_cols].sum().to_frame(margins_name).T
+    if not isinstance(sums.columns, pd.MultiIndex):
+        sums.columns = pd.MultiIndex.from_tuples([tuple(c.split('__')) for c in moment_cols])
+    return _stats_from_moments(sums, dict.fromkeys(value_cols, 0.0), value_cols, stats)
+
+
+def save_cube(cube, path):
+    """Grava cada cuboide como ``<path>/<nome>.parquet``."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for name, cells in cube.items():
+        cells.to_parquet(path / f'{name}.parquet', index=False)
+
+
+def load_cube(path):
+    """Lê um cubo gravado por ``save_cube`` ({nome: cuboide})."""
+    return {p.stem: pd.read_parquet(p) for p in sorted(Path(path).glob('*.parquet'))}
@@ -0,0 +1,267 @@
+"""
+Estatísticas ponderadas agrupadas (vetorizadas)
+
+Substituem o padrão ``groupby(...).apply(lambda x: weighted_mean(...))``:
+médias, desvios, erros padrão e totais vêm de somas aditivas calculadas em
+um único groupby, e quantis por grupo vêm de um único lexsort.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+GROUPED_STATS = ('mean', 'std', 'se', 'sum', 'weight', 'n', 'n_eff')
+
+
+def _grouped_moments(df, by, value_cols, weight_col):
+    """Soma, por grupo, os momentos aditivos Σw, Σw², Σw·x, Σw·x² e n.
+
+    Cada coluna é centrada na sua média ponderada global antes de elevar ao
+    quadrado, o que evita cancelamento numérico em variáveis de grande
+    magnitude (ex.: rendimento). Retorna (momentos, centros).
+    """
+    w_all = df[weight_col].to_numpy(dtype=float)
+    moments = {}
+    centers = {}
+    for col in value_cols:
+        x = df[col].to_numpy(dtype=float)
+        valid = ~(np.isnan(x) | np.isnan(w_all))
+        w = np.where(valid, w_all, 0.0)
+        total_w = w.sum()
+        center = (w * np.where(valid, x, 0.0)).sum() / total_w if total_w > 0 else 0.0
+        xc = np.where(valid, x - center, 0.0)
+        moments[(col, 'w')] = w
+        moments[(col, 'w2')] = w * w
+        moments[(col, 'wx')] = w * xc
+        moments[(col, 'wx2')] = w * xc * xc
+        moments[(col, 'n')] = valid.astype(np.int64)
+        centers[col] = center
+
+    keys = [df[k] for k in by]
+    sums = pd.DataFrame(moments, index=df.index).groupby(
+        keys, observed=True, sort=True
+    ).sum()
+    sums.columns = pd.MultiIndex.from_tuples(sums.columns)
+    return sums, centers
+
+
+def _add_margins(sums, by, margins_name):
+    """Acrescenta marginais somando os momentos sobre cada subconjunto de chaves."""
+    from itertools import combinations
+
+    parts = [sums]
+    n_keys = len(by)
+    for n_collapse in range(1, n_keys + 1):
+        for collapse in combinations(range(n_keys), n_collapse):
+            keep = [i for i in range(n_keys) if i not in collapse]
+            if keep:
+                part = sums.groupby(level=keep, observed=True, sort=True).sum()
+                part_keys = part.index if len(keep) > 1 else [(k,) for k in part.index]
+            else:
+                part = sums.sum().to_frame().T
+                part_keys = [()]
+            tuples = []
+            for key in part_keys:
+                key = key if isinstance(key, tuple) else (key,)
+                full = [margins_name] * n_keys
+                for pos, level in enumerate(keep):
+                    full[level] = key[pos]
+                tuples.append(tuple(full))
+            part.index = pd.MultiIndex.from_tuples(tuples, names=by)
+            parts.append(part)
+
+    base = sums.copy()
+    base.index = pd.MultiIndex.from_tuples(
+        [k if isinstance(k, tuple) else (k,) for k in sums.index], names=by
+    )
+    parts[0] = base
+    result = pd.concat(parts)
+    if n_keys == 1:
+        result.index = pd.Index([k[0] for k in result.index], name=by[0])
+    return result
+
+
+def grouped_weighted_stats(df, by, value_cols, weight_col='peso',
+                           stats=('mean',), margins=False, margins_name='Total'):
+    """Estatísticas ponderadas por grupo em uma única passada de groupby.
+
+    Substitui o padrão ``groupby(...).apply(lambda x: weighted_mean(...))``:
+    todas as estatísticas são derivadas das somas Σw, Σw², Σw·x e Σw·x²,
+    calculadas com um único groupby vetorizado (sem chamada Python por grupo).
+    A semântica de NaN é a mesma de ``weighted_mean``/``weighted_std``: cada
+    coluna ignora as linhas em que o valor ou o peso é NaN.
+
+    Parâmetros:
+        df         : pd.DataFrame com os microdados
+        by         : str ou lista de colunas de agrupamento
+        value_cols : str ou lista de colunas de valores
+        weight_col : coluna de pesos amostrais (padrão 'peso')
+        stats      : subconjunto de GROUPED_STATS:
+                     'mean'   média ponderada
+                     'std'    desvio-padrão ponderado (populacional)
+                     'se'     erro padrão via N efetivo, como ``weighted_se``
+                     'sum'    total ponderado Σw·x
+                     'weight' soma dos pesos válidos Σw (população)
+                     'n'      número de observações válidas
+                     'n_eff'  tamanho efetivo da amostra (Σw)² / Σw²
+        margins    : se True, acrescenta linhas marginais (cada chave
+                     colapsada em ``margins_name`` e o total geral)
+
+    Retorna:
+        pd.DataFrame indexado por ``by``, com colunas MultiIndex
+        (value_col, stat). Grupos com Σw = 0 recebem NaN.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    value_cols = [value_cols] if isinstance(value_cols, str) else list(value_cols)
+    stats = [stats] if isinstance(stats, str) else list(stats)
+    unknown = set(stats) - set(GROUPED_STATS)
+    if unknown:
+        raise ValueError(f"Estatísticas desconhecidas: {sorted(unknown)}")
+
+    sums, centers = _grouped_moments(df, by, value_cols, weight_col)
+    if margins:
+        sums = _add_margins(sums, by, margins_name)
+    return _stats_from_moments(sums, centers, value_cols, stats)
+
+
+def _stats_from_moments(sums, centers, value_cols, stats):
+    """Estatísticas de GROUPED_STATS a partir das somas (col, 'w'|'w2'|'wx'|'wx2'|'n').
+
+    ``centers`` é o centro usado em Σw·x e Σw·x² de cada coluna (0 para
+    somas não centradas, como as de um cubo).
+    """
+    out = {}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for col in value_cols:
+            w = sums[(col, 'w')].to_numpy(dtype=float)
+            w2 = sums[(col, 'w2')].to_numpy(dtype=float)
+            wx = sums[(col, 'wx')].to_numpy(dtype=float)
+            wx2 = sums[(col, 'wx2')].to_numpy(dtype=float)
+            n = sums[(col, 'n')].to_numpy()
+            has_w = w > 0
+
+            mean_c = np.where(has_w, wx / w, np.nan)
+            var = np.where(has_w, np.maximum(wx2 / w - mean_c ** 2, 0.0), np.nan)
+            std = np.sqrt(var)
+            n_eff = np.where(w2 > 0, w ** 2 / w2, np.nan)
+
+            for stat in stats:
+                if stat == 'mean':
+                    out[(col, stat)] = mean_c + centers[col]
+                elif stat == 'std':
+                    out[(col, stat)] = std
+                elif stat == 'se':
+                    out[(col, stat)] = np.where(n >= 2, std / np.sqrt(n_eff), np.nan)
+                elif stat == 'sum':
+                    out[(col, stat)] = np.where(has_w, wx + centers[col] * w, np.nan)
+                elif stat == 'weight':
+                    out[(col, stat)] = w
+                elif stat == 'n':
+                    out[(col, stat)] = n
+                elif stat == 'n_eff':
+                    out[(col, stat)] = n_eff
+
+    result = pd.DataFrame(out, index=sums.index)
+    result.columns = pd.MultiIndex.from_tuples(result.columns)
+    return result
+
+
+def grouped_weighted_mean(df, by, value_col, weight_col='peso'):
+    """Atalho: média ponderada de uma coluna por grupo (pd.Series)."""
+    return grouped_weighted_stats(df, by, value_col, weight_col)[(value_col, 'mean')]
+
+
+def quantile_label(q):
+    """Nome de coluna para um quantil: 0.5 → 'p50', 0.999 → 'p99.9'."""
+    return f"p{q * 100:g}"
+
+
+class _Segments:
+    """Dados ordenados por (grupo, valor), com os limites de cada grupo.
+
+    x, w, codes : arrays já ordenados (apenas linhas válidas)
+    n, w2       : por linha, nº de observações e Σw² (None em microdados,
+                  onde valem 1 e w²; informados quando cada linha é uma
+                  célula de cubo que agrega várias observações)
+    cumsum_w    : peso acumulado global com 0 inicial (len = n + 1)
+    starts/ends : posição do primeiro elemento / um após o último, por grupo
+    index       : índice pandas dos grupos (ordem de ``codes``)
+    """
+
+    def __init__(self, index, codes, x, w, n=None, w2=None):
+        self.index = index
+        self.codes = codes
+        self.x = x
+        self.w = w
+        self.n = n
+        self.w2 = w2
+        self.cumsum_w = np.concatenate([[0.0], np.cumsum(w)])
+        self.counts = np.bincount(codes, minlength=len(index))
+        self.ends = np.cumsum(self.counts)
+        self.starts = self.ends - self.counts
+        self.base_w = self.cumsum_w[self.starts]
+        self.total_w = self.cumsum_w[self.ends] - self.base_w
+
+
+def _sorted_segments(df, by, value_col, weight_col, count_col=None, weight2_col=None):
+    """Um único lexsort por (grupo, valor), ignorando linhas com NaN.
+
+    count_col/weight2_col: colunas com nº de observações e Σw² por linha,
+    para dados já agregados em células (ver ``weighted_stats.cube``).
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    grouped = df.groupby([df[k] for k in by], observed=True, sort=True)
+    index = grouped.size().index
+    codes = grouped.ngroup().to_numpy()
+
+    x = df[value_col].to_numpy(dtype=float)
+    w = df[weight_col].to_numpy(dtype=float)
+    valid = ~(np.isnan(x) | np.isnan(w)) & (codes >= 0)
+    codes, x, w = codes[valid], x[valid], w[valid]
+
+    order = np.lexsort((x, codes))
+    extra = {}
+    for name, col in (('n', count_col), ('w2', weight2_col)):
+        if col is not None:
+            extra[name] = df[col].to_numpy(dtype=float)[valid][order]
+    return _Segments(index, codes[order], x[order], w[order], **extra)
+
+
+def _segment_quantiles(seg, qs):
+    """Quantis (regra de ``weighted_quantile``) de todos os grupos: (n_grupos, len(qs))."""
+    targets = seg.base_w[:, None] + qs[None, :] * seg.total_w[:, None]
+    idx = np.searchsorted(seg.cumsum_w[1:], targets.ravel()).reshape(targets.shape)
+    idx = np.clip(idx, seg.starts[:, None],
+                  np.maximum(seg.ends - 1, seg.starts)[:, None])
+
+    values = np.full(targets.shape, np.nan)
+    has_data = (seg.counts > 0) & (seg.total_w > 0)
+    values[has_data] = seg.x[idx[has_data]]
+    return values
+
+
+def grouped_weighted_quantiles(df, by, value_col, weight_col='peso', qs=(0.5,)):
+    """Quantis ponderados por grupo com uma única ordenação.
+
+    Faz um lexsort por (grupo, valor), acumula os pesos uma única vez e
+    localiza todos os quantis de todos os grupos com um ``searchsorted``
+    sobre o peso acumulado, deslocado pelo início de cada segmento. Segue a
+    mesma regra de ``weighted_quantile`` (menor valor cujo peso acumulado no
+    grupo atinge q × Σw do grupo) e ignora linhas com valor ou peso NaN.
+
+    Parâmetros:
+        df         : pd.DataFrame com os microdados
+        by         : str ou lista de colunas de agrupamento
+        value_col  : coluna de valores
+        weight_col : coluna de pesos amostrais (padrão 'peso')
+        qs         : quantis em [0, 1]
+
+    Retorna:
+        pd.DataFrame indexado por ``by``, com uma coluna por quantil
+        ('p10', 'p50', 'p90', ...). Grupos sem dados válidos ou com Σw = 0
+        recebem NaN.
+    """
+    qs = np.atleast_1d(np.asarray(qs, dtype=float))
+    seg = _sorted_segments(df, by, value_col, weight_col)
+    values = _segment_quantiles(seg, qs)
+    return pd.DataFrame(values, index=seg.index, columns=[quantile_label(q) for q in qs])
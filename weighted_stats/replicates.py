@@ -0,0 +1,261 @@
+"""
+Variância por pesos replicados (bootstrap da PNAD Contínua)
+
+O IBGE publica, junto com o peso v1028, 200 pesos replicados bootstrap
+(v1028001 … v1028200). O erro padrão de uma estimativa é a dispersão da
+mesma estimativa recalculada com cada peso replicado.
+
+Para médias, totais e populações por grupo não é preciso repetir o cálculo
+200 vezes: os totais Σw, Σw·x e Σw[x ≠ 0] (zeros estruturais exatos) de
+todos os grupos, colunas e réplicas saem de um único produto matricial
+
+    T = Zᵀ · W        Z : indicadoras grupo × (1, x, 1[x ≠ 0])   (n × K, esparsa)
+                      W : [peso, réplicas]              (n × (R + 1))
+
+processado em blocos de linhas. Estatísticas não lineares (quantis, Gini)
+usam ``replicate_apply``, que reaplica uma função a cada réplica.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .grouped import _add_margins
+
+
+REPLICATE_PREFIX = 'peso_rep'
+N_REPLICATES = 200
+REPLICATE_STATS = ('mean', 'sum', 'weight')
+
+
+def replicate_weight_cols(n=N_REPLICATES, prefix=REPLICATE_PREFIX):
+    """Nomes das colunas de pesos replicados: peso_rep001 … peso_rep200."""
+    return [f'{prefix}{i:03d}' for i in range(1, n + 1)]
+
+
+def find_replicate_cols(df, prefix=REPLICATE_PREFIX):
+    """Colunas de pesos replicados presentes em ``df`` (lista vazia se nenhuma)."""
+    return sorted(c for c in df.columns
+                  if c.startswith(prefix) and c[len(prefix):].isdigit())
+
+
+def replicate_variance(estimate, replicates, scale=None, mse=True):
+    """Variância bootstrap a partir das estimativas replicadas.
+
+        V = scale · Σ_r (θ_r − c)²
+
+    Parâmetros:
+        estimate   : estimativa com o peso principal (escalar ou array)
+        replicates : array com as réplicas no último eixo (..., R)
+        scale      : fator de escala; padrão 1 / (R − 1), convenção bootstrap
+                     do pacote ``survey`` (svrepdesign(type='bootstrap'))
+        mse        : se True (padrão), centra em θ̂ (estimativa principal);
+                     se False, na média das réplicas
+    """
+    replicates = np.asarray(replicates, dtype=float)
+    n_rep = replicates.shape[-1]
+    if scale is None:
+        scale = 1.0 / (n_rep - 1)
+    center = np.asarray(estimate, dtype=float) if mse else replicates.mean(axis=-1)
+    dev = replicates - center[..., None]
+    return scale * np.einsum('...r,...r->...', dev, dev)
+
+
+def _group_codes(df, by):
+    grouped = df.groupby([df[k] for k in by], observed=True, sort=True)
+    return grouped.ngroup().to_numpy(), grouped.size().index
+
+
+def _replicate_totals(df, groupings, value_cols, weight_col, rep_cols, chunk_size):
+    """Σw, Σw·(x − centro) e Σw[x ≠ 0] por grupo e réplica, para todos os agrupamentos.
+
+    Σw[x ≠ 0] identifica zeros estruturais exatamente: onde é 0 (nenhuma
+    linha com x ≠ 0, ou todas com peso 0 na réplica), média e total são 0,
+    sem o resíduo de arredondamento que a centragem deixaria.
+    Todos os agrupamentos compartilham a mesma matriz de pesos, de modo que
+    a leitura das réplicas acontece uma única vez por bloco de linhas.
+    Retorna ({nome: DataFrame grupos × (col, momento, réplica)}, centros).
+    """
+    from scipy import sparse
+
+    n = len(df)
+    w_main = df[weight_col].to_numpy(dtype=float)
+    xs = {}
+    centers = {}
+    for col in value_cols:
+        x = df[col].to_numpy(dtype=float)
+        valid = ~(np.isnan(x) | np.isnan(w_main))
+        total_w = w_main[valid].sum()
+        centers[col] = (w_main[valid] * x[valid]).sum() / total_w if total_w > 0 else 0.0
+        xs[col] = (valid, np.where(valid, x - centers[col], 0.0), valid & (x != 0))
+
+    # Linhas de Zᵀ: (agrupamento, coluna, momento, grupo) em blocos contíguos
+    moments = ('w', 'wx', 'wnz')
+    layouts = {}
+    offset = 0
+    for name, by in groupings.items():
+        codes, index = _group_codes(df, by)
+        layouts[name] = (offset, codes, index)
+        offset += len(moments) * len(value_cols) * len(index)
+
+    weight_cols = [weight_col, *rep_cols]
+    totals = np.zeros((offset, len(weight_cols)))
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        rows, cols, data = [], [], []
+        for base, codes, index in layouts.values():
+            n_groups = len(index)
+            codes_chunk = codes[start:stop]
+            for j, col in enumerate(value_cols):
+                valid, xc, nonzero = xs[col]
+                keep = valid[start:stop] & (codes_chunk >= 0)
+                pos = np.flatnonzero(keep)
+                pos_nz = pos[nonzero[start:stop][pos]]
+                block = base + len(moments) * j * n_groups
+                rows += [block + codes_chunk[pos], block + n_groups + codes_chunk[pos],
+                         block + 2 * n_groups + codes_chunk[pos_nz]]
+                cols += [pos, pos, pos_nz]
+                data += [np.ones(len(pos)), xc[start:stop][pos], np.ones(len(pos_nz))]
+        z = sparse.csr_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(offset, stop - start),
+        )
+        w = np.nan_to_num(df[weight_cols].iloc[start:stop].to_numpy(dtype=float))
+        totals += z @ w
+
+    labels = ['main', *range(len(rep_cols))]
+    frames = {}
+    for name, (base, codes, index) in layouts.items():
+        n_groups = len(index)
+        parts = {}
+        for j, col in enumerate(value_cols):
+            block = base + len(moments) * j * n_groups
+            for m, moment in enumerate(moments):
+                rows_m = totals[block + m * n_groups: block + (m + 1) * n_groups]
+                for k, label in enumerate(labels):
+                    parts[(col, moment, label)] = rows_m[:, k]
+        frame = pd.DataFrame(parts, index=index)
+        frame.columns = pd.MultiIndex.from_tuples(frame.columns)
+        frames[name] = frame
+    return frames, centers
+
+
+def replicate_tables(df, groupings, value_cols, weight_col='peso', rep_cols=None,
+                     stats=('mean',), margins=False, margins_name='Total',
+                     scale=None, mse=True, chunk_size=100_000):
+    """Estimativas e erros padrão replicados de vários agrupamentos de uma vez.
+
+    Equivale a chamar ``replicate_grouped_stats`` para cada agrupamento, mas
+    as réplicas são lidas uma única vez: o custo total é de
+    aproximadamente uma passada extra sobre os microdados.
+
+    Parâmetros:
+        groupings : dict {nome: str ou lista de colunas de agrupamento}
+        (demais parâmetros como em ``replicate_grouped_stats``)
+
+    Retorna:
+        dict {nome: DataFrame} no formato de ``replicate_grouped_stats``
+    """
+    value_cols = [value_cols] if isinstance(value_cols, str) else list(value_cols)
+    stats = [stats] if isinstance(stats, str) else list(stats)
+    unknown = set(stats) - set(REPLICATE_STATS)
+    if unknown:
+        raise ValueError(f"Estatísticas desconhecidas: {sorted(unknown)}")
+    rep_cols = find_replicate_cols(df) if rep_cols is None else list(rep_cols)
+    if len(rep_cols) < 2:
+        raise ValueError("São necessárias ao menos 2 colunas de pesos replicados "
+                         f"(prefixo '{REPLICATE_PREFIX}')")
+    groupings = {name: [by] if isinstance(by, str) else list(by)
+                 for name, by in groupings.items()}
+
+    frames, centers = _replicate_totals(df, groupings, value_cols, weight_col,
+                                        rep_cols, chunk_size)
+    rep_labels = list(range(len(rep_cols)))
+
+    results = {}
+    for name, sums in frames.items():
+        if margins:
+            sums = _add_margins(sums, groupings[name], margins_name)
+        out = {}
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for col in value_cols:
+                w = sums[col]['w']
+                wx = sums[col]['wx']
+                w_main, w_rep = w['main'].to_numpy(), w[rep_labels].to_numpy()
+                wx_main, wx_rep = wx['main'].to_numpy(), wx[rep_labels].to_numpy()
+                # zeros estruturais: nenhum peso em linhas com x ≠ 0
+                zero_main = sums[col]['wnz']['main'].to_numpy() == 0
+                zero_rep = sums[col]['wnz'][rep_labels].to_numpy() == 0
+                for stat in stats:
+                    if stat == 'mean':
+                        est = np.where(w_main > 0, np.where(zero_main, 0.0,
+                                                            wx_main / w_main + centers[col]), np.nan)
+                        rep = np.where(w_rep > 0, np.where(zero_rep, 0.0,
+                                                           wx_rep / w_rep + centers[col]), np.nan)
+                    elif stat == 'sum':
+                        est = np.where(zero_main, 0.0, wx_main + centers[col] * w_main)
+                        rep = np.where(zero_rep, 0.0, wx_rep + centers[col] * w_rep)
+                    else:
+                        est, rep = w_main, w_rep
+                    out[(col, stat)] = est
+                    out[(col, f'{stat}_se')] = np.sqrt(replicate_variance(est, rep, scale, mse))
+        result = pd.DataFrame(out, index=sums.index)
+        result.columns = pd.MultiIndex.from_tuples(result.columns)
+        results[name] = result
+    return results
+
+
+def replicate_grouped_stats(df, by, value_cols, weight_col='peso', rep_cols=None,
+                            stats=('mean',), margins=False, margins_name='Total',
+                            scale=None, mse=True, chunk_size=100_000):
+    """Estatísticas ponderadas por grupo com erro padrão por pesos replicados.
+
+    Mesma semântica de NaN de ``grouped_weighted_stats`` (linhas com valor
+    ou peso principal NaN são ignoradas em cada coluna); pesos replicados NaN
+    contam como zero. Médias são razões Σw·x / Σw recalculadas em cada
+    réplica, de modo que o EP incorpora a variância do denominador.
+
+    Parâmetros:
+        df         : pd.DataFrame com os microdados e as colunas de réplicas
+        by         : str ou lista de colunas de agrupamento
+        value_cols : str ou lista de colunas de valores
+        weight_col : peso principal (padrão 'peso')
+        rep_cols   : colunas de pesos replicados; padrão: todas com o
+                     prefixo 'peso_rep'
+        stats      : subconjunto de REPLICATE_STATS ('mean', 'sum', 'weight')
+        margins    : se True, acrescenta marginais como ``grouped_weighted_stats``
+        scale, mse : convenção da variância (ver ``replicate_variance``)
+        chunk_size : linhas por bloco do produto matricial (limita a memória
+                     da cópia densa das réplicas)
+
+    Retorna:
+        pd.DataFrame indexado por ``by`` com colunas (value_col, stat) e
+        (value_col, stat + '_se').
+    """
+    return replicate_tables(
+        df, {'__by__': by}, value_cols, weight_col, rep_cols, stats,
+        margins, margins_name, scale, mse, chunk_size,
+    )['__by__']
+
+
+def replicate_apply(func, df, weight_col='peso', rep_cols=None, scale=None, mse=True):
+    """Erro padrão replicado de uma estatística arbitrária.
+
+    ``func(df, weight_col)`` é chamada com o peso principal e com cada peso
+    replicado (R + 1 chamadas); use para estatísticas não lineares, como
+    quantis e Gini, que não saem do produto matricial.
+
+    Retorna:
+        (estimativa, erro padrão), com o mesmo tipo retornado por ``func``
+        (escalar, pd.Series ou pd.DataFrame)
+    """
+    rep_cols = find_replicate_cols(df) if rep_cols is None else list(rep_cols)
+    estimate = func(df, weight_col)
+    replicates = np.stack([np.asarray(func(df, c), dtype=float) for c in rep_cols], axis=-1)
+    se = np.sqrt(replicate_variance(np.asarray(estimate, dtype=float), replicates, scale, mse))
+    if isinstance(estimate, pd.DataFrame):
+        se = pd.DataFrame(se, index=estimate.index, columns=estimate.columns)
+    elif isinstance(estimate, pd.Series):
+        se = pd.Series(se, index=estimate.index, name=estimate.name)
+    else:
+        se = float(se)
+    return estimate, se
@@ -0,0 +1,197 @@
+"""
+Sketch de quantis ponderado, agrupado e mesclável (estilo t-digest)
+
+Permite calcular medianas e outros percentis por grupo (ex.: cbo_4d × mês)
+sem manter os microdados em memória: cada lote (row group do Parquet) é
+resumido em centróides (média, peso) por grupo, e sketches de lotes, meses
+ou anos diferentes são combinados com `merge`.
+
+Compressão vetorizada: os pontos de cada grupo são ordenados, e cada um é
+alocado a um balde pela função de escala k1 do t-digest aplicada ao seu
+quantil central, k(q) = asin(2q - 1) / (2·eps). Baldes estreitos nas caudas
+e largos no centro garantem erro de rank de no máximo ~eps por quantil,
+com no máximo ~π/(2·eps) centróides por grupo, independentemente de N.
+Valores repetidos que atravessam um balde (empates) ficam em centróides
+próprios, com média exata: o quantil que cai no empate sai no valor
+empatado, ao custo de no máximo dois centróides a mais por balde.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .grouped import quantile_label
+
+
+class GroupedQuantileSketch:
+    """Sketch de quantis ponderados por grupo, mesclável e de memória limitada.
+
+    Parâmetros:
+        by  : str ou lista de colunas de agrupamento
+        eps : erro de rank máximo aproximado (0.005 → ±0,5 p.p. no quantil)
+
+    Uso:
+        sketch = GroupedQuantileSketch(['cbo_4d', 'ano', 'mes'])
+        for lote in lotes:
+            sketch.update(lote, 'salario_mensal')
+        sketch.quantiles([0.5])
+    """
+
+    def __init__(self, by, eps=0.005):
+        if not 0 < eps < 0.5:
+            raise ValueError(f"eps deve estar em (0, 0.5): {eps}")
+        self.by = [by] if isinstance(by, str) else list(by)
+        self.eps = eps
+        self._centroids = pd.DataFrame(
+            columns=self.by + ['_mean', '_weight']
+        ).astype({'_mean': float, '_weight': float})
+        self._extremes = None
+
+    # ------------------------------------------------------------------
+    # Atualização e merge
+    # ------------------------------------------------------------------
+    def update(self, df, value_col, weight_col=None):
+        """Incorpora um lote de microdados ao sketch.
+
+        Linhas com valor NaN ou peso NaN/não positivo são ignoradas.
+        Sem ``weight_col``, cada linha tem peso 1 (quantis não ponderados).
+        """
+        x = df[value_col].to_numpy(dtype=float)
+        w = (np.ones(len(df)) if weight_col is None
+             else df[weight_col].to_numpy(dtype=float))
+        valid = ~(np.isnan(x) | np.isnan(w)) & (w > 0)
+        if not valid.any():
+            return self
+
+        points = df.loc[valid, self.by].reset_index(drop=True)
+        points['_mean'] = x[valid]
+        points['_weight'] = w[valid]
+        extremes = points.groupby(self.by, observed=True, sort=False)['_mean'].agg(['min', 'max'])
+
+        self._absorb(points, extremes)
+        return self
+
+    def merge(self, other):
+        """Combina outro sketch (mesmas chaves) neste sketch e o retorna."""
+        if other.by != self.by:
+            raise ValueError(f"Chaves diferentes: {other.by} != {self.by}")
+        if other._extremes is not None:
+            self._absorb(other._centroids, other._extremes)
+        return self
+
+    def _absorb(self, centroids, extremes):
+        frames = [f for f in (self._centroids, centroids) if len(f) > 0]
+        self._centroids = self._compress(pd.concat(frames, ignore_index=True))
+        if self._extremes is None:
+            self._extremes = extremes
+        else:
+            both = pd.concat([self._extremes, extremes])
+            self._extremes = both.groupby(level=self.by, observed=True, sort=False).agg(
+                {'min': 'min', 'max': 'max'}
+            )
+
+    def _compress(self, frame):
+        """Agrupa pontos/centróides adjacentes em baldes da escala k1."""
+        codes, order, starts, counts = self._segments(frame)
+        m = frame['_mean'].to_numpy(dtype=float)[order]
+        w = frame['_weight'].to_numpy(dtype=float)[order]
+        codes = codes[order]
+
+        cum = np.cumsum(w)
+        base = (cum[starts] - w[starts])[codes]
+        totals = np.bincount(codes, weights=w)[codes]
+        q_mid = (cum - w / 2 - base) / totals
+        bucket = np.floor(
+            np.arcsin(np.clip(2 * q_mid - 1, -1, 1)) / (2 * self.eps)
+        ).astype(np.int64)
+
+        # Valor repetido que atravessa a fronteira de um balde (massa de
+        # empate, ex.: salário mínimo) vira centróides só dele: os vizinhos
+        # não o misturam com outros valores e o quantil cai exatamente nele
+        run = np.ones(len(m), dtype=bool)
+        run[1:] = (codes[1:] != codes[:-1]) | (m[1:] != m[:-1])
+        run_first = np.flatnonzero(run)
+        run_last = np.append(run_first[1:], len(m)) - 1
+        spans = (bucket[run_first] != bucket[run_last])[np.cumsum(run) - 1]
+
+        new = np.ones(len(m), dtype=bool)
+        new[1:] = ((codes[1:] != codes[:-1]) | (bucket[1:] != bucket[:-1])
+                   | (run[1:] & (spans[1:] | spans[:-1])))
+        first = np.flatnonzero(new)
+
+        # média centrada no primeiro valor do balde: valores empatados
+        # (salário mínimo, valores arredondados) saem exatos, sem resíduo
+        weight = np.add.reduceat(w, first)
+        shift = m[first][np.cumsum(new) - 1]
+        result = frame[self.by].iloc[order[first]].reset_index(drop=True)
+        result['_mean'] = m[first] + np.add.reduceat(w * (m - shift), first) / weight
+        result['_weight'] = weight
+        return result
+
+    def _segments(self, frame):
+        """Códigos de grupo, ordem (grupo, valor) e limites de cada segmento."""
+        codes = frame.groupby(self.by, observed=True, sort=True).ngroup().to_numpy()
+        order = np.lexsort((frame['_mean'].to_numpy(dtype=float), codes))
+        counts = np.bincount(codes)
+        starts = np.cumsum(counts) - counts
+        return codes, order, starts, counts
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    @property
+    def n_centroids(self):
+        """Número total de centróides mantidos (medida de memória)."""
+        return len(self._centroids)
+
+    def quantiles(self, qs=(0.5,)):
+        """Quantis estimados por grupo.
+
+        Interpola linearmente entre os centros de massa dos centróides
+        (e o mínimo/máximo observados nas caudas), como no t-digest.
+
+        Retorna:
+            pd.DataFrame indexado por ``by``, uma coluna por quantil
+            ('p50', 'p90', ...).
+        """
+        qs = np.atleast_1d(np.asarray(qs, dtype=float))
+        labels = [quantile_label(q) for q in qs]
+        frame = self._centroids
+        if len(frame) == 0:
+            return pd.DataFrame(columns=labels)
+
+        codes, order, starts, counts = self._segments(frame)
+        m = frame['_mean'].to_numpy(dtype=float)[order]
+        w = frame['_weight'].to_numpy(dtype=float)[order]
+        ends = starts + counts
+
+        cum = np.cumsum(w)
+        base = cum[starts] - w[starts]
+        totals = cum[ends - 1] - base
+        pos = cum - w / 2                      # centro de massa de cada centróide
+
+        index = frame[self.by].iloc[order[starts]]
+        index = pd.MultiIndex.from_frame(index) if len(self.by) > 1 else pd.Index(
+            index[self.by[0]], name=self.by[0]
+        )
+        extremes = self._extremes.reindex(index)
+        lo = extremes['min'].to_numpy(dtype=float)[:, None]
+        hi = extremes['max'].to_numpy(dtype=float)[:, None]
+
+        target = base[:, None] + qs[None, :] * totals[:, None]
+        j = np.searchsorted(pos, target.ravel(), side='right').reshape(target.shape) - 1
+        first, last = starts[:, None], (ends - 1)[:, None]
+        left_tail = j < first
+        right_tail = j >= last
+        j = np.clip(j, first, np.maximum(last - 1, first))
+
+        x0 = np.where(left_tail, lo, np.where(right_tail, m[last], m[j]))
+        x1 = np.where(left_tail, m[first], np.where(right_tail, hi, m[np.minimum(j + 1, last)]))
+        p0 = np.where(left_tail, base[:, None], np.where(right_tail, pos[last], pos[j]))
+        p1 = np.where(left_tail, pos[first],
+                      np.where(right_tail, (base + totals)[:, None], pos[np.minimum(j + 1, last)]))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frac = np.where(p1 > p0, (target - p0) / (p1 - p0), 0.0)
+        values = x0 + (x1 - x0) * np.clip(frac, 0.0, 1.0)
+
+        return pd.DataFrame(values, index=index, columns=labels)
@@ -0,0 +1,253 @@
+"""
+Teste: pacote compartilhado weighted_stats
+Executar: python -m pytest weighted_stats/tests  (não depende de dados)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Adicionar raiz do repositório ao path
+REPO_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(REPO_ROOT))
+
+import weighted_stats as ws
+from weighted_stats import _kernels
+
+
+def _dados(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    v = pd.Series(rng.lognormal(7, 0.8, n))
+    w = pd.Series(rng.uniform(50, 500, n))
+    v[rng.random(n) < 0.1] = np.nan
+    w[rng.random(n) < 0.05] = np.nan
+    return v, w
+
+
+def test_regras_nan_e_peso_zero():
+    """Pares com NaN são descartados; Σw = 0 ou sem dados → NaN"""
+    assert ws.weighted_mean([1.0, np.nan, 3.0], [1.0, 1.0, np.nan]) == 1.0
+    assert np.isnan(ws.weighted_mean([], []))
+    assert np.isnan(ws.weighted_mean([1.0, 2.0], [0.0, 0.0]))
+    assert ws.weighted_mean([1.0, 2.0], [0.0, 0.0], zero_weight='unweighted') == 1.5
+    assert np.isnan(ws.weighted_se([1.0], [1.0]))
+    assert np.isnan(ws.weighted_quantiles([1.0, 2.0], [0.0, 0.0], [0.5])).all()
+    print("✓ Regras de NaN/peso zero consistentes")
+
+
+def test_contra_referencia():
+    """Compara com implementações diretas em NumPy"""
+    v, w = _dados()
+    mask = v.notna() & w.notna()
+    x, p = v[mask].to_numpy(), w[mask].to_numpy()
+    media = np.average(x, weights=p)
+    dp = np.sqrt(np.average((x - media) ** 2, weights=p))
+
+    assert np.isclose(ws.weighted_mean(v, w), media)
+    assert np.isclose(ws.weighted_std(v, w), dp)
+    assert np.isclose(ws.weighted_se(v, w), dp / np.sqrt(p.sum() ** 2 / (p ** 2).sum()))
+
+    ordem = np.argsort(x)
+    acum = np.cumsum(p[ordem])
+    for q in (0.1, 0.5, 0.9):
+        esperado = x[ordem][np.searchsorted(acum, q * acum[-1])]
+        assert ws.weighted_quantile(v, w, q) == esperado
+    print("✓ Média, desvio, EP e quantis conferem com a referência")
+
+
+def test_backends_equivalentes():
+    """Backend NumPy e Numba (se instalado) dão o mesmo resultado"""
+    v, w = _dados()
+    original = _kernels._backend
+    try:
+        _kernels.set_backend('numpy')
+        ref = [ws.weighted_mean(v, w), ws.weighted_std(v, w), ws.weighted_se(v, w)]
+        if _kernels.numba is not None:
+            _kernels.set_backend('numba')
+            assert np.allclose(ref, [ws.weighted_mean(v, w), ws.weighted_std(v, w),
+                                     ws.weighted_se(v, w)])
+            print("✓ Numba == NumPy")
+    finally:
+        _kernels._backend = original
+
+
+def test_agrupado_igual_escalar():
+    """grouped_weighted_stats/quantiles == funções escalares por grupo"""
+    v, w = _dados()
+    df = pd.DataFrame({'g': np.arange(len(v)) % 7, 'x': v, 'peso': w})
+    stats = ws.grouped_weighted_stats(df, 'g', 'x', stats=['mean', 'std', 'se'])
+    quantis = ws.grouped_weighted_quantiles(df, 'g', 'x', qs=(0.5,))
+    for g, sub in df.groupby('g'):
+        assert np.isclose(stats.loc[g, ('x', 'mean')], ws.weighted_mean(sub['x'], sub['peso']))
+        assert np.isclose(stats.loc[g, ('x', 'std')], ws.weighted_std(sub['x'], sub['peso']))
+        assert np.isclose(stats.loc[g, ('x', 'se')], ws.weighted_se(sub['x'], sub['peso']))
+        assert quantis.loc[g, 'p50'] == ws.weighted_quantile(sub['x'], sub['peso'], 0.5)
+    print("✓ Estatísticas agrupadas conferem com as escalares")
+
+
+def test_desigualdade_agrupada_igual_escalar():
+    """grouped_inequality/grouped_lorenz == gini_coefficient/quantis por grupo"""
+    v, w = _dados()
+    df = pd.DataFrame({'g': np.arange(len(v)) % 5, 'x': v, 'peso': w})
+    ineq = ws.grouped_inequality(df, 'g', 'x', margins=True)
+    lorenz = ws.grouped_lorenz(df, 'g', 'x', points=11)
+    for g, sub in df.groupby('g'):
+        assert np.isclose(ineq.loc[g, 'gini'], ws.gini_coefficient(sub['x'], sub['peso']))
+        p10, p90 = ws.weighted_quantiles(sub['x'], sub['peso'], [0.1, 0.9])
+        assert np.isclose(ineq.loc[g, 'p90_p10'], p90 / p10)
+
+        sub = sub.dropna().sort_values('x')
+        cum_w = np.concatenate([[0], np.cumsum(sub['peso'])])
+        cum_wx = np.concatenate([[0], np.cumsum(sub['peso'] * sub['x'])])
+        esperado = np.interp(lorenz.columns * cum_w[-1], cum_w, cum_wx) / cum_wx[-1]
+        assert np.allclose(lorenz.loc[g].to_numpy(), esperado)
+    assert np.isclose(ineq.loc['Total', 'gini'], ws.gini_coefficient(v, w))
+    print("✓ Gini, P90/P10 e Lorenz agrupados conferem com os escalares")
+
+
+def test_balanco_igual_escalar():
+    """covariate_balance == weighted_diff_normalized por covariável e período"""
+    v, w = _dados()
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'x': v, 'z': rng.normal(size=len(v)), 'peso': w,
+                       'post': np.arange(len(v)) % 2, 'trat': rng.integers(0, 2, len(v))})
+    balance = ws.covariate_balance(df, ['x', 'z'], 'trat', by='post')
+    for post, sub in df.groupby('post'):
+        for col in ['x', 'z']:
+            t, c = sub[sub['trat'] == 1], sub[sub['trat'] == 0]
+            esperado = ws.weighted_diff_normalized(t[col], t['peso'], c[col], c['peso'])
+            assert np.isclose(balance.loc[(post, col), 'std_diff'], esperado)
+            assert 0 <= balance.loc[(post, col), 'ks'] <= 1
+    print("✓ Balanço matricial confere com weighted_diff_normalized")
+
+
+def test_replicas_igual_forca_bruta():
+    """Produto matricial das réplicas == recalcular a média com cada réplica"""
+    v, w = _dados(3000, seed=4)
+    rng = np.random.default_rng(5)
+    reps = pd.DataFrame(w.to_numpy()[:, None] * rng.exponential(1.0, (len(w), 20)),
+                        columns=ws.replicate_weight_cols(20))
+    df = pd.concat([pd.DataFrame({'g': rng.choice(list('abc'), len(v)),
+                                  'valor': v, 'peso': w}), reps], axis=1)
+
+    res = ws.replicate_grouped_stats(df, 'g', 'valor', stats=['mean', 'sum'],
+                                     margins=True, chunk_size=700)
+    ref = ws.grouped_weighted_stats(df, 'g', 'valor', stats=['mean', 'sum'], margins=True)
+    assert np.allclose(res[('valor', 'mean')], ref[('valor', 'mean')])
+    assert np.allclose(res[('valor', 'sum')], ref[('valor', 'sum')])
+
+    def media(d, peso):
+        return ws.grouped_weighted_stats(d, 'g', 'valor', peso, margins=True)[('valor', 'mean')]
+    _, se = ws.replicate_apply(media, df)
+    assert np.allclose(se, res[('valor', 'mean_se')])
+    print("✓ Erros padrão replicados conferem com a força bruta")
+
+
+def test_replicas_zero_estrutural():
+    """Grupo com indicadora sempre 0: média, total e EP exatamente 0 (sem resíduo da centragem)"""
+    rng = np.random.default_rng(8)
+    n = 5000
+    g = rng.choice(list('abcd'), n)
+    w = rng.uniform(100, 2000, n)
+    reps = pd.DataFrame(w[:, None] * rng.exponential(1.0, (n, 20)),
+                        columns=ws.replicate_weight_cols(20))
+    alta = np.where(g == 'c', 0.0, (rng.random(n) < 0.3).astype(float))
+    alta[g == 'd'] *= 1e-12          # valores reais minúsculos não viram 0
+    df = pd.concat([pd.DataFrame({'g': g, 'alta': alta, 'peso': w}), reps], axis=1)
+
+    res = ws.replicate_grouped_stats(df, 'g', 'alta', stats=['mean', 'sum'], margins=True)
+    for stat in ('mean', 'mean_se', 'sum', 'sum_se'):
+        assert res.loc['c', ('alta', stat)] == 0.0, stat
+    assert res.loc['a', ('alta', 'mean')] > 0 and res.loc['a', ('alta', 'mean_se')] > 0
+    ref = ws.grouped_weighted_stats(df, 'g', 'alta', stats=['mean'])
+    assert 0 < res.loc['d', ('alta', 'mean')] < 1e-12
+    assert np.isclose(res.loc['d', ('alta', 'mean')], ref.loc['d', ('alta', 'mean')], rtol=1e-3)
+    assert res.loc['d', ('alta', 'mean_se')] > 0
+    print("✓ Zero estrutural sai exatamente 0 nas réplicas")
+
+
+def test_cubo_igual_microdados():
+    """cube_stats e desigualdade sobre células == mesmas contas nos microdados"""
+    v, w = _dados(3000, seed=6)
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({'g': rng.choice(list('abc'), len(v)), 'h': rng.integers(0, 4, len(v)),
+                       'x': v.round(-2), 'peso': w})
+    cube = {'fino': ws.build_cube(df, ['g', 'h'], 'x'),
+            'dist': ws.build_cube(df.dropna(subset=['x']), ['g', 'x'])}
+    with tempfile.TemporaryDirectory() as tmp:
+        ws.save_cube(cube, tmp)
+        cube = ws.load_cube(tmp)
+
+    stats = ['mean', 'sum', 'weight', 'n', 'std', 'se']
+    for by in ['g', ['g', 'h']]:
+        res = ws.cube_stats(cube, by, 'x', stats, margins=True)
+        ref = ws.grouped_weighted_stats(df, by, 'x', stats=stats, margins=True)
+        assert np.allclose(res, ref, equal_nan=True)
+    total = ws.cube_stats(cube, None, 'x', ['mean'])
+    assert np.isclose(total.iloc[0, 0], ws.weighted_mean(df['x'], df['peso']))
+
+    ineq = ws.grouped_inequality(cube['dist'], 'g', 'x', count_col='n', weight2_col='peso2',
+                                 margins=True)
+    ref = ws.grouped_inequality(df, 'g', 'x', margins=True)
+    assert np.allclose(ineq, ref.loc[ineq.index, ineq.columns], equal_nan=True)
+
+    # Dimensão categórica (Parquet tipado): mesmas células, sem categorias vazias
+    cat = ws.build_cube(df.astype({'g': pd.CategoricalDtype(list('abcz'))}), ['g', 'h'], 'x')
+    pd.testing.assert_frame_equal(cat, ws.build_cube(df, ['g', 'h'], 'x'))
+    print("✓ Cubo confere com as estatísticas dos microdados")
+
+
+def test_sketch_mesclado_igual_exato():
+    """Sketches por lote mesclados: erro de rank ≤ eps frente aos quantis exatos"""
+    rng = np.random.default_rng(9)
+    n = 60_000
+    df = pd.DataFrame({'g': rng.choice(list('abcd'), n, p=[0.4, 0.3, 0.2, 0.1]),
+                       'x': rng.lognormal(7, 0.8, n).round(-2),   # empates a cada 100
+                       'peso': rng.lognormal(5, 1, n)})
+    df.loc[df['g'] == 'd', 'x'] = (df['x'] // 1000) * 1000       # poucos valores distintos
+    qs = np.array([0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99])
+
+    for eps in (0.01, 0.005):
+        # 64 lotes (o último só com o grupo 'a'), mesclados em árvore
+        lotes = [df.iloc[i:i + 1000] for i in range(0, n - 4000, 1000)]
+        lotes.append(df.iloc[n - 4000:].query("g == 'a'"))
+        parts = [ws.GroupedQuantileSketch('g', eps).update(lote, 'x', 'peso') for lote in lotes]
+        parts.append(ws.GroupedQuantileSketch('g', eps))           # sketch vazio
+        while len(parts) > 1:
+            parts = [parts[i].merge(parts[i + 1]) if i + 1 < len(parts) else parts[i]
+                     for i in range(0, len(parts), 2)]
+        est = parts[0].quantiles(qs)
+
+        sub = df.query("index < @n - 4000 or g == 'a'")
+        exato = ws.grouped_weighted_quantiles(sub, 'g', 'x', 'peso', qs)
+        assert est.index.equals(exato.index) and list(est.columns) == list(exato.columns)
+        for g, d in sub.groupby('g'):
+            x, w = d['x'].to_numpy(), d['peso'].to_numpy()
+            for q, e in zip(qs, est.loc[g]):
+                # rank de e é o intervalo [F(e-), F(e)] (empates); distância até q ≤ eps
+                lo, hi = w[x < e].sum() / w.sum(), w[x <= e].sum() / w.sum()
+                assert max(lo - q, q - hi) <= eps, (eps, g, q, e)
+        # equivalente em valores: entre os quantis exatos de q - eps e q + eps
+        faixa = [ws.grouped_weighted_quantiles(sub, 'g', 'x', 'peso', np.clip(qs + d, 0, 1))
+                 .to_numpy() for d in (-eps, eps)]
+        assert ((faixa[0] <= est.to_numpy()) & (est.to_numpy() <= faixa[1])).all()
+        # massa de empate sai exatamente no valor empatado
+        assert est.loc['d', 'p50'] == exato.loc['d', 'p50']
+        assert parts[0].n_centroids < 4 * 3 * np.pi / (2 * eps)  # 4 grupos; empates: +2 por balde
+    print("✓ Sketch mesclado por lotes confere com os quantis exatos (erro de rank ≤ eps)")
+
+
+if __name__ == "__main__":
+    test_regras_nan_e_peso_zero()
+    test_contra_referencia()
+    test_backends_equivalentes()
+    test_agrupado_igual_escalar()
+    test_desigualdade_agrupada_igual_escalar()
+    test_balanco_igual_escalar()
+    test_replicas_igual_forca_bruta()
+    test_replicas_zero_estrutural()
+    test_cubo_igual_microdados()
+    test_sketch_mesclado_igual_exato()